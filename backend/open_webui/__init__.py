@@ -21,6 +21,18 @@ def version_callback(value: bool):
         raise typer.Exit()
 
 
+def load_secret_key():
+    if os.getenv("WEBUI_SECRET_KEY") is None:
+        typer.echo(
+            "Loading WEBUI_SECRET_KEY from file, not provided as an environment variable."
+        )
+        if not KEY_FILE.exists():
+            typer.echo(f"Generating a new secret key and saving it to {KEY_FILE}")
+            KEY_FILE.write_bytes(base64.b64encode(random.randbytes(12)))
+        typer.echo(f"Loading WEBUI_SECRET_KEY from {KEY_FILE}")
+        os.environ["WEBUI_SECRET_KEY"] = KEY_FILE.read_text()
+
+
 @app.command()
 def main(
     version: Annotated[
@@ -36,15 +48,7 @@ def serve(
     port: int = 8080,
 ):
     os.environ["FROM_INIT_PY"] = "true"
-    if os.getenv("WEBUI_SECRET_KEY") is None:
-        typer.echo(
-            "Loading WEBUI_SECRET_KEY from file, not provided as an environment variable."
-        )
-        if not KEY_FILE.exists():
-            typer.echo(f"Generating a new secret key and saving it to {KEY_FILE}")
-            KEY_FILE.write_bytes(base64.b64encode(random.randbytes(12)))
-        typer.echo(f"Loading WEBUI_SECRET_KEY from {KEY_FILE}")
-        os.environ["WEBUI_SECRET_KEY"] = KEY_FILE.read_text()
+    load_secret_key()
 
     if os.getenv("USE_CUDA_DOCKER", "false") == "true":
         typer.echo(
@@ -84,6 +88,27 @@ def serve(
     )
 
 
+@app.command()
+def ingest(
+    processes: Optional[int] = None,
+    concurrency: Optional[int] = None,
+):
+    """Run the ingestion workers for the file processing queue (ENABLE_INGESTION_QUEUE)."""
+    os.environ["FROM_INIT_PY"] = "true"
+    load_secret_key()
+
+    from open_webui.env import (
+        INGESTION_WORKER_CONCURRENCY,
+        INGESTION_WORKER_PROCESSES,
+    )
+    from open_webui.ingestion import run_workers
+
+    run_workers(
+        processes=processes or INGESTION_WORKER_PROCESSES,
+        concurrency=concurrency or INGESTION_WORKER_CONCURRENCY,
+    )
+
+
 @app.command()
 def dev(
     host: str = "0.0.0.0",
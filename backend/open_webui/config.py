@@ -4,6 +4,8 @@ import os
 import shutil
 import socket
 import base64
+import threading
+import time
 from concurrent.futures import ThreadPoolExecutor
 import redis
 
@@ -226,8 +228,18 @@ class PersistentConfig(Generic[T]):
 
 
 class AppConfig:
+    """
+    Application config backed by PersistentConfig entries.
+
+    Reads are served from the in-process snapshot in ``_state``. When Redis is
+    configured, writes are stored under ``{prefix}:config:{key}`` and announced
+    on the ``{prefix}:config:updates`` channel; a background subscriber applies
+    updates published by other replicas to the local snapshot.
+    """
+
     _redis: Union[redis.Redis, redis.cluster.RedisCluster] = None
     _redis_key_prefix: str
+    _redis_channel: str
 
     _state: dict[str, PersistentConfig]
 
@@ -238,8 +250,11 @@ class AppConfig:
         redis_cluster: Optional[bool] = False,
         redis_key_prefix: str = "open-webui",
     ):
+        super().__setattr__("_state", {})
+
         if redis_url:
             super().__setattr__("_redis_key_prefix", redis_key_prefix)
+            super().__setattr__("_redis_channel", f"{redis_key_prefix}:config:updates")
             super().__setattr__(
                 "_redis",
                 get_redis_connection(
@@ -250,41 +265,103 @@ class AppConfig:
                 ),
             )
 
-        super().__setattr__("_state", {})
+            if ENABLE_PERSISTENT_CONFIG:
+                threading.Thread(
+                    target=self._listen_for_updates,
+                    name="app-config-subscriber",
+                    daemon=True,
+                ).start()
 
     def __setattr__(self, key, value):
         if isinstance(value, PersistentConfig):
             self._state[key] = value
+
+            # Seed the local snapshot with the shared value, if any
+            if self._redis and ENABLE_PERSISTENT_CONFIG:
+                try:
+                    self._apply_redis_value(
+                        key, self._redis.get(self._get_redis_key(key))
+                    )
+                except redis.exceptions.RedisError as e:
+                    log.warning(f"Failed to load {key} from Redis: {e}")
         else:
             self._state[key].value = value
             self._state[key].save()
 
             if self._redis and ENABLE_PERSISTENT_CONFIG:
-                redis_key = f"{self._redis_key_prefix}:config:{key}"
-                self._redis.set(redis_key, json.dumps(self._state[key].value))
+                encoded_value = json.dumps(self._state[key].value)
+                self._redis.set(self._get_redis_key(key), encoded_value)
+                self._redis.publish(
+                    self._redis_channel,
+                    json.dumps({"key": key, "value": encoded_value}),
+                )
 
     def __getattr__(self, key):
         if key not in self._state:
             raise AttributeError(f"Config key '{key}' not found")
 
-        # If Redis is available and persistent config is enabled, check for an updated value
-        if self._redis and ENABLE_PERSISTENT_CONFIG:
-            redis_key = f"{self._redis_key_prefix}:config:{key}"
-            redis_value = self._redis.get(redis_key)
-
-            if redis_value is not None:
-                try:
-                    decoded_value = json.loads(redis_value)
+        return self._state[key].value
 
-                    # Update the in-memory value if different
-                    if self._state[key].value != decoded_value:
-                        self._state[key].value = decoded_value
-                        log.info(f"Updated {key} from Redis: {decoded_value}")
+    def _get_redis_key(self, key: str) -> str:
+        return f"{self._redis_key_prefix}:config:{key}"
 
-                except json.JSONDecodeError:
-                    log.error(f"Invalid JSON format in Redis for {key}: {redis_value}")
+    def _apply_redis_value(self, key: str, redis_value: Optional[str]):
+        if redis_value is None or key not in self._state:
+            return
 
-        return self._state[key].value
+        try:
+            decoded_value = json.loads(redis_value)
+        except json.JSONDecodeError:
+            log.error(f"Invalid JSON format in Redis for {key}: {redis_value}")
+            return
+
+        # Update the in-memory value if different
+        if self._state[key].value != decoded_value:
+            self._state[key].value = decoded_value
+            log.info(f"Updated {key} from Redis: {decoded_value}")
+
+    def _sync_from_redis(self):
+        keys = list(self._state.keys())
+        if not keys:
+            return
+
+        redis_keys = [self._get_redis_key(key) for key in keys]
+        if isinstance(self._redis, redis.cluster.RedisCluster):
+            # The keys span hash slots; a plain MGET fails with CROSSSLOT
+            values = self._redis.mget_nonatomic(redis_keys)
+        else:
+            values = self._redis.mget(redis_keys)
+        for key, redis_value in zip(keys, values):
+            self._apply_redis_value(key, redis_value)
+
+    def _listen_for_updates(self):
+        while True:
+            pubsub = None
+            try:
+                pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self._redis_channel)
+
+                # Catch up on anything published while we were not subscribed
+                self._sync_from_redis()
+
+                for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+
+                    try:
+                        update = json.loads(message["data"])
+                        self._apply_redis_value(update["key"], update["value"])
+                    except (json.JSONDecodeError, KeyError, TypeError):
+                        log.error(f"Invalid config update message: {message}")
+            except Exception as e:
+                log.warning(f"Config update subscription lost, reconnecting: {e}")
+                time.sleep(1)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
 
 
 ####################################
@@ -2243,6 +2320,17 @@ Ensure that the tools are effectively utilized to achieve the highest-quality an
 
 VECTOR_DB = os.environ.get("VECTOR_DB", "chroma")
 
+# Persistent BM25 index for hybrid search, stored under CACHE_DIR/bm25.
+# The directory must be shared by all instances when running several replicas.
+ENABLE_RAG_BM25_INDEX = (
+    os.environ.get("ENABLE_RAG_BM25_INDEX", "False").lower() == "true"
+)
+
+try:
+    RAG_BM25_INDEX_CACHE_SIZE = int(os.environ.get("RAG_BM25_INDEX_CACHE_SIZE", "32"))
+except ValueError:
+    RAG_BM25_INDEX_CACHE_SIZE = 32
+
 # Chroma
 CHROMA_DATA_PATH = f"{DATA_DIR}/vector_db"
 
@@ -2911,6 +2999,26 @@ RAG_EMBEDDING_PREFIX_FIELD_NAME = os.environ.get(
     "RAG_EMBEDDING_PREFIX_FIELD_NAME", None
 )
 
+# Embeddings are cached by (engine, model, prefix, sha256(text)) in a bounded
+# in-memory LRU, optionally backed by Redis ("redis") or SQLite ("disk").
+ENABLE_RAG_EMBEDDING_CACHE = (
+    os.environ.get("ENABLE_RAG_EMBEDDING_CACHE", "True").lower() == "true"
+)
+
+try:
+    RAG_EMBEDDING_CACHE_SIZE = int(os.environ.get("RAG_EMBEDDING_CACHE_SIZE", "5000"))
+except ValueError:
+    RAG_EMBEDDING_CACHE_SIZE = 5000
+
+RAG_EMBEDDING_CACHE_STORAGE = os.environ.get("RAG_EMBEDDING_CACHE_STORAGE", "").lower()
+
+try:
+    RAG_EMBEDDING_CACHE_TTL = int(
+        os.environ.get("RAG_EMBEDDING_CACHE_TTL", str(7 * 24 * 60 * 60))
+    )
+except ValueError:
+    RAG_EMBEDDING_CACHE_TTL = 7 * 24 * 60 * 60
+
 RAG_RERANKING_ENGINE = PersistentConfig(
     "RAG_RERANKING_ENGINE",
     "rag.reranking_engine",
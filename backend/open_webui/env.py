@@ -363,11 +363,33 @@ if DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL is not None:
     except Exception:
         DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL = 0.0
 
+# Seconds between batched last_active_at writes, 0 writes on every update
+try:
+    DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL = float(
+        os.environ.get("DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL", "10")
+    )
+except Exception:
+    DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL = 10.0
+
 # When enabled, get_db_context reuses existing sessions; set to False to always create new sessions
 DATABASE_ENABLE_SESSION_SHARING = (
     os.environ.get("DATABASE_ENABLE_SESSION_SHARING", "False").lower() == "true"
 )
 
+# Run database calls made through run_db on the event loop with an async driver
+# (aiosqlite for SQLite, asyncpg for PostgreSQL) instead of the thread pool below
+DATABASE_ENABLE_ASYNC = (
+    os.environ.get("DATABASE_ENABLE_ASYNC", "False").lower() == "true"
+)
+
+# Threads available to database calls made through run_db
+try:
+    DATABASE_THREAD_POOL_SIZE = int(os.environ.get("DATABASE_THREAD_POOL_SIZE", "10"))
+except Exception:
+    DATABASE_THREAD_POOL_SIZE = 10
+if DATABASE_THREAD_POOL_SIZE <= 0:
+    DATABASE_THREAD_POOL_SIZE = 10
+
 # Enable public visibility of active user count (when disabled, only admins can see it)
 ENABLE_PUBLIC_ACTIVE_USERS_COUNT = (
     os.environ.get("ENABLE_PUBLIC_ACTIVE_USERS_COUNT", "True").lower() == "true"
@@ -381,6 +403,15 @@ ENABLE_REALTIME_CHAT_SAVE = (
     os.environ.get("ENABLE_REALTIME_CHAT_SAVE", "False").lower() == "true"
 )
 
+# When enabled, chat_message rows hold the message bodies and chat.chat only keeps
+# the history skeleton (ids, parent/children links, currentId).
+# Turning it on for an existing database is safe: chats written before keep their
+# full chat.chat until their next save. Turning it off again is not supported,
+# chats saved while it was on would be left with only the skeleton.
+ENABLE_CHAT_MESSAGE_STORAGE = (
+    os.environ.get("ENABLE_CHAT_MESSAGE_STORAGE", "False").lower() == "true"
+)
+
 ENABLE_QUERIES_CACHE = os.environ.get("ENABLE_QUERIES_CACHE", "False").lower() == "true"
 
 RAG_SYSTEM_CONTEXT = os.environ.get("RAG_SYSTEM_CONTEXT", "False").lower() == "true"
@@ -619,6 +650,50 @@ else:
     except Exception:
         MODELS_CACHE_TTL = 1
 
+# Seconds the custom models and function items of the model catalog are reused
+# before they are reloaded from the database, which bounds how long changes made
+# on another worker take to show up without Redis; 0 reloads on every call
+try:
+    MODELS_CATALOG_CACHE_TTL = int(os.environ.get("MODELS_CATALOG_CACHE_TTL", "60"))
+except Exception:
+    MODELS_CATALOG_CACHE_TTL = 60
+
+# Seconds a user's group ids and accessible resource ids stay cached, 0 disables.
+# Writes invalidate the cached entries through counters that are only shared
+# between workers and replicas with Redis. Without it a worker keeps honouring
+# e.g. a revoked grant made on another worker until its entry expires, so the
+# default drops from 300 to 5 seconds when there is no Redis client.
+try:
+    ACCESS_CACHE_TTL = (
+        int(os.environ["ACCESS_CACHE_TTL"])
+        if os.environ.get("ACCESS_CACHE_TTL")
+        else None
+    )
+except Exception:
+    ACCESS_CACHE_TTL = None
+
+try:
+    ACCESS_CACHE_SIZE = int(os.environ.get("ACCESS_CACHE_SIZE", "10000"))
+except Exception:
+    ACCESS_CACHE_SIZE = 10000
+
+# Seconds an authenticated user stays cached, 0 disables. As with
+# ACCESS_CACHE_TTL, role changes and deactivations only reach the other workers
+# through Redis; without it the default drops from 10 to 5 seconds.
+try:
+    USER_CACHE_TTL = (
+        int(os.environ["USER_CACHE_TTL"]) if os.environ.get("USER_CACHE_TTL") else None
+    )
+except Exception:
+    USER_CACHE_TTL = None
+
+# Seconds a loaded function or tool module is trusted before it is checked
+# against the database again, 0 checks on every call
+try:
+    PLUGIN_CACHE_TTL = int(os.environ.get("PLUGIN_CACHE_TTL", "60"))
+except Exception:
+    PLUGIN_CACHE_TTL = 60
+
 
 ####################################
 # CHAT
@@ -672,6 +747,32 @@ else:
         CHAT_STREAM_RESPONSE_CHUNK_MAX_BUFFER_SIZE = None
 
 
+# Streaming message events (status, message, embeds, files, sources) are
+# coalesced in memory and persisted at most every interval (seconds) or once
+# this many bytes are pending. Set the interval to 0 to write every event.
+CHAT_EVENT_BUFFER_FLUSH_INTERVAL = os.environ.get(
+    "CHAT_EVENT_BUFFER_FLUSH_INTERVAL", "1"
+)
+
+if CHAT_EVENT_BUFFER_FLUSH_INTERVAL == "":
+    CHAT_EVENT_BUFFER_FLUSH_INTERVAL = 1.0
+else:
+    try:
+        CHAT_EVENT_BUFFER_FLUSH_INTERVAL = float(CHAT_EVENT_BUFFER_FLUSH_INTERVAL)
+    except Exception:
+        CHAT_EVENT_BUFFER_FLUSH_INTERVAL = 1.0
+
+CHAT_EVENT_BUFFER_MAX_SIZE = os.environ.get("CHAT_EVENT_BUFFER_MAX_SIZE", "65536")
+
+if CHAT_EVENT_BUFFER_MAX_SIZE == "":
+    CHAT_EVENT_BUFFER_MAX_SIZE = 65536
+else:
+    try:
+        CHAT_EVENT_BUFFER_MAX_SIZE = int(CHAT_EVENT_BUFFER_MAX_SIZE)
+    except Exception:
+        CHAT_EVENT_BUFFER_MAX_SIZE = 65536
+
+
 ####################################
 # WEBSOCKET SUPPORT
 ####################################
@@ -755,6 +856,26 @@ AIOHTTP_CLIENT_SESSION_SSL = (
     os.environ.get("AIOHTTP_CLIENT_SESSION_SSL", "True").lower() == "true"
 )
 
+# Upstream connection pools (0 means no limit)
+try:
+    AIOHTTP_CLIENT_POOL_LIMIT = int(os.environ.get("AIOHTTP_CLIENT_POOL_LIMIT", "0"))
+except ValueError:
+    AIOHTTP_CLIENT_POOL_LIMIT = 0
+
+try:
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST = int(
+        os.environ.get("AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST", "0")
+    )
+except ValueError:
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST = 0
+
+try:
+    AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT = float(
+        os.environ.get("AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT", "30")
+    )
+except ValueError:
+    AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT = 30.0
+
 AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST = os.environ.get(
     "AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST",
     os.environ.get("AIOHTTP_CLIENT_TIMEOUT_OPENAI_MODEL_LIST", "10"),
@@ -768,6 +889,66 @@ else:
     except Exception:
         AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST = 10
 
+# Channel notification webhooks: concurrent posts per worker, retries of a
+# failed post (connection errors, 429 and 5xx) and timeout of each attempt
+try:
+    NOTIFICATION_WEBHOOK_CONCURRENCY = int(
+        os.environ.get("NOTIFICATION_WEBHOOK_CONCURRENCY", "20")
+    )
+except ValueError:
+    NOTIFICATION_WEBHOOK_CONCURRENCY = 20
+
+try:
+    NOTIFICATION_WEBHOOK_MAX_RETRIES = int(
+        os.environ.get("NOTIFICATION_WEBHOOK_MAX_RETRIES", "3")
+    )
+except ValueError:
+    NOTIFICATION_WEBHOOK_MAX_RETRIES = 3
+
+try:
+    NOTIFICATION_WEBHOOK_TIMEOUT = float(
+        os.environ.get("NOTIFICATION_WEBHOOK_TIMEOUT", "10")
+    )
+except ValueError:
+    NOTIFICATION_WEBHOOK_TIMEOUT = 10.0
+
+# File ingestion queue: with ENABLE_INGESTION_QUEUE, uploads processed in the
+# background are queued in the database and run by `open-webui ingest` workers
+# instead of the web worker that received them
+ENABLE_INGESTION_QUEUE = (
+    os.environ.get("ENABLE_INGESTION_QUEUE", "False").lower() == "true"
+)
+
+try:
+    INGESTION_WORKER_PROCESSES = int(os.environ.get("INGESTION_WORKER_PROCESSES", "1"))
+except ValueError:
+    INGESTION_WORKER_PROCESSES = 1
+
+# Jobs run at the same time by each worker process
+try:
+    INGESTION_WORKER_CONCURRENCY = int(
+        os.environ.get("INGESTION_WORKER_CONCURRENCY", "2")
+    )
+except ValueError:
+    INGESTION_WORKER_CONCURRENCY = 2
+
+try:
+    INGESTION_JOB_MAX_ATTEMPTS = int(os.environ.get("INGESTION_JOB_MAX_ATTEMPTS", "3"))
+except ValueError:
+    INGESTION_JOB_MAX_ATTEMPTS = 3
+
+# Seconds a worker holds a job without renewing it; jobs of workers that died
+# are picked up again once their lease expired
+try:
+    INGESTION_JOB_LEASE = int(os.environ.get("INGESTION_JOB_LEASE", "300"))
+except ValueError:
+    INGESTION_JOB_LEASE = 300
+
+try:
+    INGESTION_POLL_INTERVAL = float(os.environ.get("INGESTION_POLL_INTERVAL", "1"))
+except ValueError:
+    INGESTION_POLL_INTERVAL = 1.0
+
 # Pricing (pricepertoken)
 PRICEPERTOKEN_MCP_URL = os.environ.get(
     "PRICEPERTOKEN_MCP_URL", "https://api.pricepertoken.com/mcp/mcp"
@@ -779,6 +960,22 @@ PRICING_CACHE_TTL_SECONDS = int(
     os.environ.get("PRICING_CACHE_TTL_SECONDS", "86400")
 )
 
+# Seconds between full recomputes of the evaluation leaderboard ratings, which
+# are otherwise updated as feedback is submitted
+try:
+    LEADERBOARD_RECOMPUTE_INTERVAL = int(
+        os.environ.get("LEADERBOARD_RECOMPUTE_INTERVAL", "3600")
+    )
+except Exception:
+    LEADERBOARD_RECOMPUTE_INTERVAL = 3600
+
+# Seconds between compactions of chat messages into the hourly analytics
+# rollups; 0 disables them and analytics read chat_message directly
+try:
+    ANALYTICS_ROLLUP_INTERVAL = int(os.environ.get("ANALYTICS_ROLLUP_INTERVAL", "300"))
+except Exception:
+    ANALYTICS_ROLLUP_INTERVAL = 300
+
 
 AIOHTTP_CLIENT_TIMEOUT_TOOL_SERVER_DATA = os.environ.get(
     "AIOHTTP_CLIENT_TIMEOUT_TOOL_SERVER_DATA", "10"
@@ -799,6 +996,27 @@ AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL = (
     os.environ.get("AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL", "True").lower() == "true"
 )
 
+# Seconds an idle MCP session is kept open for reuse, 0 disables pooling
+try:
+    MCP_SESSION_IDLE_TIMEOUT = int(os.environ.get("MCP_SESSION_IDLE_TIMEOUT", "300"))
+except ValueError:
+    MCP_SESSION_IDLE_TIMEOUT = 300
+
+# Idle seconds after which a pooled MCP session is pinged before reuse
+try:
+    MCP_SESSION_HEALTH_CHECK_INTERVAL = int(
+        os.environ.get("MCP_SESSION_HEALTH_CHECK_INTERVAL", "30")
+    )
+except ValueError:
+    MCP_SESSION_HEALTH_CHECK_INTERVAL = 30
+
+# Seconds the tool list of a pooled MCP session is cached, unless the server
+# sends notifications/tools/list_changed first
+try:
+    MCP_TOOL_SPECS_CACHE_TTL = int(os.environ.get("MCP_TOOL_SPECS_CACHE_TTL", "300"))
+except ValueError:
+    MCP_TOOL_SPECS_CACHE_TTL = 300
+
 
 RAG_EMBEDDING_TIMEOUT = os.environ.get("RAG_EMBEDDING_TIMEOUT", "")
 
@@ -983,6 +1201,28 @@ OTEL_LOGS_OTLP_SPAN_EXPORTER = os.environ.get(
     "OTEL_LOGS_OTLP_SPAN_EXPORTER", OTEL_OTLP_SPAN_EXPORTER
 ).lower()  # grpc or http
 
+# Sample event loop lag and record the call sites that block the loop, see
+# /api/usage/event-loop (metrics are also exported when ENABLE_OTEL_METRICS is set)
+ENABLE_EVENT_LOOP_MONITOR = (
+    os.environ.get("ENABLE_EVENT_LOOP_MONITOR", "True").lower() == "true"
+)
+
+# Seconds between event loop lag samples
+try:
+    EVENT_LOOP_MONITOR_INTERVAL = float(
+        os.environ.get("EVENT_LOOP_MONITOR_INTERVAL", "0.1")
+    )
+except Exception:
+    EVENT_LOOP_MONITOR_INTERVAL = 0.1
+
+# Seconds the loop has to be blocked for the call site to be recorded
+try:
+    EVENT_LOOP_MONITOR_SLOW_THRESHOLD = float(
+        os.environ.get("EVENT_LOOP_MONITOR_SLOW_THRESHOLD", "0.1")
+    )
+except Exception:
+    EVENT_LOOP_MONITOR_SLOW_THRESHOLD = 0.1
+
 ####################################
 # TOOLS/FUNCTIONS PIP OPTIONS
 ####################################
@@ -0,0 +1,266 @@
+"""
+Ingestion workers: run the file processing jobs (loaders, transcription,
+embedding) queued by the web workers when ENABLE_INGESTION_QUEUE is set, so
+that large uploads do not compete with chat traffic.
+
+    open-webui ingest [--processes N] [--concurrency N]
+
+Workers share the database (and vector database and storage) of the web
+workers and can run on any number of hosts. Each process loads the app state
+(config, embedding and reranking models) once and runs up to `concurrency`
+jobs in threads.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+from typing import Optional
+
+from starlette.datastructures import Headers
+from starlette.requests import Request
+
+from open_webui.env import (
+    INGESTION_JOB_LEASE,
+    INGESTION_JOB_MAX_ATTEMPTS,
+    INGESTION_POLL_INTERVAL,
+    INGESTION_WORKER_CONCURRENCY,
+    INGESTION_WORKER_PROCESSES,
+)
+from open_webui.models.files import Files
+from open_webui.models.ingestion_jobs import IngestionJobModel, IngestionJobs
+from open_webui.models.users import Users
+
+log = logging.getLogger(__name__)
+
+# Seconds before the first retry of a failed job, doubled on each attempt
+RETRY_DELAY = 30
+
+
+def get_app_request() -> Request:
+    """A request bound to the app, for the handlers that read app.state."""
+    from open_webui.main import app
+
+    return Request(
+        {
+            "type": "http",
+            "asgi.version": "3.0",
+            "asgi.spec_version": "2.0",
+            "method": "POST",
+            "path": "/internal/ingestion",
+            "query_string": b"",
+            "headers": Headers({}).raw,
+            "client": ("127.0.0.1", 12345),
+            "server": ("127.0.0.1", 80),
+            "scheme": "http",
+            "app": app,
+        }
+    )
+
+
+class IngestionWorker:
+    def __init__(self, concurrency: int, worker_id: Optional[str] = None):
+        self.concurrency = max(concurrency, 1)
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+
+        self.running: set[str] = set()
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.done = threading.Event()
+
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.loop_thread: Optional[threading.Thread] = None
+
+    def load(self) -> Request:
+        """
+        Load the app and start the event loop of this process, which stands in
+        for the main loop of a web worker (the embedding calls run on it).
+        """
+        from open_webui.internal.db import SessionLocal
+        from open_webui.routers.files import process_file_content
+        from open_webui.utils.logger import start_logger
+
+        self.process_file_content = process_file_content
+        self.session_factory = SessionLocal
+        request = get_app_request()
+        start_logger()
+
+        self.loop = asyncio.new_event_loop()
+        self.loop_thread = threading.Thread(
+            target=self.loop.run_forever, name="ingestion-loop", daemon=True
+        )
+        self.loop_thread.start()
+        request.app.state.main_loop = self.loop
+        return request
+
+    def close(self):
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.loop_thread.join()
+            self.loop.close()
+            self.loop = None
+
+    def run(self):
+        """Run jobs until stop() is called, then wait for the running ones."""
+        request = self.load()
+
+        log.info(
+            f"Ingestion worker {self.worker_id} started with concurrency {self.concurrency}"
+        )
+        self.release_expired_jobs()
+
+        heartbeat = threading.Thread(
+            target=self.run_heartbeat, name="ingestion-heartbeat"
+        )
+        heartbeat.start()
+
+        slots = [
+            threading.Thread(
+                target=self.run_slot, args=(request,), name=f"ingestion-{i}"
+            )
+            for i in range(self.concurrency)
+        ]
+        for slot in slots:
+            slot.start()
+        for slot in slots:
+            slot.join()
+
+        self.done.set()
+        heartbeat.join()
+        self.close()
+
+        log.info(f"Ingestion worker {self.worker_id} stopped")
+
+    def stop(self):
+        self.stopped.set()
+
+    def run_slot(self, request: Request):
+        while not self.stopped.is_set():
+            try:
+                job = IngestionJobs.claim_job(self.worker_id, INGESTION_JOB_LEASE)
+            except Exception as e:
+                log.exception(f"Failed to claim an ingestion job: {e}")
+                job = None
+
+            if job is None:
+                self.stopped.wait(INGESTION_POLL_INTERVAL)
+                continue
+
+            with self.lock:
+                self.running.add(job.id)
+            try:
+                self.run_job(request, job)
+            except Exception as e:
+                log.exception(f"Ingestion job {job.id} failed: {e}")
+            finally:
+                with self.lock:
+                    self.running.discard(job.id)
+
+    def run_heartbeat(self):
+        # Renew the leases of the running jobs well before they expire (until
+        # they are done, after stop() too), and requeue the jobs of workers
+        # that stopped renewing theirs
+        while not self.done.wait(max(INGESTION_JOB_LEASE // 3, 1)):
+            with self.lock:
+                ids = list(self.running)
+            try:
+                IngestionJobs.renew_leases(ids, self.worker_id, INGESTION_JOB_LEASE)
+                self.release_expired_jobs()
+            except Exception as e:
+                log.exception(f"Ingestion worker heartbeat failed: {e}")
+
+    def release_expired_jobs(self):
+        for job in IngestionJobs.release_expired_jobs(INGESTION_JOB_MAX_ATTEMPTS):
+            Files.update_file_data_by_id(
+                job.file_id,
+                {"status": "failed", "error": "Processing was interrupted"},
+            )
+
+    def run_job(self, request: Request, job: IngestionJobModel):
+        file = Files.get_file_by_id(job.file_id)
+        user = Users.get_user_by_id(job.user_id)
+        if not file or not user:
+            # Deleted since it was queued
+            IngestionJobs.delete_job_by_id(job.id)
+            return
+
+        data = job.data or {}
+        log.info(
+            f"Processing file {file.id} (attempt {job.attempts} of {INGESTION_JOB_MAX_ATTEMPTS})"
+        )
+        try:
+            with self.session_factory() as db:
+                self.process_file_content(
+                    request,
+                    file.id,
+                    data.get("content_type"),
+                    data.get("file_path", file.path),
+                    data.get("metadata") or {},
+                    user,
+                    db=db,
+                )
+            IngestionJobs.delete_job_by_id(job.id)
+        except Exception as e:
+            error = str(e.detail) if hasattr(e, "detail") else str(e)
+            log.error(f"Error processing file {file.id}: {error}")
+
+            if job.attempts < INGESTION_JOB_MAX_ATTEMPTS:
+                IngestionJobs.retry_job(
+                    job.id, error, RETRY_DELAY * 2 ** (job.attempts - 1)
+                )
+                # process_file marked the file failed; it is not done yet
+                Files.update_file_data_by_id(
+                    file.id, {"status": "pending", "error": error}
+                )
+            else:
+                IngestionJobs.delete_job_by_id(job.id)
+                Files.update_file_data_by_id(
+                    file.id, {"status": "failed", "error": error}
+                )
+
+
+def run_worker(concurrency: int = INGESTION_WORKER_CONCURRENCY):
+    worker = IngestionWorker(concurrency)
+
+    def handle_signal(signum, frame):
+        log.info(f"Ingestion worker {worker.worker_id} stopping")
+        worker.stop()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+    worker.run()
+
+
+def run_workers(
+    processes: int = INGESTION_WORKER_PROCESSES,
+    concurrency: int = INGESTION_WORKER_CONCURRENCY,
+):
+    """Run the ingestion workers in this process, or in `processes` child processes."""
+    if processes <= 1:
+        return run_worker(concurrency)
+
+    # Run the migrations once, before the children start
+    import open_webui.config  # noqa: F401
+
+    context = multiprocessing.get_context("spawn")
+    children = [
+        context.Process(
+            target=run_worker, args=(concurrency,), name=f"ingestion-worker-{i}"
+        )
+        for i in range(processes)
+    ]
+    for child in children:
+        child.start()
+
+    def handle_signal(signum, frame):
+        for child in children:
+            if child.is_alive():
+                child.terminate()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    for child in children:
+        child.join()
@@ -1,8 +1,12 @@
 import os
 import json
+import asyncio
+import contextvars
+import functools
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from typing import Any, Optional
+from typing import Any, Callable, Optional, TypeVar
 
 from open_webui.internal.wrappers import register_connection
 from open_webui.env import (
@@ -15,14 +19,18 @@ from open_webui.env import (
     DATABASE_POOL_TIMEOUT,
     DATABASE_ENABLE_SQLITE_WAL,
     DATABASE_ENABLE_SESSION_SHARING,
+    DATABASE_ENABLE_ASYNC,
+    DATABASE_THREAD_POOL_SIZE,
     ENABLE_DB_MIGRATIONS,
 )
 from peewee_migrate import Router
 from sqlalchemy import Dialect, create_engine, MetaData, event, types
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import scoped_session, sessionmaker, Session
 from sqlalchemy.pool import QueuePool, NullPool
 from sqlalchemy.sql.type_api import _T
+from sqlalchemy.util.concurrency import greenlet_spawn, in_greenlet
 from typing_extensions import Self
 
 log = logging.getLogger(__name__)
@@ -144,16 +152,73 @@ else:
         engine = create_engine(SQLALCHEMY_DATABASE_URL, pool_pre_ping=True)
 
 
+def get_async_database_url(url: str) -> Optional[str]:
+    """The URL of the async driver for a database URL, if there is one."""
+    if url.startswith("sqlite:///"):
+        return "sqlite+aiosqlite" + url[len("sqlite") :]
+    for prefix in ["postgresql://", "postgresql+psycopg2://"]:
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix) :]
+    return None
+
+
+async_engine: Optional[AsyncEngine] = None
+
+if DATABASE_ENABLE_ASYNC:
+    async_database_url = get_async_database_url(SQLALCHEMY_DATABASE_URL)
+    try:
+        if async_database_url is None:
+            raise ValueError("no async driver for this database")
+        elif async_database_url.startswith("sqlite"):
+            async_engine = create_async_engine(async_database_url)
+            event.listen(async_engine.sync_engine, "connect", on_connect)
+        elif isinstance(DATABASE_POOL_SIZE, int) and DATABASE_POOL_SIZE > 0:
+            async_engine = create_async_engine(
+                async_database_url,
+                pool_size=DATABASE_POOL_SIZE,
+                max_overflow=DATABASE_POOL_MAX_OVERFLOW,
+                pool_timeout=DATABASE_POOL_TIMEOUT,
+                pool_recycle=DATABASE_POOL_RECYCLE,
+                pool_pre_ping=True,
+            )
+        elif isinstance(DATABASE_POOL_SIZE, int):
+            async_engine = create_async_engine(
+                async_database_url, pool_pre_ping=True, poolclass=NullPool
+            )
+        else:
+            async_engine = create_async_engine(async_database_url, pool_pre_ping=True)
+    except Exception as e:
+        log.warning(
+            f"DATABASE_ENABLE_ASYNC is set but the async engine is unavailable "
+            f"({e}), database calls will use the thread pool"
+        )
+
+
 SessionLocal = sessionmaker(
     autocommit=False, autoflush=False, bind=engine, expire_on_commit=False
 )
+AsyncBridgeSessionLocal = (
+    sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=async_engine.sync_engine,
+        expire_on_commit=False,
+    )
+    if async_engine is not None
+    else None
+)
 metadata_obj = MetaData(schema=DATABASE_SCHEMA)
 Base = declarative_base(metadata=metadata_obj)
 ScopedSession = scoped_session(SessionLocal)
 
 
 def get_session():
-    db = SessionLocal()
+    if AsyncBridgeSessionLocal is not None and in_greenlet():
+        # Called from run_db: go through the async driver so waiting on the
+        # database yields to the event loop instead of blocking it
+        db = AsyncBridgeSessionLocal()
+    else:
+        db = SessionLocal()
     try:
         yield db
     finally:
@@ -170,3 +235,56 @@ def get_db_context(db: Optional[Session] = None):
     else:
         with get_db() as session:
             yield session
+
+
+####################
+# Async bridge
+####################
+
+T = TypeVar("T")
+
+DB_EXECUTOR = ThreadPoolExecutor(
+    max_workers=DATABASE_THREAD_POOL_SIZE, thread_name_prefix="db"
+)
+
+
+async def run_db(fn: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Call a synchronous database function from async code without blocking the
+    event loop: on the bounded DB_EXECUTOR thread pool or, with the async
+    engine, on the loop with sessions that await the async driver.
+    """
+    if async_engine is not None:
+        return await greenlet_spawn(fn, *args, **kwargs)
+
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        DB_EXECUTOR, functools.partial(context.run, fn, *args, **kwargs)
+    )
+
+
+class AsyncTable:
+    """
+    Awaitable view of a table: `await AsyncChats.get_chat_by_id(id)` calls
+    `Chats.get_chat_by_id(id)` through run_db.
+    """
+
+    def __init__(self, table):
+        self._table = table
+
+    def __getattr__(self, name: str):
+        method = getattr(self._table, name)
+
+        @functools.wraps(method)
+        async def call(*args, **kwargs):
+            return await run_db(method, *args, **kwargs)
+
+        setattr(self, name, call)
+        return call
+
+
+async def close_async_db():
+    if async_engine is not None:
+        await async_engine.dispose()
+    DB_EXECUTOR.shutdown(wait=False)
@@ -61,8 +61,10 @@ from open_webui.utils import logger
 from open_webui.utils.audit import AuditLevel, AuditLoggingMiddleware
 from open_webui.utils.logger import start_logger
 from open_webui.socket.main import (
+    MESSAGE_EVENT_BUFFER,
     MODELS,
     app as socket_app,
+    sio,
     periodic_usage_pool_cleanup,
     get_event_emitter,
     get_models_in_use,
@@ -107,11 +109,18 @@ from open_webui.routers.retrieval import (
 
 
 from sqlalchemy.orm import Session
-from open_webui.internal.db import ScopedSession, engine, get_session
+from open_webui.internal.db import (
+    ScopedSession,
+    close_async_db,
+    engine,
+    get_session,
+    run_db,
+)
 
 from open_webui.models.functions import Functions
 from open_webui.models.models import Models
 from open_webui.models.users import UserModel, Users
+from open_webui.models.ingestion_jobs import IngestionJobs
 from open_webui.models.chats import Chats
 
 from open_webui.config import (
@@ -458,6 +467,7 @@ from open_webui.config import (
     reset_config,
 )
 from open_webui.env import (
+    DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL,
     ENABLE_CUSTOM_MODEL_FALLBACK,
     LICENSE_KEY,
     AUDIT_EXCLUDED_PATHS,
@@ -491,6 +501,9 @@ from open_webui.env import (
     RESET_CONFIG_ON_START,
     ENABLE_VERSION_UPDATE_CHECK,
     ENABLE_OTEL,
+    ENABLE_EVENT_LOOP_MONITOR,
+    ANALYTICS_ROLLUP_INTERVAL,
+    ENABLE_INGESTION_QUEUE,
     EXTERNAL_PWA_MANIFEST_URL,
     AIOHTTP_CLIENT_SESSION_SSL,
     ENABLE_STAR_SESSIONS_MIDDLEWARE,
@@ -506,8 +519,8 @@ from open_webui.env import (
 from open_webui.utils.models import (
     get_all_models,
     get_all_base_models,
+    get_user_models,
     check_model_access,
-    get_filtered_models,
 )
 from open_webui.utils.chat import (
     generate_chat_completion as chat_completion_handler,
@@ -528,8 +541,10 @@ from open_webui.utils.auth import (
     get_admin_user,
     get_verified_user,
     create_admin_user,
+    periodic_last_active_flush,
 )
 from open_webui.utils.plugin import install_tool_and_function_dependencies
+from open_webui.utils.plugin_cache import PLUGIN_VERSIONS
 from open_webui.utils.oauth import (
     get_oauth_client_info_with_dynamic_client_registration,
     encrypt_data,
@@ -540,6 +555,9 @@ from open_webui.utils.oauth import (
 )
 from open_webui.utils.security_headers import SecurityHeadersMiddleware
 from open_webui.utils.redis import get_redis_connection
+from open_webui.utils.http_client import HTTP_CLIENTS
+from open_webui.utils.mcp.client import MCP_SESSIONS
+from open_webui.utils.webhook import WEBHOOK_DISPATCHER
 from open_webui.utils.pricing import pricing_refresh_loop
 
 from open_webui.tasks import (
@@ -634,12 +652,37 @@ async def lifespan(app: FastAPI):
             redis_task_command_listener(app)
         )
 
+    if app.state.redis is not None and PLUGIN_VERSIONS.redis is not None:
+        app.state.plugin_versions_listener = asyncio.create_task(
+            PLUGIN_VERSIONS.listen(app.state.redis)
+        )
+
     if THREAD_POOL_SIZE and THREAD_POOL_SIZE > 0:
         limiter = anyio.to_thread.current_default_thread_limiter()
         limiter.total_tokens = THREAD_POOL_SIZE
 
+    if ENABLE_EVENT_LOOP_MONITOR:
+        from open_webui.utils.telemetry.metrics import EVENT_LOOP_MONITOR
+
+        for route in app.routes:
+            if hasattr(route, "endpoint"):
+                EVENT_LOOP_MONITOR.add_entrypoint(route.endpoint, route.path)
+        for handlers in sio.handlers.values():
+            for event, handler in handlers.items():
+                EVENT_LOOP_MONITOR.add_entrypoint(handler, f"socket:{event}")
+        EVENT_LOOP_MONITOR.start()
+
     asyncio.create_task(periodic_usage_pool_cleanup())
+    if DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL:
+        app.state.last_active_task = asyncio.create_task(periodic_last_active_flush())
     app.state.pricing_task = asyncio.create_task(pricing_refresh_loop())
+    app.state.leaderboard_task = asyncio.create_task(
+        evaluations.periodic_leaderboard_recompute()
+    )
+    if ANALYTICS_ROLLUP_INTERVAL:
+        app.state.analytics_rollup_task = asyncio.create_task(
+            analytics.periodic_rollup_compaction()
+        )
 
     if app.state.config.ENABLE_BASE_MODELS_CACHE:
         await get_all_models(
@@ -668,6 +711,26 @@ async def lifespan(app: FastAPI):
         app.state.redis_task_command_listener.cancel()
     if hasattr(app.state, "pricing_task"):
         app.state.pricing_task.cancel()
+    if hasattr(app.state, "leaderboard_task"):
+        app.state.leaderboard_task.cancel()
+    if hasattr(app.state, "analytics_rollup_task"):
+        app.state.analytics_rollup_task.cancel()
+    if hasattr(app.state, "plugin_versions_listener"):
+        app.state.plugin_versions_listener.cancel()
+
+    if hasattr(app.state, "last_active_task"):
+        app.state.last_active_task.cancel()
+        Users.flush_last_active()
+
+    if ENABLE_EVENT_LOOP_MONITOR:
+        EVENT_LOOP_MONITOR.stop()
+
+    # Persist the message events still waiting for their flush
+    await MESSAGE_EVENT_BUFFER.flush_all()
+    await WEBHOOK_DISPATCHER.close()
+    await HTTP_CLIENTS.close()
+    await MCP_SESSIONS.close()
+    await close_async_db()
 
 
 app = FastAPI(
@@ -878,10 +941,10 @@ app.state.EXTERNAL_PWA_MANIFEST_URL = EXTERNAL_PWA_MANIFEST_URL
 app.state.USER_COUNT = None
 
 app.state.TOOLS = {}
-app.state.TOOL_CONTENTS = {}
+app.state.TOOL_CACHE = {}
 
 app.state.FUNCTIONS = {}
-app.state.FUNCTION_CONTENTS = {}
+app.state.FUNCTION_CACHE = {}
 
 ########################################
 #
@@ -1529,7 +1592,8 @@ if audit_level != AuditLevel.NONE:
 async def get_models(
     request: Request, refresh: bool = False, user=Depends(get_verified_user)
 ):
-    all_models = await get_all_models(request, refresh=refresh, user=user)
+    # Filtered from the shared catalog, copied before being modified below
+    all_models = await get_user_models(request, user, refresh=refresh)
 
     models = []
     for model in all_models:
@@ -1537,9 +1601,18 @@ async def get_models(
         if "pipeline" in model and model["pipeline"].get("type", None) == "filter":
             continue
 
+        model = {**model}
+
         # Remove profile image URL to reduce payload size
         if model.get("info", {}).get("meta", {}).get("profile_image_url"):
-            model["info"]["meta"].pop("profile_image_url", None)
+            model["info"] = {
+                **model["info"],
+                "meta": {
+                    key: value
+                    for key, value in model["info"]["meta"].items()
+                    if key != "profile_image_url"
+                },
+            }
 
         try:
             model_tags = [
@@ -1568,8 +1641,6 @@ async def get_models(
             )
         )
 
-    models = get_filtered_models(models, user)
-
     log.debug(
         f"/api/models returned filtered models accessible to the user: {json.dumps([model.get('id') for model in models])}"
     )
@@ -2206,6 +2277,59 @@ async def get_current_usage(user=Depends(get_verified_user)):
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
+@app.get("/api/usage/connections")
+async def get_connection_pool_stats(user=Depends(get_admin_user)):
+    """
+    Get the state of the upstream connection pools (in use and idle
+    connections, requests and new connections per upstream), of the
+    pooled MCP sessions and of the notification webhook deliveries.
+    """
+    return {
+        "pools": HTTP_CLIENTS.get_stats(),
+        "mcp": MCP_SESSIONS.get_stats(),
+        "notifications": WEBHOOK_DISPATCHER.get_stats(),
+    }
+
+
+@app.get("/api/usage/message-events")
+async def get_message_event_stats(user=Depends(get_admin_user)):
+    """
+    Get the write-behind stats of the chat message events of this worker
+    (events buffered and flushes, flush errors and durations).
+    """
+    return MESSAGE_EVENT_BUFFER.get_stats()
+
+
+@app.get("/api/usage/ingestion")
+async def get_ingestion_stats(user=Depends(get_admin_user)):
+    """
+    Get the number of file processing jobs waiting for and running on the
+    ingestion workers (ENABLE_INGESTION_QUEUE).
+    """
+    return {
+        "enabled": ENABLE_INGESTION_QUEUE,
+        "jobs": await run_db(IngestionJobs.get_job_counts),
+    }
+
+
+@app.get("/api/usage/event-loop")
+async def get_event_loop_stats(limit: int = 20, user=Depends(get_admin_user)):
+    """
+    Get the event loop lag of this worker and the call sites that blocked it
+    the longest in total, with the routes they were reached from and the
+    stack of their longest block.
+    """
+    if not ENABLE_EVENT_LOOP_MONITOR:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="The event loop monitor is disabled (ENABLE_EVENT_LOOP_MONITOR)",
+        )
+
+    from open_webui.utils.telemetry.metrics import EVENT_LOOP_MONITOR
+
+    return EVENT_LOOP_MONITOR.get_stats(limit=limit)
+
+
 ############################
 # OAuth Login & Callback
 ############################
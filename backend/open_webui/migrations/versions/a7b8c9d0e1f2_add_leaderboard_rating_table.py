@@ -0,0 +1,99 @@
+"""Add leaderboard_rating table
+
+Revision ID: a7b8c9d0e1f2
+Revises: f6a7b8c9d0e1
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+
+import time
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "a7b8c9d0e1f2"
+down_revision: Union[str, None] = "f6a7b8c9d0e1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+K_FACTOR = 32
+INITIAL_RATING = 1000.0
+
+
+def upgrade() -> None:
+    # Step 1: Create table
+    leaderboard_rating = op.create_table(
+        "leaderboard_rating",
+        sa.Column("model_id", sa.Text(), primary_key=True),
+        sa.Column("rating", sa.Float(), nullable=False),
+        sa.Column("won", sa.BigInteger(), nullable=False),
+        sa.Column("lost", sa.BigInteger(), nullable=False),
+        sa.Column("tags", sa.JSON(), nullable=True),
+        sa.Column("updated_at", sa.BigInteger(), nullable=True),
+    )
+
+    # Step 2: Replay existing feedback, in order, into ratings and tag counts
+    feedback = sa.table(
+        "feedback",
+        sa.column("id", sa.Text()),
+        sa.column("data", sa.JSON()),
+        sa.column("created_at", sa.BigInteger()),
+    )
+
+    conn = op.get_bind()
+    stats = {}
+    tags = {}
+    for (data,) in conn.execute(
+        sa.select(feedback.c.data).order_by(feedback.c.created_at, feedback.c.id)
+    ):
+        data = data or {}
+        model_id = data.get("model_id")
+        if not model_id:
+            continue
+
+        model_tags = tags.setdefault(model_id, {})
+        for tag in data.get("tags") or []:
+            model_tags[tag] = model_tags.get(tag, 0) + 1
+
+        rating = str(data.get("rating", ""))
+        if rating not in ("1", "-1"):
+            continue
+
+        score = 1 if rating == "1" else 0
+        for opponent_id in data.get("sibling_model_ids") or []:
+            model = stats.setdefault(
+                model_id, {"rating": INITIAL_RATING, "won": 0, "lost": 0}
+            )
+            opponent = stats.setdefault(
+                opponent_id, {"rating": INITIAL_RATING, "won": 0, "lost": 0}
+            )
+
+            expected = 1 / (1 + 10 ** ((opponent["rating"] - model["rating"]) / 400))
+            delta = K_FACTOR * (score - expected)
+            model["rating"] += delta
+            opponent["rating"] -= delta
+
+            model["won" if score else "lost"] += 1
+            opponent["lost" if score else "won"] += 1
+
+    now = int(time.time())
+    rows = [
+        {
+            "model_id": model_id,
+            "rating": model_stats.get("rating", INITIAL_RATING),
+            "won": model_stats.get("won", 0),
+            "lost": model_stats.get("lost", 0),
+            "tags": tags.get(model_id, {}),
+            "updated_at": now,
+        }
+        for model_id, model_stats in (
+            {model_id: {} for model_id in tags} | stats
+        ).items()
+    ]
+    if rows:
+        op.bulk_insert(leaderboard_rating, rows)
+
+
+def downgrade() -> None:
+    op.drop_table("leaderboard_rating")
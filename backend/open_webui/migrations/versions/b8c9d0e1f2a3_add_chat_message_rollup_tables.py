@@ -0,0 +1,45 @@
+"""Add chat_message_rollup tables
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "b8c9d0e1f2a3"
+down_revision: Union[str, None] = "a7b8c9d0e1f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Hourly analytics totals, filled in the background from the oldest
+    # messages on; until then analytics read chat_message
+    op.create_table(
+        "chat_message_rollup",
+        sa.Column("hour", sa.BigInteger(), primary_key=True),
+        sa.Column("user_id", sa.Text(), primary_key=True),
+        sa.Column("model_id", sa.Text(), primary_key=True),
+        sa.Column("role", sa.Text(), primary_key=True),
+        sa.Column("message_count", sa.BigInteger(), nullable=False),
+        sa.Column("usage_count", sa.BigInteger(), nullable=False),
+        sa.Column("input_tokens", sa.BigInteger(), nullable=False),
+        sa.Column("output_tokens", sa.BigInteger(), nullable=False),
+    )
+
+    op.create_table(
+        "chat_message_rollup_state",
+        sa.Column("id", sa.Text(), primary_key=True),
+        sa.Column("compacted_until", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.BigInteger(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("chat_message_rollup_state")
+    op.drop_table("chat_message_rollup")
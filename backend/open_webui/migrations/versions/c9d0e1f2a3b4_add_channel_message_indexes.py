@@ -0,0 +1,42 @@
+"""Add channel message indexes
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "c9d0e1f2a3b4"
+down_revision: Union[str, None] = "b8c9d0e1f2a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Channel pages, last message and unread counts per channel
+    op.create_index(
+        "message_channel_parent_created_idx",
+        "message",
+        ["channel_id", "parent_id", "created_at"],
+    )
+    # Thread replies and reply counts per message
+    op.create_index(
+        "message_parent_created_idx", "message", ["parent_id", "created_at"]
+    )
+    op.create_index(
+        "message_reaction_message_id_idx", "message_reaction", ["message_id"]
+    )
+    op.create_index(
+        "channel_member_channel_user_idx", "channel_member", ["channel_id", "user_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("channel_member_channel_user_idx", table_name="channel_member")
+    op.drop_index("message_reaction_message_id_idx", table_name="message_reaction")
+    op.drop_index("message_parent_created_idx", table_name="message")
+    op.drop_index("message_channel_parent_created_idx", table_name="message")
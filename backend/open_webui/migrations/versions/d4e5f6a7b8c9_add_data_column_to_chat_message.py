@@ -0,0 +1,26 @@
+"""Add data column to chat_message table
+
+Revision ID: d4e5f6a7b8c9
+Revises: 9a2b3c4d5e6f
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "d4e5f6a7b8c9"
+down_revision: Union[str, None] = "9a2b3c4d5e6f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("chat_message", sa.Column("data", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("chat_message", "data")
@@ -0,0 +1,32 @@
+"""Add leaderboard_state table
+
+Revision ID: e1f2a3b4c5d6
+Revises: d0e1f2a3b4c5
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "e1f2a3b4c5d6"
+down_revision: Union[str, None] = "d0e1f2a3b4c5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # When the next full recompute of leaderboard_rating is due, shared by
+    # the workers so that only one of them runs it
+    op.create_table(
+        "leaderboard_state",
+        sa.Column("id", sa.Text(), primary_key=True),
+        sa.Column("recompute_after", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.BigInteger(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("leaderboard_state")
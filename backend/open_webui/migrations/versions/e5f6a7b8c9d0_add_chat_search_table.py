@@ -0,0 +1,207 @@
+"""Add chat_search table
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+import json
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+log = logging.getLogger(__name__)
+
+revision: str = "e5f6a7b8c9d0"
+down_revision: Union[str, None] = "d4e5f6a7b8c9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Chats backfilled per page (also the size of the IN list of their messages)
+BATCH_SIZE = 500
+
+
+def _get_content(content) -> str:
+    return content.replace("\x00", "") if isinstance(content, str) else ""
+
+
+def upgrade() -> None:
+    # Step 1: Create table
+    op.create_table(
+        "chat_search",
+        sa.Column("chat_id", sa.Text(), primary_key=True),
+        sa.Column("message_id", sa.Text(), primary_key=True),
+        sa.Column("user_id", sa.Text(), nullable=False),
+        sa.Column("content", sa.Text(), nullable=True),
+    )
+    op.create_index("chat_search_user_id_idx", "chat_search", ["user_id"])
+
+    conn = op.get_bind()
+
+    # Step 2: Text indexes
+    if conn.dialect.name == "sqlite":
+        # External content FTS5 table kept in sync by triggers. The trigram
+        # tokenizer (SQLite 3.34+) matches arbitrary substrings like LIKE does.
+        savepoint = conn.begin_nested()
+        try:
+            conn.execute(sa.text("""
+                CREATE VIRTUAL TABLE chat_search_fts USING fts5(
+                    content, content='chat_search', tokenize='trigram'
+                )
+                """))
+            conn.execute(sa.text("""
+                CREATE TRIGGER chat_search_ai AFTER INSERT ON chat_search BEGIN
+                    INSERT INTO chat_search_fts(rowid, content)
+                    VALUES (new.rowid, new.content);
+                END
+                """))
+            conn.execute(sa.text("""
+                CREATE TRIGGER chat_search_ad AFTER DELETE ON chat_search BEGIN
+                    INSERT INTO chat_search_fts(chat_search_fts, rowid, content)
+                    VALUES ('delete', old.rowid, old.content);
+                END
+                """))
+            conn.execute(sa.text("""
+                CREATE TRIGGER chat_search_au AFTER UPDATE ON chat_search BEGIN
+                    INSERT INTO chat_search_fts(chat_search_fts, rowid, content)
+                    VALUES ('delete', old.rowid, old.content);
+                    INSERT INTO chat_search_fts(rowid, content)
+                    VALUES (new.rowid, new.content);
+                END
+                """))
+            savepoint.commit()
+        except Exception as e:
+            savepoint.rollback()
+            log.warning(f"SQLite FTS5 trigram unavailable, chat search uses LIKE: {e}")
+    elif conn.dialect.name == "postgresql":
+        # pg_trgm lets ILIKE '%text%' use a GIN index
+        savepoint = conn.begin_nested()
+        try:
+            conn.execute(sa.text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            conn.execute(sa.text("""
+                CREATE INDEX chat_search_content_trgm_idx
+                ON chat_search USING gin (content gin_trgm_ops)
+                """))
+            savepoint.commit()
+        except Exception as e:
+            savepoint.rollback()
+            log.warning(f"pg_trgm unavailable, chat search is not indexed: {e}")
+
+    # Step 3: Backfill from existing chats
+    chat_table = sa.table(
+        "chat",
+        sa.column("id", sa.Text()),
+        sa.column("user_id", sa.Text()),
+        sa.column("title", sa.Text()),
+        sa.column("chat", sa.JSON()),
+    )
+    chat_message_table = sa.table(
+        "chat_message",
+        sa.column("id", sa.Text()),
+        sa.column("chat_id", sa.Text()),
+        sa.column("content", sa.JSON()),
+    )
+    chat_search_table = sa.table(
+        "chat_search",
+        sa.column("chat_id", sa.Text()),
+        sa.column("message_id", sa.Text()),
+        sa.column("user_id", sa.Text()),
+        sa.column("content", sa.Text()),
+    )
+
+    # Shared chats (user_id starting with 'shared-') are never searched. The
+    # chats are read in pages by id, with the stored messages of each page, so
+    # large instances are not loaded into memory at once
+    chats_query = (
+        sa.select(
+            chat_table.c.id,
+            chat_table.c.user_id,
+            chat_table.c.title,
+            chat_table.c.chat,
+        )
+        .where(~chat_table.c.user_id.like("shared-%"))
+        .order_by(chat_table.c.id)
+        .limit(BATCH_SIZE)
+    )
+
+    total = 0
+    last_id = None
+    while True:
+        query = chats_query
+        if last_id is not None:
+            query = query.where(chat_table.c.id > last_id)
+        chats = conn.execute(query).fetchall()
+        if not chats:
+            break
+        last_id = chats[-1][0]
+
+        # Message bodies may only live in chat_message (ENABLE_CHAT_MESSAGE_STORAGE)
+        stored_contents = {}
+        for chat_id, id, content in conn.execute(
+            sa.select(
+                chat_message_table.c.chat_id,
+                chat_message_table.c.id,
+                chat_message_table.c.content,
+            ).where(chat_message_table.c.chat_id.in_([chat[0] for chat in chats]))
+        ):
+            stored_contents[(chat_id, id[len(chat_id) + 1 :])] = content
+
+        rows = []
+        for chat_id, user_id, title, chat_data in chats:
+            if isinstance(chat_data, str):
+                try:
+                    chat_data = json.loads(chat_data)
+                except Exception:
+                    chat_data = {}
+
+            rows.append(
+                {
+                    "chat_id": chat_id,
+                    "message_id": "",
+                    "user_id": user_id,
+                    "content": _get_content(title),
+                }
+            )
+
+            messages = ((chat_data or {}).get("history") or {}).get("messages") or {}
+            for message_id, message in messages.items():
+                if not isinstance(message, dict):
+                    continue
+
+                content = _get_content(
+                    message["content"]
+                    if "content" in message
+                    else stored_contents.get((chat_id, message_id))
+                )
+                if content:
+                    rows.append(
+                        {
+                            "chat_id": chat_id,
+                            "message_id": message_id,
+                            "user_id": user_id,
+                            "content": content,
+                        }
+                    )
+
+        for i in range(0, len(rows), 1000):
+            conn.execute(sa.insert(chat_search_table), rows[i : i + 1000])
+        total += len(rows)
+
+    log.info(f"Backfilled {total} rows into chat_search table")
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name == "sqlite":
+        conn.execute(sa.text("DROP TRIGGER IF EXISTS chat_search_au"))
+        conn.execute(sa.text("DROP TRIGGER IF EXISTS chat_search_ad"))
+        conn.execute(sa.text("DROP TRIGGER IF EXISTS chat_search_ai"))
+        conn.execute(sa.text("DROP TABLE IF EXISTS chat_search_fts"))
+    elif conn.dialect.name == "postgresql":
+        conn.execute(sa.text("DROP INDEX IF EXISTS chat_search_content_trgm_idx"))
+
+    op.drop_index("chat_search_user_id_idx", table_name="chat_search")
+    op.drop_table("chat_search")
@@ -4,7 +4,8 @@ import uuid
 from typing import Optional
 
 from sqlalchemy.orm import Session
-from open_webui.internal.db import Base, get_db_context
+from open_webui.internal.db import AsyncTable, Base, get_db_context
+from open_webui.utils.access_cache import ACCESS_CACHE
 
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Column, Text, UniqueConstraint, or_, and_
@@ -296,6 +297,7 @@ class AccessGrantsTable:
             )
             db.add(grant)
             db.commit()
+            ACCESS_CACHE.bump(f"grants:{resource_type}")
             db.refresh(grant)
             return AccessGrantModel.model_validate(grant)
 
@@ -322,6 +324,8 @@ class AccessGrantsTable:
                 .delete()
             )
             db.commit()
+            if deleted:
+                ACCESS_CACHE.bump(f"grants:{resource_type}")
             return deleted > 0
 
     def revoke_all_access(
@@ -341,6 +345,8 @@ class AccessGrantsTable:
                 .delete()
             )
             db.commit()
+            if deleted:
+                ACCESS_CACHE.bump(f"grants:{resource_type}")
             return deleted
 
     def set_access_control(
@@ -378,6 +384,7 @@ class AccessGrantsTable:
                 results.append(grant)
 
             db.commit()
+            ACCESS_CACHE.bump(f"grants:{resource_type}")
 
             return [AccessGrantModel.model_validate(g) for g in results]
 
@@ -414,6 +421,7 @@ class AccessGrantsTable:
                 results.append(grant)
 
             db.commit()
+            ACCESS_CACHE.bump(f"grants:{resource_type}")
             return [AccessGrantModel.model_validate(g) for g in results]
 
     def get_access_control(
@@ -456,6 +464,92 @@ class AccessGrantsTable:
             )
             return [AccessGrantModel.model_validate(g) for g in grants]
 
+    def get_grants_by_resources(
+        self,
+        resource_type: str,
+        resource_ids: list[str],
+        db: Optional[Session] = None,
+    ) -> dict[str, list[AccessGrantModel]]:
+        """Get the grants of several resources as {resource_id: grants}."""
+        result = {resource_id: [] for resource_id in resource_ids}
+        if not resource_ids:
+            return result
+
+        with get_db_context(db) as db:
+            grants = db.query(AccessGrant).filter(
+                AccessGrant.resource_type == resource_type,
+                AccessGrant.resource_id.in_(resource_ids),
+            )
+            for grant in grants:
+                result[grant.resource_id].append(AccessGrantModel.model_validate(grant))
+            return result
+
+    def _get_principal_conditions(
+        self, user_id: str, user_group_ids: Optional[set[str]]
+    ) -> list:
+        conditions = [
+            # Public access
+            and_(
+                AccessGrant.principal_type == "user",
+                AccessGrant.principal_id == "*",
+            ),
+            # Direct user access
+            and_(
+                AccessGrant.principal_type == "user",
+                AccessGrant.principal_id == user_id,
+            ),
+        ]
+
+        # Group access
+        if user_group_ids:
+            conditions.append(
+                and_(
+                    AccessGrant.principal_type == "group",
+                    AccessGrant.principal_id.in_(user_group_ids),
+                )
+            )
+
+        return conditions
+
+    def _get_accessible_ids(
+        self,
+        user_id: str,
+        resource_type: str,
+        permission: str,
+        user_group_ids: set[str],
+        db: Optional[Session] = None,
+    ) -> frozenset[str]:
+        """
+        All ids of a resource type the user has the permission on, cached
+        until the grants of that resource type change.
+        """
+
+        def load():
+            with get_db_context(db) as session:
+                rows = (
+                    session.query(AccessGrant.resource_id)
+                    .filter(
+                        AccessGrant.resource_type == resource_type,
+                        AccessGrant.permission == permission,
+                        or_(*self._get_principal_conditions(user_id, user_group_ids)),
+                    )
+                    .distinct()
+                    .all()
+                )
+                return frozenset(row[0] for row in rows)
+
+        return ACCESS_CACHE.get_or_load(
+            (
+                "grants",
+                user_id,
+                resource_type,
+                permission,
+                frozenset(user_group_ids),
+            ),
+            (f"grants:{resource_type}",),
+            load,
+        )
+
     def has_access(
         self,
         user_id: str,
@@ -473,43 +567,24 @@ class AccessGrantsTable:
         - There's a grant for the specific user with the requested permission
         - There's a grant for any of the user's groups with the requested permission
         """
-        with get_db_context(db) as db:
-            # Build conditions for matching grants
-            conditions = [
-                # Public access
-                and_(
-                    AccessGrant.principal_type == "user",
-                    AccessGrant.principal_id == "*",
-                ),
-                # Direct user access
-                and_(
-                    AccessGrant.principal_type == "user",
-                    AccessGrant.principal_id == user_id,
-                ),
-            ]
-
-            # Group access
-            if user_group_ids is None:
-                from open_webui.models.groups import Groups
+        if user_group_ids is None:
+            from open_webui.models.groups import Groups
 
-                user_groups = Groups.get_groups_by_member_id(user_id, db=db)
-                user_group_ids = {group.id for group in user_groups}
+            user_group_ids = Groups.get_group_ids_by_member_id(user_id, db=db)
 
-            if user_group_ids:
-                conditions.append(
-                    and_(
-                        AccessGrant.principal_type == "group",
-                        AccessGrant.principal_id.in_(user_group_ids),
-                    )
-                )
+        if ACCESS_CACHE.ttl:
+            return resource_id in self._get_accessible_ids(
+                user_id, resource_type, permission, user_group_ids, db=db
+            )
 
+        with get_db_context(db) as db:
             exists = (
                 db.query(AccessGrant)
                 .filter(
                     AccessGrant.resource_type == resource_type,
                     AccessGrant.resource_id == resource_id,
                     AccessGrant.permission == permission,
-                    or_(*conditions),
+                    or_(*self._get_principal_conditions(user_id, user_group_ids)),
                 )
                 .first()
             )
@@ -532,39 +607,26 @@ class AccessGrantsTable:
         if not resource_ids:
             return set()
 
-        with get_db_context(db) as db:
-            conditions = [
-                and_(
-                    AccessGrant.principal_type == "user",
-                    AccessGrant.principal_id == "*",
-                ),
-                and_(
-                    AccessGrant.principal_type == "user",
-                    AccessGrant.principal_id == user_id,
-                ),
-            ]
-
-            if user_group_ids is None:
-                from open_webui.models.groups import Groups
+        if user_group_ids is None:
+            from open_webui.models.groups import Groups
 
-                user_groups = Groups.get_groups_by_member_id(user_id, db=db)
-                user_group_ids = {group.id for group in user_groups}
+            user_group_ids = Groups.get_group_ids_by_member_id(user_id, db=db)
 
-            if user_group_ids:
-                conditions.append(
-                    and_(
-                        AccessGrant.principal_type == "group",
-                        AccessGrant.principal_id.in_(user_group_ids),
-                    )
-                )
+        if ACCESS_CACHE.ttl:
+            return set(
+                self._get_accessible_ids(
+                    user_id, resource_type, permission, user_group_ids, db=db
+                ).intersection(resource_ids)
+            )
 
+        with get_db_context(db) as db:
             rows = (
                 db.query(AccessGrant.resource_id)
                 .filter(
                     AccessGrant.resource_type == resource_type,
                     AccessGrant.resource_id.in_(resource_ids),
                     AccessGrant.permission == permission,
-                    or_(*conditions),
+                    or_(*self._get_principal_conditions(user_id, user_group_ids)),
                 )
                 .distinct()
                 .all()
@@ -836,3 +898,4 @@ class AccessGrantsTable:
 
 
 AccessGrants = AccessGrantsTable()
+AsyncAccessGrants = AsyncTable(AccessGrants)
@@ -24,6 +24,7 @@ from sqlalchemy import (
     String,
     Text,
     JSON,
+    Index,
     UniqueConstraint,
     case,
     cast,
@@ -122,6 +123,10 @@ class ChannelMember(Base):
     created_at = Column(BigInteger)
     updated_at = Column(BigInteger)
 
+    __table_args__ = (
+        Index("channel_member_channel_user_idx", "channel_id", "user_id"),
+    )
+
 
 class ChannelMemberModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -270,6 +275,25 @@ class ChannelTable:
         channel_data["access_grants"] = access_grants
         return ChannelModel.model_validate(channel_data)
 
+    def _to_channel_models(
+        self, channels: list[Channel], db: Optional[Session] = None
+    ) -> list[ChannelModel]:
+        """Like _to_channel_model, loading the grants of all channels at once."""
+        access_grants = AccessGrants.get_grants_by_resources(
+            "channel", [channel.id for channel in channels], db=db
+        )
+        return [
+            ChannelModel.model_validate(
+                {
+                    **ChannelModel.model_validate(channel).model_dump(
+                        exclude={"access_grants"}
+                    ),
+                    "access_grants": access_grants[channel.id],
+                }
+            )
+            for channel in channels
+        ]
+
     def _collect_unique_user_ids(
         self,
         invited_by: str,
@@ -368,7 +392,7 @@ class ChannelTable:
     def get_channels(self, db: Optional[Session] = None) -> list[ChannelModel]:
         with get_db_context(db) as db:
             channels = db.query(Channel).all()
-            return [self._to_channel_model(channel, db=db) for channel in channels]
+            return self._to_channel_models(channels, db=db)
 
     def _has_permission(self, db, query, filter: dict, permission: str = "read"):
         return AccessGrants.has_permission_filter(
@@ -417,7 +441,7 @@ class ChannelTable:
             standard_channels = query.all()
 
             all_channels = membership_channels + standard_channels
-            return [self._to_channel_model(c, db=db) for c in all_channels]
+            return self._to_channel_models(all_channels, db=db)
 
     def get_dm_channel_by_user_ids(
         self, user_ids: list[str], db: Optional[Session] = None
@@ -620,6 +644,24 @@ class ChannelTable:
                 for membership in memberships
             ]
 
+    def get_members_by_channel_ids(
+        self, channel_ids: list[str], db: Optional[Session] = None
+    ) -> dict[str, list[ChannelMemberModel]]:
+        """Get the members of several channels as {channel_id: members}."""
+        result = {channel_id: [] for channel_id in channel_ids}
+        if not channel_ids:
+            return result
+
+        with get_db_context(db) as db:
+            memberships = db.query(ChannelMember).filter(
+                ChannelMember.channel_id.in_(channel_ids)
+            )
+            for membership in memberships:
+                result[membership.channel_id].append(
+                    ChannelMemberModel.model_validate(membership)
+                )
+            return result
+
     def pin_channel(
         self,
         channel_id: str,
@@ -991,6 +1033,21 @@ class ChannelTable:
             )
             return ChannelWebhookModel.model_validate(webhook) if webhook else None
 
+    def get_webhooks_by_ids(
+        self, webhook_ids: list[str], db: Optional[Session] = None
+    ) -> dict[str, ChannelWebhookModel]:
+        if not webhook_ids:
+            return {}
+
+        with get_db_context(db) as db:
+            webhooks = db.query(ChannelWebhook).filter(
+                ChannelWebhook.id.in_(webhook_ids)
+            )
+            return {
+                webhook.id: ChannelWebhookModel.model_validate(webhook)
+                for webhook in webhooks
+            }
+
     def get_webhook_by_id_and_token(
         self, webhook_id: str, token: str, db: Optional[Session] = None
     ) -> Optional[ChannelWebhookModel]:
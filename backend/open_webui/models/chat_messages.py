@@ -4,7 +4,7 @@ import uuid
 from typing import Any, Optional
 
 from sqlalchemy.orm import Session
-from open_webui.internal.db import Base, get_db_context
+from open_webui.internal.db import AsyncTable, Base, get_db_context
 
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import (
@@ -12,9 +12,12 @@ from sqlalchemy import (
     Boolean,
     Column,
     ForeignKey,
+    Integer,
     Text,
     JSON,
     Index,
+    cast,
+    exc,
     func,
 )
 
@@ -41,6 +44,56 @@ def _normalize_timestamp(timestamp: int) -> float:
     return timestamp
 
 
+# Message keys stored in their own columns, keyed to the column name.
+# Every other key of a message dict is kept in the `data` column.
+MESSAGE_BODY_COLUMNS = {
+    "content": "content",
+    "output": "output",
+    "files": "files",
+    "sources": "sources",
+    "embeds": "embeds",
+    "statusHistory": "status_history",
+    "error": "error",
+}
+
+
+def _get_message_data(message: dict) -> dict:
+    """Return the message keys that do not have a dedicated column."""
+    return {
+        key: value
+        for key, value in message.items()
+        if key not in MESSAGE_BODY_COLUMNS and key != "status_history"
+    }
+
+
+def _get_message_id(message: "ChatMessage") -> str:
+    """Strip the `{chat_id}-` prefix from a composite chat_message id."""
+    return message.id[len(message.chat_id) + 1 :]
+
+
+def message_to_dict(message: "ChatMessage") -> dict:
+    """Rebuild the chat history message dict from a chat_message row."""
+    if message.data is not None:
+        result = dict(message.data)
+    else:
+        # Rows written before the `data` column existed only carry the columns
+        result = {
+            "id": _get_message_id(message),
+            "role": message.role,
+            "parentId": message.parent_id,
+            "done": message.done,
+        }
+        if message.model_id:
+            result["model"] = message.model_id
+
+    for key, column in MESSAGE_BODY_COLUMNS.items():
+        value = getattr(message, column)
+        if value is not None:
+            result[key] = value
+
+    return result
+
+
 ####################
 # ChatMessage DB Schema
 ####################
@@ -80,6 +133,9 @@ class ChatMessage(Base):
     # Usage (tokens, timing, etc.)
     usage = Column(JSON, nullable=True)
 
+    # Remaining message fields (childrenIds, timestamp, info, ...)
+    data = Column(JSON, nullable=True)
+
     # Timestamps
     created_at = Column(BigInteger, index=True)
     updated_at = Column(BigInteger)
@@ -91,6 +147,44 @@ class ChatMessage(Base):
     )
 
 
+####################
+# ChatMessageRollup DB Schema
+####################
+
+# Hourly totals of the chat_message table for the analytics dashboard. The
+# compactor only rolls up hours that ended ROLLUP_DELAY seconds ago, so usage
+# reported at the end of a streamed response is in place by then; hours after
+# compacted_until are read from chat_message. Messages written later to a
+# rolled up hour (imports, late usage) adjust its rollups as they are upserted,
+# and deleting messages of a rolled up hour takes them out of its rollups.
+
+ROLLUP_STATE_ID = "chat_message"
+ROLLUP_DELAY = 3600
+ROLLUP_CHUNK_SIZE = 86400
+
+
+class ChatMessageRollup(Base):
+    __tablename__ = "chat_message_rollup"
+
+    hour = Column(BigInteger, primary_key=True)  # created_at of the hour start
+    user_id = Column(Text, primary_key=True)
+    model_id = Column(Text, primary_key=True)  # "" for messages without a model
+    role = Column(Text, primary_key=True)
+
+    message_count = Column(BigInteger, nullable=False)
+    usage_count = Column(BigInteger, nullable=False)  # messages with usage
+    input_tokens = Column(BigInteger, nullable=False)
+    output_tokens = Column(BigInteger, nullable=False)
+
+
+class ChatMessageRollupState(Base):
+    __tablename__ = "chat_message_rollup_state"
+
+    id = Column(Text, primary_key=True)
+    compacted_until = Column(BigInteger, nullable=False)  # hours before this
+    updated_at = Column(BigInteger)
+
+
 ####################
 # Pydantic Models
 ####################
@@ -114,6 +208,7 @@ class ChatMessageModel(BaseModel):
     status_history: Optional[list] = None
     error: Optional[dict | str] = None
     usage: Optional[dict] = None
+    data: Optional[dict] = None
     created_at: int
     updated_at: int
 
@@ -124,6 +219,196 @@ class ChatMessageModel(BaseModel):
 
 
 class ChatMessageTable:
+    def _upsert_message(
+        self,
+        db: Session,
+        message_id: str,
+        chat_id: str,
+        user_id: str,
+        data: dict,
+    ) -> ChatMessage:
+        """Stage an insert or update of a chat message without committing."""
+        now = int(time.time())
+        timestamp = data.get("timestamp", now)
+
+        # Extract usage - check direct field first, then info.usage
+        usage = data.get("usage")
+        if not usage:
+            info = data.get("info", {})
+            usage = info.get("usage") if info else None
+
+        # Use composite ID: {chat_id}-{message_id}
+        composite_id = f"{chat_id}-{message_id}"
+
+        existing = db.get(ChatMessage, composite_id)
+        rolled_up = self._is_rolled_up(
+            db, existing.created_at if existing else timestamp
+        )
+        before = (
+            self._get_rollup_totals(db, ChatMessage.id == composite_id)
+            if rolled_up and existing
+            else {}
+        )
+
+        if existing:
+            # Update existing
+            if "role" in data:
+                existing.role = data["role"]
+            if "parent_id" in data or "parentId" in data:
+                existing.parent_id = data.get("parent_id") or data.get("parentId")
+            if "content" in data:
+                existing.content = data.get("content")
+            if "output" in data:
+                existing.output = data.get("output")
+            if "model_id" in data or "model" in data:
+                existing.model_id = data.get("model_id") or data.get("model")
+            if "files" in data:
+                existing.files = data.get("files")
+            if "sources" in data:
+                existing.sources = data.get("sources")
+            if "embeds" in data:
+                existing.embeds = data.get("embeds")
+            if "done" in data:
+                existing.done = data.get("done", True)
+            if "status_history" in data or "statusHistory" in data:
+                existing.status_history = data.get("status_history") or data.get(
+                    "statusHistory"
+                )
+            if "error" in data:
+                existing.error = data.get("error")
+            if usage:
+                existing.usage = usage
+            existing.data = {**(existing.data or {}), **_get_message_data(data)}
+            existing.updated_at = now
+            if rolled_up:
+                db.flush()
+                self._adjust_rollups(
+                    db,
+                    before,
+                    self._get_rollup_totals(db, ChatMessage.id == composite_id),
+                )
+            return existing
+        else:
+            # Insert new
+            message = ChatMessage(
+                id=composite_id,
+                chat_id=chat_id,
+                user_id=user_id,
+                role=data.get("role", "user"),
+                parent_id=data.get("parent_id") or data.get("parentId"),
+                content=data.get("content"),
+                output=data.get("output"),
+                model_id=data.get("model_id") or data.get("model"),
+                files=data.get("files"),
+                sources=data.get("sources"),
+                embeds=data.get("embeds"),
+                done=data.get("done", True),
+                status_history=data.get("status_history") or data.get("statusHistory"),
+                error=data.get("error"),
+                usage=usage,
+                data=_get_message_data(data),
+                created_at=timestamp,
+                updated_at=now,
+            )
+            db.add(message)
+            if rolled_up:
+                db.flush()
+                self._adjust_rollups(
+                    db,
+                    before,
+                    self._get_rollup_totals(db, ChatMessage.id == composite_id),
+                )
+            return message
+
+    def _get_compacted_until(self, db: Session) -> int:
+        """The end of the compacted hours, read under the compactor's lock."""
+        # Shares the compactor's lock, so a message is either in the totals
+        # it writes or adjusted by the caller
+        state = (
+            db.query(ChatMessageRollupState)
+            .filter_by(id=ROLLUP_STATE_ID)
+            .with_for_update(read=True)
+            .first()
+        )
+        return state.compacted_until if state else 0
+
+    def _is_rolled_up(self, db: Session, created_at: Optional[int]) -> bool:
+        """Whether the hour of created_at was compacted into the rollups."""
+        if created_at is None or created_at >= int(time.time()) - ROLLUP_DELAY:
+            # Only hours that ended ROLLUP_DELAY ago are compacted
+            return False
+
+        return created_at < self._get_compacted_until(db)
+
+    def _get_rollup_totals(self, db: Session, *criteria) -> dict[tuple, list[int]]:
+        """What the messages matching criteria add to the rollups, by rollup key."""
+        return {
+            tuple(row[:4]): [int(value) for value in row[4:]]
+            for row in self._query_message_totals(
+                db, ["hour", "user_id", "model_id", "role"]
+            )
+            .filter(*criteria)
+            .all()
+        }
+
+    def _adjust_rollups(
+        self,
+        db: Session,
+        before: dict[tuple, list[int]],
+        after: dict[tuple, list[int]],
+    ):
+        for key in before.keys() | after.keys():
+            delta = [
+                new - old
+                for new, old in zip(after.get(key, [0] * 4), before.get(key, [0] * 4))
+            ]
+            if not any(delta):
+                continue
+
+            hour, user_id, model_id, role = key
+            rollup = (
+                db.query(ChatMessageRollup)
+                .filter_by(hour=hour, user_id=user_id, model_id=model_id, role=role)
+                .with_for_update()
+                .first()
+            )
+            if rollup is None:
+                if delta[0] < 0:
+                    # Nothing left to take the deleted messages out of
+                    continue
+                rollup = ChatMessageRollup(
+                    hour=hour,
+                    user_id=user_id,
+                    model_id=model_id,
+                    role=role,
+                    message_count=0,
+                    usage_count=0,
+                    input_tokens=0,
+                    output_tokens=0,
+                )
+                db.add(rollup)
+
+            rollup.message_count += delta[0]
+            rollup.usage_count += delta[1]
+            rollup.input_tokens += delta[2]
+            rollup.output_tokens += delta[3]
+            if rollup.message_count <= 0:
+                # Every message of the hour was deleted
+                db.delete(rollup)
+
+    def _delete_messages(self, db: Session, *criteria):
+        """
+        Stage a delete of the messages matching criteria without committing,
+        taking those of compacted hours out of the rollups.
+        """
+        compacted_until = self._get_compacted_until(db)
+        if compacted_until:
+            before = self._get_rollup_totals(
+                db, ChatMessage.created_at < compacted_until, *criteria
+            )
+            self._adjust_rollups(db, before, {})
+        db.query(ChatMessage).filter(*criteria).delete(synchronize_session=False)
+
     def upsert_message(
         self,
         message_id: str,
@@ -134,81 +419,27 @@ class ChatMessageTable:
     ) -> Optional[ChatMessageModel]:
         """Insert or update a chat message."""
         with get_db_context(db) as db:
-            now = int(time.time())
-            timestamp = data.get("timestamp", now)
-
-            # Use composite ID: {chat_id}-{message_id}
-            composite_id = f"{chat_id}-{message_id}"
-
-            existing = db.get(ChatMessage, composite_id)
-            if existing:
-                # Update existing
-                if "role" in data:
-                    existing.role = data["role"]
-                if "parent_id" in data:
-                    existing.parent_id = data.get("parent_id") or data.get("parentId")
-                if "content" in data:
-                    existing.content = data.get("content")
-                if "output" in data:
-                    existing.output = data.get("output")
-                if "model_id" in data or "model" in data:
-                    existing.model_id = data.get("model_id") or data.get("model")
-                if "files" in data:
-                    existing.files = data.get("files")
-                if "sources" in data:
-                    existing.sources = data.get("sources")
-                if "embeds" in data:
-                    existing.embeds = data.get("embeds")
-                if "done" in data:
-                    existing.done = data.get("done", True)
-                if "status_history" in data or "statusHistory" in data:
-                    existing.status_history = data.get("status_history") or data.get(
-                        "statusHistory"
-                    )
-                if "error" in data:
-                    existing.error = data.get("error")
-                # Extract usage - check direct field first, then info.usage
-                usage = data.get("usage")
-                if not usage:
-                    info = data.get("info", {})
-                    usage = info.get("usage") if info else None
-                if usage:
-                    existing.usage = usage
-                existing.updated_at = now
-                db.commit()
-                db.refresh(existing)
-                return ChatMessageModel.model_validate(existing)
-            else:
-                # Insert new
-                # Extract usage - check direct field first, then info.usage
-                usage = data.get("usage")
-                if not usage:
-                    info = data.get("info", {})
-                    usage = info.get("usage") if info else None
-                message = ChatMessage(
-                    id=composite_id,
-                    chat_id=chat_id,
-                    user_id=user_id,
-                    role=data.get("role", "user"),
-                    parent_id=data.get("parent_id") or data.get("parentId"),
-                    content=data.get("content"),
-                    output=data.get("output"),
-                    model_id=data.get("model_id") or data.get("model"),
-                    files=data.get("files"),
-                    sources=data.get("sources"),
-                    embeds=data.get("embeds"),
-                    done=data.get("done", True),
-                    status_history=data.get("status_history")
-                    or data.get("statusHistory"),
-                    error=data.get("error"),
-                    usage=usage,
-                    created_at=timestamp,
-                    updated_at=now,
-                )
-                db.add(message)
-                db.commit()
-                db.refresh(message)
-                return ChatMessageModel.model_validate(message)
+            message = self._upsert_message(db, message_id, chat_id, user_id, data)
+            db.commit()
+            db.refresh(message)
+            return ChatMessageModel.model_validate(message)
+
+    def upsert_messages(
+        self,
+        chat_id: str,
+        user_id: str,
+        messages: dict[str, dict],
+        db: Optional[Session] = None,
+    ) -> int:
+        """Insert or update several messages of a chat in a single commit."""
+        with get_db_context(db) as db:
+            count = 0
+            for message_id, message in messages.items():
+                if isinstance(message, dict) and message.get("role"):
+                    self._upsert_message(db, message_id, chat_id, user_id, message)
+                    count += 1
+            db.commit()
+            return count
 
     def get_message_by_id(
         self, id: str, db: Optional[Session] = None
@@ -301,48 +532,329 @@ class ChatMessageTable:
             )
             return [chat_id for chat_id, _ in chat_ids]
 
+    def get_message_dict(
+        self, chat_id: str, message_id: str, db: Optional[Session] = None
+    ) -> Optional[dict]:
+        """Get a single message as a chat history message dict."""
+        with get_db_context(db) as db:
+            message = db.get(ChatMessage, f"{chat_id}-{message_id}")
+            return message_to_dict(message) if message else None
+
+    def get_message_dicts_by_ids(
+        self, chat_id: str, message_ids: list[str], db: Optional[Session] = None
+    ) -> dict[str, dict]:
+        """Get some messages of a chat as {message_id: message}."""
+        result = {}
+        with get_db_context(db) as db:
+            for i in range(0, len(message_ids), 500):
+                messages = db.query(ChatMessage).filter(
+                    ChatMessage.id.in_(
+                        [
+                            f"{chat_id}-{message_id}"
+                            for message_id in message_ids[i : i + 500]
+                        ]
+                    )
+                )
+                for message in messages:
+                    result[_get_message_id(message)] = message_to_dict(message)
+            return result
+
+    def get_message_dicts_by_chat_ids(
+        self, chat_ids: list[str], db: Optional[Session] = None
+    ) -> dict[str, dict[str, dict]]:
+        """Get the messages of several chats as {chat_id: {message_id: message}}."""
+        result = {chat_id: {} for chat_id in chat_ids}
+        if not chat_ids:
+            return result
+
+        with get_db_context(db) as db:
+            for i in range(0, len(chat_ids), 500):
+                messages = db.query(ChatMessage).filter(
+                    ChatMessage.chat_id.in_(chat_ids[i : i + 500])
+                )
+                for message in messages:
+                    message_id = _get_message_id(message)
+                    result[message.chat_id][message_id] = message_to_dict(message)
+            return result
+
+    def delete_messages_by_chat_id_except(
+        self, chat_id: str, message_ids: list[str], db: Optional[Session] = None
+    ) -> bool:
+        """Delete the messages of a chat that are not in message_ids."""
+        with get_db_context(db) as db:
+            keep_ids = [f"{chat_id}-{message_id}" for message_id in message_ids]
+            self._delete_messages(
+                db, ChatMessage.chat_id == chat_id, ChatMessage.id.not_in(keep_ids)
+            )
+            db.commit()
+            return True
+
     def delete_messages_by_chat_id(
         self, chat_id: str, db: Optional[Session] = None
     ) -> bool:
         with get_db_context(db) as db:
-            db.query(ChatMessage).filter_by(chat_id=chat_id).delete()
+            self._delete_messages(db, ChatMessage.chat_id == chat_id)
             db.commit()
             return True
 
     # Analytics methods
-    def get_message_count_by_model(
+    def _get_usage_tokens(self, db: Session):
+        """Input and output token counts of a message's usage, as SQL."""
+        dialect = db.bind.dialect.name
+
+        if dialect == "sqlite":
+            input_tokens = cast(
+                func.json_extract(ChatMessage.usage, "$.input_tokens"), Integer
+            )
+            output_tokens = cast(
+                func.json_extract(ChatMessage.usage, "$.output_tokens"), Integer
+            )
+        elif dialect == "postgresql":
+            # Use json_extract_path_text for PostgreSQL JSON columns
+            input_tokens = cast(
+                func.json_extract_path_text(ChatMessage.usage, "input_tokens"),
+                Integer,
+            )
+            output_tokens = cast(
+                func.json_extract_path_text(ChatMessage.usage, "output_tokens"),
+                Integer,
+            )
+        else:
+            raise NotImplementedError(f"Unsupported dialect: {dialect}")
+
+        return input_tokens, output_tokens
+
+    def _query_message_totals(self, db: Session, keys: list[str]):
+        """Message and token totals of chat_message grouped by keys."""
+        input_tokens, output_tokens = self._get_usage_tokens(db)
+        columns = {
+            "hour": ChatMessage.created_at - ChatMessage.created_at % 3600,
+            "user_id": ChatMessage.user_id,
+            "model_id": func.coalesce(ChatMessage.model_id, ""),
+            "role": ChatMessage.role,
+        }
+        group_by = [columns[key] for key in keys]
+
+        return (
+            db.query(
+                *group_by,
+                func.count(ChatMessage.id),
+                func.count(ChatMessage.usage),
+                func.coalesce(func.sum(input_tokens), 0),
+                func.coalesce(func.sum(output_tokens), 0),
+            )
+            .filter(
+                ChatMessage.user_id.isnot(None),
+                ~ChatMessage.user_id.like("shared-%"),
+            )
+            .group_by(*group_by)
+        )
+
+    def _get_message_totals(
         self,
+        db: Session,
+        keys: list[str],
         start_date: Optional[int] = None,
         end_date: Optional[int] = None,
         group_id: Optional[str] = None,
-        db: Optional[Session] = None,
-    ) -> dict[str, int]:
-        with get_db_context(db) as db:
-            from sqlalchemy import func
-            from open_webui.models.groups import GroupMember
-
+        assistant_only: bool = False,
+        require_model: bool = False,
+    ) -> dict[tuple, dict[str, int]]:
+        """
+        Totals grouped by keys (of hour, user_id, model_id, role), reading the
+        hours wholly within the range from the rollups and the rest from
+        chat_message.
+        """
+        from open_webui.models.groups import GroupMember
+
+        state = db.get(ChatMessageRollupState, ROLLUP_STATE_ID)
+        rollup_start = -(-start_date // 3600) * 3600 if start_date else 0
+        rollup_end = state.compacted_until if state else 0
+        if end_date:
+            rollup_end = min(rollup_end, (end_date + 1) // 3600 * 3600)
+
+        group_users = (
+            db.query(GroupMember.user_id)
+            .filter(GroupMember.group_id == group_id)
+            .subquery()
+            if group_id
+            else None
+        )
+
+        queries = []
+        if rollup_start < rollup_end:
+            columns = [getattr(ChatMessageRollup, key) for key in keys]
             query = db.query(
-                ChatMessage.model_id, func.count(ChatMessage.id).label("count")
+                *columns,
+                func.sum(ChatMessageRollup.message_count),
+                func.sum(ChatMessageRollup.usage_count),
+                func.sum(ChatMessageRollup.input_tokens),
+                func.sum(ChatMessageRollup.output_tokens),
             ).filter(
-                ChatMessage.role == "assistant",
-                ChatMessage.model_id.isnot(None),
-                ~ChatMessage.user_id.like("shared-%"),
+                ChatMessageRollup.hour >= rollup_start,
+                ChatMessageRollup.hour < rollup_end,
             )
-
-            if start_date:
-                query = query.filter(ChatMessage.created_at >= start_date)
+            if assistant_only:
+                query = query.filter(ChatMessageRollup.role == "assistant")
+            if require_model:
+                query = query.filter(ChatMessageRollup.model_id != "")
+            if group_users is not None:
+                query = query.filter(ChatMessageRollup.user_id.in_(group_users))
+            queries.append(query.group_by(*columns))
+
+            ranges = [(rollup_end, None)]
+            if start_date and start_date < rollup_start:
+                ranges.append((start_date, rollup_start))
+        else:
+            ranges = [(start_date, None)]
+
+        for range_start, range_end in ranges:
+            query = self._query_message_totals(db, keys)
+            if range_start:
+                query = query.filter(ChatMessage.created_at >= range_start)
+            if range_end is not None:
+                query = query.filter(ChatMessage.created_at < range_end)
             if end_date:
                 query = query.filter(ChatMessage.created_at <= end_date)
-            if group_id:
-                group_users = (
-                    db.query(GroupMember.user_id)
-                    .filter(GroupMember.group_id == group_id)
-                    .subquery()
-                )
+            if assistant_only:
+                query = query.filter(ChatMessage.role == "assistant")
+            if require_model:
+                query = query.filter(ChatMessage.model_id.isnot(None))
+            if group_users is not None:
                 query = query.filter(ChatMessage.user_id.in_(group_users))
+            queries.append(query)
+
+        totals: dict[tuple, dict[str, int]] = {}
+        for query in queries:
+            for row in query.all():
+                key = tuple(row[: len(keys)])
+                entry = totals.setdefault(
+                    key,
+                    {
+                        "message_count": 0,
+                        "usage_count": 0,
+                        "input_tokens": 0,
+                        "output_tokens": 0,
+                    },
+                )
+                entry["message_count"] += int(row[-4])
+                entry["usage_count"] += int(row[-3])
+                entry["input_tokens"] += int(row[-2])
+                entry["output_tokens"] += int(row[-1])
+        return totals
+
+    def compact_rollups(self, db: Optional[Session] = None) -> int:
+        """
+        Roll up the messages of the hours that ended ROLLUP_DELAY seconds ago
+        and were not compacted yet, a day per transaction. Returns the number
+        of rollup rows written.
+        """
+        end = (int(time.time()) - ROLLUP_DELAY) // 3600 * 3600
+        written = 0
+
+        with get_db_context(db) as db:
+            while True:
+                state = (
+                    db.query(ChatMessageRollupState)
+                    .filter_by(id=ROLLUP_STATE_ID)
+                    .with_for_update()
+                    .first()
+                )
+                start = state.compacted_until if state else 0
+                if start >= end:
+                    db.rollback()
+                    return written
+
+                # Skip ahead over hours without messages
+                first = (
+                    db.query(func.min(ChatMessage.created_at))
+                    .filter(
+                        ChatMessage.created_at >= start,
+                        ChatMessage.created_at < end,
+                    )
+                    .scalar()
+                )
+                chunk_start = first // 3600 * 3600 if first is not None else end
+                chunk_end = min(chunk_start + ROLLUP_CHUNK_SIZE, end)
 
-            results = query.group_by(ChatMessage.model_id).all()
-            return {row.model_id: row.count for row in results}
+                rows = (
+                    self._query_message_totals(
+                        db, ["hour", "user_id", "model_id", "role"]
+                    )
+                    .filter(
+                        ChatMessage.created_at >= chunk_start,
+                        ChatMessage.created_at < chunk_end,
+                    )
+                    .all()
+                )
+                db.add_all(
+                    [
+                        ChatMessageRollup(
+                            hour=hour,
+                            user_id=user_id,
+                            model_id=model_id,
+                            role=role,
+                            message_count=message_count,
+                            usage_count=usage_count,
+                            input_tokens=input_tokens,
+                            output_tokens=output_tokens,
+                        )
+                        for (
+                            hour,
+                            user_id,
+                            model_id,
+                            role,
+                            message_count,
+                            usage_count,
+                            input_tokens,
+                            output_tokens,
+                        ) in rows
+                    ]
+                )
+
+                if state is None:
+                    state = ChatMessageRollupState(id=ROLLUP_STATE_ID)
+                    db.add(state)
+                state.compacted_until = chunk_end
+                state.updated_at = int(time.time())
+
+                try:
+                    db.commit()
+                except exc.IntegrityError:
+                    # Another worker compacted the same hours first
+                    db.rollback()
+                    return written
+                written += len(rows)
+
+    def delete_rollups_by_user_id(
+        self, user_id: str, db: Optional[Session] = None
+    ) -> bool:
+        with get_db_context(db) as db:
+            db.query(ChatMessageRollup).filter_by(user_id=user_id).delete()
+            db.commit()
+            return True
+
+    def get_message_count_by_model(
+        self,
+        start_date: Optional[int] = None,
+        end_date: Optional[int] = None,
+        group_id: Optional[str] = None,
+        db: Optional[Session] = None,
+    ) -> dict[str, int]:
+        with get_db_context(db) as db:
+            totals = self._get_message_totals(
+                db,
+                ["model_id"],
+                start_date=start_date,
+                end_date=end_date,
+                group_id=group_id,
+                assistant_only=True,
+                require_model=True,
+            )
+            return {
+                model_id: entry["message_count"]
+                for (model_id,), entry in totals.items()
+            }
 
     def get_token_usage_by_model(
         self,
@@ -351,67 +863,26 @@ class ChatMessageTable:
         group_id: Optional[str] = None,
         db: Optional[Session] = None,
     ) -> dict[str, dict]:
-        """Aggregate token usage by model using database-level aggregation."""
+        """Aggregate token usage by model from the hourly rollups."""
         with get_db_context(db) as db:
-            from sqlalchemy import func, cast, Integer
-            from open_webui.models.groups import GroupMember
-
-            dialect = db.bind.dialect.name
-
-            if dialect == "sqlite":
-                input_tokens = cast(
-                    func.json_extract(ChatMessage.usage, "$.input_tokens"), Integer
-                )
-                output_tokens = cast(
-                    func.json_extract(ChatMessage.usage, "$.output_tokens"), Integer
-                )
-            elif dialect == "postgresql":
-                # Use json_extract_path_text for PostgreSQL JSON columns
-                input_tokens = cast(
-                    func.json_extract_path_text(ChatMessage.usage, "input_tokens"),
-                    Integer,
-                )
-                output_tokens = cast(
-                    func.json_extract_path_text(ChatMessage.usage, "output_tokens"),
-                    Integer,
-                )
-            else:
-                raise NotImplementedError(f"Unsupported dialect: {dialect}")
-
-            query = db.query(
-                ChatMessage.model_id,
-                func.coalesce(func.sum(input_tokens), 0).label("input_tokens"),
-                func.coalesce(func.sum(output_tokens), 0).label("output_tokens"),
-                func.count(ChatMessage.id).label("message_count"),
-            ).filter(
-                ChatMessage.role == "assistant",
-                ChatMessage.model_id.isnot(None),
-                ChatMessage.usage.isnot(None),
-                ~ChatMessage.user_id.like("shared-%"),
+            totals = self._get_message_totals(
+                db,
+                ["model_id"],
+                start_date=start_date,
+                end_date=end_date,
+                group_id=group_id,
+                assistant_only=True,
+                require_model=True,
             )
-
-            if start_date:
-                query = query.filter(ChatMessage.created_at >= start_date)
-            if end_date:
-                query = query.filter(ChatMessage.created_at <= end_date)
-            if group_id:
-                group_users = (
-                    db.query(GroupMember.user_id)
-                    .filter(GroupMember.group_id == group_id)
-                    .subquery()
-                )
-                query = query.filter(ChatMessage.user_id.in_(group_users))
-
-            results = query.group_by(ChatMessage.model_id).all()
-
             return {
-                row.model_id: {
-                    "input_tokens": row.input_tokens,
-                    "output_tokens": row.output_tokens,
-                    "total_tokens": row.input_tokens + row.output_tokens,
-                    "message_count": row.message_count,
+                model_id: {
+                    "input_tokens": entry["input_tokens"],
+                    "output_tokens": entry["output_tokens"],
+                    "total_tokens": entry["input_tokens"] + entry["output_tokens"],
+                    "message_count": entry["usage_count"],
                 }
-                for row in results
+                for (model_id,), entry in totals.items()
+                if entry["usage_count"]
             }
 
     def get_token_usage_by_user(
@@ -420,59 +891,24 @@ class ChatMessageTable:
         end_date: Optional[int] = None,
         db: Optional[Session] = None,
     ) -> dict[str, dict]:
-        """Aggregate token usage by user using database-level aggregation."""
+        """Aggregate token usage by user from the hourly rollups."""
         with get_db_context(db) as db:
-            from sqlalchemy import func, cast, Integer
-
-            dialect = db.bind.dialect.name
-
-            if dialect == "sqlite":
-                input_tokens = cast(
-                    func.json_extract(ChatMessage.usage, "$.input_tokens"), Integer
-                )
-                output_tokens = cast(
-                    func.json_extract(ChatMessage.usage, "$.output_tokens"), Integer
-                )
-            elif dialect == "postgresql":
-                # Use json_extract_path_text for PostgreSQL JSON columns
-                input_tokens = cast(
-                    func.json_extract_path_text(ChatMessage.usage, "input_tokens"),
-                    Integer,
-                )
-                output_tokens = cast(
-                    func.json_extract_path_text(ChatMessage.usage, "output_tokens"),
-                    Integer,
-                )
-            else:
-                raise NotImplementedError(f"Unsupported dialect: {dialect}")
-
-            query = db.query(
-                ChatMessage.user_id,
-                func.coalesce(func.sum(input_tokens), 0).label("input_tokens"),
-                func.coalesce(func.sum(output_tokens), 0).label("output_tokens"),
-                func.count(ChatMessage.id).label("message_count"),
-            ).filter(
-                ChatMessage.role == "assistant",
-                ChatMessage.user_id.isnot(None),
-                ChatMessage.usage.isnot(None),
-                ~ChatMessage.user_id.like("shared-%"),
+            totals = self._get_message_totals(
+                db,
+                ["user_id"],
+                start_date=start_date,
+                end_date=end_date,
+                assistant_only=True,
             )
-
-            if start_date:
-                query = query.filter(ChatMessage.created_at >= start_date)
-            if end_date:
-                query = query.filter(ChatMessage.created_at <= end_date)
-
-            results = query.group_by(ChatMessage.user_id).all()
-
             return {
-                row.user_id: {
-                    "input_tokens": row.input_tokens,
-                    "output_tokens": row.output_tokens,
-                    "total_tokens": row.input_tokens + row.output_tokens,
-                    "message_count": row.message_count,
+                user_id: {
+                    "input_tokens": entry["input_tokens"],
+                    "output_tokens": entry["output_tokens"],
+                    "total_tokens": entry["input_tokens"] + entry["output_tokens"],
+                    "message_count": entry["usage_count"],
                 }
-                for row in results
+                for (user_id,), entry in totals.items()
+                if entry["usage_count"]
             }
 
     def get_message_count_by_user(
@@ -483,27 +919,16 @@ class ChatMessageTable:
         db: Optional[Session] = None,
     ) -> dict[str, int]:
         with get_db_context(db) as db:
-            from sqlalchemy import func
-            from open_webui.models.groups import GroupMember
-
-            query = db.query(
-                ChatMessage.user_id, func.count(ChatMessage.id).label("count")
-            ).filter(~ChatMessage.user_id.like("shared-%"))
-
-            if start_date:
-                query = query.filter(ChatMessage.created_at >= start_date)
-            if end_date:
-                query = query.filter(ChatMessage.created_at <= end_date)
-            if group_id:
-                group_users = (
-                    db.query(GroupMember.user_id)
-                    .filter(GroupMember.group_id == group_id)
-                    .subquery()
-                )
-                query = query.filter(ChatMessage.user_id.in_(group_users))
-
-            results = query.group_by(ChatMessage.user_id).all()
-            return {row.user_id: row.count for row in results}
+            totals = self._get_message_totals(
+                db,
+                ["user_id"],
+                start_date=start_date,
+                end_date=end_date,
+                group_id=group_id,
+            )
+            return {
+                user_id: entry["message_count"] for (user_id,), entry in totals.items()
+            }
 
     def get_message_count_by_chat(
         self,
@@ -535,22 +960,19 @@ class ChatMessageTable:
             results = query.group_by(ChatMessage.chat_id).all()
             return {row.chat_id: row.count for row in results}
 
-    def get_daily_message_counts_by_model(
+    def get_chat_count(
         self,
         start_date: Optional[int] = None,
         end_date: Optional[int] = None,
         group_id: Optional[str] = None,
         db: Optional[Session] = None,
-    ) -> dict[str, dict[str, int]]:
-        """Get message counts grouped by day and model."""
+    ) -> int:
+        """Count the chats with messages in the range."""
         with get_db_context(db) as db:
-            from datetime import datetime, timedelta
             from open_webui.models.groups import GroupMember
 
-            query = db.query(ChatMessage.created_at, ChatMessage.model_id).filter(
-                ChatMessage.role == "assistant",
-                ChatMessage.model_id.isnot(None),
-                ~ChatMessage.user_id.like("shared-%"),
+            query = db.query(func.count(func.distinct(ChatMessage.chat_id))).filter(
+                ~ChatMessage.user_id.like("shared-%")
             )
 
             if start_date:
@@ -565,18 +987,39 @@ class ChatMessageTable:
                 )
                 query = query.filter(ChatMessage.user_id.in_(group_users))
 
-            results = query.all()
+            return query.scalar() or 0
+
+    def get_daily_message_counts_by_model(
+        self,
+        start_date: Optional[int] = None,
+        end_date: Optional[int] = None,
+        group_id: Optional[str] = None,
+        db: Optional[Session] = None,
+    ) -> dict[str, dict[str, int]]:
+        """Get message counts grouped by day and model."""
+        with get_db_context(db) as db:
+            from datetime import datetime, timedelta
+
+            totals = self._get_message_totals(
+                db,
+                ["hour", "model_id"],
+                start_date=start_date,
+                end_date=end_date,
+                group_id=group_id,
+                assistant_only=True,
+                require_model=True,
+            )
 
             # Group by date -> model -> count
             daily_counts: dict[str, dict[str, int]] = {}
-            for timestamp, model_id in results:
-                date_str = datetime.fromtimestamp(
-                    _normalize_timestamp(timestamp)
-                ).strftime("%Y-%m-%d")
+            for (hour, model_id), entry in totals.items():
+                date_str = datetime.fromtimestamp(_normalize_timestamp(hour)).strftime(
+                    "%Y-%m-%d"
+                )
                 if date_str not in daily_counts:
                     daily_counts[date_str] = {}
                 daily_counts[date_str][model_id] = (
-                    daily_counts[date_str].get(model_id, 0) + 1
+                    daily_counts[date_str].get(model_id, 0) + entry["message_count"]
                 )
 
             # Fill in missing days
@@ -601,29 +1044,25 @@ class ChatMessageTable:
         with get_db_context(db) as db:
             from datetime import datetime, timedelta
 
-            query = db.query(ChatMessage.created_at, ChatMessage.model_id).filter(
-                ChatMessage.role == "assistant",
-                ChatMessage.model_id.isnot(None),
-                ~ChatMessage.user_id.like("shared-%"),
+            totals = self._get_message_totals(
+                db,
+                ["hour", "model_id"],
+                start_date=start_date,
+                end_date=end_date,
+                assistant_only=True,
+                require_model=True,
             )
 
-            if start_date:
-                query = query.filter(ChatMessage.created_at >= start_date)
-            if end_date:
-                query = query.filter(ChatMessage.created_at <= end_date)
-
-            results = query.all()
-
             # Group by hour -> model -> count
             hourly_counts: dict[str, dict[str, int]] = {}
-            for timestamp, model_id in results:
-                hour_str = datetime.fromtimestamp(
-                    _normalize_timestamp(timestamp)
-                ).strftime("%Y-%m-%d %H:00")
+            for (hour, model_id), entry in totals.items():
+                hour_str = datetime.fromtimestamp(_normalize_timestamp(hour)).strftime(
+                    "%Y-%m-%d %H:00"
+                )
                 if hour_str not in hourly_counts:
                     hourly_counts[hour_str] = {}
                 hourly_counts[hour_str][model_id] = (
-                    hourly_counts[hour_str].get(model_id, 0) + 1
+                    hourly_counts[hour_str].get(model_id, 0) + entry["message_count"]
                 )
 
             # Fill in missing hours
@@ -642,3 +1081,4 @@ class ChatMessageTable:
 
 
 ChatMessages = ChatMessageTable()
+AsyncChatMessages = AsyncTable(ChatMessages)
@@ -0,0 +1,205 @@
+import logging
+from typing import Optional
+
+from sqlalchemy.orm import Session
+from open_webui.internal.db import Base, get_db_context
+from open_webui.utils.misc import sanitize_text_for_db
+
+from sqlalchemy import (
+    Column,
+    Float,
+    Index,
+    String,
+    Text,
+    func,
+    inspect,
+    literal,
+    select,
+    text,
+)
+
+log = logging.getLogger(__name__)
+
+# The chat title is indexed as a row with an empty message id
+TITLE_MESSAGE_ID = ""
+
+# SQLite's trigram tokenizer only indexes substrings of at least 3 characters
+FTS_MIN_QUERY_LENGTH = 3
+
+####################
+# Chat Search DB Schema
+####################
+
+
+class ChatSearch(Base):
+    """
+    Searchable text of a chat: one row for the title and one per message.
+
+    On SQLite the rows are mirrored by triggers into the chat_search_fts
+    FTS5 table (trigram tokenizer), on PostgreSQL content has a pg_trgm GIN
+    index. Both keep `LIKE '%text%'` semantics while avoiding a scan of
+    every chat blob a user owns.
+    """
+
+    __tablename__ = "chat_search"
+
+    chat_id = Column(Text, primary_key=True)
+    message_id = Column(Text, primary_key=True)
+    user_id = Column(Text, nullable=False)
+    content = Column(Text, nullable=True)
+
+    __table_args__ = (Index("chat_search_user_id_idx", "user_id"),)
+
+
+def get_message_content(message: dict) -> str:
+    content = message.get("content") if isinstance(message, dict) else None
+    return sanitize_text_for_db(content) if isinstance(content, str) else ""
+
+
+def get_chat_search_contents(title: str, chat: dict) -> dict[str, str]:
+    """Map a chat's title and message ids to their searchable text."""
+    contents = {TITLE_MESSAGE_ID: sanitize_text_for_db(title or "")}
+
+    messages = (chat.get("history") or {}).get("messages") or {}
+    for message_id, message in messages.items():
+        content = get_message_content(message)
+        if content:
+            contents[message_id] = content
+
+    return contents
+
+
+class ChatSearchTable:
+    _has_fts: Optional[bool] = None
+
+    def _get_fts_enabled(self, db: Session) -> bool:
+        if self._has_fts is None:
+            ChatSearchTable._has_fts = inspect(db.bind).has_table("chat_search_fts")
+        return self._has_fts
+
+    def index_chat(
+        self,
+        chat_id: str,
+        user_id: str,
+        title: str,
+        chat: dict,
+        db: Optional[Session] = None,
+    ) -> None:
+        """Bring the rows of a chat in line with its title and messages."""
+        with get_db_context(db) as db:
+            contents = get_chat_search_contents(title, chat)
+            rows = {
+                row.message_id: row
+                for row in db.query(ChatSearch).filter_by(chat_id=chat_id).all()
+            }
+
+            for message_id, content in contents.items():
+                row = rows.get(message_id)
+                if row is None:
+                    db.add(
+                        ChatSearch(
+                            chat_id=chat_id,
+                            message_id=message_id,
+                            user_id=user_id,
+                            content=content,
+                        )
+                    )
+                elif row.content != content or row.user_id != user_id:
+                    row.content = content
+                    row.user_id = user_id
+
+            for message_id, row in rows.items():
+                if message_id not in contents:
+                    db.delete(row)
+
+            db.commit()
+
+    def index_message(
+        self,
+        chat_id: str,
+        user_id: str,
+        message_id: str,
+        message: dict,
+        db: Optional[Session] = None,
+    ) -> None:
+        with get_db_context(db) as db:
+            content = get_message_content(message)
+            row = db.get(ChatSearch, (chat_id, message_id))
+
+            if row is None:
+                if content:
+                    db.add(
+                        ChatSearch(
+                            chat_id=chat_id,
+                            message_id=message_id,
+                            user_id=user_id,
+                            content=content,
+                        )
+                    )
+            elif not content:
+                db.delete(row)
+            elif row.content != content:
+                row.content = content
+
+            db.commit()
+
+    def index_title(
+        self, chat_id: str, user_id: str, title: str, db: Optional[Session] = None
+    ) -> None:
+        self.index_message(
+            chat_id, user_id, TITLE_MESSAGE_ID, {"content": title or ""}, db=db
+        )
+
+    def get_matches(self, user_id: str, search_text: str, db: Session):
+        """
+        Return a subquery of (chat_id, rank) for the chats of a user whose title
+        or messages contain search_text, and the ordering of its rank.
+        """
+        dialect_name = db.bind.dialect.name
+
+        if (
+            dialect_name == "sqlite"
+            and len(search_text) >= FTS_MIN_QUERY_LENGTH
+            and self._get_fts_enabled(db)
+        ):
+            # Match the text as a single trigram phrase, ranked by bm25 (lower is better)
+            matches = (
+                text("""
+                    SELECT chat_search.chat_id AS chat_id, MIN(chat_search_fts.rank) AS rank
+                    FROM chat_search_fts
+                    JOIN chat_search ON chat_search.rowid = chat_search_fts.rowid
+                    WHERE chat_search_fts MATCH :match AND chat_search.user_id = :user_id
+                    GROUP BY chat_search.chat_id
+                    """)
+                .bindparams(
+                    match='"' + search_text.replace('"', '""') + '"',
+                    user_id=user_id,
+                )
+                .columns(chat_id=String, rank=Float)
+                .subquery("matches")
+            )
+            return matches, matches.c.rank.asc()
+
+        if dialect_name == "postgresql":
+            rank = func.max(
+                func.ts_rank(
+                    func.to_tsvector("simple", ChatSearch.content),
+                    func.plainto_tsquery("simple", search_text),
+                )
+            )
+        else:
+            rank = literal(0.0)
+
+        matches = (
+            select(ChatSearch.chat_id.label("chat_id"), rank.label("rank"))
+            .where(
+                ChatSearch.user_id == user_id,
+                ChatSearch.content.ilike(f"%{search_text}%"),
+            )
+            .group_by(ChatSearch.chat_id)
+            .subquery("matches")
+        )
+        return matches, matches.c.rank.desc()
+
+
+ChatSearches = ChatSearchTable()
@@ -5,11 +5,17 @@ import uuid
 from typing import Optional
 
 from sqlalchemy.orm import Session
-from open_webui.internal.db import Base, JSONField, get_db, get_db_context
+from open_webui.internal.db import AsyncTable, Base, JSONField, get_db, get_db_context
+from open_webui.env import ENABLE_CHAT_MESSAGE_STORAGE
 from open_webui.models.tags import TagModel, Tag, Tags
 from open_webui.models.folders import Folders
 from open_webui.models.chat_messages import ChatMessage, ChatMessages
-from open_webui.utils.misc import sanitize_data_for_db, sanitize_text_for_db
+from open_webui.models.chat_search import ChatSearch, ChatSearches
+from open_webui.utils.misc import (
+    get_message_path_ids,
+    sanitize_data_for_db,
+    sanitize_text_for_db,
+)
 
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import (
@@ -64,6 +70,8 @@ class Chat(Base):
         Index("updated_at_user_id_idx", "updated_at", "user_id"),
         # WHERE folder_id = ... AND user_id = ...
         Index("folder_id_user_id_idx", "folder_id", "user_id"),
+        # WHERE user_id = ... ORDER BY updated_at DESC, id DESC (keyset pages)
+        Index("user_id_updated_at_id_idx", "user_id", "updated_at", "id"),
     )
 
 
@@ -290,11 +298,174 @@ class ChatTable:
 
         return changed
 
+    ####################
+    # Message storage (ENABLE_CHAT_MESSAGE_STORAGE)
+    ####################
+
+    def _get_message_skeleton(self, message: dict) -> dict:
+        if not isinstance(message, dict):
+            return message
+
+        return {
+            key: message[key]
+            for key in ("id", "parentId", "childrenIds", "role")
+            if key in message
+        }
+
+    def _split_chat(self, chat: dict) -> tuple[dict, dict]:
+        """
+        Split a chat into the skeleton stored in chat.chat and the messages map
+        stored in the chat_message table. The skeleton keeps the history tree
+        (currentId, parent/children ids) without any message bodies.
+        """
+        history = chat.get("history")
+        if not isinstance(history, dict):
+            return chat, {}
+
+        messages = history.get("messages") or {}
+        skeleton = {
+            **chat,
+            "history": {
+                **history,
+                "messages": {
+                    message_id: self._get_message_skeleton(message)
+                    for message_id, message in messages.items()
+                },
+            },
+        }
+
+        if isinstance(chat.get("messages"), list):
+            skeleton["messages"] = [
+                (
+                    {"id": message["id"]}
+                    if isinstance(message, dict) and message.get("id") in messages
+                    else message
+                )
+                for message in chat["messages"]
+            ]
+
+        return skeleton, messages
+
+    def _hydrate_chat(self, chat: dict, messages: dict) -> dict:
+        """Merge chat_message bodies back into a chat skeleton."""
+        history = chat.get("history")
+        if not messages or not isinstance(history, dict):
+            return chat
+
+        history_messages = {
+            message_id: (
+                {**message, **messages[message_id]}
+                if message_id in messages
+                else message
+            )
+            for message_id, message in (history.get("messages") or {}).items()
+        }
+        chat = {**chat, "history": {**history, "messages": history_messages}}
+
+        if isinstance(chat.get("messages"), list):
+            chat["messages"] = [
+                (
+                    history_messages.get(message["id"], message)
+                    if isinstance(message, dict) and message.keys() == {"id"}
+                    else message
+                )
+                for message in chat["messages"]
+            ]
+
+        return chat
+
+    def _to_chat_models(self, chat_items, db: Session) -> list[ChatModel]:
+        chats = [ChatModel.model_validate(chat_item) for chat_item in chat_items]
+        if not ENABLE_CHAT_MESSAGE_STORAGE or not chats:
+            return chats
+
+        messages_by_chat_id = ChatMessages.get_message_dicts_by_chat_ids(
+            [chat.id for chat in chats], db=db
+        )
+        return [
+            chat.model_copy(
+                update={
+                    "chat": self._hydrate_chat(
+                        chat.chat, messages_by_chat_id.get(chat.id, {})
+                    )
+                }
+            )
+            for chat in chats
+        ]
+
+    def _to_chat_model(self, chat_item, db: Session) -> ChatModel:
+        return self._to_chat_models([chat_item], db)[0]
+
+    ####################
+    # Chat lists
+    ####################
+
+    def _to_title_id_responses(self, rows) -> list[ChatTitleIdResponse]:
+        # Rows projected from the chat table, so they are not validated again
+        return [
+            ChatTitleIdResponse.model_construct(
+                id=row.id,
+                title=row.title,
+                updated_at=row.updated_at,
+                created_at=row.created_at,
+            )
+            for row in rows
+        ]
+
+    def _order_chat_list(self, query, cursor: Optional[tuple[int, str]] = None):
+        """
+        Order chats newest first. With cursor, the (updated_at, id) of the last
+        chat of the previous page, return the chats after it (keyset paging).
+        """
+        if cursor:
+            updated_at, id = cursor
+            query = query.filter(
+                # The first condition is implied by the second, but lets the
+                # index range scan start at the cursor
+                Chat.updated_at <= updated_at,
+                or_(
+                    Chat.updated_at < updated_at,
+                    and_(Chat.updated_at == updated_at, Chat.id < id),
+                ),
+            )
+        return query.order_by(Chat.updated_at.desc(), Chat.id.desc())
+
+    def _save_chat_messages(self, id: str, user_id: str, messages: dict, db: Session):
+        """
+        Write the changed messages of a chat to the chat_message table and drop
+        the ones no longer in its history.
+        """
+        existing = ChatMessages.get_message_dicts_by_chat_ids([id], db=db)[id]
+        changed = {
+            message_id: message
+            for message_id, message in messages.items()
+            if existing.get(message_id) != message
+        }
+
+        if changed:
+            ChatMessages.upsert_messages(id, user_id, changed, db=db)
+        if existing.keys() - messages.keys():
+            ChatMessages.delete_messages_by_chat_id_except(
+                id, list(messages.keys()), db=db
+            )
+
+    def _index_chat(self, id: str, user_id: str, title: str, chat: dict, db: Session):
+        """Refresh the chat_search rows of a chat; failures never fail the write."""
+        try:
+            if "history" in chat:
+                ChatSearches.index_chat(id, user_id, title, chat, db=db)
+            else:
+                ChatSearches.index_title(id, user_id, title, db=db)
+        except Exception as e:
+            db.rollback()
+            log.warning(f"Failed to update chat search index: {e}")
+
     def insert_new_chat(
         self, user_id: str, form_data: ChatForm, db: Optional[Session] = None
     ) -> Optional[ChatModel]:
         with get_db_context(db) as db:
             id = str(uuid.uuid4())
+            chat_data = self._clean_null_bytes(form_data.chat)
             chat = ChatModel(
                 **{
                     "id": id,
@@ -304,17 +475,29 @@ class ChatTable:
                         if "title" in form_data.chat
                         else "New Chat"
                     ),
-                    "chat": self._clean_null_bytes(form_data.chat),
+                    "chat": chat_data,
                     "folder_id": form_data.folder_id,
                     "created_at": int(time.time()),
                     "updated_at": int(time.time()),
                 }
             )
 
+            if ENABLE_CHAT_MESSAGE_STORAGE:
+                skeleton, messages = self._split_chat(chat_data)
+
+                chat_item = Chat(**{**chat.model_dump(), "chat": skeleton})
+                db.add(chat_item)
+                db.commit()
+
+                ChatMessages.upsert_messages(id, user_id, messages, db=db)
+                self._index_chat(id, user_id, chat.title, chat_data, db)
+                return chat
+
             chat_item = Chat(**chat.model_dump())
             db.add(chat_item)
             db.commit()
             db.refresh(chat_item)
+            self._index_chat(id, user_id, chat.title, chat_data, db)
 
             # Dual-write initial messages to chat_message table
             try:
@@ -369,6 +552,24 @@ class ChatTable:
         with get_db_context(db) as db:
             chats = []
 
+            if ENABLE_CHAT_MESSAGE_STORAGE:
+                chat_models = []
+                chat_messages = []
+                for form_data in chat_import_forms:
+                    chat = self._chat_import_form_to_chat_model(user_id, form_data)
+                    skeleton, messages = self._split_chat(chat.chat)
+                    chats.append(Chat(**{**chat.model_dump(), "chat": skeleton}))
+                    chat_models.append(chat)
+                    chat_messages.append(messages)
+
+                db.add_all(chats)
+                db.commit()
+
+                for chat, messages in zip(chat_models, chat_messages):
+                    ChatMessages.upsert_messages(chat.id, user_id, messages, db=db)
+                    self._index_chat(chat.id, user_id, chat.title, chat.chat, db)
+                return chat_models
+
             for form_data in chat_import_forms:
                 chat = self._chat_import_form_to_chat_model(user_id, form_data)
                 chats.append(Chat(**chat.model_dump()))
@@ -376,6 +577,9 @@ class ChatTable:
             db.add_all(chats)
             db.commit()
 
+            for chat in chats:
+                self._index_chat(chat.id, user_id, chat.title, chat.chat, db)
+
             # Dual-write messages to chat_message table
             try:
                 for form_data, chat_obj in zip(chat_import_forms, chats):
@@ -394,7 +598,7 @@ class ChatTable:
                     f"Failed to write imported messages to chat_message table: {e}"
                 )
 
-            return [ChatModel.model_validate(chat) for chat in chats]
+            return self._to_chat_models(chats, db)
 
     def update_chat_by_id(
         self, id: str, chat: dict, db: Optional[Session] = None
@@ -402,7 +606,7 @@ class ChatTable:
         try:
             with get_db_context(db) as db:
                 chat_item = db.get(Chat, id)
-                chat_item.chat = self._clean_null_bytes(chat)
+                chat = self._clean_null_bytes(chat)
                 chat_item.title = (
                     self._clean_null_bytes(chat["title"])
                     if "title" in chat
@@ -411,8 +615,23 @@ class ChatTable:
 
                 chat_item.updated_at = int(time.time())
 
+                if ENABLE_CHAT_MESSAGE_STORAGE:
+                    skeleton, messages = self._split_chat(chat)
+                    chat_item.chat = skeleton
+                    db.commit()
+
+                    if "history" in chat:
+                        self._save_chat_messages(id, chat_item.user_id, messages, db)
+                    self._index_chat(id, chat_item.user_id, chat_item.title, chat, db)
+
+                    return ChatModel.model_validate(chat_item).model_copy(
+                        update={"chat": chat}
+                    )
+
+                chat_item.chat = chat
                 db.commit()
                 db.refresh(chat_item)
+                self._index_chat(id, chat_item.user_id, chat_item.title, chat, db)
 
                 return ChatModel.model_validate(chat_item)
         except Exception:
@@ -462,26 +681,149 @@ class ChatTable:
 
         return chat.chat.get("history", {}).get("messages", {}) or {}
 
+    def get_message_list_by_chat_id(
+        self,
+        id: str,
+        message_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        user_id: Optional[str] = None,
+        db: Optional[Session] = None,
+    ) -> list[dict]:
+        """
+        Messages of the branch ending at message_id (the current message by
+        default), root first. With limit, only the last limit messages. With
+        user_id, nothing is returned unless the chat belongs to that user.
+
+        Only the branch is walked, and with ENABLE_CHAT_MESSAGE_STORAGE only
+        its messages are read from chat_message.
+        """
+        with get_db_context(db) as db:
+            chat_item = db.get(Chat, id)
+            if chat_item is None or (user_id and chat_item.user_id != user_id):
+                return []
+
+            history = (chat_item.chat or {}).get("history", {})
+            messages_map = history.get("messages", {})
+            path_ids = get_message_path_ids(
+                messages_map, message_id or history.get("currentId"), limit=limit
+            )
+
+            if not ENABLE_CHAT_MESSAGE_STORAGE:
+                return [messages_map[message_id] for message_id in path_ids]
+
+            # messages_map only holds the skeletons
+            messages = ChatMessages.get_message_dicts_by_ids(id, path_ids, db=db)
+            return [
+                {**messages_map[message_id], **messages.get(message_id, {})}
+                for message_id in path_ids
+            ]
+
     def get_message_by_id_and_message_id(
         self, id: str, message_id: str
     ) -> Optional[dict]:
+        if ENABLE_CHAT_MESSAGE_STORAGE:
+            with get_db_context() as db:
+                chat_item = db.get(Chat, id)
+                if chat_item is None:
+                    return None
+
+                return self._get_message(chat_item, message_id, db)
+
         chat = self.get_chat_by_id(id)
         if chat is None:
             return None
 
         return chat.chat.get("history", {}).get("messages", {}).get(message_id, {})
 
+    def _get_message(self, chat_item: Chat, message_id: str, db: Session) -> dict:
+        """Read one message without loading the rest of the chat's messages."""
+        message = (
+            (chat_item.chat or {})
+            .get("history", {})
+            .get("messages", {})
+            .get(message_id, {})
+        )
+        stored_message = ChatMessages.get_message_dict(chat_item.id, message_id, db=db)
+        return {**message, **stored_message} if stored_message else message
+
+    def _upsert_message(
+        self,
+        chat_item: Chat,
+        message_id: str,
+        message: dict,
+        db: Session,
+        set_current: bool = True,
+    ) -> dict:
+        """
+        Merge a partial message into its chat_message row and only rewrite the
+        chat skeleton when the history tree itself changed.
+        """
+        message = {**self._get_message(chat_item, message_id, db), **message}
+        ChatMessages.upsert_message(
+            message_id=message_id,
+            chat_id=chat_item.id,
+            user_id=chat_item.user_id,
+            data=message,
+            db=db,
+        )
+
+        history = (chat_item.chat or {}).get("history", {})
+        messages = history.get("messages", {})
+        skeleton = {
+            **self._get_message_skeleton(messages.get(message_id, {})),
+            **self._get_message_skeleton(message),
+        }
+
+        if messages.get(message_id) != skeleton or (
+            set_current and history.get("currentId") != message_id
+        ):
+            history = {**history, "messages": {**messages, message_id: skeleton}}
+            if set_current:
+                history["currentId"] = message_id
+            chat_item.chat = {**chat_item.chat, "history": history}
+
+        chat_item.updated_at = int(time.time())
+        db.commit()
+        return message
+
     def upsert_message_to_chat_by_id_and_message_id(
-        self, id: str, message_id: str, message: dict
+        self,
+        id: str,
+        message_id: str,
+        message: dict,
+        db: Optional[Session] = None,
     ) -> Optional[ChatModel]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
+        """
+        Merge a message into a chat's history and make it the current message.
 
+        With ENABLE_CHAT_MESSAGE_STORAGE the returned chat only holds the
+        history skeleton; use get_chat_by_id for the full chat.
+        """
         # Sanitize message content for null characters before upserting
         if isinstance(message.get("content"), str):
             message["content"] = sanitize_text_for_db(message["content"])
 
+        if ENABLE_CHAT_MESSAGE_STORAGE:
+            with get_db_context(db) as db:
+                chat_item = db.get(Chat, id)
+                if chat_item is None:
+                    return None
+
+                message = self._upsert_message(chat_item, message_id, message, db)
+                try:
+                    ChatSearches.index_message(
+                        id, chat_item.user_id, message_id, message, db=db
+                    )
+                except Exception as e:
+                    db.rollback()
+                    log.warning(f"Failed to update chat search index: {e}")
+                return ChatModel.model_validate(chat_item)
+
+        chat = self.get_chat_by_id(id, db=db)
+        if chat is None:
+            return None
+
+        user_id = chat.user_id
         chat = chat.chat
         history = chat.get("history", {})
 
@@ -502,17 +844,39 @@ class ChatTable:
             ChatMessages.upsert_message(
                 message_id=message_id,
                 chat_id=id,
-                user_id=self.get_chat_by_id(id).user_id,
+                user_id=user_id,
                 data=history["messages"][message_id],
             )
         except Exception as e:
             log.warning(f"Failed to write to chat_message table: {e}")
 
-        return self.update_chat_by_id(id, chat)
+        return self.update_chat_by_id(id, chat, db=db)
 
     def add_message_status_to_chat_by_id_and_message_id(
         self, id: str, message_id: str, status: dict
     ) -> Optional[ChatModel]:
+        if ENABLE_CHAT_MESSAGE_STORAGE:
+            with get_db_context() as db:
+                chat_item = db.get(Chat, id)
+                if chat_item is None:
+                    return None
+
+                message = self._get_message(chat_item, message_id, db)
+                if message:
+                    self._upsert_message(
+                        chat_item,
+                        message_id,
+                        {
+                            "statusHistory": [
+                                *message.get("statusHistory", []),
+                                status,
+                            ]
+                        },
+                        db,
+                        set_current=False,
+                    )
+                return ChatModel.model_validate(chat_item)
+
         chat = self.get_chat_by_id(id)
         if chat is None:
             return None
@@ -532,6 +896,25 @@ class ChatTable:
         self, id: str, message_id: str, files: list[dict]
     ) -> list[dict]:
         with get_db_context() as db:
+            if ENABLE_CHAT_MESSAGE_STORAGE:
+                chat_item = db.get(Chat, id)
+                if chat_item is None:
+                    return None
+
+                message = self._get_message(chat_item, message_id, db)
+                if not message:
+                    return []
+
+                message_files = message.get("files", []) + files
+                self._upsert_message(
+                    chat_item,
+                    message_id,
+                    {"files": message_files},
+                    db,
+                    set_current=False,
+                )
+                return message_files
+
             chat = self.get_chat_by_id(id, db=db)
             if chat is None:
                 return None
@@ -568,7 +951,7 @@ class ChatTable:
                     "id": str(uuid.uuid4()),
                     "user_id": f"shared-{chat_id}",
                     "title": chat.title,
-                    "chat": chat.chat,
+                    "chat": self._to_chat_model(chat, db).chat,
                     "meta": chat.meta,
                     "pinned": chat.pinned,
                     "folder_id": chat.folder_id,
@@ -604,7 +987,7 @@ class ChatTable:
                     return self.insert_shared_chat_by_chat_id(chat_id, db=db)
 
                 shared_chat.title = chat.title
-                shared_chat.chat = chat.chat
+                shared_chat.chat = self._to_chat_model(chat, db).chat
                 shared_chat.meta = chat.meta
                 shared_chat.pinned = chat.pinned
                 shared_chat.folder_id = chat.folder_id
@@ -655,7 +1038,7 @@ class ChatTable:
                 chat.share_id = share_id
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(chat, db)
         except Exception:
             return None
 
@@ -669,7 +1052,7 @@ class ChatTable:
                 chat.updated_at = int(time.time())
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(chat, db)
         except Exception:
             return None
 
@@ -684,7 +1067,7 @@ class ChatTable:
                 chat.updated_at = int(time.time())
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(chat, db)
         except Exception:
             return None
 
@@ -706,7 +1089,7 @@ class ChatTable:
         skip: int = 0,
         limit: int = 50,
         db: Optional[Session] = None,
-    ) -> list[ChatModel]:
+    ) -> list[ChatTitleIdResponse]:
 
         with get_db_context(db) as db:
             query = db.query(Chat).filter_by(user_id=user_id, archived=True)
@@ -737,8 +1120,11 @@ class ChatTable:
             if limit:
                 query = query.limit(limit)
 
-            all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_title_id_responses(
+                query.with_entities(
+                    Chat.id, Chat.title, Chat.updated_at, Chat.created_at
+                )
+            )
 
     def get_shared_chat_list_by_user_id(
         self,
@@ -747,7 +1133,7 @@ class ChatTable:
         skip: int = 0,
         limit: int = 50,
         db: Optional[Session] = None,
-    ) -> list[ChatModel]:
+    ) -> list[SharedChatResponse]:
 
         with get_db_context(db) as db:
             query = (
@@ -782,8 +1168,19 @@ class ChatTable:
             if limit:
                 query = query.limit(limit)
 
-            all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            rows = query.with_entities(
+                Chat.id, Chat.title, Chat.share_id, Chat.updated_at, Chat.created_at
+            )
+            return [
+                SharedChatResponse.model_construct(
+                    id=row.id,
+                    title=row.title,
+                    share_id=row.share_id,
+                    updated_at=row.updated_at,
+                    created_at=row.created_at,
+                )
+                for row in rows
+            ]
 
     def get_chat_list_by_user_id(
         self,
@@ -793,7 +1190,7 @@ class ChatTable:
         skip: int = 0,
         limit: int = 50,
         db: Optional[Session] = None,
-    ) -> list[ChatModel]:
+    ) -> list[ChatTitleIdResponse]:
         with get_db_context(db) as db:
             query = db.query(Chat).filter_by(user_id=user_id)
             if not include_archived:
@@ -815,15 +1212,18 @@ class ChatTable:
                     else:
                         raise ValueError("Invalid direction for ordering")
             else:
-                query = query.order_by(Chat.updated_at.desc())
+                query = self._order_chat_list(query)
 
             if skip:
                 query = query.offset(skip)
             if limit:
                 query = query.limit(limit)
 
-            all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_title_id_responses(
+                query.with_entities(
+                    Chat.id, Chat.title, Chat.updated_at, Chat.created_at
+                )
+            )
 
     def get_chat_title_id_list_by_user_id(
         self,
@@ -833,8 +1233,13 @@ class ChatTable:
         include_pinned: bool = False,
         skip: Optional[int] = None,
         limit: Optional[int] = None,
+        cursor: Optional[tuple[int, str]] = None,
         db: Optional[Session] = None,
     ) -> list[ChatTitleIdResponse]:
+        """
+        Ids and titles of a user's chats, newest first. Pages are selected with
+        cursor (see _order_chat_list) or with skip.
+        """
         with get_db_context(db) as db:
             query = db.query(Chat).filter_by(user_id=user_id)
 
@@ -847,7 +1252,7 @@ class ChatTable:
             if not include_archived:
                 query = query.filter_by(archived=False)
 
-            query = query.order_by(Chat.updated_at.desc()).with_entities(
+            query = self._order_chat_list(query, cursor).with_entities(
                 Chat.id, Chat.title, Chat.updated_at, Chat.created_at
             )
 
@@ -856,20 +1261,7 @@ class ChatTable:
             if limit:
                 query = query.limit(limit)
 
-            all_chats = query.all()
-
-            # result has to be destructured from sqlalchemy `row` and mapped to a dict since the `ChatModel`is not the returned dataclass.
-            return [
-                ChatTitleIdResponse.model_validate(
-                    {
-                        "id": chat[0],
-                        "title": chat[1],
-                        "updated_at": chat[2],
-                        "created_at": chat[3],
-                    }
-                )
-                for chat in all_chats
-            ]
+            return self._to_title_id_responses(query)
 
     def get_chat_list_by_chat_ids(
         self,
@@ -886,7 +1278,7 @@ class ChatTable:
                 .order_by(Chat.updated_at.desc())
                 .all()
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(all_chats, db)
 
     def get_chat_by_id(
         self, id: str, db: Optional[Session] = None
@@ -901,7 +1293,7 @@ class ChatTable:
                     db.commit()
                     db.refresh(chat_item)
 
-                return ChatModel.model_validate(chat_item)
+                return self._to_chat_model(chat_item, db)
         except Exception:
             return None
 
@@ -927,7 +1319,7 @@ class ChatTable:
         try:
             with get_db_context(db) as db:
                 chat = db.query(Chat).filter_by(id=id, user_id=user_id).first()
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(chat, db)
         except Exception:
             return None
 
@@ -940,7 +1332,7 @@ class ChatTable:
                 # .limit(limit).offset(skip)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(all_chats, db)
 
     def get_chats_by_user_id(
         self,
@@ -983,21 +1375,23 @@ class ChatTable:
 
             return ChatListResponse(
                 **{
-                    "items": [ChatModel.model_validate(chat) for chat in all_chats],
+                    "items": self._to_chat_models(all_chats, db),
                     "total": total,
                 }
             )
 
     def get_pinned_chats_by_user_id(
         self, user_id: str, db: Optional[Session] = None
-    ) -> list[ChatModel]:
+    ) -> list[ChatTitleIdResponse]:
         with get_db_context(db) as db:
-            all_chats = (
-                db.query(Chat)
-                .filter_by(user_id=user_id, pinned=True, archived=False)
-                .order_by(Chat.updated_at.desc())
+            query = self._order_chat_list(
+                db.query(Chat).filter_by(user_id=user_id, pinned=True, archived=False)
+            )
+            return self._to_title_id_responses(
+                query.with_entities(
+                    Chat.id, Chat.title, Chat.updated_at, Chat.created_at
+                )
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
 
     def get_archived_chats_by_user_id(
         self, user_id: str, db: Optional[Session] = None
@@ -1008,26 +1402,22 @@ class ChatTable:
                 .filter_by(user_id=user_id, archived=True)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(all_chats, db)
 
-    def get_chats_by_user_id_and_search_text(
-        self,
-        user_id: str,
-        search_text: str,
-        include_archived: bool = False,
-        skip: int = 0,
-        limit: int = 60,
-        db: Optional[Session] = None,
-    ) -> list[ChatModel]:
+    def _get_search_query(
+        self, db: Session, user_id: str, search_text: str, include_archived: bool
+    ):
         """
-        Filters chats based on a search query using Python, allowing pagination using skip and limit.
+        Query of a user's chats matching search_text, through the chat_search
+        index, most relevant first.
         """
         search_text = sanitize_text_for_db(search_text).lower().strip()
 
         if not search_text:
-            return self.get_chat_list_by_user_id(
-                user_id, include_archived, filter={}, skip=skip, limit=limit, db=db
-            )
+            query = db.query(Chat).filter_by(user_id=user_id)
+            if not include_archived:
+                query = query.filter_by(archived=False)
+            return self._order_chat_list(query)
 
         search_text_words = search_text.split(" ")
 
@@ -1081,133 +1471,126 @@ class ChatTable:
 
         search_text = " ".join(search_text_words)
 
-        with get_db_context(db) as db:
-            query = db.query(Chat).filter(Chat.user_id == user_id)
+        query = db.query(Chat).filter(Chat.user_id == user_id)
 
-            if is_archived is not None:
-                query = query.filter(Chat.archived == is_archived)
-            elif not include_archived:
-                query = query.filter(Chat.archived == False)
+        if is_archived is not None:
+            query = query.filter(Chat.archived == is_archived)
+        elif not include_archived:
+            query = query.filter(Chat.archived == False)
 
-            if is_pinned is not None:
-                query = query.filter(Chat.pinned == is_pinned)
+        if is_pinned is not None:
+            query = query.filter(Chat.pinned == is_pinned)
 
-            if is_shared is not None:
-                if is_shared:
-                    query = query.filter(Chat.share_id.isnot(None))
-                else:
-                    query = query.filter(Chat.share_id.is_(None))
+        if is_shared is not None:
+            if is_shared:
+                query = query.filter(Chat.share_id.isnot(None))
+            else:
+                query = query.filter(Chat.share_id.is_(None))
 
-            if folder_ids:
-                query = query.filter(Chat.folder_id.in_(folder_ids))
+        if folder_ids:
+            query = query.filter(Chat.folder_id.in_(folder_ids))
 
+        if search_text:
+            # Title and message text are matched through the chat_search index
+            matches, rank_order = ChatSearches.get_matches(user_id, search_text, db)
+            query = query.join(matches, matches.c.chat_id == Chat.id).order_by(
+                rank_order, Chat.updated_at.desc()
+            )
+        else:
             query = query.order_by(Chat.updated_at.desc())
 
-            # Check if the database dialect is either 'sqlite' or 'postgresql'
-            dialect_name = db.bind.dialect.name
-            if dialect_name == "sqlite":
-                # SQLite case: using JSON1 extension for JSON searching
-                sqlite_content_sql = (
-                    "EXISTS ("
-                    "    SELECT 1 "
-                    "    FROM json_each(Chat.chat, '$.messages') AS message "
-                    "    WHERE LOWER(message.value->>'content') LIKE '%' || :content_key || '%'"
-                    ")"
-                )
-                sqlite_content_clause = text(sqlite_content_sql)
-                query = query.filter(
-                    or_(
-                        Chat.title.ilike(bindparam("title_key")), sqlite_content_clause
-                    ).params(title_key=f"%{search_text}%", content_key=search_text)
-                )
-
-                # Check if there are any tags to filter, it should have all the tags
-                if "none" in tag_ids:
-                    query = query.filter(text("""
-                            NOT EXISTS (
-                                SELECT 1
-                                FROM json_each(Chat.meta, '$.tags') AS tag
-                            )
-                            """))
-                elif tag_ids:
-                    query = query.filter(
-                        and_(
-                            *[
-                                text(f"""
-                                    EXISTS (
-                                        SELECT 1
-                                        FROM json_each(Chat.meta, '$.tags') AS tag
-                                        WHERE tag.value = :tag_id_{tag_idx}
-                                    )
-                                    """).params(**{f"tag_id_{tag_idx}": tag_id})
-                                for tag_idx, tag_id in enumerate(tag_ids)
-                            ]
+        # Check if the database dialect is either 'sqlite' or 'postgresql'
+        dialect_name = db.bind.dialect.name
+        if dialect_name == "sqlite":
+            # Check if there are any tags to filter, it should have all the tags
+            if "none" in tag_ids:
+                query = query.filter(text("""
+                        NOT EXISTS (
+                            SELECT 1
+                            FROM json_each(Chat.meta, '$.tags') AS tag
                         )
+                        """))
+            elif tag_ids:
+                query = query.filter(
+                    and_(
+                        *[
+                            text(f"""
+                                EXISTS (
+                                    SELECT 1
+                                    FROM json_each(Chat.meta, '$.tags') AS tag
+                                    WHERE tag.value = :tag_id_{tag_idx}
+                                )
+                                """).params(**{f"tag_id_{tag_idx}": tag_id})
+                            for tag_idx, tag_id in enumerate(tag_ids)
+                        ]
                     )
-
-            elif dialect_name == "postgresql":
-                # PostgreSQL doesn't allow null bytes in text. We filter those out by checking
-                # the JSON representation for \u0000 before attempting text extraction
-
-                # Safety filter: JSON field must not contain \u0000
-                query = query.filter(text("Chat.chat::text NOT LIKE '%\\\\u0000%'"))
-
-                # Safety filter: title must not contain actual null bytes
-                query = query.filter(text("Chat.title::text NOT LIKE '%\\x00%'"))
-
-                postgres_content_sql = """
-                EXISTS (
-                    SELECT 1
-                    FROM json_array_elements(Chat.chat->'messages') AS message
-                    WHERE json_typeof(message->'content') = 'string'
-                    AND LOWER(message->>'content') LIKE '%' || :content_key || '%'
                 )
-                """
 
-                postgres_content_clause = text(postgres_content_sql)
-
-                query = query.filter(
-                    or_(
-                        Chat.title.ilike(bindparam("title_key")),
-                        postgres_content_clause,
-                    )
-                ).params(title_key=f"%{search_text}%", content_key=search_text.lower())
-
-                # Check if there are any tags to filter, it should have all the tags
-                if "none" in tag_ids:
-                    query = query.filter(text("""
-                            NOT EXISTS (
-                                SELECT 1
-                                FROM json_array_elements_text(Chat.meta->'tags') AS tag
-                            )
-                            """))
-                elif tag_ids:
-                    query = query.filter(
-                        and_(
-                            *[
-                                text(f"""
-                                    EXISTS (
-                                        SELECT 1
-                                        FROM json_array_elements_text(Chat.meta->'tags') AS tag
-                                        WHERE tag = :tag_id_{tag_idx}
-                                    )
-                                    """).params(**{f"tag_id_{tag_idx}": tag_id})
-                                for tag_idx, tag_id in enumerate(tag_ids)
-                            ]
+        elif dialect_name == "postgresql":
+            # Check if there are any tags to filter, it should have all the tags
+            if "none" in tag_ids:
+                query = query.filter(text("""
+                        NOT EXISTS (
+                            SELECT 1
+                            FROM json_array_elements_text(Chat.meta->'tags') AS tag
                         )
+                        """))
+            elif tag_ids:
+                query = query.filter(
+                    and_(
+                        *[
+                            text(f"""
+                                EXISTS (
+                                    SELECT 1
+                                    FROM json_array_elements_text(Chat.meta->'tags') AS tag
+                                    WHERE tag = :tag_id_{tag_idx}
+                                )
+                                """).params(**{f"tag_id_{tag_idx}": tag_id})
+                            for tag_idx, tag_id in enumerate(tag_ids)
+                        ]
                     )
-            else:
-                raise NotImplementedError(
-                    f"Unsupported dialect: {db.bind.dialect.name}"
                 )
+        else:
+            raise NotImplementedError(f"Unsupported dialect: {db.bind.dialect.name}")
 
-            # Perform pagination at the SQL level
-            all_chats = query.offset(skip).limit(limit).all()
+        return query
 
-            log.info(f"The number of chats: {len(all_chats)}")
+    def get_chats_by_user_id_and_search_text(
+        self,
+        user_id: str,
+        search_text: str,
+        include_archived: bool = False,
+        skip: int = 0,
+        limit: int = 60,
+        db: Optional[Session] = None,
+    ) -> list[ChatModel]:
+        """
+        Search a user's chats through the chat_search index, most relevant
+        first, allowing pagination using skip and limit.
+        """
+        with get_db_context(db) as db:
+            query = self._get_search_query(db, user_id, search_text, include_archived)
+            return self._to_chat_models(query.offset(skip).limit(limit).all(), db)
 
-            # Validate and return chats
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+    def get_chat_title_id_list_by_user_id_and_search_text(
+        self,
+        user_id: str,
+        search_text: str,
+        include_archived: bool = False,
+        skip: int = 0,
+        limit: int = 60,
+        db: Optional[Session] = None,
+    ) -> list[ChatTitleIdResponse]:
+        """Like get_chats_by_user_id_and_search_text, without loading the chats."""
+        with get_db_context(db) as db:
+            query = self._get_search_query(db, user_id, search_text, include_archived)
+            return self._to_title_id_responses(
+                query.with_entities(
+                    Chat.id, Chat.title, Chat.updated_at, Chat.created_at
+                )
+                .offset(skip)
+                .limit(limit)
+            )
 
     def get_chats_by_folder_id_and_user_id(
         self,
@@ -1215,22 +1598,26 @@ class ChatTable:
         user_id: str,
         skip: int = 0,
         limit: int = 60,
+        cursor: Optional[tuple[int, str]] = None,
         db: Optional[Session] = None,
-    ) -> list[ChatModel]:
+    ) -> list[ChatTitleIdResponse]:
         with get_db_context(db) as db:
             query = db.query(Chat).filter_by(folder_id=folder_id, user_id=user_id)
             query = query.filter(or_(Chat.pinned == False, Chat.pinned == None))
             query = query.filter_by(archived=False)
 
-            query = query.order_by(Chat.updated_at.desc())
+            query = self._order_chat_list(query, cursor)
 
             if skip:
                 query = query.offset(skip)
             if limit:
                 query = query.limit(limit)
 
-            all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_title_id_responses(
+                query.with_entities(
+                    Chat.id, Chat.title, Chat.updated_at, Chat.created_at
+                )
+            )
 
     def get_chats_by_folder_ids_and_user_id(
         self, folder_ids: list[str], user_id: str, db: Optional[Session] = None
@@ -1245,7 +1632,7 @@ class ChatTable:
             query = query.order_by(Chat.updated_at.desc())
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(all_chats, db)
 
     def update_chat_folder_id_by_id_and_user_id(
         self, id: str, user_id: str, folder_id: str, db: Optional[Session] = None
@@ -1258,7 +1645,7 @@ class ChatTable:
                 chat.pinned = False
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(chat, db)
         except Exception:
             return None
 
@@ -1277,7 +1664,7 @@ class ChatTable:
         skip: int = 0,
         limit: int = 50,
         db: Optional[Session] = None,
-    ) -> list[ChatModel]:
+    ) -> list[ChatTitleIdResponse]:
         with get_db_context(db) as db:
             query = db.query(Chat).filter_by(user_id=user_id)
             tag_id = tag_name.replace(" ", "_").lower()
@@ -1302,9 +1689,11 @@ class ChatTable:
                     f"Unsupported dialect: {db.bind.dialect.name}"
                 )
 
-            all_chats = query.all()
-            log.debug(f"all_chats: {all_chats}")
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_title_id_responses(
+                query.with_entities(
+                    Chat.id, Chat.title, Chat.updated_at, Chat.created_at
+                )
+            )
 
     def add_chat_tag_by_id_and_user_id_and_tag_name(
         self, id: str, user_id: str, tag_name: str, db: Optional[Session] = None
@@ -1325,7 +1714,7 @@ class ChatTable:
 
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._to_chat_model(chat, db)
         except Exception:
             return None
 
@@ -1417,7 +1806,8 @@ class ChatTable:
     def delete_chat_by_id(self, id: str, db: Optional[Session] = None) -> bool:
         try:
             with get_db_context(db) as db:
-                db.query(ChatMessage).filter_by(chat_id=id).delete()
+                ChatMessages._delete_messages(db, ChatMessage.chat_id == id)
+                db.query(ChatSearch).filter_by(chat_id=id).delete()
                 db.query(Chat).filter_by(id=id).delete()
                 db.commit()
 
@@ -1430,7 +1820,8 @@ class ChatTable:
     ) -> bool:
         try:
             with get_db_context(db) as db:
-                db.query(ChatMessage).filter_by(chat_id=id).delete()
+                ChatMessages._delete_messages(db, ChatMessage.chat_id == id)
+                db.query(ChatSearch).filter_by(chat_id=id, user_id=user_id).delete()
                 db.query(Chat).filter_by(id=id, user_id=user_id).delete()
                 db.commit()
 
@@ -1448,9 +1839,10 @@ class ChatTable:
                 chat_id_subquery = (
                     db.query(Chat.id).filter_by(user_id=user_id).subquery()
                 )
-                db.query(ChatMessage).filter(
-                    ChatMessage.chat_id.in_(chat_id_subquery)
-                ).delete(synchronize_session=False)
+                ChatMessages._delete_messages(
+                    db, ChatMessage.chat_id.in_(chat_id_subquery)
+                )
+                db.query(ChatSearch).filter_by(user_id=user_id).delete()
                 db.query(Chat).filter_by(user_id=user_id).delete()
                 db.commit()
 
@@ -1468,8 +1860,11 @@ class ChatTable:
                     .filter_by(user_id=user_id, folder_id=folder_id)
                     .subquery()
                 )
-                db.query(ChatMessage).filter(
-                    ChatMessage.chat_id.in_(chat_id_subquery)
+                ChatMessages._delete_messages(
+                    db, ChatMessage.chat_id.in_(chat_id_subquery)
+                )
+                db.query(ChatSearch).filter(
+                    ChatSearch.chat_id.in_(chat_id_subquery)
                 ).delete(synchronize_session=False)
                 db.query(Chat).filter_by(user_id=user_id, folder_id=folder_id).delete()
                 db.commit()
@@ -1615,7 +2010,8 @@ class ChatTable:
                 .all()
             )
 
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._to_chat_models(all_chats, db)
 
 
 Chats = ChatTable()
+AsyncChats = AsyncTable(Chats)
@@ -5,10 +5,17 @@ from typing import Optional
 
 from sqlalchemy.orm import Session
 from open_webui.internal.db import Base, JSONField, get_db, get_db_context
+from open_webui.models.leaderboard import (
+    Leaderboard,
+    LeaderboardMatches,
+    get_feedback_matches,
+    get_feedback_tags,
+    update_ratings,
+)
 from open_webui.models.users import User
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, Text, JSON, Boolean
+from sqlalchemy import BigInteger, Column, Text, JSON, Boolean, func, tuple_
 
 log = logging.getLogger(__name__)
 
@@ -139,6 +146,18 @@ class ModelHistoryResponse(BaseModel):
 
 
 class FeedbackTable:
+    _leaderboard_matches: Optional[tuple[tuple, LeaderboardMatches]] = None
+
+    def _update_leaderboard(
+        self, old_data: Optional[dict], new_data: Optional[dict], db: Session
+    ):
+        try:
+            with db.begin_nested():
+                Leaderboard.apply_feedback(old_data, new_data, db)
+        except Exception as e:
+            log.warning(f"Leaderboard update failed, recomputing it: {e}")
+            Leaderboard.mark_stale(db)
+
     def insert_new_feedback(
         self, user_id: str, form_data: FeedbackForm, db: Optional[Session] = None
     ) -> Optional[FeedbackModel]:
@@ -157,6 +176,7 @@ class FeedbackTable:
             try:
                 result = Feedback(**feedback.model_dump())
                 db.add(result)
+                self._update_leaderboard(None, result.data, db)
                 db.commit()
                 db.refresh(result)
                 if result:
@@ -316,6 +336,101 @@ class FeedbackTable:
                 for row in db.query(Feedback.id, Feedback.data).all()
             ]
 
+    def get_leaderboard_matches(
+        self, db: Optional[Session] = None
+    ) -> LeaderboardMatches:
+        """
+        All leaderboard comparisons in feedback order, cached until feedback is
+        added, edited or deleted.
+        """
+        with get_db_context(db) as db:
+            key = tuple(
+                db.query(func.count(Feedback.id), func.max(Feedback.updated_at)).one()
+            )
+            if self._leaderboard_matches and self._leaderboard_matches[0] == key:
+                return self._leaderboard_matches[1]
+
+            matches = LeaderboardMatches.from_feedback_data(
+                [
+                    data
+                    for (data,) in db.query(Feedback.data).order_by(
+                        Feedback.created_at, Feedback.id
+                    )
+                ]
+            )
+            FeedbackTable._leaderboard_matches = (key, matches)
+            return matches
+
+    def recompute_leaderboard(
+        self, interval: int, db: Optional[Session] = None
+    ) -> bool:
+        """
+        Rebuild the leaderboard ratings by replaying all feedback, if the
+        recompute is due and no other worker claimed it. Returns whether it ran.
+
+        The feedback is replayed without holding any lock, as of a
+        (created_at, id) watermark. The ratings are then locked only to apply
+        the feedback added past the watermark and replace them.
+        """
+        stats = {}
+        tags = {}
+
+        def apply(data: Optional[dict]):
+            update_ratings(stats, get_feedback_matches(data))
+
+            model_id, feedback_tags = get_feedback_tags(data)
+            if model_id:
+                model_tags = tags.setdefault(model_id, {})
+                for tag in feedback_tags:
+                    model_tags[tag] = model_tags.get(tag, 0) + 1
+
+        with get_db_context(db) as db:
+            if not Leaderboard.claim_recompute(interval, db):
+                db.rollback()
+                return False
+            db.commit()
+
+            started_at = int(time.time())
+            rows = (
+                db.query(Feedback.created_at, Feedback.id, Feedback.data)
+                .order_by(Feedback.created_at, Feedback.id)
+                .all()
+            )
+            # End the read transaction before the replay
+            db.commit()
+
+            for _, _, data in rows:
+                apply(data)
+
+            Leaderboard.lock_ratings(db)
+
+            new_rows = db.query(Feedback.id, Feedback.data).order_by(
+                Feedback.created_at, Feedback.id
+            )
+            if rows:
+                watermark = tuple_(Feedback.created_at, Feedback.id) > tuple_(
+                    rows[-1].created_at, rows[-1].id
+                )
+                new_rows = new_rows.filter(watermark)
+            new_ids = []
+            for id, data in new_rows:
+                apply(data)
+                new_ids.append(id)
+
+            # Feedback written behind the watermark (an older created_at) or
+            # edited during the replay is missing from it: run again next time
+            count = db.query(func.count(Feedback.id)).scalar()
+            edited = (
+                db.query(Feedback.id)
+                .filter(Feedback.updated_at >= started_at, Feedback.id.notin_(new_ids))
+                .first()
+            )
+            if count != len(rows) + len(new_ids) or edited:
+                Leaderboard.mark_stale(db)
+
+            Leaderboard.replace_all(stats, tags, db=db)
+            return True
+
     def get_model_evaluation_history(
         self, model_id: str, days: int = 30, db: Optional[Session] = None
     ) -> list[ModelHistoryEntry]:
@@ -418,7 +533,9 @@ class FeedbackTable:
                 return None
 
             if form_data.data:
-                feedback.data = form_data.data.model_dump()
+                data = form_data.data.model_dump()
+                self._update_leaderboard(feedback.data, data, db)
+                feedback.data = data
             if form_data.meta:
                 feedback.meta = form_data.meta
             if form_data.snapshot:
@@ -442,7 +559,9 @@ class FeedbackTable:
                 return None
 
             if form_data.data:
-                feedback.data = form_data.data.model_dump()
+                data = form_data.data.model_dump()
+                self._update_leaderboard(feedback.data, data, db)
+                feedback.data = data
             if form_data.meta:
                 feedback.meta = form_data.meta
             if form_data.snapshot:
@@ -459,6 +578,7 @@ class FeedbackTable:
             if not feedback:
                 return False
             db.delete(feedback)
+            Leaderboard.mark_stale(db)
             db.commit()
             return True
 
@@ -470,6 +590,7 @@ class FeedbackTable:
             if not feedback:
                 return False
             db.delete(feedback)
+            Leaderboard.mark_stale(db)
             db.commit()
             return True
 
@@ -478,6 +599,8 @@ class FeedbackTable:
     ) -> bool:
         with get_db_context(db) as db:
             result = db.query(Feedback).filter_by(user_id=user_id).delete()
+            if result:
+                Leaderboard.mark_stale(db)
             db.commit()
             return result > 0
 
@@ -485,6 +608,7 @@ class FeedbackTable:
         with get_db_context(db) as db:
             result = db.query(Feedback).delete()
             db.commit()
+            Leaderboard.delete_all_ratings(db=db)
             return result > 0
 
 
@@ -7,6 +7,8 @@ from open_webui.internal.db import Base, JSONField, get_db, get_db_context
 from pydantic import BaseModel, ConfigDict, model_validator
 from sqlalchemy import BigInteger, Column, String, Text, JSON
 
+from open_webui.models.ingestion_jobs import IngestionJobs
+
 log = logging.getLogger(__name__)
 
 ####################
@@ -380,6 +382,7 @@ class FilesTable:
             try:
                 db.query(File).filter_by(id=id).delete()
                 db.commit()
+                IngestionJobs.delete_jobs_by_file_id(id, db=db)
 
                 return True
             except Exception:
@@ -390,6 +393,7 @@ class FilesTable:
             try:
                 db.query(File).delete()
                 db.commit()
+                IngestionJobs.delete_all_jobs(db=db)
 
                 return True
             except Exception:
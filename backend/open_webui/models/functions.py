@@ -5,6 +5,7 @@ from typing import Optional
 from sqlalchemy.orm import Session
 from open_webui.internal.db import Base, JSONField, get_db, get_db_context
 from open_webui.models.users import Users, UserModel
+from open_webui.utils.plugin_cache import PLUGIN_VERSIONS
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Boolean, Column, String, Text, Index
 
@@ -126,6 +127,7 @@ class FunctionsTable:
                 db.add(result)
                 db.commit()
                 db.refresh(result)
+                PLUGIN_VERSIONS.bump(f"function:{result.id}")
                 if result:
                     return FunctionModel.model_validate(result)
                 else:
@@ -176,6 +178,7 @@ class FunctionsTable:
                         db.delete(func)
 
                 db.commit()
+                PLUGIN_VERSIONS.bump("functions")
 
                 return [
                     FunctionModel.model_validate(func)
@@ -317,6 +320,7 @@ class FunctionsTable:
                 function.valves = valves
                 function.updated_at = int(time.time())
                 db.commit()
+                PLUGIN_VERSIONS.bump(f"function:{id}")
                 db.refresh(function)
                 return FunctionModel.model_validate(function)
             except Exception:
@@ -337,6 +341,7 @@ class FunctionsTable:
 
                     function.updated_at = int(time.time())
                     db.commit()
+                    PLUGIN_VERSIONS.bump(f"function:{id}")
                     db.refresh(function)
                     return FunctionModel.model_validate(function)
                 else:
@@ -349,7 +354,12 @@ class FunctionsTable:
         self, id: str, user_id: str, db: Optional[Session] = None
     ) -> Optional[dict]:
         try:
-            user = Users.get_user_by_id(user_id, db=db)
+            # Read on every filter and tool call, so prefer the cached user
+            user = (
+                Users.get_cached_user_by_id(user_id)
+                if db is None
+                else Users.get_user_by_id(user_id, db=db)
+            )
             user_settings = user.settings.model_dump() if user.settings else {}
 
             # Check if user has "functions" and "valves" settings
@@ -400,6 +410,7 @@ class FunctionsTable:
                     }
                 )
                 db.commit()
+                PLUGIN_VERSIONS.bump(f"function:{id}")
                 function = db.get(Function, id)
                 return FunctionModel.model_validate(function) if function else None
             except Exception:
@@ -415,6 +426,7 @@ class FunctionsTable:
                     }
                 )
                 db.commit()
+                PLUGIN_VERSIONS.bump("functions")
                 return True
             except Exception:
                 return None
@@ -424,6 +436,7 @@ class FunctionsTable:
             try:
                 db.query(Function).filter_by(id=id).delete()
                 db.commit()
+                PLUGIN_VERSIONS.bump(f"function:{id}")
 
                 return True
             except Exception:
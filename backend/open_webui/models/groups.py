@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 from open_webui.internal.db import Base, JSONField, get_db, get_db_context
 
 from open_webui.models.files import FileMetadataResponse
+from open_webui.utils.access_cache import ACCESS_CACHE
 
 
 from pydantic import BaseModel, ConfigDict
@@ -284,6 +285,23 @@ class GroupTable:
                 .all()
             ]
 
+    def get_group_ids_by_member_id(
+        self, user_id: str, db: Optional[Session] = None
+    ) -> set[str]:
+        """Ids of the groups a user belongs to, cached until memberships change."""
+
+        def load():
+            with get_db_context(db) as session:
+                return frozenset(
+                    row[0]
+                    for row in session.query(Group.id)
+                    .join(GroupMember, GroupMember.group_id == Group.id)
+                    .filter(GroupMember.user_id == user_id)
+                    .all()
+                )
+
+        return set(ACCESS_CACHE.get_or_load(("groups", user_id), ("groups",), load))
+
     def get_groups_by_member_ids(
         self, user_ids: list[str], db: Optional[Session] = None
     ) -> dict[str, list[GroupModel]]:
@@ -369,6 +387,7 @@ class GroupTable:
 
             db.add_all(new_members)
             db.commit()
+            ACCESS_CACHE.bump("groups")
 
     def get_group_member_count_by_id(
         self, id: str, db: Optional[Session] = None
@@ -421,6 +440,7 @@ class GroupTable:
             with get_db_context(db) as db:
                 db.query(Group).filter_by(id=id).delete()
                 db.commit()
+                ACCESS_CACHE.bump("groups")
                 return True
         except Exception:
             return False
@@ -430,6 +450,7 @@ class GroupTable:
             try:
                 db.query(Group).delete()
                 db.commit()
+                ACCESS_CACHE.bump("groups")
 
                 return True
             except Exception:
@@ -459,6 +480,7 @@ class GroupTable:
                     )
 
                 db.commit()
+                ACCESS_CACHE.bump("groups")
                 return True
 
             except Exception:
@@ -552,6 +574,8 @@ class GroupTable:
                     )
 
                 db.commit()
+                if groups_to_add or groups_to_remove:
+                    ACCESS_CACHE.bump("groups")
                 return True
 
             except Exception as e:
@@ -592,6 +616,7 @@ class GroupTable:
 
                 group.updated_at = now
                 db.commit()
+                ACCESS_CACHE.bump("groups")
                 db.refresh(group)
 
                 return GroupModel.model_validate(group)
@@ -624,6 +649,7 @@ class GroupTable:
                 group.updated_at = int(time.time())
 
                 db.commit()
+                ACCESS_CACHE.bump("groups")
                 db.refresh(group)
                 return GroupModel.model_validate(group)
 
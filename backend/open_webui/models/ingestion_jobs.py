@@ -0,0 +1,283 @@
+import logging
+import time
+import uuid
+from typing import Optional
+
+from sqlalchemy.orm import Session
+from open_webui.internal.db import Base, get_db_context
+
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import BigInteger, Column, Index, JSON, Text, func
+
+log = logging.getLogger(__name__)
+
+
+# File ingestion queue
+#
+# Uploads processed in the background are queued here by the web workers and
+# run by the ingestion workers (open_webui/ingestion.py). A worker claims the
+# pending job with the highest priority, holds it for a lease it renews while
+# processing, and deletes it once done. Failed jobs are retried after a delay
+# until they run out of attempts, then deleted (the error is kept in the file
+# data); jobs whose lease expired (the worker died) are put back in the queue.
+
+# Uploads someone is waiting on (chats, channels, notes) run before the
+# files added to knowledge bases
+PRIORITY_INTERACTIVE = 10
+PRIORITY_BULK = 0
+
+
+####################
+# IngestionJob DB Schema
+####################
+
+
+class IngestionJob(Base):
+    __tablename__ = "ingestion_job"
+
+    id = Column(Text, primary_key=True)
+    file_id = Column(Text, nullable=False)
+    user_id = Column(Text, nullable=False)
+    data = Column(JSON, nullable=True)  # content_type, file_path and metadata
+
+    priority = Column(BigInteger, nullable=False)
+    status = Column(Text, nullable=False)  # "pending" or "running"
+    attempts = Column(BigInteger, nullable=False)
+    error = Column(Text, nullable=True)
+
+    worker_id = Column(Text, nullable=True)
+    available_at = Column(BigInteger, nullable=False)
+    lease_until = Column(BigInteger, nullable=True)
+
+    created_at = Column(BigInteger, nullable=False)
+    updated_at = Column(BigInteger, nullable=False)
+
+    __table_args__ = (
+        Index("ingestion_job_status_priority_idx", "status", "priority", "created_at"),
+        Index("ingestion_job_file_id_idx", "file_id"),
+    )
+
+
+class IngestionJobModel(BaseModel):
+    id: str
+    file_id: str
+    user_id: str
+    data: Optional[dict] = None
+
+    priority: int
+    status: str
+    attempts: int
+    error: Optional[str] = None
+
+    worker_id: Optional[str] = None
+    available_at: int
+    lease_until: Optional[int] = None
+
+    created_at: int
+    updated_at: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+####################
+# Table
+####################
+
+
+class IngestionJobsTable:
+    def insert_new_job(
+        self,
+        file_id: str,
+        user_id: str,
+        data: Optional[dict] = None,
+        priority: int = PRIORITY_BULK,
+        db: Optional[Session] = None,
+    ) -> IngestionJobModel:
+        now = int(time.time())
+        with get_db_context(db) as db:
+            job = IngestionJob(
+                id=str(uuid.uuid4()),
+                file_id=file_id,
+                user_id=user_id,
+                data=data,
+                priority=priority,
+                status="pending",
+                attempts=0,
+                available_at=now,
+                created_at=now,
+                updated_at=now,
+            )
+            db.add(job)
+            db.commit()
+            return IngestionJobModel.model_validate(job)
+
+    def claim_job(
+        self, worker_id: str, lease: int, db: Optional[Session] = None
+    ) -> Optional[IngestionJobModel]:
+        """
+        Claim the next pending job for worker_id, or return None if there is
+        none. Safe to call from several workers at once: a job is only claimed
+        by the worker whose update finds it still pending.
+        """
+        now = int(time.time())
+        with get_db_context(db) as db:
+            candidates = (
+                db.query(IngestionJob.id)
+                .filter(
+                    IngestionJob.status == "pending",
+                    IngestionJob.available_at <= now,
+                )
+                .order_by(IngestionJob.priority.desc(), IngestionJob.created_at)
+                .limit(10)
+                .all()
+            )
+
+            for (id,) in candidates:
+                claimed = (
+                    db.query(IngestionJob)
+                    .filter(IngestionJob.id == id, IngestionJob.status == "pending")
+                    .update(
+                        {
+                            "status": "running",
+                            "worker_id": worker_id,
+                            "attempts": IngestionJob.attempts + 1,
+                            "lease_until": now + lease,
+                            "updated_at": now,
+                        },
+                        synchronize_session=False,
+                    )
+                )
+                db.commit()
+                if claimed:
+                    job = db.get(IngestionJob, id)
+                    db.refresh(job)
+                    return IngestionJobModel.model_validate(job)
+            return None
+
+    def renew_leases(
+        self,
+        ids: list[str],
+        worker_id: str,
+        lease: int,
+        db: Optional[Session] = None,
+    ) -> int:
+        if not ids:
+            return 0
+
+        now = int(time.time())
+        with get_db_context(db) as db:
+            renewed = (
+                db.query(IngestionJob)
+                .filter(
+                    IngestionJob.id.in_(ids),
+                    IngestionJob.worker_id == worker_id,
+                    IngestionJob.status == "running",
+                )
+                .update(
+                    {"lease_until": now + lease, "updated_at": now},
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            return renewed
+
+    def retry_job(
+        self, id: str, error: str, delay: int, db: Optional[Session] = None
+    ) -> None:
+        now = int(time.time())
+        with get_db_context(db) as db:
+            db.query(IngestionJob).filter_by(id=id).update(
+                {
+                    "status": "pending",
+                    "error": error,
+                    "worker_id": None,
+                    "lease_until": None,
+                    "available_at": now + delay,
+                    "updated_at": now,
+                },
+                synchronize_session=False,
+            )
+            db.commit()
+
+    def release_expired_jobs(
+        self, max_attempts: int, db: Optional[Session] = None
+    ) -> list[IngestionJobModel]:
+        """
+        Put the running jobs whose lease expired back in the queue, and delete
+        those that ran out of attempts. Returns the deleted jobs.
+        """
+        now = int(time.time())
+        with get_db_context(db) as db:
+            expired = (
+                db.query(IngestionJob)
+                .filter(
+                    IngestionJob.status == "running",
+                    IngestionJob.lease_until < now,
+                )
+                .all()
+            )
+
+            failed = []
+            for job in expired:
+                job = IngestionJobModel.model_validate(job)
+                # Only if no other worker released and claimed it in between
+                query = db.query(IngestionJob).filter(
+                    IngestionJob.id == job.id,
+                    IngestionJob.status == "running",
+                    IngestionJob.lease_until < now,
+                )
+                if job.attempts >= max_attempts:
+                    released = query.delete(synchronize_session=False)
+                else:
+                    released = query.update(
+                        {
+                            "status": "pending",
+                            "worker_id": None,
+                            "lease_until": None,
+                            "available_at": now,
+                            "updated_at": now,
+                        },
+                        synchronize_session=False,
+                    )
+                db.commit()
+
+                if released:
+                    log.warning(
+                        f"Ingestion job {job.id} of file {job.file_id} was abandoned by worker {job.worker_id}"
+                    )
+                    if job.attempts >= max_attempts:
+                        failed.append(job)
+            return failed
+
+    def delete_job_by_id(self, id: str, db: Optional[Session] = None) -> bool:
+        with get_db_context(db) as db:
+            db.query(IngestionJob).filter_by(id=id).delete()
+            db.commit()
+            return True
+
+    def delete_jobs_by_file_id(
+        self, file_id: str, db: Optional[Session] = None
+    ) -> bool:
+        with get_db_context(db) as db:
+            db.query(IngestionJob).filter_by(file_id=file_id).delete()
+            db.commit()
+            return True
+
+    def delete_all_jobs(self, db: Optional[Session] = None) -> bool:
+        with get_db_context(db) as db:
+            db.query(IngestionJob).delete()
+            db.commit()
+            return True
+
+    def get_job_counts(self, db: Optional[Session] = None) -> dict[str, int]:
+        """Number of jobs per status."""
+        with get_db_context(db) as db:
+            rows = (
+                db.query(IngestionJob.status, func.count(IngestionJob.id))
+                .group_by(IngestionJob.status)
+                .all()
+            )
+            return {status: count for status, count in rows}
+
+
+IngestionJobs = IngestionJobsTable()
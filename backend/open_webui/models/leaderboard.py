@@ -0,0 +1,394 @@
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from sqlalchemy.orm import Session
+from open_webui.internal.db import Base, get_db_context
+
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import BigInteger, Column, Float, JSON, Text, exc, text
+
+log = logging.getLogger(__name__)
+
+
+# Leaderboard Elo ratings
+#
+# Each model starts at INITIAL_RATING. A rated feedback is a comparison of the
+# rated model against each of its siblings; the winner takes
+# K_FACTOR * (actual - expected) points from the loser, where expected is the
+# probability of winning given the current ratings.
+#
+# The ratings of all feedback in order are kept in the leaderboard_rating
+# table: new feedback is applied on insert, while edits that change an outcome
+# (and deletes) mark the table stale until the next full recompute. The full
+# recompute is due every LEADERBOARD_RECOMPUTE_INTERVAL seconds, or as soon as
+# the table is stale, and is claimed by one worker through leaderboard_state.
+
+K_FACTOR = 32
+INITIAL_RATING = 1000.0
+
+LEADERBOARD_STATE_ID = "leaderboard"
+
+
+####################
+# Leaderboard DB Schema
+####################
+
+
+class LeaderboardRating(Base):
+    __tablename__ = "leaderboard_rating"
+
+    model_id = Column(Text, primary_key=True)
+    rating = Column(Float, nullable=False)
+    won = Column(BigInteger, nullable=False)
+    lost = Column(BigInteger, nullable=False)
+    tags = Column(JSON, nullable=True)  # {tag: count} over the model's feedback
+    updated_at = Column(BigInteger)
+
+
+class LeaderboardState(Base):
+    __tablename__ = "leaderboard_state"
+
+    id = Column(Text, primary_key=True)
+    recompute_after = Column(BigInteger, nullable=False)  # next full recompute
+    updated_at = Column(BigInteger)
+
+
+class LeaderboardRatingModel(BaseModel):
+    model_id: str
+    rating: float
+    won: int
+    lost: int
+    tags: Optional[dict] = None
+    updated_at: int
+
+    model_config = ConfigDict(from_attributes=True, protected_namespaces=())
+
+
+####################
+# Elo
+####################
+
+
+def get_feedback_matches(data: Optional[dict]) -> list[tuple[str, str, int]]:
+    """
+    The (model_id, opponent_id, score) comparisons of a feedback, score being 1
+    if the rated model won.
+    """
+    data = data or {}
+    model_id = data.get("model_id")
+    rating = str(data.get("rating", ""))
+    if not model_id or rating not in ("1", "-1"):
+        return []
+
+    score = 1 if rating == "1" else 0
+    return [
+        (model_id, opponent_id, score)
+        for opponent_id in data.get("sibling_model_ids") or []
+    ]
+
+
+def get_feedback_tags(data: Optional[dict]) -> tuple[Optional[str], list[str]]:
+    data = data or {}
+    return data.get("model_id"), data.get("tags") or []
+
+
+def update_ratings(
+    stats: dict[str, dict], matches: list[tuple[str, str, int]], weight: float = 1.0
+):
+    """Apply comparisons to {model_id: {"rating", "won", "lost"}} in place."""
+    for model_id, opponent_id, score in matches:
+        model = stats.setdefault(
+            model_id, {"rating": INITIAL_RATING, "won": 0, "lost": 0}
+        )
+        opponent = stats.setdefault(
+            opponent_id, {"rating": INITIAL_RATING, "won": 0, "lost": 0}
+        )
+
+        expected = 1 / (1 + 10 ** ((opponent["rating"] - model["rating"]) / 400))
+        delta = K_FACTOR * (score - expected) * weight
+        model["rating"] += delta
+        opponent["rating"] -= delta
+
+        if score:
+            model["won"] += 1
+            opponent["lost"] += 1
+        else:
+            model["lost"] += 1
+            opponent["won"] += 1
+
+
+@dataclass
+class LeaderboardMatches:
+    """
+    All comparisons in feedback order as arrays, to replay the ratings with
+    per feedback weights (the relevance of each feedback to a search query).
+    """
+
+    model_ids: list[str]
+    model: Any  # np.ndarray, index in model_ids of the rated model of each match
+    opponent: Any  # np.ndarray, index in model_ids of the opponent
+    score: Any  # np.ndarray, 1 if the rated model won
+    feedback: Any  # np.ndarray, index of the feedback of each match
+    feedback_count: int
+
+    tags: list[str]  # distinct tags
+    tag_feedback: Any  # np.ndarray, feedback index of each (feedback, tag) pair
+    tag_index: Any  # np.ndarray, index in tags of each (feedback, tag) pair
+
+    @classmethod
+    def from_feedback_data(cls, rows: list[Optional[dict]]) -> "LeaderboardMatches":
+        import numpy as np
+
+        model_index: dict[str, int] = {}
+        tag_index: dict[str, int] = {}
+        model, opponent, score, feedback = [], [], [], []
+        tag_feedback, tag_ids = [], []
+
+        for i, data in enumerate(rows):
+            for model_id, opponent_id, match_score in get_feedback_matches(data):
+                model.append(model_index.setdefault(model_id, len(model_index)))
+                opponent.append(model_index.setdefault(opponent_id, len(model_index)))
+                score.append(match_score)
+                feedback.append(i)
+
+            for tag in get_feedback_tags(data)[1]:
+                tag_feedback.append(i)
+                tag_ids.append(tag_index.setdefault(tag, len(tag_index)))
+
+        return cls(
+            model_ids=list(model_index),
+            model=np.array(model, dtype=np.int64),
+            opponent=np.array(opponent, dtype=np.int64),
+            score=np.array(score, dtype=np.float64),
+            feedback=np.array(feedback, dtype=np.int64),
+            feedback_count=len(rows),
+            tags=list(tag_index),
+            tag_feedback=np.array(tag_feedback, dtype=np.int64),
+            tag_index=np.array(tag_ids, dtype=np.int64),
+        )
+
+    def replay(self, weights=None) -> dict[str, dict]:
+        """
+        Ratings after all matches, with optional weights per feedback. Returns
+        {model_id: {"rating": float, "won": int, "lost": int}}.
+        """
+        import numpy as np
+
+        count = len(self.model_ids)
+        won = np.bincount(self.model, self.score, count) + np.bincount(
+            self.opponent, 1 - self.score, count
+        )
+        lost = np.bincount(self.model, 1 - self.score, count) + np.bincount(
+            self.opponent, self.score, count
+        )
+
+        # Ratings depend on the previous match, only the inputs are vectorised
+        factors = (
+            K_FACTOR * np.asarray(weights, dtype=np.float64)[self.feedback]
+            if weights is not None
+            else np.full(len(self.model), float(K_FACTOR))
+        )
+        ratings = [INITIAL_RATING] * count
+        for a, b, s, k in zip(
+            self.model.tolist(),
+            self.opponent.tolist(),
+            self.score.tolist(),
+            factors.tolist(),
+        ):
+            expected = 1 / (1 + 10 ** ((ratings[b] - ratings[a]) / 400))
+            delta = k * (s - expected)
+            ratings[a] += delta
+            ratings[b] -= delta
+
+        return {
+            model_id: {"rating": ratings[i], "won": int(won[i]), "lost": int(lost[i])}
+            for i, model_id in enumerate(self.model_ids)
+        }
+
+
+####################
+# Leaderboard Table
+####################
+
+
+class LeaderboardTable:
+    def mark_stale(self, db: Session):
+        """
+        Make the full recompute due now, for feedback that changed in a way
+        that can't be applied incrementally. Part of the caller's transaction.
+        """
+        db.query(LeaderboardState).filter_by(id=LEADERBOARD_STATE_ID).update(
+            {"recompute_after": 0}, synchronize_session=False
+        )
+
+    def claim_recompute(self, interval: int, db: Session) -> bool:
+        """
+        Claim the full recompute if it is due, and schedule the next one in
+        `interval` seconds. Only one worker's claim succeeds; the state row
+        stays locked until the caller's transaction ends.
+        """
+        now = int(time.time())
+        claimed = (
+            db.query(LeaderboardState)
+            .filter(
+                LeaderboardState.id == LEADERBOARD_STATE_ID,
+                LeaderboardState.recompute_after <= now,
+            )
+            .update(
+                {"recompute_after": now + interval, "updated_at": now},
+                synchronize_session=False,
+            )
+        )
+        if claimed:
+            return True
+        if db.query(LeaderboardState.id).filter_by(id=LEADERBOARD_STATE_ID).first():
+            return False
+
+        # No recompute ran yet; the first worker to insert the state gets it
+        db.add(
+            LeaderboardState(
+                id=LEADERBOARD_STATE_ID,
+                recompute_after=now + interval,
+                updated_at=now,
+            )
+        )
+        try:
+            db.flush()
+        except exc.IntegrityError:
+            db.rollback()
+            return False
+        return True
+
+    def lock_ratings(self, db: Session):
+        """
+        Lock the ratings until the caller's transaction ends, so feedback
+        applied during a full recompute waits for it rather than being lost.
+        """
+        if db.bind.dialect.name == "postgresql":
+            db.execute(text("LOCK TABLE leaderboard_rating IN EXCLUSIVE MODE"))
+        else:
+            # Takes the write lock on SQLite and gap locks on MySQL
+            db.query(LeaderboardRating).delete()
+
+    def apply_feedback(
+        self,
+        old_data: Optional[dict],
+        new_data: Optional[dict],
+        db: Session,
+    ):
+        """
+        Update the ratings for a feedback being created (old_data None) or
+        edited, in the caller's session and transaction.
+        """
+        old_matches = get_feedback_matches(old_data)
+        new_matches = get_feedback_matches(new_data)
+        if old_matches and old_matches != new_matches:
+            # Replaying the following feedback is left to the next recompute
+            self.mark_stale(db)
+            return
+
+        tag_changes = Counter()
+        model_id, tags = get_feedback_tags(old_data)
+        if model_id:
+            tag_changes.subtract((model_id, tag) for tag in tags)
+        model_id, tags = get_feedback_tags(new_data)
+        if model_id:
+            tag_changes.update((model_id, tag) for tag in tags)
+        tag_changes = {key: count for key, count in tag_changes.items() if count}
+
+        matches = new_matches if not old_matches else []
+        model_ids = {m for match in matches for m in match[:2]} | {
+            model_id for model_id, _ in tag_changes
+        }
+        if not model_ids:
+            return
+
+        rows = {
+            row.model_id: row
+            for row in db.query(LeaderboardRating)
+            .filter(LeaderboardRating.model_id.in_(model_ids))
+            .with_for_update()
+            .all()
+        }
+
+        stats = {
+            model_id: {"rating": row.rating, "won": row.won, "lost": row.lost}
+            for model_id, row in rows.items()
+        }
+        update_ratings(stats, matches)
+
+        now = int(time.time())
+        for model_id in model_ids:
+            row = rows.get(model_id)
+            if row is None:
+                row = LeaderboardRating(
+                    model_id=model_id,
+                    rating=INITIAL_RATING,
+                    won=0,
+                    lost=0,
+                    tags={},
+                )
+                db.add(row)
+
+            if model_id in stats:
+                row.rating = stats[model_id]["rating"]
+                row.won = stats[model_id]["won"]
+                row.lost = stats[model_id]["lost"]
+
+            row_tags = dict(row.tags or {})
+            for (tag_model_id, tag), count in tag_changes.items():
+                if tag_model_id == model_id:
+                    row_tags[tag] = row_tags.get(tag, 0) + count
+                    if row_tags[tag] <= 0:
+                        del row_tags[tag]
+            row.tags = row_tags
+            row.updated_at = now
+
+    def replace_all(
+        self,
+        stats: dict[str, dict],
+        tags: dict[str, dict],
+        db: Optional[Session] = None,
+    ):
+        """Replace the ratings with a full recompute and commit."""
+        now = int(time.time())
+        with get_db_context(db) as db:
+            db.query(LeaderboardRating).delete()
+            db.add_all(
+                [
+                    LeaderboardRating(
+                        model_id=model_id,
+                        rating=model_stats.get("rating", INITIAL_RATING),
+                        won=model_stats.get("won", 0),
+                        lost=model_stats.get("lost", 0),
+                        tags=tags.get(model_id, {}),
+                        updated_at=now,
+                    )
+                    for model_id, model_stats in (
+                        {model_id: {} for model_id in tags} | stats
+                    ).items()
+                ]
+            )
+            db.commit()
+
+    def get_ratings(self, db: Optional[Session] = None) -> list[LeaderboardRatingModel]:
+        with get_db_context(db) as db:
+            return [
+                LeaderboardRatingModel.model_validate(row)
+                for row in db.query(LeaderboardRating).all()
+            ]
+
+    def has_ratings(self, db: Optional[Session] = None) -> bool:
+        with get_db_context(db) as db:
+            return db.query(LeaderboardRating.model_id).first() is not None
+
+    def delete_all_ratings(self, db: Optional[Session] = None):
+        with get_db_context(db) as db:
+            db.query(LeaderboardRating).delete()
+            db.commit()
+
+
+Leaderboard = LeaderboardTable()
@@ -7,11 +7,11 @@ from sqlalchemy.orm import Session
 from open_webui.internal.db import Base, JSONField, get_db, get_db_context
 from open_webui.models.tags import TagModel, Tag, Tags
 from open_webui.models.users import Users, User, UserNameResponse
-from open_webui.models.channels import Channels, ChannelMember
+from open_webui.models.channels import Channels, ChannelMember, ChannelWebhookModel
 
 
 from pydantic import BaseModel, ConfigDict, field_validator
-from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON
+from sqlalchemy import BigInteger, Boolean, Column, Index, String, Text, JSON
 from sqlalchemy import or_, func, select, and_, text
 from sqlalchemy.sql import exists
 
@@ -28,6 +28,8 @@ class MessageReaction(Base):
     name = Column(Text)
     created_at = Column(BigInteger)
 
+    __table_args__ = (Index("message_reaction_message_id_idx", "message_id"),)
+
 
 class MessageReactionModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -61,6 +63,16 @@ class Message(Base):
     created_at = Column(BigInteger)  # time_ns
     updated_at = Column(BigInteger)  # time_ns
 
+    __table_args__ = (
+        Index(
+            "message_channel_parent_created_idx",
+            "channel_id",
+            "parent_id",
+            "created_at",
+        ),
+        Index("message_parent_created_idx", "parent_id", "created_at"),
+    )
+
 
 class MessageModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -136,7 +148,91 @@ class MessageResponse(MessageReplyToResponse):
     reactions: list[Reactions]
 
 
+def _get_webhook_user_info(
+    message: Message, webhooks: dict[str, ChannelWebhookModel]
+) -> Optional[dict]:
+    """The user of a message sent by a webhook (webhook info in meta)."""
+    webhook_info = message.meta.get("webhook") if message.meta else None
+    if not (webhook_info and webhook_info.get("id")):
+        return None
+
+    webhook = webhooks.get(webhook_info.get("id"))
+    if webhook:
+        return {"id": webhook.id, "name": webhook.name, "role": "webhook"}
+
+    # Webhook was deleted, use placeholder
+    return {
+        "id": webhook_info.get("id"),
+        "name": "Deleted Webhook",
+        "role": "webhook",
+    }
+
+
+def _get_webhook_ids(messages: list[Message]) -> list[str]:
+    return list(
+        {
+            message.meta["webhook"]["id"]
+            for message in messages
+            if message.meta
+            and isinstance(message.meta.get("webhook"), dict)
+            and message.meta["webhook"].get("id")
+        }
+    )
+
+
 class MessageTable:
+    def _to_reply_to_responses(
+        self, messages: list[Message], db: Session
+    ) -> list[MessageReplyToResponse]:
+        """
+        Build the responses of a page of messages, loading the messages they
+        reply to, their users and webhooks in one query each.
+        """
+        reply_to_ids = list({m.reply_to_id for m in messages if m.reply_to_id})
+        reply_to_messages = (
+            {m.id: m for m in db.query(Message).filter(Message.id.in_(reply_to_ids))}
+            if reply_to_ids
+            else {}
+        )
+
+        webhooks = Channels.get_webhooks_by_ids(
+            _get_webhook_ids(messages + list(reply_to_messages.values())), db=db
+        )
+        reply_to_user_ids = [
+            m.user_id
+            for m in reply_to_messages.values()
+            if _get_webhook_user_info(m, webhooks) is None
+        ]
+        users = (
+            {u.id: u for u in Users.get_users_by_user_ids(reply_to_user_ids, db=db)}
+            if reply_to_user_ids
+            else {}
+        )
+
+        def get_reply_to_message(message: Message) -> Optional[dict]:
+            reply_to = reply_to_messages.get(message.reply_to_id)
+            if reply_to is None:
+                return None
+
+            user_info = _get_webhook_user_info(reply_to, webhooks)
+            if user_info is None and reply_to.user_id in users:
+                user_info = users[reply_to.user_id].model_dump()
+            return {
+                **MessageModel.model_validate(reply_to).model_dump(),
+                "user": user_info,
+            }
+
+        return [
+            MessageReplyToResponse.model_validate(
+                {
+                    **MessageModel.model_validate(message).model_dump(),
+                    "user": _get_webhook_user_info(message, webhooks),
+                    "reply_to_message": get_reply_to_message(message),
+                }
+            )
+            for message in messages
+        ]
+
     def insert_new_message(
         self,
         form_data: MessageForm,
@@ -195,9 +291,13 @@ class MessageTable:
 
             reactions = self.get_reactions_by_message_id(id, db=db)
 
-            thread_replies = []
+            reply_count, latest_reply_at = 0, None
             if include_thread_replies:
-                thread_replies = self.get_thread_replies_by_message_id(id, db=db)
+                reply_count, latest_reply_at = (
+                    self.get_thread_reply_stats_by_message_ids([id], db=db).get(
+                        id, (0, None)
+                    )
+                )
 
             # Check if message was sent by webhook (webhook info in meta takes precedence)
             webhook_info = message.meta.get("webhook") if message.meta else None
@@ -228,10 +328,8 @@ class MessageTable:
                     "reply_to_message": (
                         reply_to_message.model_dump() if reply_to_message else None
                     ),
-                    "latest_reply_at": (
-                        thread_replies[0].created_at if thread_replies else None
-                    ),
-                    "reply_count": len(thread_replies),
+                    "latest_reply_at": latest_reply_at,
+                    "reply_count": reply_count,
                     "reactions": reactions,
                 }
             )
@@ -247,47 +345,7 @@ class MessageTable:
                 .all()
             )
 
-            messages = []
-            for message in all_messages:
-                reply_to_message = (
-                    self.get_message_by_id(
-                        message.reply_to_id, include_thread_replies=False, db=db
-                    )
-                    if message.reply_to_id
-                    else None
-                )
-
-                webhook_info = message.meta.get("webhook") if message.meta else None
-                user_info = None
-                if webhook_info and webhook_info.get("id"):
-                    webhook = Channels.get_webhook_by_id(webhook_info.get("id"), db=db)
-                    if webhook:
-                        user_info = {
-                            "id": webhook.id,
-                            "name": webhook.name,
-                            "role": "webhook",
-                        }
-                    else:
-                        user_info = {
-                            "id": webhook_info.get("id"),
-                            "name": "Deleted Webhook",
-                            "role": "webhook",
-                        }
-
-                messages.append(
-                    MessageReplyToResponse.model_validate(
-                        {
-                            **MessageModel.model_validate(message).model_dump(),
-                            "user": user_info,
-                            "reply_to_message": (
-                                reply_to_message.model_dump()
-                                if reply_to_message
-                                else None
-                            ),
-                        }
-                    )
-                )
-            return messages
+            return self._to_reply_to_responses(all_messages, db)
 
     def get_reply_user_ids_by_message_id(
         self, id: str, db: Optional[Session] = None
@@ -315,47 +373,7 @@ class MessageTable:
                 .all()
             )
 
-            messages = []
-            for message in all_messages:
-                reply_to_message = (
-                    self.get_message_by_id(
-                        message.reply_to_id, include_thread_replies=False, db=db
-                    )
-                    if message.reply_to_id
-                    else None
-                )
-
-                webhook_info = message.meta.get("webhook") if message.meta else None
-                user_info = None
-                if webhook_info and webhook_info.get("id"):
-                    webhook = Channels.get_webhook_by_id(webhook_info.get("id"), db=db)
-                    if webhook:
-                        user_info = {
-                            "id": webhook.id,
-                            "name": webhook.name,
-                            "role": "webhook",
-                        }
-                    else:
-                        user_info = {
-                            "id": webhook_info.get("id"),
-                            "name": "Deleted Webhook",
-                            "role": "webhook",
-                        }
-
-                messages.append(
-                    MessageReplyToResponse.model_validate(
-                        {
-                            **MessageModel.model_validate(message).model_dump(),
-                            "user": user_info,
-                            "reply_to_message": (
-                                reply_to_message.model_dump()
-                                if reply_to_message
-                                else None
-                            ),
-                        }
-                    )
-                )
-            return messages
+            return self._to_reply_to_responses(all_messages, db)
 
     def get_messages_by_parent_id(
         self,
@@ -384,47 +402,7 @@ class MessageTable:
             if len(all_messages) < limit:
                 all_messages.append(message)
 
-            messages = []
-            for message in all_messages:
-                reply_to_message = (
-                    self.get_message_by_id(
-                        message.reply_to_id, include_thread_replies=False, db=db
-                    )
-                    if message.reply_to_id
-                    else None
-                )
-
-                webhook_info = message.meta.get("webhook") if message.meta else None
-                user_info = None
-                if webhook_info and webhook_info.get("id"):
-                    webhook = Channels.get_webhook_by_id(webhook_info.get("id"), db=db)
-                    if webhook:
-                        user_info = {
-                            "id": webhook.id,
-                            "name": webhook.name,
-                            "role": "webhook",
-                        }
-                    else:
-                        user_info = {
-                            "id": webhook_info.get("id"),
-                            "name": "Deleted Webhook",
-                            "role": "webhook",
-                        }
-
-                messages.append(
-                    MessageReplyToResponse.model_validate(
-                        {
-                            **MessageModel.model_validate(message).model_dump(),
-                            "user": user_info,
-                            "reply_to_message": (
-                                reply_to_message.model_dump()
-                                if reply_to_message
-                                else None
-                            ),
-                        }
-                    )
-                )
-            return messages
+            return self._to_reply_to_responses(all_messages, db)
 
     def get_last_message_by_channel_id(
         self, channel_id: str, db: Optional[Session] = None
@@ -508,6 +486,73 @@ class MessageTable:
                 query = query.filter(Message.user_id != user_id)
             return query.count()
 
+    def get_last_message_at_by_channel_ids(
+        self, channel_ids: list[str], db: Optional[Session] = None
+    ) -> dict[str, int]:
+        """Get the created_at of the latest message of each channel."""
+        if not channel_ids:
+            return {}
+
+        with get_db_context(db) as db:
+            rows = (
+                db.query(Message.channel_id, func.max(Message.created_at))
+                .filter(Message.channel_id.in_(channel_ids))
+                .group_by(Message.channel_id)
+            )
+            return {channel_id: created_at for channel_id, created_at in rows}
+
+    def get_unread_message_counts_by_channel_ids(
+        self, channel_ids: list[str], user_id: str, db: Optional[Session] = None
+    ) -> dict[str, int]:
+        """
+        Count the top-level messages of others since the user last read each
+        channel they are a member of.
+        """
+        if not channel_ids:
+            return {}
+
+        with get_db_context(db) as db:
+            rows = (
+                db.query(Message.channel_id, func.count(Message.id))
+                .join(
+                    ChannelMember,
+                    and_(
+                        ChannelMember.channel_id == Message.channel_id,
+                        ChannelMember.user_id == user_id,
+                    ),
+                )
+                .filter(
+                    Message.channel_id.in_(channel_ids),
+                    Message.parent_id == None,  # only count top-level messages
+                    Message.created_at > func.coalesce(ChannelMember.last_read_at, 0),
+                    Message.user_id != user_id,
+                )
+                .group_by(Message.channel_id)
+            )
+            return {channel_id: count for channel_id, count in rows}
+
+    def get_thread_reply_stats_by_message_ids(
+        self, ids: list[str], db: Optional[Session] = None
+    ) -> dict[str, tuple[int, int]]:
+        """Get {message_id: (reply_count, latest_reply_at)} of thread parents."""
+        if not ids:
+            return {}
+
+        with get_db_context(db) as db:
+            rows = (
+                db.query(
+                    Message.parent_id,
+                    func.count(Message.id),
+                    func.max(Message.created_at),
+                )
+                .filter(Message.parent_id.in_(ids))
+                .group_by(Message.parent_id)
+            )
+            return {
+                parent_id: (count, latest_reply_at)
+                for parent_id, count, latest_reply_at in rows
+            }
+
     def add_reaction_to_message(
         self, id: str, user_id: str, name: str, db: Optional[Session] = None
     ) -> Optional[MessageReactionModel]:
@@ -567,6 +612,45 @@ class MessageTable:
 
             return [Reactions(**reaction) for reaction in reactions.values()]
 
+    def get_reactions_by_message_ids(
+        self, ids: list[str], db: Optional[Session] = None
+    ) -> dict[str, list[Reactions]]:
+        """Get the reactions of several messages as {message_id: reactions}."""
+        reactions = {id: {} for id in ids}
+        if not ids:
+            return {}
+
+        with get_db_context(db) as db:
+            # JOIN User so all user info is fetched in one query
+            results = (
+                db.query(MessageReaction, User)
+                .join(User, MessageReaction.user_id == User.id)
+                .filter(MessageReaction.message_id.in_(ids))
+                .all()
+            )
+
+            for reaction, user in results:
+                message_reactions = reactions[reaction.message_id]
+                if reaction.name not in message_reactions:
+                    message_reactions[reaction.name] = {
+                        "name": reaction.name,
+                        "users": [],
+                        "count": 0,
+                    }
+
+                message_reactions[reaction.name]["users"].append(
+                    {
+                        "id": user.id,
+                        "name": user.name,
+                    }
+                )
+                message_reactions[reaction.name]["count"] += 1
+
+            return {
+                id: [Reactions(**reaction) for reaction in message_reactions.values()]
+                for id, message_reactions in reactions.items()
+            }
+
     def remove_reaction_by_id_and_user_id_and_name(
         self, id: str, user_id: str, name: str, db: Optional[Session] = None
     ) -> bool:
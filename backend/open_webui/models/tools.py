@@ -7,6 +7,7 @@ from open_webui.internal.db import Base, JSONField, get_db, get_db_context
 from open_webui.models.users import Users, UserResponse
 from open_webui.models.groups import Groups
 from open_webui.models.access_grants import AccessGrantModel, AccessGrants
+from open_webui.utils.plugin_cache import PLUGIN_VERSIONS
 
 from pydantic import BaseModel, ConfigDict, Field
 from sqlalchemy import BigInteger, Column, String, Text
@@ -126,6 +127,7 @@ class ToolsTable:
                 db.add(result)
                 db.commit()
                 db.refresh(result)
+                PLUGIN_VERSIONS.bump(f"tool:{result.id}")
                 AccessGrants.set_access_grants(
                     "tool", result.id, form_data.access_grants, db=db
                 )
@@ -211,6 +213,7 @@ class ToolsTable:
                     {"valves": valves, "updated_at": int(time.time())}
                 )
                 db.commit()
+                PLUGIN_VERSIONS.bump(f"tool:{id}")
                 return self.get_tool_by_id(id, db=db)
         except Exception:
             return None
@@ -219,7 +222,12 @@ class ToolsTable:
         self, id: str, user_id: str, db: Optional[Session] = None
     ) -> Optional[dict]:
         try:
-            user = Users.get_user_by_id(user_id, db=db)
+            # Read on every filter and tool call, so prefer the cached user
+            user = (
+                Users.get_cached_user_by_id(user_id)
+                if db is None
+                else Users.get_user_by_id(user_id, db=db)
+            )
             user_settings = user.settings.model_dump() if user.settings else {}
 
             # Check if user has "tools" and "valves" settings
@@ -270,6 +278,7 @@ class ToolsTable:
                     {**updated, "updated_at": int(time.time())}
                 )
                 db.commit()
+                PLUGIN_VERSIONS.bump(f"tool:{id}")
                 if access_grants is not None:
                     AccessGrants.set_access_grants("tool", id, access_grants, db=db)
 
@@ -285,6 +294,7 @@ class ToolsTable:
                 AccessGrants.revoke_all_access("tool", id, db=db)
                 db.query(Tool).filter_by(id=id).delete()
                 db.commit()
+                PLUGIN_VERSIONS.bump(f"tool:{id}")
 
                 return True
         except Exception:
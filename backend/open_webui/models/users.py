@@ -1,16 +1,24 @@
+import hashlib
+import logging
+import threading
 import time
 from typing import Optional
 
 from sqlalchemy.orm import Session, defer
-from open_webui.internal.db import Base, JSONField, get_db, get_db_context
+from open_webui.internal.db import AsyncTable, Base, JSONField, get_db, get_db_context
 
 
-from open_webui.env import DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL
+from open_webui.env import (
+    DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL,
+    DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL,
+)
 
+from open_webui.models.chat_messages import ChatMessages
 from open_webui.models.chats import Chats
 from open_webui.models.groups import Groups, GroupMember
 from open_webui.models.channels import ChannelMember
 
+from open_webui.utils.access_cache import USER_CACHE
 from open_webui.utils.misc import throttle
 from open_webui.utils.validate import validate_profile_image_url
 
@@ -27,12 +35,16 @@ from sqlalchemy import (
     exists,
     select,
     cast,
+    bindparam,
+    update,
 )
 from sqlalchemy import or_, case, func
 from sqlalchemy.dialects.postgresql import JSONB
 
 import datetime
 
+log = logging.getLogger(__name__)
+
 ####################
 # User DB Schema
 ####################
@@ -258,6 +270,14 @@ class UserUpdateForm(BaseModel):
 
 
 class UsersTable:
+    def __init__(self):
+        # user id -> last active timestamp, written by flush_last_active
+        self._last_active: dict[str, int] = {}
+        self._last_active_lock = threading.Lock()
+
+    def invalidate_user(self, id: str):
+        USER_CACHE.bump(f"user:{id}")
+
     def insert_new_user(
         self,
         id: str,
@@ -288,6 +308,7 @@ class UsersTable:
             db.add(result)
             db.commit()
             db.refresh(result)
+            self.invalidate_user(id)
             if result:
                 return user
             else:
@@ -303,6 +324,43 @@ class UsersTable:
         except Exception:
             return None
 
+    def get_cached_user_by_id(self, id: str) -> Optional[UserModel]:
+        """
+        Get a user from the short-lived user cache, loading it on a miss.
+        Writes through this table invalidate the cached entry.
+        """
+
+        def load():
+            with get_db_context() as db:
+                user = db.query(User).filter_by(id=id).first()
+                return UserModel.model_validate(user) if user else None
+
+        try:
+            user = USER_CACHE.get_or_load(("user", id), (f"user:{id}",), load)
+        except Exception:
+            # Not cached, the next request retries
+            return None
+
+        # Copy, so callers can't change the cached entry
+        return user.model_copy() if user else None
+
+    def get_cached_user_by_api_key(self, api_key: str) -> Optional[UserModel]:
+        def load():
+            with get_db_context() as db:
+                api_key_row = db.query(ApiKey.user_id).filter_by(key=api_key).first()
+                return api_key_row.user_id if api_key_row else None
+
+        try:
+            # Keyed by a hash so the cache never holds the keys themselves
+            user_id = USER_CACHE.get_or_load(
+                ("api_key", hashlib.sha256(api_key.encode()).hexdigest()),
+                ("api_keys",),
+                load,
+            )
+        except Exception:
+            return None
+        return self.get_cached_user_by_id(user_id) if user_id else None
+
     def get_user_by_api_key(
         self, api_key: str, db: Optional[Session] = None
     ) -> Optional[UserModel]:
@@ -539,6 +597,53 @@ class UsersTable:
             )
             return [UserModel.model_validate(user) for user in users]
 
+    def get_channel_member_settings(
+        self,
+        channel_id: str,
+        user_ids: Optional[list[str]] = None,
+        group_ids: Optional[list[str]] = None,
+        db: Optional[Session] = None,
+    ) -> dict[str, Optional[UserSettings]]:
+        """
+        Get the settings of the members of a channel as {user_id: settings}.
+        With user_ids or group_ids, only members among those users or in those
+        groups are returned; with neither (public channels), every member that
+        is not pending.
+        """
+        with get_db_context(db) as db:
+            query = db.query(User.id, User.settings).filter(
+                exists(
+                    select(ChannelMember.id).where(
+                        ChannelMember.user_id == User.id,
+                        ChannelMember.channel_id == channel_id,
+                    )
+                )
+            )
+
+            if user_ids is None and group_ids is None:
+                query = query.filter(User.role != "pending")
+            else:
+                conditions = []
+                if user_ids:
+                    conditions.append(User.id.in_(user_ids))
+                if group_ids:
+                    conditions.append(
+                        exists(
+                            select(GroupMember.id).where(
+                                GroupMember.user_id == User.id,
+                                GroupMember.group_id.in_(group_ids),
+                            )
+                        )
+                    )
+                if not conditions:
+                    return {}
+                query = query.filter(or_(*conditions))
+
+            return {
+                user_id: UserSettings.model_validate(settings) if settings else None
+                for user_id, settings in query
+            }
+
     def get_num_users(self, db: Optional[Session] = None) -> Optional[int]:
         with get_db_context(db) as db:
             return db.query(User).count()
@@ -593,6 +698,7 @@ class UsersTable:
                 user.role = role
                 db.commit()
                 db.refresh(user)
+                self.invalidate_user(id)
                 return UserModel.model_validate(user)
         except Exception:
             return None
@@ -609,6 +715,7 @@ class UsersTable:
                     setattr(user, key, value)
                 db.commit()
                 db.refresh(user)
+                self.invalidate_user(id)
                 return UserModel.model_validate(user)
         except Exception:
             return None
@@ -624,6 +731,7 @@ class UsersTable:
                 user.profile_image_url = profile_image_url
                 db.commit()
                 db.refresh(user)
+                self.invalidate_user(id)
                 return UserModel.model_validate(user)
         except Exception:
             return None
@@ -632,6 +740,12 @@ class UsersTable:
     def update_last_active_by_id(
         self, id: str, db: Optional[Session] = None
     ) -> Optional[UserModel]:
+        if DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL:
+            # Written in batches by flush_last_active
+            with self._last_active_lock:
+                self._last_active[id] = int(time.time())
+            return None
+
         try:
             with get_db_context(db) as db:
                 user = db.query(User).filter_by(id=id).first()
@@ -644,6 +758,35 @@ class UsersTable:
         except Exception:
             return None
 
+    def flush_last_active(self, db: Optional[Session] = None) -> int:
+        """Write the pending last active timestamps in one batched UPDATE."""
+        with self._last_active_lock:
+            pending, self._last_active = self._last_active, {}
+
+        if not pending:
+            return 0
+
+        try:
+            with get_db_context(db) as db:
+                db.execute(
+                    update(User.__table__)
+                    .where(User.__table__.c.id == bindparam("user_id"))
+                    .values(last_active_at=bindparam("last_active_at")),
+                    [
+                        {"user_id": id, "last_active_at": last_active_at}
+                        for id, last_active_at in pending.items()
+                    ],
+                )
+                db.commit()
+            return len(pending)
+        except Exception as e:
+            log.warning(f"Failed to update last active timestamps: {e}")
+            # Retry on the next flush, unless the user has been seen since
+            with self._last_active_lock:
+                for id, last_active_at in pending.items():
+                    self._last_active.setdefault(id, last_active_at)
+            return 0
+
     def update_user_oauth_by_id(
         self, id: str, provider: str, sub: str, db: Optional[Session] = None
     ) -> Optional[UserModel]:
@@ -670,6 +813,7 @@ class UsersTable:
                 # Persist updated JSON
                 db.query(User).filter_by(id=id).update({"oauth": oauth})
                 db.commit()
+                self.invalidate_user(id)
 
                 return UserModel.model_validate(user)
 
@@ -702,6 +846,7 @@ class UsersTable:
 
                 db.query(User).filter_by(id=id).update({"scim": scim})
                 db.commit()
+                self.invalidate_user(id)
 
                 return UserModel.model_validate(user)
 
@@ -720,6 +865,7 @@ class UsersTable:
                     setattr(user, key, value)
                 db.commit()
                 db.refresh(user)
+                self.invalidate_user(id)
                 return UserModel.model_validate(user)
         except Exception as e:
             print(e)
@@ -743,6 +889,7 @@ class UsersTable:
 
                 db.query(User).filter_by(id=id).update({"settings": user_settings})
                 db.commit()
+                self.invalidate_user(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -757,11 +904,17 @@ class UsersTable:
             # Delete User Chats
             result = Chats.delete_chats_by_user_id(id, db=db)
             if result:
+                # Delete User Analytics
+                ChatMessages.delete_rollups_by_user_id(id, db=db)
+
                 with get_db_context(db) as db:
                     # Delete User
                     db.query(User).filter_by(id=id).delete()
                     db.commit()
 
+                self.invalidate_user(id)
+                USER_CACHE.bump("api_keys")
+
                 return True
             else:
                 return False
@@ -796,6 +949,7 @@ class UsersTable:
                 )
                 db.add(new_api_key)
                 db.commit()
+                USER_CACHE.bump("api_keys")
 
                 return True
 
@@ -807,6 +961,7 @@ class UsersTable:
             with get_db_context(db) as db:
                 db.query(ApiKey).filter_by(user_id=id).delete()
                 db.commit()
+                USER_CACHE.bump("api_keys")
                 return True
         except Exception:
             return False
@@ -854,3 +1009,4 @@ class UsersTable:
 
 
 Users = UsersTable()
+AsyncUsers = AsyncTable(Users)
@@ -0,0 +1,784 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+import numpy as np
+from langchain_core.documents import Document
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the threads of a process are serialised
+    fcntl = None
+
+from open_webui.config import ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS
+from open_webui.retrieval.vector.main import (
+    GetResult,
+    SearchResult,
+    VectorDBBase,
+    VectorItem,
+)
+
+log = logging.getLogger(__name__)
+
+# Same term frequency saturation and length normalisation as rank_bm25's
+# BM25Okapi, which backs langchain's BM25Retriever.
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Postings added and chunks deleted since the last compaction are kept in an
+# append-only log; they are merged into the memory-mapped arrays once they grow
+# past this share of them.
+COMPACTION_RATIO = 0.25
+COMPACTION_MIN_POSTINGS = 10_000
+COMPACTION_MAX_POSTINGS = 500_000
+
+
+def tokenize(text: str) -> list[str]:
+    # Whitespace tokenisation, as BM25Retriever does by default
+    return text.split()
+
+
+def get_enriched_text(text: str, metadata: dict) -> str:
+    metadata = metadata or {}
+    metadata_parts = [text]
+
+    # Add filename (repeat twice for extra weight in BM25 scoring)
+    if metadata.get("name"):
+        filename = metadata["name"]
+        filename_tokens = filename.replace("_", " ").replace("-", " ").replace(".", " ")
+        metadata_parts.append(
+            f"Filename: {filename} {filename_tokens} {filename_tokens}"
+        )
+
+    # Add title if available
+    if metadata.get("title"):
+        metadata_parts.append(f"Title: {metadata['title']}")
+
+    # Add document section headings if available (from markdown splitter)
+    if metadata.get("headings") and isinstance(metadata["headings"], list):
+        headings = " > ".join(str(h) for h in metadata["headings"])
+        metadata_parts.append(f"Section: {headings}")
+
+    # Add source URL/path if available
+    if metadata.get("source"):
+        metadata_parts.append(f"Source: {metadata['source']}")
+
+    # Add snippet for web search results
+    if metadata.get("snippet"):
+        metadata_parts.append(f"Snippet: {metadata['snippet']}")
+
+    return " ".join(metadata_parts)
+
+
+def get_records(result: Optional[GetResult]) -> list[tuple[str, str, dict]]:
+    if not result or not result.ids or not result.ids[0]:
+        return []
+
+    return [
+        (str(id), text or "", metadata or {})
+        for id, text, metadata in zip(
+            result.ids[0], result.documents[0], result.metadatas[0]
+        )
+    ]
+
+
+class BM25Index:
+    """
+    Incrementally maintained BM25 index over the chunks of one collection.
+
+    Each index lives in its own directory:
+      - docs.<gen>.jsonl: append-only chunk store (id, text, metadata)
+      - index.<gen>.json: ids, term spans and totals as of a compaction
+      - postings_docs/postings_tfs.<gen>.npy: compacted postings, memory-mapped
+      - offsets/lengths/alive.<gen>.npy: per-chunk offset, token count and
+        tombstone flag as of a compaction
+      - log.<gen>.jsonl: append-only log of the chunks added and deleted since
+        that compaction, one line per save, replayed on load
+      - meta.json: the current generations. It is replaced atomically at each
+        compaction and is the commit point of the files above; between
+        compactions a save only appends to the log.
+    """
+
+    def __init__(self, path: Path, enriched: bool = False):
+        self.path = path
+        self.enriched = enriched
+        self.lock = threading.RLock()
+        self.mtime = None
+
+        self.generation = 0
+        self.docs_generation = 0
+        self._reset()
+
+    def _reset(self):
+        self.ids: list[str] = []
+        self.id_map: dict[str, int] = {}
+        self.offsets = np.empty(0, dtype=np.int64)
+        self.lengths = np.empty(0, dtype=np.int32)
+        self.alive = np.empty(0, dtype=bool)
+        self.count = 0
+        self.total_length = 0
+
+        # term -> [start, count] into the compacted postings arrays
+        self.terms: dict[str, list[int]] = {}
+        self.postings_docs = np.empty(0, dtype=np.int32)
+        self.postings_tfs = np.empty(0, dtype=np.int32)
+
+        # term -> [[doc, tf], ...] added since the last compaction
+        self.delta: dict[str, list[list[int]]] = {}
+        self.delta_size = 0
+        self.tombstones = 0
+
+        # Bytes of the log replayed so far, and the changes not yet written to it
+        self.log_size = 0
+        self.pending_docs: list[list] = []
+        self.pending_deletes: list[int] = []
+
+    def _get_file(self, name: str, generation: int) -> Path:
+        stem, suffix = name.split(".")
+        return self.path / f"{stem}.{generation}.{suffix}"
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["BM25Index"]:
+        # Another process may compact the index while it is being read
+        for _ in range(3):
+            try:
+                return cls._load(path)
+            except FileNotFoundError:
+                if not (path / "meta.json").exists():
+                    return None
+        return None
+
+    @classmethod
+    def _load(cls, path: Path) -> "BM25Index":
+        meta_path = path / "meta.json"
+        mtime = meta_path.stat().st_mtime_ns
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+
+        index = cls(path, meta["enriched"])
+        index.mtime = mtime
+        index.generation = meta["generation"]
+        index.docs_generation = meta["docs_generation"]
+
+        with open(
+            index._get_file("index.json", index.generation), "r", encoding="utf-8"
+        ) as f:
+            state = json.load(f)
+
+        index.ids = state["ids"]
+        index.offsets = np.load(index._get_file("offsets.npy", index.generation))
+        index.lengths = np.load(index._get_file("lengths.npy", index.generation))
+        index.alive = np.load(index._get_file("alive.npy", index.generation))
+        index.id_map = {id: doc for doc, id in enumerate(index.ids) if index.alive[doc]}
+        index.count = state["count"]
+        index.total_length = state["total_length"]
+
+        index.terms = state["terms"]
+        if state["postings_size"]:
+            index.postings_docs = np.load(
+                index._get_file("postings_docs.npy", index.generation),
+                mmap_mode="r",
+            )
+            index.postings_tfs = np.load(
+                index._get_file("postings_tfs.npy", index.generation),
+                mmap_mode="r",
+            )
+
+        index._replay_log()
+        return index
+
+    def _replay_log(self):
+        """Apply the log entries written after the ones already replayed."""
+        try:
+            with open(self._get_file("log.jsonl", self.generation), "rb") as f:
+                f.seek(self.log_size)
+                data = f.read()
+        except FileNotFoundError:
+            return
+
+        # A torn last line (a writer died mid-append) is ignored, and is
+        # truncated by the next writer
+        for line in data.split(b"\n")[:-1]:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break
+
+            docs, deletes = entry["docs"], entry["deleted"]
+            for id, offset, length, term_frequencies in docs:
+                self._add_doc(id, term_frequencies)
+            if docs:
+                self.offsets = np.concatenate(
+                    [self.offsets, np.array([d[1] for d in docs], dtype=np.int64)]
+                )
+                self.lengths = np.concatenate(
+                    [self.lengths, np.array([d[2] for d in docs], dtype=np.int32)]
+                )
+                self.alive = np.concatenate([self.alive, np.ones(len(docs), bool)])
+                self.count += len(docs)
+                self.total_length += sum(d[2] for d in docs)
+
+            for doc in deletes:
+                if self.alive[doc]:
+                    self._delete_doc(doc)
+            self.tombstones += len(deletes)
+            self.log_size += len(line) + 1
+
+    def is_stale(self) -> bool:
+        try:
+            if (self.path / "meta.json").stat().st_mtime_ns != self.mtime:
+                return True
+            log_path = self._get_file("log.jsonl", self.generation)
+            return log_path.exists() and log_path.stat().st_size != self.log_size
+        except FileNotFoundError:
+            return True
+
+    def refresh(self) -> bool:
+        """
+        Catch up with the saves of other processes. Returns False when the
+        index was compacted since it was loaded and has to be loaded again.
+        """
+        with self.lock:
+            try:
+                if (self.path / "meta.json").stat().st_mtime_ns != self.mtime:
+                    return False
+            except FileNotFoundError:
+                return False
+
+            self._replay_log()
+            return not self.is_stale()
+
+    def _add_doc(self, id: str, term_frequencies: dict[str, int]) -> int:
+        doc = len(self.ids)
+        self.ids.append(id)
+        self.id_map[id] = doc
+
+        for term, tf in term_frequencies.items():
+            self.delta.setdefault(term, []).append([doc, tf])
+        self.delta_size += len(term_frequencies)
+        return doc
+
+    def _delete_doc(self, doc: int):
+        self.id_map.pop(self.ids[doc], None)
+        self.alive[doc] = False
+        self.count -= 1
+        self.total_length -= int(self.lengths[doc])
+
+    def add(self, records: list[tuple[str, str, dict]]):
+        with self.lock:
+            # Re-added ids replace the previous version of the chunk
+            records = list({record[0]: record for record in records}.values())
+            self.delete([id for id, _, _ in records])
+
+            self.path.mkdir(parents=True, exist_ok=True)
+            offsets, lengths = [], []
+            with open(self._get_file("docs.jsonl", self.docs_generation), "ab") as f:
+                for id, text, metadata in records:
+                    offset = f.tell()
+                    f.write(
+                        json.dumps(
+                            {"id": id, "text": text, "metadata": metadata},
+                            ensure_ascii=False,
+                            default=str,
+                        ).encode("utf-8")
+                        + b"\n"
+                    )
+
+                    tokens = tokenize(
+                        get_enriched_text(text, metadata) if self.enriched else text
+                    )
+                    term_frequencies = dict(Counter(tokens))
+                    self._add_doc(id, term_frequencies)
+                    self.pending_docs.append(
+                        [id, offset, len(tokens), term_frequencies]
+                    )
+                    offsets.append(offset)
+                    lengths.append(len(tokens))
+
+            self.offsets = np.concatenate(
+                [self.offsets, np.array(offsets, dtype=np.int64)]
+            )
+            self.lengths = np.concatenate(
+                [self.lengths, np.array(lengths, dtype=np.int32)]
+            )
+            self.alive = np.concatenate([self.alive, np.ones(len(records), dtype=bool)])
+            self.count += len(records)
+            self.total_length += sum(lengths)
+
+    def delete(self, ids: list[str]):
+        with self.lock:
+            for id in ids:
+                doc = self.id_map.get(id)
+                if doc is not None:
+                    self._delete_doc(doc)
+                    self.pending_deletes.append(doc)
+                    self.tombstones += 1
+
+    def _get_postings(self, term: str) -> tuple[np.ndarray, np.ndarray]:
+        docs, tfs = [], []
+
+        span = self.terms.get(term)
+        if span:
+            start, count = span
+            docs.append(self.postings_docs[start : start + count])
+            tfs.append(self.postings_tfs[start : start + count])
+
+        delta = self.delta.get(term)
+        if delta:
+            postings = np.array(delta, dtype=np.int32)
+            docs.append(postings[:, 0])
+            tfs.append(postings[:, 1])
+
+        if not docs:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32)
+
+        docs = np.concatenate(docs)
+        tfs = np.concatenate(tfs)
+        mask = self.alive[docs]
+        return docs[mask], tfs[mask]
+
+    def search(self, query: str, k: int) -> list[tuple[int, float]]:
+        with self.lock:
+            if not self.count:
+                return []
+
+            avgdl = self.total_length / self.count
+            doc_parts, score_parts = [], []
+
+            # Only the postings of the query terms are touched; every query
+            # token contributes, like BM25Okapi.get_scores does
+            for term in tokenize(query):
+                docs, tfs = self._get_postings(term)
+                if not len(docs):
+                    continue
+
+                # Lucene-style idf, which stays positive for very common terms
+                df = len(docs)
+                idf = np.log(1 + (self.count - df + 0.5) / (df + 0.5))
+
+                tfs = tfs.astype(np.float64)
+                dl = self.lengths[docs]
+                doc_parts.append(docs)
+                score_parts.append(
+                    idf
+                    * tfs
+                    * (BM25_K1 + 1)
+                    / (tfs + BM25_K1 * (1 - BM25_B + BM25_B * dl / avgdl))
+                )
+
+            if not doc_parts:
+                return []
+
+            docs, inverse = np.unique(np.concatenate(doc_parts), return_inverse=True)
+            scores = np.bincount(inverse, weights=np.concatenate(score_parts))
+
+            if len(docs) > k:
+                top = np.argpartition(-scores, k)[:k]
+            else:
+                top = np.arange(len(docs))
+            top = top[np.argsort(-scores[top], kind="stable")]
+
+            return [(int(docs[i]), float(scores[i])) for i in top]
+
+    def get_records(self, docs: list[int]) -> list[tuple[str, str, dict]]:
+        records = []
+        with open(self._get_file("docs.jsonl", self.docs_generation), "rb") as f:
+            for doc in docs:
+                f.seek(int(self.offsets[doc]))
+                record = json.loads(f.readline())
+                records.append((record["id"], record["text"], record["metadata"]))
+        return records
+
+    def search_documents(self, query: str, k: int) -> list[Document]:
+        with self.lock:
+            results = self.search(query, k)
+            return [
+                Document(id=id, page_content=text, metadata=metadata)
+                for id, text, metadata in self.get_records([doc for doc, _ in results])
+            ]
+
+    def _compact(self):
+        terms = sorted(set(self.terms) | set(self.delta))
+
+        docs_parts, tfs_parts, spans, start = [], [], {}, 0
+        for term in terms:
+            docs, tfs = self._get_postings(term)
+            if len(docs):
+                spans[term] = [start, len(docs)]
+                start += len(docs)
+                docs_parts.append(docs)
+                tfs_parts.append(tfs)
+
+        self.terms = spans
+        self.postings_docs = (
+            np.concatenate(docs_parts).astype(np.int32)
+            if docs_parts
+            else np.empty(0, dtype=np.int32)
+        )
+        self.postings_tfs = (
+            np.concatenate(tfs_parts).astype(np.int32)
+            if tfs_parts
+            else np.empty(0, dtype=np.int32)
+        )
+        self.delta = {}
+        self.delta_size = 0
+
+    def rebuild(self, enriched: Optional[bool] = None):
+        """Re-index the live chunks, dropping tombstones from every file."""
+        with self.lock:
+            records = self.get_records(np.flatnonzero(self.alive).tolist())
+            if enriched is not None:
+                self.enriched = enriched
+
+            self._reset()
+            self.docs_generation = self.generation + 1
+            self.add(records)
+            self.save(compact=True)
+
+    def save(self, compact: bool = False):
+        with self.lock:
+            # Mostly deleted indexes are rebuilt rather than compacted
+            if (
+                len(self.ids) > COMPACTION_MIN_POSTINGS
+                and self.count < len(self.ids) / 2
+            ):
+                return self.rebuild()
+
+            self.path.mkdir(parents=True, exist_ok=True)
+
+            threshold = min(
+                max(
+                    len(self.postings_docs) * COMPACTION_RATIO, COMPACTION_MIN_POSTINGS
+                ),
+                COMPACTION_MAX_POSTINGS,
+            )
+            if (
+                compact
+                or self.mtime is None
+                or self.delta_size + self.tombstones > threshold
+            ):
+                self._save_compacted()
+            else:
+                self._append_log()
+
+            self.pending_docs = []
+            self.pending_deletes = []
+
+    def _append_log(self):
+        if not self.pending_docs and not self.pending_deletes:
+            return
+
+        line = (
+            json.dumps(
+                {"docs": self.pending_docs, "deleted": self.pending_deletes},
+                ensure_ascii=False,
+            ).encode("utf-8")
+            + b"\n"
+        )
+        with open(self._get_file("log.jsonl", self.generation), "ab") as f:
+            # Drop a torn line left by a writer that died mid-append
+            f.truncate(self.log_size)
+            f.write(line)
+        self.log_size += len(line)
+
+    def _save_compacted(self):
+        generation = self.generation + 1
+        self._compact()
+
+        np.save(self._get_file("postings_docs.npy", generation), self.postings_docs)
+        np.save(self._get_file("postings_tfs.npy", generation), self.postings_tfs)
+        np.save(self._get_file("offsets.npy", generation), self.offsets)
+        np.save(self._get_file("lengths.npy", generation), self.lengths)
+        np.save(self._get_file("alive.npy", generation), self.alive)
+        with open(self._get_file("index.json", generation), "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "ids": self.ids,
+                    "count": self.count,
+                    "total_length": self.total_length,
+                    "terms": self.terms,
+                    "postings_size": len(self.postings_docs),
+                },
+                f,
+                ensure_ascii=False,
+            )
+
+        meta_path = self.path / "meta.json"
+        tmp_path = self.path / f"meta.json.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "enriched": self.enriched,
+                    "generation": generation,
+                    "docs_generation": self.docs_generation,
+                },
+                f,
+            )
+        os.replace(tmp_path, meta_path)
+
+        self.generation = generation
+        self.tombstones = 0
+        self.log_size = 0
+        self.mtime = meta_path.stat().st_mtime_ns
+        self._remove_unused_files()
+
+    def _remove_unused_files(self):
+        used = {
+            self._get_file("docs.jsonl", self.docs_generation).name,
+            *(
+                self._get_file(name, self.generation).name
+                for name in (
+                    "index.json",
+                    "log.jsonl",
+                    "postings_docs.npy",
+                    "postings_tfs.npy",
+                    "offsets.npy",
+                    "lengths.npy",
+                    "alive.npy",
+                )
+            ),
+            "meta.json",
+        }
+        for file in self.path.iterdir():
+            if file.name not in used and not file.name.endswith(".tmp"):
+                try:
+                    file.unlink()
+                except OSError:
+                    pass
+
+
+class BM25IndexManager:
+    """Loads, caches (bounded LRU) and updates the BM25 index of each collection."""
+
+    def __init__(self, directory: Path, cache_size: int = 32):
+        self.directory = directory
+        self.cache_size = cache_size
+        self.indexes: OrderedDict[str, BM25Index] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def _get_path(self, collection_name: str) -> Path:
+        return self.directory / hashlib.sha256(collection_name.encode()).hexdigest()
+
+    def _cache(self, collection_name: str, index: Optional[BM25Index]):
+        with self.lock:
+            if index is None:
+                self.indexes.pop(collection_name, None)
+                return
+
+            self.indexes[collection_name] = index
+            self.indexes.move_to_end(collection_name)
+            while len(self.indexes) > self.cache_size:
+                self.indexes.popitem(last=False)
+
+    def get(self, collection_name: str) -> Optional[BM25Index]:
+        with self.lock:
+            index = self.indexes.get(collection_name)
+            if index is not None:
+                self.indexes.move_to_end(collection_name)
+
+        # Catch up when another process or instance has written the index,
+        # replaying only its new log entries unless it was compacted since
+        if index is None or index.is_stale():
+            if index is None or not index.refresh():
+                index = BM25Index.load(self._get_path(collection_name))
+                self._cache(collection_name, index)
+        return index
+
+    @contextmanager
+    def _lock_collection(self, collection_name: str):
+        """
+        Serialise the writers of a collection's index across threads and
+        processes (workers sharing DATA_DIR). The lock file sits next to the
+        index directory, which is removed and recreated on create.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._get_path(collection_name)
+        with open(path.with_name(f"{path.name}.lock"), "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _create(
+        self,
+        collection_name: str,
+        records: list[tuple[str, str, dict]],
+        enriched: bool,
+    ) -> BM25Index:
+        path = self._get_path(collection_name)
+        shutil.rmtree(path, ignore_errors=True)
+
+        index = BM25Index(path, enriched)
+        index.add(records)
+        index.save(compact=True)
+        self._cache(collection_name, index)
+        return index
+
+    def create(
+        self,
+        collection_name: str,
+        records: list[tuple[str, str, dict]],
+        enriched: bool,
+    ) -> BM25Index:
+        with self._lock_collection(collection_name):
+            return self._create(collection_name, records, enriched)
+
+    def get_or_create(
+        self,
+        collection_name: str,
+        enriched: bool,
+        get_result: Callable[[], Optional[GetResult]],
+    ) -> Optional[BM25Index]:
+        """
+        Return the index of a collection, building it from the vector DB the
+        first time (e.g. for collections ingested before the index existed).
+        """
+        index = self.get(collection_name)
+        if index is not None and index.enriched == enriched:
+            return index
+
+        with self._lock_collection(collection_name):
+            # Another writer may have built it while we waited for the lock
+            index = self.get(collection_name)
+            if index is None:
+                records = get_records(get_result())
+                if not records:
+                    return None
+                index = self._create(collection_name, records, enriched)
+            elif index.enriched != enriched:
+                index.rebuild(enriched)
+            return index
+
+    def update(self, collection_name: str, apply: Callable[[BM25Index], None]):
+        # Holding the lock from the reload to the save keeps the updates of
+        # other workers from being overwritten
+        with self._lock_collection(collection_name):
+            index = self.get(collection_name)
+            if index is None:
+                return
+
+            with index.lock:
+                apply(index)
+                index.save()
+
+    def drop(self, collection_name: str):
+        with self._lock_collection(collection_name):
+            self._cache(collection_name, None)
+            shutil.rmtree(self._get_path(collection_name), ignore_errors=True)
+
+    def drop_all(self):
+        with self.lock:
+            self.indexes.clear()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class BM25IndexedVectorDB(VectorDBBase):
+    """
+    Vector DB client wrapper that keeps the BM25 index of each collection in
+    sync with the writes made through it. Index maintenance never fails a
+    write; a collection whose index could not be updated is dropped and
+    rebuilt on its next hybrid search.
+    """
+
+    def __init__(self, client: VectorDBBase, indexes: BM25IndexManager):
+        self.client = client
+        self.indexes = indexes
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+    def _update_index(self, collection_name: str, apply: Callable[[BM25Index], None]):
+        try:
+            self.indexes.update(collection_name, apply)
+        except Exception as e:
+            log.exception(f"Failed to update BM25 index of {collection_name}: {e}")
+            self.indexes.drop(collection_name)
+
+    def _add_items(self, collection_name: str, items: List[VectorItem], is_new: bool):
+        records = [(item.id, item.text, item.metadata or {}) for item in items]
+        if is_new:
+            try:
+                self.indexes.create(
+                    collection_name,
+                    records,
+                    ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS.value,
+                )
+            except Exception as e:
+                log.exception(f"Failed to create BM25 index of {collection_name}: {e}")
+                self.indexes.drop(collection_name)
+        else:
+            self._update_index(collection_name, lambda index: index.add(records))
+
+    def has_collection(self, collection_name: str) -> bool:
+        return self.client.has_collection(collection_name)
+
+    def delete_collection(self, collection_name: str) -> None:
+        self.client.delete_collection(collection_name)
+        self.indexes.drop(collection_name)
+
+    def insert(self, collection_name: str, items: List[VectorItem]) -> None:
+        is_new = not self.client.has_collection(collection_name)
+        self.client.insert(collection_name, items)
+        self._add_items(collection_name, items, is_new)
+
+    def upsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        is_new = not self.client.has_collection(collection_name)
+        self.client.upsert(collection_name, items)
+        self._add_items(collection_name, items, is_new)
+
+    def search(
+        self,
+        collection_name: str,
+        vectors: List[List[Union[float, int]]],
+        filter: Optional[Dict] = None,
+        limit: int = 10,
+    ) -> Optional[SearchResult]:
+        return self.client.search(collection_name, vectors, filter, limit)
+
+    def query(
+        self, collection_name: str, filter: Dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        return self.client.query(collection_name, filter, limit)
+
+    def get(self, collection_name: str) -> Optional[GetResult]:
+        return self.client.get(collection_name)
+
+    def get_vectors(
+        self, collection_name: str, ids: List[str]
+    ) -> Optional[Dict[str, List[float]]]:
+        return self.client.get_vectors(collection_name, ids)
+
+    def delete(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict] = None,
+    ) -> None:
+        deleted_ids = ids
+        if ids is None and filter and self.indexes.get(collection_name):
+            # Resolve the filter before the matching chunks are gone
+            try:
+                result = self.client.query(collection_name, filter)
+                deleted_ids = result.ids[0] if result and result.ids else []
+            except Exception as e:
+                log.exception(f"Failed to resolve BM25 index deletes: {e}")
+                self.indexes.drop(collection_name)
+
+        self.client.delete(collection_name, ids=ids, filter=filter)
+
+        if deleted_ids:
+            self._update_index(collection_name, lambda index: index.delete(deleted_ids))
+
+    def reset(self) -> None:
+        self.client.reset()
+        self.indexes.drop_all()
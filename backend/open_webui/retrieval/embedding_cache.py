@@ -0,0 +1,225 @@
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from open_webui.env import (
+    REDIS_CLUSTER,
+    REDIS_KEY_PREFIX,
+    REDIS_SENTINEL_HOSTS,
+    REDIS_SENTINEL_PORT,
+    REDIS_URL,
+)
+from open_webui.utils.redis import get_redis_connection, get_sentinels_from_env
+
+log = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """
+    Content-addressed embedding cache: a bounded in-memory LRU, optionally
+    backed by Redis (shared between instances) or a SQLite file on disk.
+    Vectors are stored as float32.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        storage: str = "",
+        ttl: Optional[int] = None,
+        directory: Optional[Path] = None,
+    ):
+        self.size = size
+        self.ttl = ttl
+        self.entries: OrderedDict[str, np.ndarray] = OrderedDict()
+        self.lock = threading.Lock()
+
+        self.redis = None
+        self.db_path = None
+
+        if storage == "redis":
+            if REDIS_URL:
+                self.redis = get_redis_connection(
+                    redis_url=REDIS_URL,
+                    redis_sentinels=get_sentinels_from_env(
+                        REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT
+                    ),
+                    redis_cluster=REDIS_CLUSTER,
+                    async_mode=True,
+                    decode_responses=False,
+                )
+            else:
+                log.warning("Embedding cache storage is redis but REDIS_URL is not set")
+        elif storage == "disk" and directory is not None:
+            self.db_path = directory / "embeddings.db"
+            self._init_db()
+        elif storage:
+            log.warning(f"Unknown embedding cache storage: {storage}")
+
+    @staticmethod
+    def get_key(engine: str, model: str, prefix: Optional[str], text: str) -> str:
+        namespace = hashlib.sha256(
+            f"{engine}\n{model}\n{prefix or ''}".encode()
+        ).hexdigest()[:16]
+        return f"{namespace}:{hashlib.sha256(text.encode()).hexdigest()}"
+
+    def _get_redis_key(self, key: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:embeddings:{key}"
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _init_db(self):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embedding "
+                "(key TEXT PRIMARY KEY, vector BLOB NOT NULL, created_at INTEGER NOT NULL)"
+            )
+            if self.ttl:
+                conn.execute(
+                    "DELETE FROM embedding WHERE created_at < ?",
+                    (int(time.time()) - self.ttl,),
+                )
+
+    def _get_from_db(self, keys: list[str]) -> dict[str, bytes]:
+        found = {}
+        with closing(self._connect()) as conn, conn:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i : i + 500]
+                rows = conn.execute(
+                    f"SELECT key, vector FROM embedding "
+                    f"WHERE key IN ({','.join('?' * len(chunk))}) AND created_at >= ?",
+                    (*chunk, int(time.time()) - self.ttl if self.ttl else 0),
+                ).fetchall()
+                found.update(rows)
+        return found
+
+    def _set_in_db(self, entries: dict[str, bytes]):
+        now = int(time.time())
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embedding (key, vector, created_at) VALUES (?, ?, ?)",
+                [(key, vector, now) for key, vector in entries.items()],
+            )
+
+    def _remember(self, entries: dict[str, np.ndarray]):
+        with self.lock:
+            for key, vector in entries.items():
+                self.entries[key] = vector
+                self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    async def get_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        found = {}
+        with self.lock:
+            for key in keys:
+                vector = self.entries.get(key)
+                if vector is not None:
+                    self.entries.move_to_end(key)
+                    found[key] = vector
+
+        missing = list(dict.fromkeys(key for key in keys if key not in found))
+        if not missing or (self.redis is None and self.db_path is None):
+            return found
+
+        stored = {}
+        try:
+            if self.redis is not None:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    for key in missing:
+                        pipe.get(self._get_redis_key(key))
+                    values = await pipe.execute()
+                stored = {
+                    key: value
+                    for key, value in zip(missing, values)
+                    if value is not None
+                }
+            else:
+                stored = await asyncio.to_thread(self._get_from_db, missing)
+        except Exception as e:
+            log.warning(f"Failed to read embedding cache: {e}")
+
+        stored = {
+            key: np.frombuffer(value, dtype=np.float32) for key, value in stored.items()
+        }
+        self._remember(stored)
+        found.update(stored)
+        return found
+
+    async def set_many(self, entries: dict[str, list[float]]):
+        vectors = {
+            key: np.asarray(embedding, dtype=np.float32)
+            for key, embedding in entries.items()
+        }
+        self._remember(vectors)
+
+        if self.redis is None and self.db_path is None:
+            return
+
+        try:
+            if self.redis is not None:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    for key, vector in vectors.items():
+                        pipe.set(
+                            self._get_redis_key(key), vector.tobytes(), ex=self.ttl
+                        )
+                    await pipe.execute()
+            else:
+                await asyncio.to_thread(
+                    self._set_in_db,
+                    {key: vector.tobytes() for key, vector in vectors.items()},
+                )
+        except Exception as e:
+            log.warning(f"Failed to write embedding cache: {e}")
+
+
+def get_cached_embedding_function(
+    embedding_function, engine: str, model: str, cache: EmbeddingCache
+):
+    async def cached_embedding_function(query, prefix=None, user=None):
+        texts = query if isinstance(query, list) else [query]
+        keys = [cache.get_key(engine, model, prefix, text) for text in texts]
+        embeddings = await cache.get_many(keys)
+
+        # Embed each missing text once, even when it repeats within the batch
+        missing = {key: text for key, text in zip(keys, texts) if key not in embeddings}
+        if missing:
+            log.debug(
+                f"embedding cache: {len(texts) - len(missing)} hits, {len(missing)} misses"
+            )
+            result = await embedding_function(
+                list(missing.values()), prefix=prefix, user=user
+            )
+            if not result or len(result) != len(missing):
+                # A short batch cannot be matched to the texts; fail as the
+                # embedding function does without the cache
+                log.error(
+                    f"Expected {len(missing)} embeddings, got {len(result) if result else 0}"
+                )
+                return None
+
+            computed = dict(zip(missing.keys(), result))
+            await cache.set_many(computed)
+            embeddings.update(computed)
+
+        results = [
+            (
+                embeddings[key].tolist()
+                if isinstance(embeddings[key], np.ndarray)
+                else embeddings[key]
+            )
+            for key in keys
+        ]
+        return results if isinstance(query, list) else results[0]
+
+    return cached_embedding_function
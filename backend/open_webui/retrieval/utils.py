@@ -6,6 +6,7 @@ import requests
 import aiohttp
 import asyncio
 import hashlib
+import numpy as np
 from concurrent.futures import ThreadPoolExecutor
 import time
 import re
@@ -20,7 +21,8 @@ from langchain_community.retrievers import BM25Retriever
 from langchain_core.documents import Document
 
 from open_webui.config import VECTOR_DB
-from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.vector.factory import BM25_INDEXES, VECTOR_DB_CLIENT
+from open_webui.retrieval.bm25 import BM25Index, get_enriched_text
 
 
 from open_webui.models.users import UserModel
@@ -46,13 +48,33 @@ from open_webui.env import (
     AIOHTTP_CLIENT_SESSION_SSL,
 )
 from open_webui.config import (
+    CACHE_DIR,
+    ENABLE_RAG_EMBEDDING_CACHE,
+    RAG_EMBEDDING_CACHE_SIZE,
+    RAG_EMBEDDING_CACHE_STORAGE,
+    RAG_EMBEDDING_CACHE_TTL,
     RAG_EMBEDDING_QUERY_PREFIX,
     RAG_EMBEDDING_CONTENT_PREFIX,
     RAG_EMBEDDING_PREFIX_FIELD_NAME,
 )
+from open_webui.retrieval.embedding_cache import (
+    EmbeddingCache,
+    get_cached_embedding_function,
+)
 
 log = logging.getLogger(__name__)
 
+EMBEDDING_CACHE = (
+    EmbeddingCache(
+        RAG_EMBEDDING_CACHE_SIZE,
+        RAG_EMBEDDING_CACHE_STORAGE,
+        RAG_EMBEDDING_CACHE_TTL,
+        CACHE_DIR,
+    )
+    if ENABLE_RAG_EMBEDDING_CACHE
+    else None
+)
+
 
 from typing import Any
 
@@ -92,6 +114,8 @@ class VectorSearchRetriever(BaseRetriever):
     collection_name: Any
     embedding_function: Any
     top_k: int
+    # Shared with RerankCompressor so the query is only embedded once
+    query_embeddings: Optional[dict] = None
 
     def _get_relevant_documents(
         self, query: str, *, run_manager: CallbackManagerForRetrieverRun
@@ -114,6 +138,9 @@ class VectorSearchRetriever(BaseRetriever):
         run_manager: CallbackManagerForRetrieverRun,
     ) -> list[Document]:
         embedding = await self.embedding_function(query, RAG_EMBEDDING_QUERY_PREFIX)
+        if self.query_embeddings is not None:
+            self.query_embeddings[query] = embedding
+
         result = VECTOR_DB_CLIENT.search(
             collection_name=self.collection_name,
             vectors=[embedding],
@@ -128,6 +155,7 @@ class VectorSearchRetriever(BaseRetriever):
         for idx in range(len(ids)):
             results.append(
                 Document(
+                    id=str(ids[idx]),
                     metadata=metadatas[idx],
                     page_content=documents[idx],
                 )
@@ -135,6 +163,24 @@ class VectorSearchRetriever(BaseRetriever):
         return results
 
 
+class BM25IndexRetriever(BaseRetriever):
+    index: Any
+    k: int
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> list[Document]:
+        return self.index.search_documents(query, self.k)
+
+    async def _aget_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: CallbackManagerForRetrieverRun,
+    ) -> list[Document]:
+        return await asyncio.to_thread(self.index.search_documents, query, self.k)
+
+
 def query_doc(
     collection_name: str, query_embedding: list[float], k: int, user: UserModel = None
 ):
@@ -170,41 +216,27 @@ def get_doc(collection_name: str, user: UserModel = None):
 
 
 def get_enriched_texts(collection_result: GetResult) -> list[str]:
-    enriched_texts = []
-    for idx, text in enumerate(collection_result.documents[0]):
-        metadata = collection_result.metadatas[0][idx]
-        metadata_parts = [text]
-
-        # Add filename (repeat twice for extra weight in BM25 scoring)
-        if metadata.get("name"):
-            filename = metadata["name"]
-            filename_tokens = (
-                filename.replace("_", " ").replace("-", " ").replace(".", " ")
-            )
-            metadata_parts.append(
-                f"Filename: {filename} {filename_tokens} {filename_tokens}"
-            )
-
-        # Add title if available
-        if metadata.get("title"):
-            metadata_parts.append(f"Title: {metadata['title']}")
-
-        # Add document section headings if available (from markdown splitter)
-        if metadata.get("headings") and isinstance(metadata["headings"], list):
-            headings = " > ".join(str(h) for h in metadata["headings"])
-            metadata_parts.append(f"Section: {headings}")
-
-        # Add source URL/path if available
-        if metadata.get("source"):
-            metadata_parts.append(f"Source: {metadata['source']}")
+    return [
+        get_enriched_text(text, collection_result.metadatas[0][idx])
+        for idx, text in enumerate(collection_result.documents[0])
+    ]
 
-        # Add snippet for web search results
-        if metadata.get("snippet"):
-            metadata_parts.append(f"Snippet: {metadata['snippet']}")
 
-        enriched_texts.append(" ".join(metadata_parts))
+def get_bm25_index(
+    collection_name: str, enable_enriched_texts: bool = False
+) -> Optional[BM25Index]:
+    if BM25_INDEXES is None:
+        return None
 
-    return enriched_texts
+    try:
+        return BM25_INDEXES.get_or_create(
+            collection_name,
+            enable_enriched_texts,
+            lambda: VECTOR_DB_CLIENT.get(collection_name=collection_name),
+        )
+    except Exception as e:
+        log.exception(f"Failed to load BM25 index of {collection_name}: {e}")
+        return None
 
 
 async def query_doc_with_hybrid_search(
@@ -218,10 +250,15 @@ async def query_doc_with_hybrid_search(
     r: float,
     hybrid_bm25_weight: float,
     enable_enriched_texts: bool = False,
+    bm25_index: Optional[BM25Index] = None,
 ) -> dict:
     try:
+        if bm25_index is not None:
+            if not bm25_index.count:
+                log.warning(f"query_doc_with_hybrid_search:no_docs {collection_name}")
+                return {"documents": [], "metadatas": [], "distances": []}
         # First check if collection_result has the required attributes
-        if (
+        elif (
             not collection_result
             or not hasattr(collection_result, "documents")
             or not hasattr(collection_result, "metadatas")
@@ -230,7 +267,7 @@ async def query_doc_with_hybrid_search(
             return {"documents": [], "metadatas": [], "distances": []}
 
         # Now safely check the documents content after confirming attributes exist
-        if (
+        elif (
             not collection_result.documents
             or len(collection_result.documents) == 0
             or not collection_result.documents[0]
@@ -240,22 +277,29 @@ async def query_doc_with_hybrid_search(
 
         log.debug(f"query_doc_with_hybrid_search:doc {collection_name}")
 
-        bm25_texts = (
-            get_enriched_texts(collection_result)
-            if enable_enriched_texts
-            else collection_result.documents[0]
-        )
+        if bm25_index is not None:
+            # Scores only the postings of the query terms
+            bm25_retriever = BM25IndexRetriever(index=bm25_index, k=k)
+        else:
+            bm25_texts = (
+                get_enriched_texts(collection_result)
+                if enable_enriched_texts
+                else collection_result.documents[0]
+            )
 
-        bm25_retriever = BM25Retriever.from_texts(
-            texts=bm25_texts,
-            metadatas=collection_result.metadatas[0],
-        )
-        bm25_retriever.k = k
+            bm25_retriever = BM25Retriever.from_texts(
+                texts=bm25_texts,
+                metadatas=collection_result.metadatas[0],
+                ids=[str(id) for id in collection_result.ids[0]],
+            )
+            bm25_retriever.k = k
 
+        query_embeddings = {}
         vector_search_retriever = VectorSearchRetriever(
             collection_name=collection_name,
             embedding_function=embedding_function,
             top_k=k,
+            query_embeddings=query_embeddings,
         )
 
         if hybrid_bm25_weight <= 0:
@@ -277,6 +321,8 @@ async def query_doc_with_hybrid_search(
             top_n=k_reranker,
             reranking_function=reranking_function,
             r_score=r,
+            collection_name=collection_name,
+            query_embeddings=query_embeddings,
         )
 
         compression_retriever = ContextualCompressionRetriever(
@@ -472,7 +518,19 @@ async def query_collection_with_hybrid_search(
     # Fetch collection data once per collection sequentially
     # Avoid fetching the same data multiple times later
     collection_results = {}
+    bm25_indexes = {}
     for collection_name in collection_names:
+        # The persistent BM25 index makes the full collection fetch unnecessary.
+        # Loading or building it reads files and the vector DB, off the loop.
+        bm25_indexes[collection_name] = await asyncio.to_thread(
+            get_bm25_index, collection_name, enable_enriched_texts
+        )
+        if bm25_indexes[collection_name] is not None:
+            collection_results[collection_name] = GetResult(
+                ids=None, documents=None, metadatas=None
+            )
+            continue
+
         try:
             log.debug(
                 f"query_collection_with_hybrid_search:VECTOR_DB_CLIENT.get:collection {collection_name}"
@@ -501,6 +559,7 @@ async def query_collection_with_hybrid_search(
                 r=r,
                 hybrid_bm25_weight=hybrid_bm25_weight,
                 enable_enriched_texts=enable_enriched_texts,
+                bm25_index=bm25_indexes[collection_name],
             )
             return result, None
         except Exception as e:
@@ -794,6 +853,14 @@ async def agenerate_ollama_batch_embeddings(
         return None
 
 
+def with_embedding_cache(embedding_function, embedding_engine, embedding_model):
+    if EMBEDDING_CACHE is None:
+        return embedding_function
+    return get_cached_embedding_function(
+        embedding_function, embedding_engine, embedding_model, EMBEDDING_CACHE
+    )
+
+
 def get_embedding_function(
     embedding_engine,
     embedding_model,
@@ -819,7 +886,9 @@ def get_embedding_function(
                 prefix,
             )
 
-        return async_embedding_function
+        return with_embedding_cache(
+            async_embedding_function, embedding_engine, embedding_model
+        )
     elif embedding_engine in ["ollama", "openai", "azure_openai"]:
         embedding_function = lambda query, prefix=None, user=None: generate_embeddings(
             engine=embedding_engine,
@@ -873,7 +942,9 @@ def get_embedding_function(
             else:
                 return await embedding_function(query, prefix, user)
 
-        return async_embedding_function
+        return with_embedding_cache(
+            async_embedding_function, embedding_engine, embedding_model
+        )
     else:
         raise ValueError(f"Unknown embedding engine: {embedding_engine}")
 
@@ -1279,11 +1350,22 @@ from langchain_core.callbacks import Callbacks
 from langchain_core.documents import BaseDocumentCompressor, Document
 
 
+def get_cosine_similarities(query_embedding, embeddings) -> list[float]:
+    query = np.asarray(query_embedding, dtype=np.float32).reshape(-1)
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+    return (matrix @ query / np.where(norms == 0, 1, norms)).tolist()
+
+
 class RerankCompressor(BaseDocumentCompressor):
     embedding_function: Any
     top_n: int
     reranking_function: Any
     r_score: float
+    # Without a reranking model, candidates are scored against their stored
+    # vectors in this collection instead of being embedded again
+    collection_name: Optional[str] = None
+    query_embeddings: Optional[dict] = None
 
     class Config:
         extra = "forbid"
@@ -1320,15 +1402,15 @@ class RerankCompressor(BaseDocumentCompressor):
         if reranking:
             scores = await asyncio.to_thread(self.reranking_function, query, documents)
         else:
-            from sentence_transformers import util
-
-            query_embedding = await self.embedding_function(
-                query, RAG_EMBEDDING_QUERY_PREFIX
-            )
-            document_embedding = await self.embedding_function(
-                [doc.page_content for doc in documents], RAG_EMBEDDING_CONTENT_PREFIX
+            query_embedding = (self.query_embeddings or {}).get(query)
+            if query_embedding is None:
+                query_embedding = await self.embedding_function(
+                    query, RAG_EMBEDDING_QUERY_PREFIX
+                )
+            document_embeddings = await self._get_document_embeddings(
+                documents, np.asarray(query_embedding).size
             )
-            scores = util.cos_sim(query_embedding, document_embedding)[0]
+            scores = get_cosine_similarities(query_embedding, document_embeddings)
 
         if scores is not None:
             docs_with_scores = list(
@@ -1358,3 +1440,39 @@ class RerankCompressor(BaseDocumentCompressor):
                 "No valid scores found, check your reranking function. Returning original documents."
             )
             return documents
+
+    async def _get_document_embeddings(
+        self, documents: Sequence[Document], dimension: int
+    ) -> list:
+        vectors = {}
+        ids = [doc.id for doc in documents if doc.id]
+        if self.collection_name and ids:
+            try:
+                vectors = (
+                    await asyncio.to_thread(
+                        VECTOR_DB_CLIENT.get_vectors, self.collection_name, ids
+                    )
+                    or {}
+                )
+            except Exception as e:
+                log.warning(f"Failed to get stored vectors: {e}")
+
+        # Only documents without a usable stored vector are embedded again
+        embeddings = [
+            (
+                vectors[doc.id]
+                if doc.id in vectors and len(vectors[doc.id]) == dimension
+                else None
+            )
+            for doc in documents
+        ]
+        missing = [idx for idx, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            missing_embeddings = await self.embedding_function(
+                [documents[idx].page_content for idx in missing],
+                RAG_EMBEDDING_CONTENT_PREFIX,
+            )
+            for idx, embedding in zip(missing, missing_embeddings):
+                embeddings[idx] = embedding
+
+        return embeddings
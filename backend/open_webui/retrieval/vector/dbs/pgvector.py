@@ -662,6 +662,33 @@ class PgvectorClient(VectorDBBase):
             log.exception(f"Error during get: {e}")
             return None
 
+    def get_vectors(
+        self, collection_name: str, ids: List[str]
+    ) -> Optional[Dict[str, List[float]]]:
+        try:
+            results = self.session.execute(
+                select(DocumentChunk.id, DocumentChunk.vector).where(
+                    DocumentChunk.collection_name == collection_name,
+                    DocumentChunk.id.in_(ids),
+                )
+            ).all()
+            self.session.rollback()  # read-only transaction
+
+            # halfvec columns load as HalfVector, vector columns as numpy arrays
+            return {
+                row.id: (
+                    row.vector.to_list()
+                    if hasattr(row.vector, "to_list")
+                    else row.vector
+                )
+                for row in results
+                if row.vector is not None
+            }
+        except Exception as e:
+            self.session.rollback()
+            log.exception(f"Error during get_vectors: {e}")
+            return None
+
     def delete(
         self,
         collection_name: str,
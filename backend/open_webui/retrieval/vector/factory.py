@@ -1,6 +1,10 @@
 from open_webui.retrieval.vector.main import VectorDBBase
 from open_webui.retrieval.vector.type import VectorType
+from open_webui.retrieval.bm25 import BM25IndexManager, BM25IndexedVectorDB
 from open_webui.config import (
+    CACHE_DIR,
+    ENABLE_RAG_BM25_INDEX,
+    RAG_BM25_INDEX_CACHE_SIZE,
     VECTOR_DB,
     ENABLE_QDRANT_MULTITENANCY_MODE,
     ENABLE_MILVUS_MULTITENANCY_MODE,
@@ -80,3 +84,8 @@ class Vector:
 
 
 VECTOR_DB_CLIENT = Vector.get_vector(VECTOR_DB)
+
+BM25_INDEXES = None
+if ENABLE_RAG_BM25_INDEX:
+    BM25_INDEXES = BM25IndexManager(CACHE_DIR / "bm25", RAG_BM25_INDEX_CACHE_SIZE)
+    VECTOR_DB_CLIENT = BM25IndexedVectorDB(VECTOR_DB_CLIENT, BM25_INDEXES)
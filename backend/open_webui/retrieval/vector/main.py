@@ -74,6 +74,12 @@ class VectorDBBase(ABC):
         """Retrieve all vectors from a collection."""
         pass
 
+    def get_vectors(
+        self, collection_name: str, ids: List[str]
+    ) -> Optional[Dict[str, List[float]]]:
+        """Retrieve the stored vectors of the given ids, or None if the backend does not support it."""
+        return None
+
     @abstractmethod
     def delete(
         self,
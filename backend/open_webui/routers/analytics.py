@@ -1,6 +1,7 @@
 from typing import Optional
 from datetime import datetime, timedelta
 from collections import defaultdict
+import asyncio
 import logging
 from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel
@@ -11,7 +12,8 @@ from open_webui.models.groups import Groups
 from open_webui.models.users import Users
 from open_webui.models.feedbacks import Feedbacks
 from open_webui.utils.auth import get_admin_user
-from open_webui.internal.db import get_session
+from open_webui.internal.db import get_session, run_db
+from open_webui.env import ANALYTICS_ROLLUP_INTERVAL
 from sqlalchemy.orm import Session
 
 log = logging.getLogger(__name__)
@@ -20,6 +22,16 @@ log = logging.getLogger(__name__)
 router = APIRouter()
 
 
+async def periodic_rollup_compaction():
+    """Roll up chat messages into the hourly analytics totals."""
+    while True:
+        try:
+            await run_db(ChatMessages.compact_rollups)
+        except Exception as e:
+            log.warning(f"Analytics rollup compaction failed: {e}")
+        await asyncio.sleep(ANALYTICS_ROLLUP_INTERVAL)
+
+
 ####################
 # Response Models
 ####################
@@ -169,13 +181,13 @@ async def get_summary(
     user_counts = ChatMessages.get_message_count_by_user(
         start_date=start_date, end_date=end_date, group_id=group_id, db=db
     )
-    chat_counts = ChatMessages.get_message_count_by_chat(
+    chat_count = ChatMessages.get_chat_count(
         start_date=start_date, end_date=end_date, group_id=group_id, db=db
     )
 
     return SummaryResponse(
         total_messages=sum(model_counts.values()),
-        total_chats=len(chat_counts),
+        total_chats=chat_count,
         total_models=len(model_counts),
         total_users=len(user_counts),
     )
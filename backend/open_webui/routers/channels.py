@@ -53,18 +53,15 @@ from open_webui.constants import ERROR_MESSAGES
 from open_webui.env import STATIC_DIR
 
 
-from open_webui.utils.models import (
-    get_all_models,
-    get_filtered_models,
-)
+from open_webui.utils.models import get_user_models
 from open_webui.utils.chat import generate_chat_completion
 
 
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_permission
-from open_webui.utils.webhook import post_webhook
+from open_webui.utils.webhook import WEBHOOK_DISPATCHER
 from open_webui.utils.channels import extract_mentions, replace_mentions
-from open_webui.internal.db import get_session
+from open_webui.internal.db import get_session, run_db
 from sqlalchemy.orm import Session
 
 log = logging.getLogger(__name__)
@@ -177,37 +174,41 @@ async def get_channels(
     check_channels_access(request, user)
 
     channels = Channels.get_channels_by_user_id(user.id, db=db)
-    channel_list = []
-    for channel in channels:
-        last_message = Messages.get_last_message_by_channel_id(channel.id, db=db)
-        last_message_at = last_message.created_at if last_message else None
+    channel_ids = [channel.id for channel in channels]
 
-        channel_member = Channels.get_member_by_channel_and_user_id(
-            channel.id, user.id, db=db
-        )
-        unread_count = (
-            Messages.get_unread_message_count(
-                channel.id, user.id, channel_member.last_read_at, db=db
-            )
-            if channel_member
-            else 0
-        )
+    last_message_at = Messages.get_last_message_at_by_channel_ids(channel_ids, db=db)
+    unread_counts = Messages.get_unread_message_counts_by_channel_ids(
+        channel_ids, user.id, db=db
+    )
+
+    # Members of the DM channels, with their users fetched in a single query
+    dm_members = Channels.get_members_by_channel_ids(
+        [channel.id for channel in channels if channel.type == "dm"], db=db
+    )
+    dm_user_ids = list(
+        {member.user_id for members in dm_members.values() for member in members}
+    )
+    dm_users = (
+        {u.id: u for u in Users.get_users_by_user_ids(dm_user_ids, db=db)}
+        if dm_user_ids
+        else {}
+    )
 
+    channel_list = []
+    for channel in channels:
         user_ids = None
         users = None
         if channel.type == "dm":
-            user_ids = [
-                member.user_id
-                for member in Channels.get_members_by_channel_id(channel.id, db=db)
-            ]
+            user_ids = [member.user_id for member in dm_members[channel.id]]
             users = [
                 UserIdNameStatusResponse(
                     **{
-                        **user.model_dump(),
-                        "is_active": Users.is_active(user),
+                        **dm_users[user_id].model_dump(),
+                        "is_active": Users.is_active(dm_users[user_id]),
                     }
                 )
-                for user in Users.get_users_by_user_ids(user_ids, db=db)
+                for user_id in user_ids
+                if user_id in dm_users
             ]
 
         channel_list.append(
@@ -215,8 +216,8 @@ async def get_channels(
                 **channel.model_dump(),
                 user_ids=user_ids,
                 users=users,
-                last_message_at=last_message_at,
-                unread_count=unread_count,
+                last_message_at=last_message_at.get(channel.id),
+                unread_count=unread_counts.get(channel.id, 0),
             )
         )
 
@@ -832,12 +833,13 @@ async def get_channel_messages(
     user_ids = list(set(m.user_id for m in message_list))
     users = {u.id: u for u in Users.get_users_by_user_ids(user_ids, db=db)}
 
+    message_ids = [message.id for message in message_list]
+    reply_stats = Messages.get_thread_reply_stats_by_message_ids(message_ids, db=db)
+    reactions = Messages.get_reactions_by_message_ids(message_ids, db=db)
+
     messages = []
     for message in message_list:
-        thread_replies = Messages.get_thread_replies_by_message_id(message.id, db=db)
-        latest_thread_reply_at = (
-            thread_replies[0].created_at if thread_replies else None
-        )
+        reply_count, latest_reply_at = reply_stats.get(message.id, (0, None))
 
         # Use message.user if present (for webhooks), otherwise look up by user_id
         user_info = message.user
@@ -848,11 +850,9 @@ async def get_channel_messages(
             MessageUserResponse(
                 **{
                     **message.model_dump(),
-                    "reply_count": len(thread_replies),
-                    "latest_reply_at": latest_thread_reply_at,
-                    "reactions": Messages.get_reactions_by_message_id(
-                        message.id, db=db
-                    ),
+                    "reply_count": reply_count,
+                    "latest_reply_at": latest_reply_at,
+                    "reactions": reactions[message.id],
                     "user": user_info,
                 }
             )
@@ -908,6 +908,9 @@ async def get_pinned_channel_messages(
     # Batch fetch all users in a single query (fixes N+1 problem)
     user_ids = list(set(m.user_id for m in message_list))
     users = {u.id: u for u in Users.get_users_by_user_ids(user_ids, db=db)}
+    reactions = Messages.get_reactions_by_message_ids(
+        [message.id for message in message_list], db=db
+    )
 
     messages = []
     for message in message_list:
@@ -928,9 +931,7 @@ async def get_pinned_channel_messages(
             MessageWithReactionsResponse(
                 **{
                     **message.model_dump(),
-                    "reactions": Messages.get_reactions_by_message_id(
-                        message.id, db=db
-                    ),
+                    "reactions": reactions[message.id],
                     "user": user_info,
                 }
             )
@@ -944,40 +945,56 @@ async def get_pinned_channel_messages(
 ############################
 
 
+def get_notification_webhook_urls(
+    channel: ChannelModel, active_user_ids, db: Optional[Session] = None
+) -> list[str]:
+    """Webhook URLs of the channel members with read access that are not active in it."""
+    permitted_ids = get_channel_permitted_group_and_user_ids(channel, "read") or {}
+    settings = Users.get_channel_member_settings(
+        channel.id,
+        user_ids=permitted_ids.get("user_ids"),
+        group_ids=permitted_ids.get("group_ids"),
+        db=db,
+    )
+
+    active_user_ids = set(active_user_ids)
+    urls = []
+    for user_id, user_settings in settings.items():
+        if user_id in active_user_ids or not user_settings:
+            continue
+        webhook_url = (
+            (user_settings.ui or {}).get("notifications", {}).get("webhook_url", None)
+        )
+        if webhook_url:
+            urls.append(webhook_url)
+    return urls
+
+
 async def send_notification(
     name, webui_url, channel, message, active_user_ids, db=None
 ):
-    users = get_channel_users_with_access(channel, "read", db=db)
+    webhook_urls = await run_db(
+        get_notification_webhook_urls, channel, active_user_ids, db=db
+    )
 
-    for user in users:
-        if (user.id not in active_user_ids) and Channels.is_user_channel_member(
-            channel.id, user.id, db=db
-        ):
-            if user.settings:
-                webhook_url = user.settings.ui.get("notifications", {}).get(
-                    "webhook_url", None
-                )
-                if webhook_url:
-                    await post_webhook(
-                        name,
-                        webhook_url,
-                        f"#{channel.name} - {webui_url}/channels/{channel.id}\n\n{message.content}",
-                        {
-                            "action": "channel",
-                            "message": message.content,
-                            "title": channel.name,
-                            "url": f"{webui_url}/channels/{channel.id}",
-                        },
-                    )
+    # Posted in the background, once per distinct webhook URL
+    WEBHOOK_DISPATCHER.dispatch(
+        name,
+        webhook_urls,
+        f"#{channel.name} - {webui_url}/channels/{channel.id}\n\n{message.content}",
+        {
+            "action": "channel",
+            "message": message.content,
+            "title": channel.name,
+            "url": f"{webui_url}/channels/{channel.id}",
+        },
+    )
 
     return True
 
 
 async def model_response_handler(request, channel, message, user, db=None):
-    MODELS = {
-        model["id"]: model
-        for model in get_filtered_models(await get_all_models(request, user=user), user)
-    }
+    MODELS = {model["id"]: model for model in await get_user_models(request, user)}
 
     mentions = extract_mentions(message.content)
     message_content = replace_mentions(message.content)
@@ -1271,7 +1288,6 @@ async def post_new_message(
         # Background tasks should manage their own short-lived sessions to avoid
         # holding database connections during slow operations (e.g., LLM calls).
         async def background_handler():
-            await model_response_handler(request, channel, message, user)
             await send_notification(
                 request.app.state.WEBUI_NAME,
                 request.app.state.config.WEBUI_URL,
@@ -1279,6 +1295,7 @@ async def post_new_message(
                 message,
                 active_user_ids,
             )
+            await model_response_handler(request, channel, message, user)
 
         background_tasks.add_task(background_handler)
 
@@ -1510,6 +1527,9 @@ async def get_channel_thread_messages(
     # Batch fetch all users in a single query (fixes N+1 problem)
     user_ids = list(set(m.user_id for m in message_list))
     users = {u.id: u for u in Users.get_users_by_user_ids(user_ids, db=db)}
+    reactions = Messages.get_reactions_by_message_ids(
+        [message.id for message in message_list], db=db
+    )
 
     messages = []
     for message in message_list:
@@ -1524,9 +1544,7 @@ async def get_channel_thread_messages(
                     **message.model_dump(),
                     "reply_count": 0,
                     "latest_reply_at": None,
-                    "reactions": Messages.get_reactions_by_message_id(
-                        message.id, db=db
-                    ),
+                    "reactions": reactions[message.id],
                     "user": user_info,
                 }
             )
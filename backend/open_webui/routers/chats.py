@@ -9,6 +9,7 @@ from fastapi.responses import StreamingResponse
 from open_webui.utils.misc import get_message_list
 from open_webui.socket.main import get_event_emitter
 from open_webui.models.chats import (
+    AsyncChats,
     ChatForm,
     ChatImportForm,
     ChatUsageStatsListResponse,
@@ -50,12 +51,25 @@ router = APIRouter()
 def get_session_user_chat_list(
     user=Depends(get_verified_user),
     page: Optional[int] = None,
+    cursor: Optional[str] = None,
     include_pinned: Optional[bool] = False,
     include_folders: Optional[bool] = False,
     db: Session = Depends(get_session),
 ):
     try:
-        if page is not None:
+        if cursor is not None:
+            # "<updated_at>:<id>" of the last chat of the previous page
+            updated_at, _, chat_id = cursor.partition(":")
+
+            return Chats.get_chat_title_id_list_by_user_id(
+                user.id,
+                include_folders=include_folders,
+                include_pinned=include_pinned,
+                cursor=(int(updated_at), chat_id),
+                limit=60,
+                db=db,
+            )
+        elif page is not None:
             limit = 60
             skip = (page - 1) * limit
 
@@ -646,12 +660,9 @@ def search_user_chats(
     limit = 60
     skip = (page - 1) * limit
 
-    chat_list = [
-        ChatTitleIdResponse(**chat.model_dump())
-        for chat in Chats.get_chats_by_user_id_and_search_text(
-            user.id, text, skip=skip, limit=limit, db=db
-        )
-    ]
+    chat_list = Chats.get_chat_title_id_list_by_user_id_and_search_text(
+        user.id, text, skip=skip, limit=limit, db=db
+    )
 
     # Delete tag if no chat is found
     words = text.strip().split(" ")
@@ -693,6 +704,7 @@ async def get_chats_by_folder_id(
 async def get_chat_list_by_folder_id(
     folder_id: str,
     page: Optional[int] = 1,
+    cursor: Optional[str] = None,
     user=Depends(get_verified_user),
     db: Session = Depends(get_session),
 ):
@@ -700,11 +712,24 @@ async def get_chat_list_by_folder_id(
         limit = 10
         skip = (page - 1) * limit
 
-        return [
-            {"title": chat.title, "id": chat.id, "updated_at": chat.updated_at}
-            for chat in Chats.get_chats_by_folder_id_and_user_id(
+        if cursor is not None:
+            # "<updated_at>:<id>" of the last chat of the previous page
+            updated_at, _, chat_id = cursor.partition(":")
+            chats = Chats.get_chats_by_folder_id_and_user_id(
+                folder_id,
+                user.id,
+                limit=limit,
+                cursor=(int(updated_at), chat_id),
+                db=db,
+            )
+        else:
+            chats = Chats.get_chats_by_folder_id_and_user_id(
                 folder_id, user.id, skip=skip, limit=limit, db=db
             )
+
+        return [
+            {"title": chat.title, "id": chat.id, "updated_at": chat.updated_at}
+            for chat in chats
         ]
 
     except Exception as e:
@@ -723,10 +748,7 @@ async def get_chat_list_by_folder_id(
 async def get_user_pinned_chats(
     user=Depends(get_verified_user), db: Session = Depends(get_session)
 ):
-    return [
-        ChatTitleIdResponse(**chat.model_dump())
-        for chat in Chats.get_pinned_chats_by_user_id(user.id, db=db)
-    ]
+    return Chats.get_pinned_chats_by_user_id(user.id, db=db)
 
 
 ############################
@@ -821,16 +843,13 @@ async def get_archived_session_user_chat_list(
     if direction:
         filter["direction"] = direction
 
-    chat_list = [
-        ChatTitleIdResponse(**chat.model_dump())
-        for chat in Chats.get_archived_chat_list_by_user_id(
-            user.id,
-            filter=filter,
-            skip=skip,
-            limit=limit,
-            db=db,
-        )
-    ]
+    chat_list = Chats.get_archived_chat_list_by_user_id(
+        user.id,
+        filter=filter,
+        skip=skip,
+        limit=limit,
+        db=db,
+    )
 
     return chat_list
 
@@ -887,16 +906,13 @@ async def get_shared_session_user_chat_list(
     if direction:
         filter["direction"] = direction
 
-    chat_list = [
-        SharedChatResponse(**chat.model_dump())
-        for chat in Chats.get_shared_chat_list_by_user_id(
-            user.id,
-            filter=filter,
-            skip=skip,
-            limit=limit,
-            db=db,
-        )
-    ]
+    chat_list = Chats.get_shared_chat_list_by_user_id(
+        user.id,
+        filter=filter,
+        skip=skip,
+        limit=limit,
+        db=db,
+    )
 
     return chat_list
 
@@ -964,10 +980,8 @@ async def get_user_chat_list_by_tag_name(
 
 
 @router.get("/{id}", response_model=Optional[ChatResponse])
-async def get_chat_by_id(
-    id: str, user=Depends(get_verified_user), db: Session = Depends(get_session)
-):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id, db=db)
+async def get_chat_by_id(id: str, user=Depends(get_verified_user)):
+    chat = await AsyncChats.get_chat_by_id_and_user_id(id, user.id)
 
     if chat:
         return ChatResponse(**chat.model_dump())
@@ -988,12 +1002,11 @@ async def update_chat_by_id(
     id: str,
     form_data: ChatForm,
     user=Depends(get_verified_user),
-    db: Session = Depends(get_session),
 ):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id, db=db)
+    chat = await AsyncChats.get_chat_by_id_and_user_id(id, user.id)
     if chat:
         updated_chat = {**chat.chat, **form_data.chat}
-        chat = Chats.update_chat_by_id(id, updated_chat, db=db)
+        chat = await AsyncChats.update_chat_by_id(id, updated_chat)
         return ChatResponse(**chat.model_dump())
     else:
         raise HTTPException(
@@ -1031,7 +1044,7 @@ async def update_chat_message_by_id(
             detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
         )
 
-    chat = Chats.upsert_message_to_chat_by_id_and_message_id(
+    Chats.upsert_message_to_chat_by_id_and_message_id(
         id,
         message_id,
         {
@@ -1039,6 +1052,7 @@ async def update_chat_message_by_id(
         },
         db=db,
     )
+    chat = Chats.get_chat_by_id(id, db=db)
 
     event_emitter = get_event_emitter(
         {
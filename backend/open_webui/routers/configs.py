@@ -8,6 +8,7 @@ from typing import Optional
 
 from open_webui.env import AIOHTTP_CLIENT_TIMEOUT
 from open_webui.utils.auth import get_admin_user, get_verified_user
+from open_webui.utils.models import invalidate_models
 from open_webui.config import get_config, save_config
 from open_webui.config import BannerModel
 
@@ -44,8 +45,11 @@ class ImportConfigForm(BaseModel):
 
 
 @router.post("/import", response_model=dict)
-async def import_config(form_data: ImportConfigForm, user=Depends(get_admin_user)):
+async def import_config(
+    request: Request, form_data: ImportConfigForm, user=Depends(get_admin_user)
+):
     save_config(form_data.config)
+    invalidate_models(request.app)
     return get_config()
 
 
@@ -89,6 +93,7 @@ async def set_connections_config(
     request.app.state.config.ENABLE_BASE_MODELS_CACHE = (
         form_data.ENABLE_BASE_MODELS_CACHE
     )
+    invalidate_models(request.app)
 
     return {
         "ENABLE_DIRECT_CONNECTIONS": request.app.state.config.ENABLE_DIRECT_CONNECTIONS,
@@ -1,4 +1,5 @@
 from typing import Optional
+import asyncio
 import logging
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.concurrency import run_in_threadpool
@@ -12,15 +13,17 @@ from open_webui.models.feedbacks import (
     FeedbackForm,
     FeedbackUserResponse,
     FeedbackListResponse,
-    LeaderboardFeedbackData,
     ModelHistoryEntry,
     ModelHistoryResponse,
     Feedbacks,
 )
+from open_webui.models.leaderboard import Leaderboard, LeaderboardMatches
 
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.utils.auth import get_admin_user, get_verified_user
-from open_webui.internal.db import get_session
+from open_webui.utils.models import invalidate_models
+from open_webui.internal.db import get_session, run_db
+from open_webui.env import LEADERBOARD_RECOMPUTE_INTERVAL
 from sqlalchemy.orm import Session
 
 log = logging.getLogger(__name__)
@@ -69,91 +72,28 @@ def _get_embedding_model():
     return _embedding_model
 
 
-def _calculate_elo(
-    feedbacks: list[LeaderboardFeedbackData], similarities: dict = None
-) -> dict:
-    """
-    Calculate Elo ratings for models based on user feedback.
-
-    Each feedback represents a comparison where a user rated one model
-    against its opponents (sibling_model_ids). Rating=1 means the model won,
-    rating=-1 means it lost.
-
-    The Elo system adjusts ratings based on:
-    - Current rating difference (upsets cause bigger swings)
-    - Optional similarity weights (for query-based filtering)
-
-    Returns: {model_id: {"rating": float, "won": int, "lost": int}}
-    """
-    K_FACTOR = 32  # Standard Elo K-factor for rating volatility
-    model_stats = {}
-
-    def get_or_create_stats(model_id):
-        if model_id not in model_stats:
-            model_stats[model_id] = {"rating": 1000.0, "won": 0, "lost": 0}
-        return model_stats[model_id]
-
-    for feedback in feedbacks:
-        data = feedback.data or {}
-        winner_id = data.get("model_id")
-        rating_value = str(data.get("rating", ""))
-        if not winner_id or rating_value not in ("1", "-1"):
-            continue
-
-        won = rating_value == "1"
-        weight = similarities.get(feedback.id, 1.0) if similarities else 1.0
-
-        for opponent_id in data.get("sibling_model_ids") or []:
-            winner = get_or_create_stats(winner_id)
-            opponent = get_or_create_stats(opponent_id)
-            expected = 1 / (1 + 10 ** ((opponent["rating"] - winner["rating"]) / 400))
-
-            winner["rating"] += K_FACTOR * ((1 if won else 0) - expected) * weight
-            opponent["rating"] += (
-                K_FACTOR * ((0 if won else 1) - (1 - expected)) * weight
-            )
-
-            if won:
-                winner["won"] += 1
-                opponent["lost"] += 1
-            else:
-                winner["lost"] += 1
-                opponent["won"] += 1
-
-    return model_stats
-
-
-def _get_top_tags(feedbacks: list[LeaderboardFeedbackData], limit: int = 5) -> dict:
-    """
-    Count tag occurrences per model and return the most frequent ones.
+# Embeddings of feedback tags, normalized, by tag
+_tag_embeddings: dict = {}
+TAG_EMBEDDING_CACHE_SIZE = 50000
 
-    Each feedback can have tags describing the conversation topic.
-    This aggregates those tags per model to show what topics each model
-    is commonly used for.
 
-    Returns: {model_id: [{"tag": str, "count": int}, ...]}
-    """
-    from collections import defaultdict
+def _get_tag_embeddings(embedding_model, tags: list[str]):
+    """Normalized embeddings of the tags, encoding only the ones not cached yet."""
+    import numpy as np
 
-    tag_counts = defaultdict(lambda: defaultdict(int))
+    missing = [tag for tag in tags if tag not in _tag_embeddings]
+    if missing:
+        embeddings = np.asarray(embedding_model.encode(missing), dtype=np.float64)
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-9
 
-    for feedback in feedbacks:
-        data = feedback.data or {}
-        model_id = data.get("model_id")
-        if model_id:
-            for tag in data.get("tags", []):
-                tag_counts[model_id][tag] += 1
+        if len(_tag_embeddings) + len(missing) > TAG_EMBEDDING_CACHE_SIZE:
+            _tag_embeddings.clear()
+        _tag_embeddings.update(zip(missing, embeddings))
 
-    return {
-        model_id: [
-            {"tag": tag, "count": count}
-            for tag, count in sorted(tags.items(), key=lambda x: -x[1])[:limit]
-        ]
-        for model_id, tags in tag_counts.items()
-    }
+    return np.stack([_tag_embeddings[tag] for tag in tags])
 
 
-def _compute_similarities(feedbacks: list[LeaderboardFeedbackData], query: str) -> dict:
+def _compute_weights(matches: LeaderboardMatches, query: str):
     """
     Compute how relevant each feedback is to a search query.
 
@@ -164,50 +104,34 @@ def _compute_similarities(feedbacks: list[LeaderboardFeedbackData], query: str)
     This is used to weight Elo calculations - feedbacks matching the
     query have more influence on the final rankings.
 
-    Returns: {feedback_id: similarity_score (0-1)}
+    Returns: array of similarity scores (0-1) by feedback index, or None
     """
     import numpy as np
 
+    if not matches.tags:
+        return None
+
     embedding_model = _get_embedding_model()
     if not embedding_model:
-        return {}
-
-    all_tags = list(
-        {
-            tag
-            for feedback in feedbacks
-            if feedback.data
-            for tag in feedback.data.get("tags", [])
-        }
-    )
-    if not all_tags:
-        return {}
+        return None
 
     try:
-        tag_embeddings = embedding_model.encode(all_tags)
-        query_embedding = embedding_model.encode([query])[0]
+        tag_embeddings = _get_tag_embeddings(embedding_model, matches.tags)
+        query_embedding = np.asarray(
+            embedding_model.encode([query])[0], dtype=np.float64
+        )
     except Exception as e:
         log.error(f"Embedding error: {e}")
-        return {}
+        return None
 
-    # Vectorized cosine similarity
-    tag_norms = np.linalg.norm(tag_embeddings, axis=1)
-    query_norm = np.linalg.norm(query_embedding)
-    similarities = np.dot(tag_embeddings, query_embedding) / (
-        tag_norms * query_norm + 1e-9
-    )
-    tag_similarity_map = dict(zip(all_tags, similarities.tolist()))
+    query_embedding /= np.linalg.norm(query_embedding) + 1e-9
+    similarities = tag_embeddings @ query_embedding
 
-    return {
-        feedback.id: max(
-            (
-                tag_similarity_map.get(tag, 0)
-                for tag in (feedback.data or {}).get("tags", [])
-            ),
-            default=0,
-        )
-        for feedback in feedbacks
-    }
+    # Each feedback weighs as much as its most similar tag, 0 without tags
+    weights = np.full(matches.feedback_count, -np.inf)
+    np.maximum.at(weights, matches.tag_feedback, similarities[matches.tag_index])
+    weights[np.isneginf(weights)] = 0
+    return weights
 
 
 class LeaderboardEntry(BaseModel):
@@ -230,16 +154,30 @@ async def get_leaderboard(
     db: Session = Depends(get_session),
 ):
     """Get model leaderboard with Elo ratings. Query filters by tag similarity."""
-    feedbacks = Feedbacks.get_feedbacks_for_leaderboard(db=db)
+    ratings = Leaderboard.get_ratings(db=db)
+    tags_by_model = {
+        rating.model_id: [
+            {"tag": tag, "count": count}
+            for tag, count in sorted((rating.tags or {}).items(), key=lambda x: -x[1])[
+                :5
+            ]
+        ]
+        for rating in ratings
+    }
+    elo_stats = {
+        rating.model_id: {
+            "rating": rating.rating,
+            "won": rating.won,
+            "lost": rating.lost,
+        }
+        for rating in ratings
+    }
 
-    similarities = None
     if query and query.strip():
-        similarities = await run_in_threadpool(
-            _compute_similarities, feedbacks, query.strip()
-        )
-
-    elo_stats = _calculate_elo(feedbacks, similarities)
-    tags_by_model = _get_top_tags(feedbacks)
+        matches = Feedbacks.get_leaderboard_matches(db=db)
+        weights = await run_in_threadpool(_compute_weights, matches, query.strip())
+        if weights is not None:
+            elo_stats = await run_in_threadpool(matches.replay, weights)
 
     entries = sorted(
         [
@@ -252,6 +190,7 @@ async def get_leaderboard(
                 top_tags=tags_by_model.get(mid, []),
             )
             for mid, s in elo_stats.items()
+            if s["won"] + s["lost"] > 0
         ],
         key=lambda e: e.rating,
         reverse=True,
@@ -260,6 +199,22 @@ async def get_leaderboard(
     return LeaderboardResponse(entries=entries)
 
 
+async def periodic_leaderboard_recompute():
+    """
+    Rebuild the leaderboard ratings every LEADERBOARD_RECOMPUTE_INTERVAL
+    seconds, or soon after feedback was edited or deleted, on whichever
+    worker claims it first.
+    """
+    while True:
+        await asyncio.sleep(10)
+        try:
+            await run_db(
+                Feedbacks.recompute_leaderboard, LEADERBOARD_RECOMPUTE_INTERVAL
+            )
+        except Exception as e:
+            log.warning(f"Leaderboard recompute failed: {e}")
+
+
 @router.get("/leaderboard/{model_id}/history", response_model=ModelHistoryResponse)
 async def get_model_history(
     model_id: str,
@@ -308,6 +263,7 @@ async def update_config(
         config.ENABLE_EVALUATION_ARENA_MODELS = form_data.ENABLE_EVALUATION_ARENA_MODELS
     if form_data.EVALUATION_ARENA_MODELS is not None:
         config.EVALUATION_ARENA_MODELS = form_data.EVALUATION_ARENA_MODELS
+    invalidate_models(request.app)
     return {
         "ENABLE_EVALUATION_ARENA_MODELS": config.ENABLE_EVALUATION_ARENA_MODELS,
         "EVALUATION_ARENA_MODELS": config.EVALUATION_ARENA_MODELS,
@@ -25,6 +25,7 @@ from sqlalchemy.orm import Session
 from open_webui.internal.db import get_session, SessionLocal
 
 from open_webui.constants import ERROR_MESSAGES
+from open_webui.env import ENABLE_INGESTION_QUEUE
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
 
 from open_webui.models.channels import Channels
@@ -39,6 +40,11 @@ from open_webui.models.chats import Chats
 from open_webui.models.knowledge import Knowledges
 from open_webui.models.groups import Groups
 from open_webui.models.access_grants import AccessGrants
+from open_webui.models.ingestion_jobs import (
+    IngestionJobs,
+    PRIORITY_BULK,
+    PRIORITY_INTERACTIVE,
+)
 
 
 from open_webui.routers.retrieval import ProcessFileForm, process_file
@@ -120,6 +126,58 @@ def has_access_to_file(
 ############################
 
 
+def process_file_content(
+    request,
+    file_id: str,
+    content_type: Optional[str],
+    file_path: str,
+    file_metadata: dict,
+    user,
+    db: Optional[Session] = None,
+):
+    """
+    Extract, transcribe or load the content of an uploaded file and embed it.
+    Runs in the background tasks of the web workers, or in the ingestion
+    workers when ENABLE_INGESTION_QUEUE is set. Raises on failure.
+    """
+    if content_type:
+        stt_supported_content_types = getattr(
+            request.app.state.config, "STT_SUPPORTED_CONTENT_TYPES", []
+        )
+
+        if strict_match_mime_type(stt_supported_content_types, content_type):
+            file_path_processed = Storage.get_file(file_path)
+            result = transcribe(request, file_path_processed, file_metadata, user)
+
+            process_file(
+                request,
+                ProcessFileForm(file_id=file_id, content=result.get("text", "")),
+                user=user,
+                db=db,
+            )
+        elif (not content_type.startswith(("image/", "video/"))) or (
+            request.app.state.config.CONTENT_EXTRACTION_ENGINE == "external"
+        ):
+            process_file(
+                request,
+                ProcessFileForm(file_id=file_id),
+                user=user,
+                db=db,
+            )
+        else:
+            raise Exception(f"File type {content_type} is not supported for processing")
+    else:
+        log.info(
+            f"File type {content_type} is not provided, but trying to process anyway"
+        )
+        process_file(
+            request,
+            ProcessFileForm(file_id=file_id),
+            user=user,
+            db=db,
+        )
+
+
 def process_uploaded_file(
     request,
     file,
@@ -131,51 +189,15 @@ def process_uploaded_file(
 ):
     def _process_handler(db_session):
         try:
-            if file.content_type:
-                stt_supported_content_types = getattr(
-                    request.app.state.config, "STT_SUPPORTED_CONTENT_TYPES", []
-                )
-
-                if strict_match_mime_type(
-                    stt_supported_content_types, file.content_type
-                ):
-                    file_path_processed = Storage.get_file(file_path)
-                    result = transcribe(
-                        request, file_path_processed, file_metadata, user
-                    )
-
-                    process_file(
-                        request,
-                        ProcessFileForm(
-                            file_id=file_item.id, content=result.get("text", "")
-                        ),
-                        user=user,
-                        db=db_session,
-                    )
-                elif (not file.content_type.startswith(("image/", "video/"))) or (
-                    request.app.state.config.CONTENT_EXTRACTION_ENGINE == "external"
-                ):
-                    process_file(
-                        request,
-                        ProcessFileForm(file_id=file_item.id),
-                        user=user,
-                        db=db_session,
-                    )
-                else:
-                    raise Exception(
-                        f"File type {file.content_type} is not supported for processing"
-                    )
-            else:
-                log.info(
-                    f"File type {file.content_type} is not provided, but trying to process anyway"
-                )
-                process_file(
-                    request,
-                    ProcessFileForm(file_id=file_item.id),
-                    user=user,
-                    db=db_session,
-                )
-
+            process_file_content(
+                request,
+                file_item.id,
+                file.content_type,
+                file_path,
+                file_metadata,
+                user,
+                db=db_session,
+            )
         except Exception as e:
             log.error(f"Error processing file: {file_item.id}")
             Files.update_file_data_by_id(
@@ -194,6 +216,27 @@ def process_uploaded_file(
             _process_handler(db_session)
 
 
+def enqueue_uploaded_file(
+    file, file_path, file_item, file_metadata, user, db: Optional[Session] = None
+):
+    """Queue the processing of an uploaded file for the ingestion workers."""
+    IngestionJobs.insert_new_job(
+        file_item.id,
+        user.id,
+        {
+            "content_type": (
+                file.content_type if isinstance(file.content_type, str) else None
+            ),
+            "file_path": file_path,
+            "metadata": file_metadata,
+        },
+        priority=(
+            PRIORITY_BULK if "knowledge_id" in file_metadata else PRIORITY_INTERACTIVE
+        ),
+        db=db,
+    )
+
+
 @router.post("/", response_model=FileModelResponse)
 def upload_file(
     request: Request,
@@ -311,15 +354,20 @@ def upload_file_handler(
 
         if process:
             if background_tasks and process_in_background:
-                background_tasks.add_task(
-                    process_uploaded_file,
-                    request,
-                    file,
-                    file_path,
-                    file_item,
-                    file_metadata,
-                    user,
-                )
+                if ENABLE_INGESTION_QUEUE:
+                    enqueue_uploaded_file(
+                        file, file_path, file_item, file_metadata, user, db=db
+                    )
+                else:
+                    background_tasks.add_task(
+                        process_uploaded_file,
+                        request,
+                        file,
+                        file_path,
+                        file_item,
+                        file_metadata,
+                        user,
+                    )
                 return {"status": True, **file_item.model_dump()}
             else:
                 process_uploaded_file(
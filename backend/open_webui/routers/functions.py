@@ -25,6 +25,7 @@ from open_webui.config import CACHE_DIR
 from open_webui.constants import ERROR_MESSAGES
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from open_webui.utils.auth import get_admin_user, get_verified_user
+from open_webui.utils.models import invalidate_models
 from pydantic import BaseModel, HttpUrl
 from open_webui.internal.db import get_session
 from sqlalchemy.orm import Session
@@ -166,6 +167,7 @@ async def sync_functions(
             function_module, function_type, frontmatter = load_function_module_by_id(
                 function.id,
                 content=function.content,
+                app=request.app,
             )
 
             if hasattr(function_module, "Valves") and function.valves:
@@ -180,7 +182,9 @@ async def sync_functions(
                     )
                     raise e
 
-        return Functions.sync_functions(user.id, form_data.functions, db=db)
+        functions = Functions.sync_functions(user.id, form_data.functions, db=db)
+        invalidate_models(request.app)
+        return functions
     except Exception as e:
         log.exception(f"Failed to load a function: {e}")
         raise HTTPException(
@@ -216,6 +220,7 @@ async def create_new_function(
             function_module, function_type, frontmatter = load_function_module_by_id(
                 form_data.id,
                 content=form_data.content,
+                app=request.app,
             )
             form_data.meta.manifest = frontmatter
 
@@ -235,6 +240,7 @@ async def create_new_function(
                 )
 
             if function:
+                invalidate_models(request.app)
                 return function
             else:
                 raise HTTPException(
@@ -281,7 +287,10 @@ async def get_function_by_id(
 
 @router.post("/id/{id}/toggle", response_model=Optional[FunctionModel])
 async def toggle_function_by_id(
-    id: str, user=Depends(get_admin_user), db: Session = Depends(get_session)
+    request: Request,
+    id: str,
+    user=Depends(get_admin_user),
+    db: Session = Depends(get_session),
 ):
     function = Functions.get_function_by_id(id, db=db)
     if function:
@@ -290,6 +299,7 @@ async def toggle_function_by_id(
         )
 
         if function:
+            invalidate_models(request.app)
             return function
         else:
             raise HTTPException(
@@ -310,7 +320,10 @@ async def toggle_function_by_id(
 
 @router.post("/id/{id}/toggle/global", response_model=Optional[FunctionModel])
 async def toggle_global_by_id(
-    id: str, user=Depends(get_admin_user), db: Session = Depends(get_session)
+    request: Request,
+    id: str,
+    user=Depends(get_admin_user),
+    db: Session = Depends(get_session),
 ):
     function = Functions.get_function_by_id(id, db=db)
     if function:
@@ -319,6 +332,7 @@ async def toggle_global_by_id(
         )
 
         if function:
+            invalidate_models(request.app)
             return function
         else:
             raise HTTPException(
@@ -348,7 +362,7 @@ async def update_function_by_id(
     try:
         form_data.content = replace_imports(form_data.content)
         function_module, function_type, frontmatter = load_function_module_by_id(
-            id, content=form_data.content
+            id, content=form_data.content, app=request.app
         )
         form_data.meta.manifest = frontmatter
 
@@ -364,6 +378,7 @@ async def update_function_by_id(
             Functions.update_function_metadata_by_id(id, {"toggle": True}, db=db)
 
         if function:
+            invalidate_models(request.app)
             return function
         else:
             raise HTTPException(
@@ -396,6 +411,7 @@ async def delete_function_by_id(
         FUNCTIONS = request.app.state.FUNCTIONS
         if id in FUNCTIONS:
             del FUNCTIONS[id]
+        invalidate_models(request.app)
 
     return result
 
@@ -35,6 +35,7 @@ from open_webui.models.access_grants import AccessGrants, has_public_read_access
 
 from open_webui.config import BYPASS_ADMIN_ACCESS_CONTROL
 from open_webui.models.models import Models, ModelForm
+from open_webui.utils.models import invalidate_models
 
 log = logging.getLogger(__name__)
 
@@ -889,7 +890,10 @@ def remove_file_from_knowledge_by_id(
 
 @router.delete("/{id}/delete", response_model=bool)
 async def delete_knowledge_by_id(
-    id: str, user=Depends(get_verified_user), db: Session = Depends(get_session)
+    request: Request,
+    id: str,
+    user=Depends(get_verified_user),
+    db: Session = Depends(get_session),
 ):
     knowledge = Knowledges.get_knowledge_by_id(id=id, db=db)
     if not knowledge:
@@ -921,6 +925,7 @@ async def delete_knowledge_by_id(
     log.info(f"Found {len(models)} models to check for knowledge base {id}")
 
     # Update models that reference this knowledge base
+    models_updated = False
     for model in models:
         if model.meta and hasattr(model.meta, "knowledge"):
             knowledge_list = model.meta.knowledge or []
@@ -942,6 +947,10 @@ async def delete_knowledge_by_id(
                     is_active=model.is_active,
                 )
                 Models.update_model_by_id(model.id, model_form, db=db)
+                models_updated = True
+
+    if models_updated:
+        invalidate_models(request.app)
 
     # Clean up vector DB
     try:
@@ -34,6 +34,7 @@ from fastapi.responses import FileResponse, StreamingResponse
 
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_permission
+from open_webui.utils.models import invalidate_models
 from open_webui.config import BYPASS_ADMIN_ACCESS_CONTROL, STATIC_DIR
 from open_webui.internal.db import get_session
 from sqlalchemy.orm import Session
@@ -199,6 +200,7 @@ async def create_new_model(
     else:
         model = Models.insert_new_model(form_data, user.id, db=db)
         if model:
+            invalidate_models(request.app)
             return model
         else:
             raise HTTPException(
@@ -300,6 +302,7 @@ async def import_models(
                         Models.insert_new_model(
                             user_id=user.id, form_data=new_model, db=db
                         )
+            invalidate_models(request.app)
             return True
         else:
             raise HTTPException(status_code=400, detail="Invalid JSON format")
@@ -324,7 +327,9 @@ async def sync_models(
     user=Depends(get_admin_user),
     db: Session = Depends(get_session),
 ):
-    return Models.sync_models(user.id, form_data.models, db=db)
+    models = Models.sync_models(user.id, form_data.models, db=db)
+    invalidate_models(request.app)
+    return models
 
 
 ###########################
@@ -429,7 +434,10 @@ def get_model_profile_image(id: str, user=Depends(get_verified_user)):
 
 @router.post("/model/toggle", response_model=Optional[ModelResponse])
 async def toggle_model_by_id(
-    id: str, user=Depends(get_verified_user), db: Session = Depends(get_session)
+    request: Request,
+    id: str,
+    user=Depends(get_verified_user),
+    db: Session = Depends(get_session),
 ):
     model = Models.get_model_by_id(id, db=db)
     if model:
@@ -447,6 +455,7 @@ async def toggle_model_by_id(
             model = Models.toggle_model_by_id(id, db=db)
 
             if model:
+                invalidate_models(request.app)
                 return model
             else:
                 raise HTTPException(
@@ -472,6 +481,7 @@ async def toggle_model_by_id(
 
 @router.post("/model/update", response_model=Optional[ModelModel])
 async def update_model_by_id(
+    request: Request,
     form_data: ModelForm,
     user=Depends(get_verified_user),
     db: Session = Depends(get_session),
@@ -502,6 +512,7 @@ async def update_model_by_id(
     model = Models.update_model_by_id(
         form_data.id, ModelForm(**form_data.model_dump()), db=db
     )
+    invalidate_models(request.app)
     return model
 
 
@@ -586,6 +597,7 @@ async def update_model_access_by_id(
     AccessGrants.set_access_grants(
         "model", form_data.id, form_data.access_grants, db=db
     )
+    invalidate_models(request.app)
 
     return Models.get_model_by_id(form_data.id, db=db)
 
@@ -597,6 +609,7 @@ async def update_model_access_by_id(
 
 @router.post("/model/delete", response_model=bool)
 async def delete_model_by_id(
+    request: Request,
     form_data: ModelIdForm,
     user=Depends(get_verified_user),
     db: Session = Depends(get_session),
@@ -625,12 +638,16 @@ async def delete_model_by_id(
         )
 
     result = Models.delete_model_by_id(form_data.id, db=db)
+    invalidate_models(request.app)
     return result
 
 
 @router.delete("/delete/all", response_model=bool)
 async def delete_all_models(
-    user=Depends(get_admin_user), db: Session = Depends(get_session)
+    request: Request,
+    user=Depends(get_admin_user),
+    db: Session = Depends(get_session),
 ):
     result = Models.delete_all_models(db=db)
+    invalidate_models(request.app)
     return result
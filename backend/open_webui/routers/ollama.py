@@ -18,6 +18,7 @@ from aiocache import cached
 import requests
 
 from open_webui.utils.headers import include_user_info_headers
+from open_webui.utils.http_client import get_http_session
 from open_webui.models.chats import Chats
 from open_webui.models.users import UserModel
 
@@ -84,21 +85,21 @@ log = logging.getLogger(__name__)
 async def send_get_request(url, key=None, user: UserModel = None):
     timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_MODEL_LIST)
     try:
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
-            headers = {
-                "Content-Type": "application/json",
-                **({"Authorization": f"Bearer {key}"} if key else {}),
-            }
+        headers = {
+            "Content-Type": "application/json",
+            **({"Authorization": f"Bearer {key}"} if key else {}),
+        }
 
-            if ENABLE_FORWARD_USER_INFO_HEADERS and user:
-                headers = include_user_info_headers(headers, user)
+        if ENABLE_FORWARD_USER_INFO_HEADERS and user:
+            headers = include_user_info_headers(headers, user)
 
-            async with session.get(
-                url,
-                headers=headers,
-                ssl=AIOHTTP_CLIENT_SESSION_SSL,
-            ) as response:
-                return await response.json()
+        async with get_http_session(url).get(
+            url,
+            headers=headers,
+            ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            timeout=timeout,
+        ) as response:
+            return await response.json()
     except Exception as e:
         # Handle connection error here
         log.error(f"Connection error: {e}")
@@ -118,10 +119,6 @@ async def send_post_request(
     r = None
     streaming = False
     try:
-        session = aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        )
-
         headers = {
             "Content-Type": "application/json",
             **({"Authorization": f"Bearer {key}"} if key else {}),
@@ -132,17 +129,18 @@ async def send_post_request(
             if metadata and metadata.get("chat_id"):
                 headers[FORWARD_SESSION_INFO_HEADER_CHAT_ID] = metadata.get("chat_id")
 
-        r = await session.post(
+        r = await get_http_session(url).post(
             url,
             data=payload,
             headers=headers,
             ssl=AIOHTTP_CLIENT_SESSION_SSL,
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
         )
 
         if r.ok is False:
             try:
                 res = await r.json()
-                await cleanup_response(r, session)
+                await cleanup_response(r, None)
                 if "error" in res:
                     raise HTTPException(status_code=r.status, detail=res["error"])
             except HTTPException as e:
@@ -163,7 +161,7 @@ async def send_post_request(
 
             streaming = True
             return StreamingResponse(
-                stream_wrapper(r, session),
+                stream_wrapper(r, None),
                 status_code=r.status,
                 headers=response_headers,
             )
@@ -182,7 +180,7 @@ async def send_post_request(
         )
     finally:
         if not streaming:
-            await cleanup_response(r, session)
+            await cleanup_response(r, None)
 
 
 def get_api_key(idx, url, configs):
@@ -290,6 +288,11 @@ async def update_config(
         if key in keys
     }
 
+    # Imported here, open_webui.utils.models depends on this router
+    from open_webui.utils.models import invalidate_models
+
+    invalidate_models(request.app)
+
     return {
         "ENABLE_OLLAMA_API": request.app.state.config.ENABLE_OLLAMA_API,
         "OLLAMA_BASE_URLS": request.app.state.config.OLLAMA_BASE_URLS,
@@ -422,9 +425,7 @@ async def get_filtered_models(models, user, db=None):
         model_info.id: model_info
         for model_info in Models.get_models_by_ids(model_ids, db=db)
     }
-    user_group_ids = {
-        group.id for group in Groups.get_groups_by_member_id(user.id, db=db)
-    }
+    user_group_ids = Groups.get_group_ids_by_member_id(user.id, db=db)
 
     # Batch-fetch accessible resource IDs in a single query instead of N has_access calls
     accessible_model_ids = AccessGrants.get_accessible_resource_ids(
@@ -1337,9 +1338,7 @@ async def generate_chat_completion(
 
         # Check if user has access to the model
         if not bypass_filter and user.role == "user":
-            user_group_ids = {
-                group.id for group in Groups.get_groups_by_member_id(user.id)
-            }
+            user_group_ids = Groups.get_group_ids_by_member_id(user.id)
             if not (
                 user.id == model_info.user_id
                 or AccessGrants.has_access(
@@ -1448,9 +1447,7 @@ async def generate_openai_completion(
 
         # Check if user has access to the model
         if user.role == "user":
-            user_group_ids = {
-                group.id for group in Groups.get_groups_by_member_id(user.id)
-            }
+            user_group_ids = Groups.get_group_ids_by_member_id(user.id)
             if not (
                 user.id == model_info.user_id
                 or AccessGrants.has_access(
@@ -1536,9 +1533,7 @@ async def generate_openai_chat_completion(
 
         # Check if user has access to the model
         if user.role == "user":
-            user_group_ids = {
-                group.id for group in Groups.get_groups_by_member_id(user.id)
-            }
+            user_group_ids = Groups.get_group_ids_by_member_id(user.id)
             if not (
                 user.id == model_info.user_id
                 or AccessGrants.has_access(
@@ -1642,9 +1637,7 @@ async def get_openai_models(
             model_info.id: model_info
             for model_info in Models.get_models_by_ids(model_ids, db=db)
         }
-        user_group_ids = {
-            group.id for group in Groups.get_groups_by_member_id(user.id, db=db)
-        }
+        user_group_ids = Groups.get_group_ids_by_member_id(user.id, db=db)
 
         # Batch-fetch accessible resource IDs in a single query instead of N has_access calls
         accessible_model_ids = AccessGrants.get_accessible_resource_ids(
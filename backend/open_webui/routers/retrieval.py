@@ -79,6 +79,7 @@ from open_webui.retrieval.web.external import search_external
 from open_webui.retrieval.web.yandex import search_yandex
 
 from open_webui.retrieval.utils import (
+    get_bm25_index,
     get_content_from_url,
     get_embedding_function,
     get_reranking_function,
@@ -2481,9 +2482,17 @@ async def query_doc_handler(
         if request.app.state.config.ENABLE_RAG_HYBRID_SEARCH and (
             form_data.hybrid is None or form_data.hybrid
         ):
+            enable_enriched_texts = (
+                request.app.state.config.ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS
+            )
+            bm25_index = get_bm25_index(
+                form_data.collection_name, enable_enriched_texts
+            )
             collection_results = {}
-            collection_results[form_data.collection_name] = VECTOR_DB_CLIENT.get(
-                collection_name=form_data.collection_name
+            collection_results[form_data.collection_name] = (
+                VECTOR_DB_CLIENT.get(collection_name=form_data.collection_name)
+                if bm25_index is None
+                else None
             )
             return await query_doc_with_hybrid_search(
                 collection_name=form_data.collection_name,
@@ -2514,6 +2523,8 @@ async def query_doc_handler(
                     if form_data.hybrid_bm25_weight
                     else request.app.state.config.HYBRID_BM25_WEIGHT
                 ),
+                enable_enriched_texts=enable_enriched_texts,
+                bm25_index=bm25_index,
                 user=user,
             )
         else:
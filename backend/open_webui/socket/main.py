@@ -9,7 +9,7 @@ from typing import Dict, Set
 from redis import asyncio as aioredis
 import pycrdt as Y
 
-from open_webui.models.users import Users, UserNameResponse
+from open_webui.models.users import AsyncUsers, Users, UserNameResponse
 from open_webui.models.channels import Channels
 from open_webui.models.chats import Chats
 from open_webui.models.notes import Notes, NoteUpdateForm
@@ -37,13 +37,20 @@ from open_webui.env import (
     WEBSOCKET_SERVER_PING_INTERVAL,
     WEBSOCKET_SERVER_LOGGING,
     WEBSOCKET_SERVER_ENGINEIO_LOGGING,
+    CHAT_EVENT_BUFFER_FLUSH_INTERVAL,
+    CHAT_EVENT_BUFFER_MAX_SIZE,
 )
 from open_webui.utils.auth import decode_token
-from open_webui.socket.utils import RedisDict, RedisLock, YdocManager
+from open_webui.socket.utils import (
+    MessageEventBuffer,
+    RedisDict,
+    RedisLock,
+    YdocManager,
+)
 from open_webui.tasks import create_task, stop_item_tasks
 from open_webui.utils.redis import get_redis_connection
 from open_webui.utils.access_control import has_permission
-from open_webui.models.access_grants import AccessGrants
+from open_webui.models.access_grants import AsyncAccessGrants
 
 
 from open_webui.env import (
@@ -100,6 +107,11 @@ else:
 # Timeout duration in seconds
 TIMEOUT_DURATION = 3
 
+MESSAGE_EVENT_BUFFER = MessageEventBuffer(
+    flush_interval=CHAT_EVENT_BUFFER_FLUSH_INTERVAL,
+    max_size=CHAT_EVENT_BUFFER_MAX_SIZE,
+)
+
 # Dictionary to maintain the user pool
 
 if WEBSOCKET_MANAGER == "redis":
@@ -310,7 +322,7 @@ async def connect(sid, environ, auth):
         data = decode_token(auth["token"])
 
         if data is not None and "id" in data:
-            user = Users.get_user_by_id(data["id"])
+            user = await AsyncUsers.get_user_by_id(data["id"])
 
         if user:
             SESSION_POOL[sid] = user.model_dump(
@@ -336,7 +348,7 @@ async def user_join(sid, data):
     if data is None or "id" not in data:
         return
 
-    user = Users.get_user_by_id(data["id"])
+    user = await AsyncUsers.get_user_by_id(data["id"])
     if not user:
         return
 
@@ -379,7 +391,7 @@ async def join_channel(sid, data):
     if data is None or "id" not in data:
         return
 
-    user = Users.get_user_by_id(data["id"])
+    user = await AsyncUsers.get_user_by_id(data["id"])
     if not user:
         return
 
@@ -401,7 +413,7 @@ async def join_note(sid, data):
     if token_data is None or "id" not in token_data:
         return
 
-    user = Users.get_user_by_id(token_data["id"])
+    user = await AsyncUsers.get_user_by_id(token_data["id"])
     if not user:
         return
 
@@ -413,7 +425,7 @@ async def join_note(sid, data):
     if (
         user.role != "admin"
         and user.id != note.user_id
-        and not AccessGrants.has_access(
+        and not await AsyncAccessGrants.has_access(
             user_id=user.id,
             resource_type="note",
             resource_id=note.id,
@@ -480,7 +492,7 @@ async def ydoc_document_join(sid, data):
             if (
                 user.get("role") != "admin"
                 and user.get("id") != note.user_id
-                and not AccessGrants.has_access(
+                and not await AsyncAccessGrants.has_access(
                     user_id=user.get("id"),
                     resource_type="note",
                     resource_id=note.id,
@@ -553,7 +565,7 @@ async def document_save_handler(document_id, data, user):
         if (
             user.get("role") != "admin"
             and user.get("id") != note.user_id
-            and not AccessGrants.has_access(
+            and not await AsyncAccessGrants.has_access(
                 user_id=user.get("id"),
                 resource_type="note",
                 resource_id=note.id,
@@ -735,95 +747,14 @@ def get_event_emitter(request_info, update_db=True):
             and message_id
             and not request_info.get("chat_id", "").startswith("local:")
         ):
+            MESSAGE_EVENT_BUFFER.add(chat_id, message_id, event_data)
 
-            if "type" in event_data and event_data["type"] == "status":
-                Chats.add_message_status_to_chat_by_id_and_message_id(
-                    request_info["chat_id"],
-                    request_info["message_id"],
-                    event_data.get("data", {}),
-                )
-
-            if "type" in event_data and event_data["type"] == "message":
-                message = Chats.get_message_by_id_and_message_id(
-                    request_info["chat_id"],
-                    request_info["message_id"],
-                )
-
-                if message:
-                    content = message.get("content", "")
-                    content += event_data.get("data", {}).get("content", "")
-
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
-                        request_info["chat_id"],
-                        request_info["message_id"],
-                        {
-                            "content": content,
-                        },
-                    )
-
-            if "type" in event_data and event_data["type"] == "replace":
-                content = event_data.get("data", {}).get("content", "")
-
-                Chats.upsert_message_to_chat_by_id_and_message_id(
-                    request_info["chat_id"],
-                    request_info["message_id"],
-                    {
-                        "content": content,
-                    },
-                )
-
-            if "type" in event_data and event_data["type"] == "embeds":
-                message = Chats.get_message_by_id_and_message_id(
-                    request_info["chat_id"],
-                    request_info["message_id"],
-                )
-
-                embeds = event_data.get("data", {}).get("embeds", [])
-                embeds.extend(message.get("embeds", []))
-
-                Chats.upsert_message_to_chat_by_id_and_message_id(
-                    request_info["chat_id"],
-                    request_info["message_id"],
-                    {
-                        "embeds": embeds,
-                    },
-                )
-
-            if "type" in event_data and event_data["type"] == "files":
-                message = Chats.get_message_by_id_and_message_id(
-                    request_info["chat_id"],
-                    request_info["message_id"],
-                )
-
-                files = event_data.get("data", {}).get("files", [])
-                files.extend(message.get("files", []))
-
-                Chats.upsert_message_to_chat_by_id_and_message_id(
-                    request_info["chat_id"],
-                    request_info["message_id"],
-                    {
-                        "files": files,
-                    },
-                )
-
-            if event_data.get("type") in ["source", "citation"]:
-                data = event_data.get("data", {})
-                if data.get("type") == None:
-                    message = Chats.get_message_by_id_and_message_id(
-                        request_info["chat_id"],
-                        request_info["message_id"],
-                    )
-
-                    sources = message.get("sources", [])
-                    sources.append(data)
-
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
-                        request_info["chat_id"],
-                        request_info["message_id"],
-                        {
-                            "sources": sources,
-                        },
-                    )
+            # Persist buffered events before the stream's final write
+            if event_data.get("type") == "chat:tasks:cancel" or (
+                event_data.get("type") == "chat:completion"
+                and event_data.get("data", {}).get("done")
+            ):
+                await MESSAGE_EVENT_BUFFER.flush(chat_id, message_id)
 
     if (
         "user_id" in request_info
@@ -835,6 +766,16 @@ def get_event_emitter(request_info, update_db=True):
         return None
 
 
+async def flush_message_events(chat_id: str, message_id: str):
+    """Persist any buffered events of a message, e.g. before writing it directly."""
+    await MESSAGE_EVENT_BUFFER.flush(chat_id, message_id)
+
+
+async def upsert_message(chat_id: str, message_id: str, message: dict):
+    """Write a message after, and never alongside, a flush of its buffered events."""
+    await MESSAGE_EVENT_BUFFER.upsert_message(chat_id, message_id, message)
+
+
 def get_event_call(request_info):
     async def __event_caller__(event_data):
         response = await sio.call(
@@ -1,10 +1,20 @@
+import asyncio
 import json
+import logging
+import time
 import uuid
+from contextlib import asynccontextmanager
 from open_webui.utils.redis import get_redis_connection
 from open_webui.env import REDIS_KEY_PREFIX
 from typing import Optional, List, Tuple
+from opentelemetry import metrics
 import pycrdt as Y
 
+from open_webui.internal.db import run_db
+from open_webui.models.chats import Chats
+
+log = logging.getLogger(__name__)
+
 
 class RedisLock:
     def __init__(
@@ -225,3 +235,227 @@ class YdocManager:
                 del self._updates[document_id]
             if document_id in self._users:
                 del self._users[document_id]
+
+
+class MessageEventBuffer:
+    """
+    Write-behind buffer for the chat message events persisted by the event
+    emitter (status, message, replace, embeds, files, source/citation).
+
+    Events for the same (chat_id, message_id) are coalesced in memory and
+    written with a single read-modify-write once `flush_interval` seconds
+    have passed, once `max_size` bytes are pending, or when `flush` is called
+    at the end of a stream or on cancellation.
+    """
+
+    def __init__(self, flush_interval: float = 1.0, max_size: int = 65536):
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+
+        self._pending: dict[tuple[str, str], dict] = {}
+        self._timers: dict[tuple[str, str], asyncio.Task] = {}
+        # (lock, number of flushes using it) so idle locks can be dropped
+        self._locks: dict[tuple[str, str], list] = {}
+
+        self._stats = {
+            "events": 0,
+            "flushes": 0,
+            "flush_errors": 0,
+            "flush_seconds_total": 0.0,
+            "flush_seconds_max": 0.0,
+        }
+
+        meter = metrics.get_meter(__name__)
+        self._events_counter = meter.create_counter(
+            name="webui.chat.event_buffer.events",
+            description="Message events accepted by the write-behind buffer",
+            unit="1",
+        )
+        self._flushes_counter = meter.create_counter(
+            name="webui.chat.event_buffer.flushes",
+            description="Database writes issued by the write-behind buffer",
+            unit="1",
+        )
+        self._flush_duration = meter.create_histogram(
+            name="webui.chat.event_buffer.flush.duration",
+            description="Duration of write-behind buffer flushes",
+            unit="ms",
+        )
+
+    @staticmethod
+    def _new_pending() -> dict:
+        return {
+            "content": None,  # set by "replace" events
+            "content_delta": "",  # appended by "message" events
+            "embeds": [],
+            "files": [],
+            "sources": [],
+            "status_history": [],
+            "size": 0,
+        }
+
+    def add(self, chat_id: str, message_id: str, event_data: dict) -> bool:
+        """
+        Buffer a message event. Returns False if the event type is not
+        persisted by the buffer.
+        """
+        event_type = event_data.get("type")
+        data = event_data.get("data", {}) or {}
+
+        key = (chat_id, message_id)
+        pending = self._pending.get(key) or self._new_pending()
+
+        if event_type == "status":
+            pending["status_history"].append(data)
+        elif event_type == "message":
+            pending["content_delta"] += data.get("content", "")
+        elif event_type == "replace":
+            pending["content"] = data.get("content", "")
+            pending["content_delta"] = ""
+        elif event_type == "embeds":
+            # Newer embeds go first, matching the unbuffered behaviour
+            pending["embeds"] = data.get("embeds", []) + pending["embeds"]
+        elif event_type == "files":
+            pending["files"] = data.get("files", []) + pending["files"]
+        elif event_type in ["source", "citation"] and data.get("type") is None:
+            pending["sources"].append(data)
+        else:
+            return False
+
+        pending["size"] += len(json.dumps(data, default=str))
+        self._pending[key] = pending
+
+        self._stats["events"] += 1
+        self._events_counter.add(1)
+
+        if self.flush_interval <= 0 or pending["size"] >= self.max_size:
+            self._schedule(key, 0)
+        elif key not in self._timers:
+            self._schedule(key, self.flush_interval)
+
+        return True
+
+    def _schedule(self, key: tuple[str, str], delay: float):
+        timer = self._timers.get(key)
+        if timer is not None:
+            if delay > 0:
+                return
+            timer.cancel()
+
+        self._timers[key] = asyncio.create_task(self._flush_later(key, delay))
+
+    async def _flush_later(self, key: tuple[str, str], delay: float):
+        try:
+            if delay > 0:
+                await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            return
+
+        if self._timers.get(key) is asyncio.current_task():
+            del self._timers[key]
+        await self.flush(*key)
+
+    async def flush(self, chat_id: str, message_id: str):
+        """Persist everything buffered for a message."""
+        key = (chat_id, message_id)
+        self._cancel_timer(key)
+
+        async with self._lock(key):
+            pending = self._pending.pop(key, None)
+            if pending:
+                await self._flush_pending(chat_id, message_id, pending)
+
+    async def upsert_message(self, chat_id: str, message_id: str, message: dict):
+        """
+        Write a message directly, e.g. from the middleware. Its buffered events
+        are flushed first, and no flush of that message can run alongside the
+        write: both are read-modify-writes of the same chat.
+        """
+        key = (chat_id, message_id)
+        self._cancel_timer(key)
+
+        async with self._lock(key):
+            pending = self._pending.pop(key, None)
+            if pending:
+                await self._flush_pending(chat_id, message_id, pending)
+            await run_db(
+                Chats.upsert_message_to_chat_by_id_and_message_id,
+                chat_id,
+                message_id,
+                message,
+            )
+
+    def _cancel_timer(self, key: tuple[str, str]):
+        timer = self._timers.pop(key, None)
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+
+    @asynccontextmanager
+    async def _lock(self, key: tuple[str, str]):
+        lock = self._locks.setdefault(key, [asyncio.Lock(), 0])
+        lock[1] += 1
+        try:
+            async with lock[0]:
+                yield
+        finally:
+            lock[1] -= 1
+            if lock[1] == 0:
+                self._locks.pop(key, None)
+
+    async def _flush_pending(self, chat_id: str, message_id: str, pending: dict):
+        start = time.perf_counter()
+        try:
+            await run_db(self._write, chat_id, message_id, pending)
+        except Exception as e:
+            self._stats["flush_errors"] += 1
+            log.exception(f"Failed to flush message events: {e}")
+
+        duration = time.perf_counter() - start
+        self._stats["flushes"] += 1
+        self._stats["flush_seconds_total"] += duration
+        self._stats["flush_seconds_max"] = max(
+            self._stats["flush_seconds_max"], duration
+        )
+        self._flushes_counter.add(1)
+        self._flush_duration.record(duration * 1000)
+
+    async def flush_all(self):
+        await asyncio.gather(*[self.flush(*key) for key in list(self._pending)])
+
+    def _write(self, chat_id: str, message_id: str, pending: dict):
+        message = Chats.get_message_by_id_and_message_id(chat_id, message_id) or {}
+
+        update = {}
+        if pending["content"] is not None:
+            update["content"] = pending["content"] + pending["content_delta"]
+        elif pending["content_delta"] and message:
+            content = message.get("content") or ""
+            update["content"] = content + pending["content_delta"]
+
+        if pending["embeds"]:
+            update["embeds"] = pending["embeds"] + message.get("embeds", [])
+        if pending["files"]:
+            update["files"] = pending["files"] + message.get("files", [])
+        if pending["sources"]:
+            update["sources"] = message.get("sources", []) + pending["sources"]
+
+        if pending["status_history"] and (update or message):
+            update["statusHistory"] = (
+                message.get("statusHistory", []) + pending["status_history"]
+            )
+
+        if update:
+            Chats.upsert_message_to_chat_by_id_and_message_id(
+                chat_id, message_id, update
+            )
+
+    def get_stats(self) -> dict:
+        flushes = self._stats["flushes"]
+        return {
+            **self._stats,
+            "pending": len(self._pending),
+            "coalescing_ratio": (self._stats["events"] / flushes if flushes else 0.0),
+            "flush_seconds_avg": (
+                self._stats["flush_seconds_total"] / flushes if flushes else 0.0
+            ),
+        }
@@ -0,0 +1,51 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from open_webui.utils.access_cache import AccessCache, get_cache_ttl
+
+
+def test_bumped_generations_invalidate_entries():
+    cache = AccessCache(ttl=60, size=10)
+    loads = []
+
+    def load():
+        loads.append(1)
+        return frozenset({"a"})
+
+    key = ("grants", "user", "model", "read")
+    assert cache.get_or_load(key, ("grants:model",), load) == {"a"}
+    assert cache.get_or_load(key, ("grants:model",), load) == {"a"}
+    assert len(loads) == 1
+
+    # Only entries depending on a bumped counter are reloaded
+    cache.bump("grants:knowledge")
+    cache.get_or_load(key, ("grants:model",), load)
+    assert len(loads) == 1
+
+    cache.bump("grants:model")
+    cache.get_or_load(key, ("grants:model",), load)
+    assert len(loads) == 2
+
+
+def test_size_and_ttl_bound_entries():
+    cache = AccessCache(ttl=60, size=2)
+    for user in ("a", "b", "c"):
+        cache.get_or_load((user,), ("groups",), lambda: frozenset())
+    assert list(cache.entries) == [("b",), ("c",)]
+
+    disabled = AccessCache(ttl=0, size=2)
+    loads = []
+    disabled.get_or_load(("a",), ("groups",), lambda: loads.append(1))
+    disabled.get_or_load(("a",), ("groups",), lambda: loads.append(1))
+    assert len(loads) == 2 and not disabled.entries
+
+
+def test_ttl_defaults_to_a_few_seconds_without_redis():
+    assert get_cache_ttl(None, 300, redis=object()) == 300
+    # Per process counters only invalidate the worker that made the write
+    assert get_cache_ttl(None, 300, redis=None) == 5
+    # An explicit TTL is kept either way
+    assert get_cache_ttl(60, 300, redis=None) == 60
+    assert get_cache_ttl(0, 300, redis=object()) == 0
@@ -0,0 +1,141 @@
+import multiprocessing
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from open_webui.retrieval.bm25 import BM25Index, BM25IndexManager
+
+RECORDS = [
+    ("a", "the quick brown fox", {"name": "fox.txt"}),
+    ("b", "the lazy dog sleeps", {"name": "dog.txt"}),
+    ("c", "quick quick dog", {"name": "mixed.txt"}),
+    ("d", "nothing relevant here", {"name": "other.txt"}),
+]
+
+
+def get_ids(index, query, k=10):
+    return [
+        id for id, _, _ in index.get_records([d for d, _ in index.search(query, k)])
+    ]
+
+
+def test_search_ranks_matching_chunks(tmp_path):
+    index = BM25Index(tmp_path / "index")
+    index.add(RECORDS)
+
+    assert get_ids(index, "quick") == ["c", "a"]
+    assert get_ids(index, "quick dog", k=1) == ["c"]
+    assert get_ids(index, "missing") == []
+
+    documents = index.search_documents("lazy", 1)
+    assert documents[0].page_content == "the lazy dog sleeps"
+    assert documents[0].metadata == {"name": "dog.txt"}
+
+
+def test_incremental_updates_persist(tmp_path):
+    index = BM25Index(tmp_path / "index")
+    index.add(RECORDS)
+    index.save(compact=True)
+
+    index.delete(["c"])
+    index.add([("a", "slow turtle", {}), ("e", "quick turtle", {})])
+    index.save()
+
+    loaded = BM25Index.load(tmp_path / "index")
+    assert loaded.count == 4
+    assert get_ids(loaded, "quick") == ["e"]
+    assert sorted(get_ids(loaded, "turtle")) == ["a", "e"]
+
+    loaded.rebuild(enriched=True)
+    assert get_ids(BM25Index.load(tmp_path / "index"), "dog.txt") == ["b"]
+
+
+def test_saves_between_compactions_only_append_to_the_log(tmp_path):
+    path = tmp_path / "index"
+    index = BM25Index(path)
+    index.add(RECORDS)
+    index.save(compact=True)
+    compacted = {file.name: file.stat().st_mtime_ns for file in path.iterdir()}
+
+    index.add([("e", "quick turtle", {})])
+    index.save()
+    index.delete(["a"])
+    index.save()
+
+    # Only the chunk store and the log were written
+    changed = {
+        file.name
+        for file in path.iterdir()
+        if compacted.get(file.name) != file.stat().st_mtime_ns
+    }
+    assert changed == {"docs.0.jsonl", "log.1.jsonl"}
+    assert len((path / "log.1.jsonl").read_bytes().splitlines()) == 2
+
+    loaded = BM25Index.load(path)
+    assert loaded.count == 4
+    assert get_ids(loaded, "quick") == ["c", "e"]
+
+
+def test_torn_log_lines_are_ignored_and_truncated(tmp_path):
+    path = tmp_path / "index"
+    index = BM25Index(path)
+    index.add(RECORDS)
+    index.save(compact=True)
+    index.add([("e", "quick turtle", {})])
+    index.save()
+
+    # A writer that died mid-append
+    with open(path / "log.1.jsonl", "ab") as f:
+        f.write(b'{"docs": [["f", 0')
+
+    loaded = BM25Index.load(path)
+    assert get_ids(loaded, "turtle") == ["e"]
+
+    loaded.add([("g", "green turtle", {})])
+    loaded.save()
+    assert sorted(get_ids(BM25Index.load(path), "turtle")) == ["e", "g"]
+
+
+def test_manager_reloads_stale_indexes(tmp_path):
+    first = BM25IndexManager(tmp_path, cache_size=1)
+    second = BM25IndexManager(tmp_path, cache_size=1)
+
+    first.create("collection", RECORDS, enriched=False)
+    assert get_ids(second.get("collection"), "fox") == ["a"]
+
+    # Log appends are replayed into the cached index rather than reloading it
+    cached = second.get("collection")
+    first.update("collection", lambda index: index.delete(["a"]))
+    assert second.get("collection") is cached
+    assert get_ids(cached, "fox") == []
+
+    second.drop("collection")
+    assert first.get("collection") is None
+
+
+def add_records(directory, worker):
+    manager = BM25IndexManager(directory)
+    for i in range(10):
+        manager.update(
+            "collection",
+            lambda index: index.add([(f"{worker}-{i}", f"turtle {worker}", {})]),
+        )
+
+
+def test_concurrent_updates_from_processes_are_kept(tmp_path):
+    BM25IndexManager(tmp_path).create("collection", RECORDS, enriched=False)
+
+    context = multiprocessing.get_context("fork")
+    processes = [
+        context.Process(target=add_records, args=(tmp_path, worker))
+        for worker in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    index = BM25IndexManager(tmp_path).get("collection")
+    assert index.count == len(RECORDS) + 40
+    assert len(get_ids(index, "turtle", k=100)) == 40
@@ -0,0 +1,159 @@
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from open_webui.internal import db as internal_db
+from open_webui.internal.db import Base
+from open_webui.models.channels import (
+    Channel,
+    ChannelMember,
+    ChannelWebhook,
+    Channels,
+)
+from open_webui.models.messages import Message, MessageReaction, Messages
+from open_webui.models.users import User
+
+CHANNEL_IDS = ["read", "unread", "not-a-member", "empty"]
+MESSAGE_IDS = ["a", "b", "c", "d", "e", "missing"]
+
+
+@pytest.fixture
+def db(monkeypatch):
+    # Run the table methods in this session rather than the app database
+    monkeypatch.setattr(internal_db, "DATABASE_ENABLE_SESSION_SHARING", True)
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(
+        engine,
+        tables=[
+            User.__table__,
+            Channel.__table__,
+            ChannelMember.__table__,
+            ChannelWebhook.__table__,
+            Message.__table__,
+            MessageReaction.__table__,
+        ],
+    )
+    with Session(engine) as db:
+        add_channels(db)
+        db.commit()
+        yield db
+
+
+def add_channels(db):
+    for id in ("u", "v", "w"):
+        db.add(User(id=id, name=id.upper(), email=f"{id}@example.com", role="user"))
+
+    for id in CHANNEL_IDS:
+        db.add(Channel(id=id, user_id="v", name=id, created_at=0, updated_at=0))
+
+    # "not-a-member" has members but no row for u, "empty" has none at all
+    for channel_id, user_id, last_read_at in [
+        ("read", "u", 25),
+        ("read", "v", None),
+        ("unread", "u", None),
+        ("unread", "w", 10),
+        ("not-a-member", "v", None),
+    ]:
+        db.add(
+            ChannelMember(
+                id=f"{channel_id}-{user_id}",
+                channel_id=channel_id,
+                user_id=user_id,
+                last_read_at=last_read_at,
+                created_at=0,
+                updated_at=0,
+            )
+        )
+
+    # Top-level messages from u and others, with thread replies under a and c
+    for id, channel_id, user_id, parent_id, created_at in [
+        ("a", "read", "v", None, 10),
+        ("b", "read", "v", None, 30),
+        ("c", "read", "u", None, 40),
+        ("a1", "read", "u", "a", 50),
+        ("a2", "read", "w", "a", 60),
+        ("c1", "read", "v", "c", 45),
+        ("d", "unread", "v", None, 20),
+        ("e", "unread", "u", None, 20),
+        ("f", "not-a-member", "v", None, 20),
+    ]:
+        db.add(
+            Message(
+                id=id,
+                channel_id=channel_id,
+                user_id=user_id,
+                parent_id=parent_id,
+                content=id,
+                created_at=created_at,
+                updated_at=created_at,
+            )
+        )
+
+    for id, message_id, user_id, name in [
+        ("r1", "a", "u", "+1"),
+        ("r2", "a", "v", "+1"),
+        ("r3", "a", "v", "eyes"),
+        ("r4", "d", "w", "+1"),
+    ]:
+        db.add(
+            MessageReaction(
+                id=id, message_id=message_id, user_id=user_id, name=name, created_at=0
+            )
+        )
+
+
+def test_unread_counts_match_the_per_channel_lookup(db):
+    counts = Messages.get_unread_message_counts_by_channel_ids(CHANNEL_IDS, "u", db=db)
+
+    for channel_id in CHANNEL_IDS:
+        member = Channels.get_member_by_channel_and_user_id(channel_id, "u", db=db)
+        expected = (
+            Messages.get_unread_message_count(
+                channel_id, "u", member.last_read_at, db=db
+            )
+            if member
+            else 0
+        )
+        assert counts.get(channel_id, 0) == expected, channel_id
+
+    assert counts == {"read": 1, "unread": 1}
+
+
+def test_members_match_the_per_channel_lookup(db):
+    members = Channels.get_members_by_channel_ids(CHANNEL_IDS, db=db)
+
+    assert members.keys() == set(CHANNEL_IDS)
+    for channel_id in CHANNEL_IDS:
+        assert members[channel_id] == Channels.get_members_by_channel_id(
+            channel_id, db=db
+        )
+    assert members["empty"] == []
+
+
+def test_reply_stats_match_the_thread_replies(db):
+    stats = Messages.get_thread_reply_stats_by_message_ids(MESSAGE_IDS, db=db)
+
+    for message_id in MESSAGE_IDS:
+        replies = Messages.get_thread_replies_by_message_id(message_id, db=db)
+        expected = (len(replies), replies[0].created_at if replies else None)
+        assert stats.get(message_id, (0, None)) == expected, message_id
+
+    assert stats == {"a": (2, 60), "c": (1, 45)}
+
+
+def test_reactions_match_the_per_message_lookup(db):
+    reactions = Messages.get_reactions_by_message_ids(MESSAGE_IDS, db=db)
+
+    assert reactions.keys() == set(MESSAGE_IDS)
+    for message_id in MESSAGE_IDS:
+        assert reactions[message_id] == Messages.get_reactions_by_message_id(
+            message_id, db=db
+        )
+
+    assert [(r.name, r.count) for r in reactions["a"]] == [("+1", 2), ("eyes", 1)]
+    assert reactions["b"] == []
@@ -0,0 +1,113 @@
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from open_webui.internal import db as internal_db
+from open_webui.internal.db import Base
+from open_webui.models.chat_messages import (
+    ChatMessage,
+    ChatMessageRollup,
+    ChatMessageRollupState,
+    ChatMessages,
+)
+from open_webui.models.chat_search import ChatSearch
+from open_webui.models.chats import Chat, Chats
+
+DAY_AGO = (int(time.time()) - 86400) // 3600 * 3600
+
+
+@pytest.fixture
+def db(monkeypatch):
+    # Run the table methods in this session rather than the app database
+    monkeypatch.setattr(internal_db, "DATABASE_ENABLE_SESSION_SHARING", True)
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(
+        engine,
+        tables=[
+            Chat.__table__,
+            ChatMessage.__table__,
+            ChatMessageRollup.__table__,
+            ChatMessageRollupState.__table__,
+            ChatSearch.__table__,
+        ],
+    )
+    with Session(engine) as db:
+        yield db
+
+
+def assistant_message(timestamp: int, usage=None) -> dict:
+    message = {"role": "assistant", "model": "m", "timestamp": timestamp}
+    if usage:
+        message["usage"] = usage
+    return message
+
+
+def test_late_writes_adjust_compacted_hours(db):
+    ChatMessages.upsert_message("a", "chat", "u", assistant_message(DAY_AGO), db=db)
+    assert ChatMessages.compact_rollups(db=db) == 1
+
+    # Usage reported after the hour was rolled up, and a backfilled message
+    ChatMessages.upsert_message(
+        "a",
+        "chat",
+        "u",
+        {"usage": {"input_tokens": 10, "output_tokens": 5}},
+        db=db,
+    )
+    ChatMessages.upsert_message(
+        "b",
+        "chat",
+        "u",
+        assistant_message(DAY_AGO + 60, {"input_tokens": 1, "output_tokens": 2}),
+        db=db,
+    )
+    assert ChatMessages.compact_rollups(db=db) == 0
+
+    assert ChatMessages.get_message_count_by_model(db=db) == {"m": 2}
+    assert ChatMessages.get_token_usage_by_model(db=db) == {
+        "m": {
+            "input_tokens": 11,
+            "output_tokens": 7,
+            "total_tokens": 18,
+            "message_count": 2,
+        }
+    }
+
+
+def test_deletes_take_messages_out_of_compacted_hours(db):
+    for id in ("a", "b", "c"):
+        ChatMessages.upsert_message(
+            id,
+            "chat",
+            "u",
+            assistant_message(DAY_AGO, {"input_tokens": 1, "output_tokens": 2}),
+            db=db,
+        )
+    ChatMessages.upsert_message("d", "other", "u", assistant_message(DAY_AGO), db=db)
+    assert ChatMessages.compact_rollups(db=db) == 1
+
+    # Edits of a chat drop the messages no longer in it
+    ChatMessages.delete_messages_by_chat_id_except("chat", ["a", "b"], db=db)
+    assert ChatMessages.get_message_count_by_model(db=db) == {"m": 3}
+    assert ChatMessages.get_token_usage_by_model(db=db)["m"] == {
+        "input_tokens": 2,
+        "output_tokens": 4,
+        "total_tokens": 6,
+        "message_count": 3,
+    }
+
+    db.add(Chat(id="chat", user_id="u", title="", chat={}, created_at=0, updated_at=0))
+    db.commit()
+    assert Chats.delete_chat_by_id("chat", db=db)
+    assert ChatMessages.get_message_count_by_model(db=db) == {"m": 1}
+
+    # The rollup row goes with the last message of its hour
+    ChatMessages.delete_messages_by_chat_id("other", db=db)
+    assert ChatMessages.get_message_count_by_model(db=db) == {}
+    assert db.query(ChatMessageRollup).count() == 0
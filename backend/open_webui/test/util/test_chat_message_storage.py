@@ -0,0 +1,156 @@
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from open_webui.internal import db as internal_db
+from open_webui.internal.db import Base
+from open_webui.models import chats as chats_module
+from open_webui.models.chat_messages import (
+    ChatMessage,
+    ChatMessageRollup,
+    ChatMessageRollupState,
+)
+from open_webui.models.chat_search import ChatSearch
+from open_webui.models.chats import Chat, ChatForm, Chats
+
+
+@pytest.fixture
+def db(monkeypatch):
+    # Run the table methods in this session rather than the app database
+    monkeypatch.setattr(internal_db, "DATABASE_ENABLE_SESSION_SHARING", True)
+    monkeypatch.setattr(chats_module, "ENABLE_CHAT_MESSAGE_STORAGE", True)
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(
+        engine,
+        tables=[
+            Chat.__table__,
+            ChatMessage.__table__,
+            ChatMessageRollup.__table__,
+            ChatMessageRollupState.__table__,
+            ChatSearch.__table__,
+        ],
+    )
+    with Session(engine) as db:
+        yield db
+
+
+def make_chat() -> dict:
+    messages = {
+        "a": {
+            "id": "a",
+            "parentId": None,
+            "childrenIds": ["b"],
+            "role": "user",
+            "content": "hello",
+            "timestamp": 1,
+        },
+        "b": {
+            "id": "b",
+            "parentId": "a",
+            "childrenIds": [],
+            "role": "assistant",
+            "content": "hi there",
+            "model": "m",
+            "timestamp": 2,
+        },
+    }
+    return {
+        "title": "Greeting",
+        "history": {"currentId": "b", "messages": messages},
+        "messages": [messages["a"], messages["b"]],
+    }
+
+
+def test_split_chat_keeps_only_the_skeleton():
+    chat = make_chat()
+    skeleton, messages = Chats._split_chat(chat)
+
+    assert messages == chat["history"]["messages"]
+    assert skeleton["title"] == "Greeting"
+    assert skeleton["history"] == {
+        "currentId": "b",
+        "messages": {
+            "a": {"id": "a", "parentId": None, "childrenIds": ["b"], "role": "user"},
+            "b": {"id": "b", "parentId": "a", "childrenIds": [], "role": "assistant"},
+        },
+    }
+    assert skeleton["messages"] == [{"id": "a"}, {"id": "b"}]
+
+
+def test_split_chat_without_history():
+    chat = {"title": "Empty"}
+    assert Chats._split_chat(chat) == (chat, {})
+
+
+def test_hydrate_chat_round_trips_split_chat():
+    chat = make_chat()
+    assert Chats._hydrate_chat(*Chats._split_chat(chat)) == chat
+
+
+def test_hydrate_chat_keeps_skeleton_of_missing_messages():
+    skeleton, messages = Chats._split_chat(make_chat())
+    hydrated = Chats._hydrate_chat(skeleton, {"b": messages["b"]})
+
+    assert hydrated["history"]["messages"]["a"] == skeleton["history"]["messages"]["a"]
+    assert hydrated["history"]["messages"]["b"] == messages["b"]
+    assert hydrated["messages"] == [
+        skeleton["history"]["messages"]["a"],
+        messages["b"],
+    ]
+
+
+def test_insert_stores_bodies_in_chat_message(db):
+    chat = Chats.insert_new_chat("u", ChatForm(chat=make_chat()), db=db)
+
+    chat_item = db.get(Chat, chat.id)
+    assert "content" not in chat_item.chat["history"]["messages"]["b"]
+    assert db.query(ChatMessage).filter_by(chat_id=chat.id).count() == 2
+    assert Chats.get_chat_by_id(chat.id, db=db).chat == make_chat()
+
+
+def test_upsert_message_merges_into_row(db):
+    chat = Chats.insert_new_chat("u", ChatForm(chat=make_chat()), db=db)
+    chat_item = db.get(Chat, chat.id)
+    skeleton = chat_item.chat
+
+    # A body-only update does not rewrite the skeleton
+    message = Chats._upsert_message(chat_item, "b", {"content": "hi again"}, db)
+    assert message["content"] == "hi again"
+    assert message["model"] == "m"
+    assert db.get(Chat, chat.id).chat == skeleton
+
+    # A new message is linked into the history tree and made current
+    Chats._upsert_message(
+        chat_item,
+        "c",
+        {"id": "c", "parentId": "b", "childrenIds": [], "role": "user"},
+        db,
+    )
+    history = db.get(Chat, chat.id).chat["history"]
+    assert history["currentId"] == "c"
+    assert history["messages"]["c"] == {
+        "id": "c",
+        "parentId": "b",
+        "childrenIds": [],
+        "role": "user",
+    }
+
+    chat = Chats.get_chat_by_id(chat.id, db=db).chat
+    assert chat["history"]["messages"]["b"]["content"] == "hi again"
+
+
+def test_chat_updates_return_the_full_chat(db):
+    chat = Chats.insert_new_chat("u", ChatForm(chat=make_chat()), db=db)
+
+    assert Chats.toggle_chat_pinned_by_id(chat.id, db=db).chat == make_chat()
+    assert Chats.toggle_chat_archive_by_id(chat.id, db=db).chat == make_chat()
+    assert Chats.update_chat_share_id_by_id(chat.id, "s", db=db).chat == make_chat()
+    assert (
+        Chats.update_chat_folder_id_by_id_and_user_id(chat.id, "u", "f", db=db).chat
+        == make_chat()
+    )
@@ -0,0 +1,187 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from open_webui.internal import db as internal_db
+from open_webui.internal.db import Base
+from open_webui.models import chats as chats_module
+from open_webui.models.chat_messages import (
+    ChatMessage,
+    ChatMessageRollup,
+    ChatMessageRollupState,
+)
+from open_webui.models.chat_search import ChatSearch, ChatSearchTable, ChatSearches
+from open_webui.models.chats import Chat, ChatForm, Chats
+
+MIGRATION = (
+    Path(__file__).resolve().parents[2]
+    / "migrations"
+    / "versions"
+    / "e5f6a7b8c9d0_add_chat_search_table.py"
+)
+
+
+def get_migration():
+    spec = importlib.util.spec_from_file_location("chat_search_migration", MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_migration(engine, migration=None):
+    with engine.begin() as conn:
+        with Operations.context(MigrationContext.configure(conn)):
+            (migration or get_migration()).upgrade()
+
+
+@pytest.fixture
+def engine(monkeypatch, tmp_path):
+    # Run the table methods in the test session rather than the app database
+    monkeypatch.setattr(internal_db, "DATABASE_ENABLE_SESSION_SHARING", True)
+    # Keeps the message writes of the chat methods in the test session too
+    monkeypatch.setattr(chats_module, "ENABLE_CHAT_MESSAGE_STORAGE", True)
+    monkeypatch.setattr(ChatSearchTable, "_has_fts", None)
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'webui.db'}")
+    Base.metadata.create_all(
+        engine,
+        tables=[
+            Chat.__table__,
+            ChatMessage.__table__,
+            ChatMessageRollup.__table__,
+            ChatMessageRollupState.__table__,
+        ],
+    )
+    return engine
+
+
+@pytest.fixture(params=["fts", "like"])
+def db(request, engine, monkeypatch):
+    run_migration(engine)
+    if request.param == "like":
+        monkeypatch.setattr(ChatSearchTable, "_has_fts", False)
+
+    with Session(engine) as db:
+        yield db
+
+
+def make_chat(title: str, *contents: str) -> dict:
+    messages = {
+        f"m{i}": {"id": f"m{i}", "role": "user", "content": content}
+        for i, content in enumerate(contents)
+    }
+    return {"title": title, "history": {"messages": messages}}
+
+
+def get_rows(db, chat_id: str) -> dict:
+    return {
+        row.message_id: row.content
+        for row in db.query(ChatSearch).filter_by(chat_id=chat_id)
+    }
+
+
+def search(db, text: str, user_id: str = "u") -> list[str]:
+    return [
+        chat.title
+        for chat in Chats.get_chats_by_user_id_and_search_text(user_id, text, db=db)
+    ]
+
+
+def test_rows_follow_chat_writes(db):
+    chat = Chats.insert_new_chat(
+        "u", ChatForm(chat=make_chat("Trip", "pack the tent", "")), db=db
+    )
+    assert get_rows(db, chat.id) == {"": "Trip", "m0": "pack the tent"}
+
+    Chats.update_chat_by_id(chat.id, make_chat("Camping", "pack the stove"), db=db)
+    assert get_rows(db, chat.id) == {"": "Camping", "m0": "pack the stove"}
+    assert search(db, "tent") == []
+    assert search(db, "stove") == ["Camping"]
+
+    Chats.upsert_message_to_chat_by_id_and_message_id(
+        chat.id, "m1", {"role": "assistant", "content": "and a lantern"}, db=db
+    )
+    assert search(db, "lantern") == ["Camping"]
+
+    Chats.delete_chat_by_id(chat.id, db=db)
+    assert get_rows(db, chat.id) == {}
+    assert search(db, "stove") == []
+
+
+def test_search_is_scoped_to_the_user(db):
+    Chats.insert_new_chat("u", ChatForm(chat=make_chat("Mine", "recipe")), db=db)
+    Chats.insert_new_chat("v", ChatForm(chat=make_chat("Theirs", "recipe")), db=db)
+
+    assert search(db, "recipe") == ["Mine"]
+    assert search(db, "recipe", user_id="v") == ["Theirs"]
+    # Substrings and titles match, as with LIKE
+    assert search(db, "CIP") == ["Mine"]
+    assert search(db, "min") == ["Mine"]
+
+
+def test_ranking(db, request):
+    for updated_at, title, content in [
+        (1, "Often", "kayak kayak kayak"),
+        (2, "Once", "a long note that mentions kayak once among many other words"),
+    ]:
+        chat = Chats.insert_new_chat(
+            "u", ChatForm(chat=make_chat(title, content)), db=db
+        )
+        db.get(Chat, chat.id).updated_at = updated_at
+    db.commit()
+
+    if request.node.callspec.params["db"] == "fts":
+        # bm25 ranks the denser match first
+        assert search(db, "kayak") == ["Often", "Once"]
+    else:
+        # LIKE matches are unranked and ordered by recency
+        assert search(db, "kayak") == ["Once", "Often"]
+
+
+def test_backfill_pages_existing_chats(engine, monkeypatch):
+    with Session(engine) as db:
+        # Message bodies in the chat blob, and in chat_message only
+        db.add(
+            Chat(
+                id="inline",
+                user_id="u",
+                title="Inline",
+                chat=make_chat("Inline", "blob body"),
+                created_at=0,
+                updated_at=0,
+            )
+        )
+        db.add(
+            Chat(
+                id="shared-x",
+                user_id="shared-inline",
+                title="Shared",
+                chat=make_chat("Shared", "blob body"),
+                created_at=0,
+                updated_at=0,
+            )
+        )
+        db.commit()
+        stored = Chats.insert_new_chat(
+            "u", ChatForm(chat=make_chat("Stored", "row body")), db=db
+        )
+
+    migration = get_migration()
+    monkeypatch.setattr(migration, "BATCH_SIZE", 1)
+    run_migration(engine, migration)
+
+    with Session(engine) as db:
+        assert get_rows(db, "inline") == {"": "Inline", "m0": "blob body"}
+        assert get_rows(db, stored.id) == {"": "Stored", "m0": "row body"}
+        assert get_rows(db, "shared-x") == {}
+
+        assert ChatSearches._get_fts_enabled(db)
+        assert search(db, "body") == ["Stored", "Inline"]
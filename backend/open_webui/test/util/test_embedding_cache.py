@@ -0,0 +1,64 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from open_webui.retrieval.embedding_cache import (
+    EmbeddingCache,
+    get_cached_embedding_function,
+)
+
+
+def get_embedding_function(calls):
+    async def embedding_function(query, prefix=None, user=None):
+        calls.append(query)
+        return [[float(len(text)), 1.0] for text in query]
+
+    return embedding_function
+
+
+@pytest.mark.asyncio
+async def test_embeds_only_misses():
+    calls = []
+    embedding_function = get_cached_embedding_function(
+        get_embedding_function(calls), "openai", "model", EmbeddingCache(size=10)
+    )
+
+    assert await embedding_function("abc", prefix="q") == [3.0, 1.0]
+    assert await embedding_function(["abc", "de", "de"], prefix="q") == [
+        [3.0, 1.0],
+        [2.0, 1.0],
+        [2.0, 1.0],
+    ]
+    # A different prefix is a different embedding
+    await embedding_function("abc", prefix="c")
+
+    assert calls == [["abc"], ["de"], ["abc"]]
+
+
+@pytest.mark.asyncio
+async def test_disk_storage_survives_restart(tmp_path):
+    calls = []
+    for _ in range(2):
+        embedding_function = get_cached_embedding_function(
+            get_embedding_function(calls),
+            "openai",
+            "model",
+            EmbeddingCache(size=10, storage="disk", ttl=60, directory=tmp_path),
+        )
+        assert await embedding_function(["abcd"]) == [[4.0, 1.0]]
+
+    assert calls == [["abcd"]]
+
+
+@pytest.mark.asyncio
+async def test_short_batches_fail():
+    async def embedding_function(query, prefix=None, user=None):
+        return [[1.0, 1.0]]
+
+    embedding_function = get_cached_embedding_function(
+        embedding_function, "openai", "model", EmbeddingCache(size=10)
+    )
+    assert await embedding_function(["abc", "de"]) is None
@@ -0,0 +1,40 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from open_webui.utils.telemetry.metrics import EventLoopMonitor
+
+
+def blocking_call():
+    time.sleep(0.3)
+
+
+async def blocking_handler():
+    blocking_call()
+
+
+def test_blocking_call_sites_are_recorded():
+    monitor = EventLoopMonitor(interval=0.01, slow_threshold=0.05)
+    monitor.add_entrypoint(blocking_handler, "/blocking")
+
+    async def run():
+        monitor.start()
+        await asyncio.sleep(0.05)
+        await blocking_handler()
+        await asyncio.sleep(0.05)
+        monitor.stop()
+
+    asyncio.run(run())
+    stats = monitor.get_stats()
+
+    assert stats["blocks"] == 1
+    assert stats["lag_ms"]["max"] >= 250
+
+    [site] = stats["sites"]
+    assert site["site"].startswith("open_webui/test/util/test_event_loop_monitor.py")
+    assert site["site"].endswith("in blocking_call")
+    assert site["routes"] == {"/blocking": 1}
+    assert "time.sleep(0.3)" in site["stack"][-1]
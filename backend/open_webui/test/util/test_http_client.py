@@ -0,0 +1,58 @@
+import asyncio
+import sys
+from pathlib import Path
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from open_webui.utils.http_client import HTTPClientRegistry
+
+
+def test_sessions_are_shared_per_origin_and_ssl():
+    async def run():
+        registry = HTTPClientRegistry(limit=0, limit_per_host=0, keepalive_timeout=30)
+
+        session = registry.get_session("https://api.example.com/v1/chat", ssl=True)
+        assert registry.get_session("https://API.example.com/v1/models") is not None
+        assert registry.get_session("https://api.example.com/v1", ssl=True) is session
+        assert (
+            registry.get_session("https://api.example.com/v1", ssl=False) is not session
+        )
+        assert (
+            registry.get_session("http://api.example.com/v1", ssl=True) is not session
+        )
+
+        await registry.close()
+        assert session.closed
+        assert registry.get_stats() == []
+
+    asyncio.run(run())
+
+
+def test_connections_are_reused():
+    async def handler(request):
+        return web.json_response({"ok": True})
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/", handler)
+
+        registry = HTTPClientRegistry(limit=0, limit_per_host=0, keepalive_timeout=30)
+        async with TestServer(app) as server:
+            url = str(server.make_url("/"))
+            for _ in range(5):
+                async with registry.get_session(url).get(url) as response:
+                    assert await response.json() == {"ok": True}
+
+            [stats] = registry.get_stats()
+            assert stats["requests"] == 5
+            assert stats["handshakes"] == 1
+            assert stats["reused"] == 4
+            assert stats["in_use"] == 0
+            assert stats["idle"] == 1
+
+            await registry.close()
+
+    asyncio.run(run())
@@ -0,0 +1,112 @@
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+
+def _backend_dir() -> Path:
+    return Path(__file__).resolve().parents[3]
+
+
+def _worker_script() -> str:
+    # Runs in a fresh process with its own DATA_DIR: the worker loads the app,
+    # which reads its config from the database at import time
+    return """
+import io
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class EmbeddingsHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        data = [{"embedding": [1.0, float(i), 0.5]} for i, _ in enumerate(body["input"])]
+        payload = json.dumps({"data": data}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), EmbeddingsHandler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+
+import os
+
+os.environ["RAG_OPENAI_API_BASE_URL"] = f"http://127.0.0.1:{server.server_port}/v1"
+
+from open_webui.ingestion import IngestionWorker
+from open_webui.models.auths import Auths
+from open_webui.models.files import FileForm, Files
+from open_webui.models.ingestion_jobs import IngestionJobs
+from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.storage.provider import Storage
+
+user = Auths.insert_new_auth("worker@example.com", "password", "Worker", role="admin")
+_, path = Storage.upload_file(io.BytesIO(b"hello from the queue"), "a_notes.txt", {})
+file = Files.insert_new_file(
+    user.id,
+    FileForm(
+        id="a",
+        filename="notes.txt",
+        path=path,
+        data={"status": "pending"},
+        meta={"name": "notes.txt", "content_type": "text/plain"},
+    ),
+)
+IngestionJobs.insert_new_job(
+    file.id, user.id, {"content_type": "text/plain", "file_path": path, "metadata": {}}
+)
+
+worker = IngestionWorker(1)
+request = worker.load()
+job = IngestionJobs.claim_job(worker.worker_id, 60)
+worker.run_job(request, job)
+worker.close()
+
+file = Files.get_file_by_id("a")
+assert file.data["status"] == "completed", file.data
+assert file.data["content"] == "hello from the queue"
+assert IngestionJobs.get_job_counts() == {}
+result = VECTOR_DB_CLIENT.query(collection_name="file-a", filter={"file_id": "a"})
+assert result.documents[0] == ["hello from the queue"]
+
+# Deleting a file drops its queued jobs
+IngestionJobs.insert_new_job(file.id, user.id, {})
+Files.delete_file_by_id(file.id)
+assert IngestionJobs.get_job_counts() == {}
+print("ok")
+"""
+
+
+def test_worker_processes_a_queued_file():
+    with tempfile.TemporaryDirectory() as data_dir:
+        env = os.environ.copy()
+        env["PYTHONPATH"] = str(_backend_dir())
+        env["DATA_DIR"] = data_dir
+        # Loading the app rewrites the static directory
+        env["STATIC_DIR"] = os.path.join(data_dir, "static")
+        os.makedirs(env["STATIC_DIR"])
+        env["WEBUI_SECRET_KEY"] = "test"
+        env["RAG_EMBEDDING_ENGINE"] = "openai"
+        env["RAG_EMBEDDING_MODEL"] = "test-embedding"
+        env["RAG_OPENAI_API_KEY"] = "test"
+        env["VECTOR_DB"] = "chroma"
+
+        result = subprocess.run(
+            [sys.executable, "-c", _worker_script()],
+            env=env,
+            cwd=data_dir,
+            capture_output=True,
+            text=True,
+            timeout=300,
+        )
+
+    assert result.returncode == 0, result.stderr[-4000:]
+    assert result.stdout.strip().endswith("ok")
@@ -0,0 +1,183 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from open_webui.internal import db as internal_db
+from open_webui.internal.db import Base
+from open_webui.models.feedbacks import Feedback, Feedbacks
+from open_webui.models.leaderboard import (
+    Leaderboard,
+    LeaderboardMatches,
+    LeaderboardRating,
+    LeaderboardState,
+    get_feedback_matches,
+    update_ratings,
+)
+
+MODELS = ["a", "b", "c", "d"]
+
+
+def random_feedback(count: int) -> list[dict]:
+    rng = random.Random(0)
+    rows = []
+    for _ in range(count):
+        model_id = rng.choice(MODELS)
+        rows.append(
+            {
+                "model_id": model_id,
+                "sibling_model_ids": rng.sample(
+                    [m for m in MODELS if m != model_id], rng.randint(0, 2)
+                ),
+                "rating": rng.choice([1, -1, 0, "1", None]),
+                "tags": rng.sample(["x", "y", "z"], rng.randint(0, 2)),
+            }
+        )
+    return rows
+
+
+def assert_same_stats(actual: dict, expected: dict):
+    assert actual.keys() == expected.keys()
+    for model_id, stats in expected.items():
+        assert abs(actual[model_id]["rating"] - stats["rating"]) < 1e-9
+        assert actual[model_id]["won"] == stats["won"]
+        assert actual[model_id]["lost"] == stats["lost"]
+
+
+def test_replay_matches_sequential_updates():
+    rows = random_feedback(500)
+
+    expected = {}
+    for data in rows:
+        update_ratings(expected, get_feedback_matches(data))
+
+    assert_same_stats(LeaderboardMatches.from_feedback_data(rows).replay(), expected)
+
+
+def test_weighted_replay_matches_weighted_updates():
+    rows = random_feedback(500)
+    rng = random.Random(1)
+    weights = [rng.random() for _ in rows]
+
+    expected = {}
+    for data, weight in zip(rows, weights):
+        update_ratings(expected, get_feedback_matches(data), weight)
+
+    matches = LeaderboardMatches.from_feedback_data(rows)
+    assert_same_stats(matches.replay(weights), expected)
+    assert len(matches.tag_feedback) == sum(len(data["tags"]) for data in rows)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    # Run the table methods in this session rather than the app database
+    monkeypatch.setattr(internal_db, "DATABASE_ENABLE_SESSION_SHARING", True)
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(
+        engine,
+        tables=[
+            Feedback.__table__,
+            LeaderboardRating.__table__,
+            LeaderboardState.__table__,
+        ],
+    )
+    with Session(engine) as db:
+        yield db
+
+
+def test_recompute_runs_when_due(db):
+    for i, data in enumerate(random_feedback(50)):
+        db.add(Feedback(id=str(i), user_id="u", type="rating", data=data, created_at=i))
+    db.commit()
+
+    expected = {}
+    for data in random_feedback(50):
+        update_ratings(expected, get_feedback_matches(data))
+
+    assert Feedbacks.recompute_leaderboard(3600, db=db)
+    ratings = {
+        rating.model_id: rating.model_dump()
+        for rating in Leaderboard.get_ratings(db=db)
+    }
+    assert_same_stats({model_id: ratings[model_id] for model_id in expected}, expected)
+
+    # Claimed until the interval passes, unless the ratings go stale
+    assert not Feedbacks.recompute_leaderboard(3600, db=db)
+    Feedbacks.delete_feedback_by_id("0", db=db)
+    assert Feedbacks.recompute_leaderboard(3600, db=db)
+    assert not Feedbacks.recompute_leaderboard(3600, db=db)
+
+
+def get_stats(db, model_ids) -> dict:
+    ratings = {
+        rating.model_id: rating.model_dump()
+        for rating in Leaderboard.get_ratings(db=db)
+    }
+    return {model_id: ratings[model_id] for model_id in model_ids}
+
+
+def add_feedback_before_lock(monkeypatch, rows: list[tuple[int, dict]]):
+    """Commit feedback between the replay and the ratings lock."""
+    lock_ratings = Leaderboard.lock_ratings
+
+    def add_then_lock(db):
+        for created_at, data in rows:
+            db.add(
+                Feedback(
+                    id=f"late-{created_at}",
+                    user_id="u",
+                    type="rating",
+                    data=data,
+                    created_at=created_at,
+                    updated_at=created_at,
+                )
+            )
+        db.commit()
+        lock_ratings(db)
+
+    monkeypatch.setattr(Leaderboard, "lock_ratings", add_then_lock)
+
+
+def test_recompute_applies_feedback_past_the_watermark(db, monkeypatch):
+    rows = random_feedback(60)
+    for i, data in enumerate(rows[:50]):
+        db.add(Feedback(id=str(i), user_id="u", type="rating", data=data, created_at=i))
+    db.commit()
+
+    add_feedback_before_lock(monkeypatch, list(enumerate(rows))[50:])
+    assert Feedbacks.recompute_leaderboard(3600, db=db)
+
+    expected = {}
+    for data in rows:
+        update_ratings(expected, get_feedback_matches(data))
+    assert_same_stats(get_stats(db, expected), expected)
+
+    # Nothing was missed, so the next recompute is not due early
+    monkeypatch.undo()
+    monkeypatch.setattr(internal_db, "DATABASE_ENABLE_SESSION_SHARING", True)
+    assert not Feedbacks.recompute_leaderboard(3600, db=db)
+
+
+def test_recompute_runs_again_for_feedback_behind_the_watermark(db, monkeypatch):
+    rows = random_feedback(51)
+    for i, data in enumerate(rows[1:], start=1):
+        db.add(Feedback(id=str(i), user_id="u", type="rating", data=data, created_at=i))
+    db.commit()
+
+    # Written during the replay with an older created_at
+    add_feedback_before_lock(monkeypatch, [(0, rows[0])])
+    assert Feedbacks.recompute_leaderboard(3600, db=db)
+
+    monkeypatch.undo()
+    monkeypatch.setattr(internal_db, "DATABASE_ENABLE_SESSION_SHARING", True)
+    assert Feedbacks.recompute_leaderboard(3600, db=db)
+
+    expected = {}
+    for data in rows:
+        update_ratings(expected, get_feedback_matches(data))
+    assert_same_stats(get_stats(db, expected), expected)
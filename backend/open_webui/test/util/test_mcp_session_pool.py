@@ -0,0 +1,149 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import anyio
+from mcp import types
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from open_webui.utils.mcp import client as mcp_client
+from open_webui.utils.mcp.client import MCPSessionPool
+
+
+class FakeClient:
+    connects = 0
+
+    def __init__(self):
+        self.message_handler = None
+        self.fail_next = False
+
+    async def connect(self, url, headers=None, message_handler=None):
+        FakeClient.connects += 1
+        self.message_handler = message_handler
+
+    async def disconnect(self):
+        pass
+
+    async def list_tool_specs(self):
+        if self.fail_next:
+            raise anyio.ClosedResourceError()
+        return [{"name": "tool", "description": "", "parameters": {}}]
+
+    async def call_tool(self, function_name, function_args):
+        return [{"type": "text", "text": function_name}]
+
+
+def test_sessions_are_reused_per_identity(monkeypatch):
+    monkeypatch.setattr(mcp_client, "MCPClient", FakeClient)
+    FakeClient.connects = 0
+
+    async def run():
+        pool = MCPSessionPool(
+            idle_timeout=300, health_check_interval=300, tool_specs_ttl=300
+        )
+        alice = pool.get_client("http://mcp", {"Authorization": "Bearer a"})
+        bob = pool.get_client("http://mcp", {"Authorization": "Bearer b"})
+
+        for _ in range(3):
+            await alice.list_tool_specs()
+            await alice.call_tool("tool", {})
+        await bob.list_tool_specs()
+        assert FakeClient.connects == 2
+
+        await pool.close()
+        assert pool.get_stats() == []
+
+    asyncio.run(run())
+
+
+def test_tool_specs_are_refreshed_on_list_changed(monkeypatch):
+    monkeypatch.setattr(mcp_client, "MCPClient", FakeClient)
+
+    async def run():
+        pool = MCPSessionPool(
+            idle_timeout=300, health_check_interval=300, tool_specs_ttl=300
+        )
+        client = pool.get_client("http://mcp", None)
+        await client.list_tool_specs()
+
+        [session] = pool.sessions.values()
+        assert session.tool_specs is not None
+
+        await session.client.message_handler(
+            types.ServerNotification(
+                types.ToolListChangedNotification(
+                    method="notifications/tools/list_changed"
+                )
+            )
+        )
+        assert session.tool_specs is None
+
+        await pool.close()
+
+    asyncio.run(run())
+
+
+def test_broken_sessions_are_replaced(monkeypatch):
+    monkeypatch.setattr(mcp_client, "MCPClient", FakeClient)
+    FakeClient.connects = 0
+
+    async def run():
+        pool = MCPSessionPool(
+            idle_timeout=300, health_check_interval=300, tool_specs_ttl=0
+        )
+        client = pool.get_client("http://mcp", None)
+        await client.list_tool_specs()
+
+        [session] = pool.sessions.values()
+        session.client.fail_next = True
+
+        # Retried once on a new session
+        assert await client.list_tool_specs()
+        assert session.closed
+        assert FakeClient.connects == 2
+
+        await pool.close()
+
+    asyncio.run(run())
+
+
+def test_idle_sessions_are_evicted(monkeypatch):
+    monkeypatch.setattr(mcp_client, "MCPClient", FakeClient)
+
+    async def run():
+        pool = MCPSessionPool(
+            idle_timeout=0, health_check_interval=300, tool_specs_ttl=300
+        )
+        await pool.get_client("http://a", None).list_tool_specs()
+        [session] = pool.sessions.values()
+
+        await asyncio.sleep(0.01)
+        await pool.get_client("http://b", None).list_tool_specs()
+
+        assert session.closed
+        assert [s["url"] for s in pool.get_stats()] == ["http://b"]
+
+        await pool.close()
+
+    asyncio.run(run())
+
+
+def test_idle_sessions_are_evicted_in_the_background(monkeypatch):
+    monkeypatch.setattr(mcp_client, "MCPClient", FakeClient)
+
+    async def run():
+        pool = MCPSessionPool(
+            idle_timeout=0.1, health_check_interval=300, tool_specs_ttl=300
+        )
+        await pool.get_client("http://a", None).list_tool_specs()
+        [session] = pool.sessions.values()
+
+        await asyncio.sleep(0.5)
+        assert session.closed
+        assert pool.get_stats() == []
+        assert pool.evict_task.done()
+
+        await pool.close()
+
+    asyncio.run(run())
@@ -0,0 +1,133 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from open_webui.socket import utils as socket_utils
+from open_webui.socket.utils import MessageEventBuffer
+
+
+class FakeChats:
+    def __init__(self, message):
+        self.message = message
+        self.reads = 0
+        self.writes = []
+
+    def get_message_by_id_and_message_id(self, id, message_id):
+        self.reads += 1
+        return dict(self.message)
+
+    def upsert_message_to_chat_by_id_and_message_id(self, id, message_id, message):
+        self.writes.append(message)
+        self.message.update(message)
+
+
+@pytest.fixture
+def chats(monkeypatch):
+    chats = FakeChats({"content": "Hello", "sources": [{"id": "a"}]})
+    monkeypatch.setattr(socket_utils, "Chats", chats)
+    return chats
+
+
+@pytest.mark.asyncio
+async def test_deltas_are_coalesced_into_one_write(chats):
+    buffer = MessageEventBuffer(flush_interval=60)
+
+    for delta in [" wor", "ld", "!"]:
+        buffer.add("chat", "msg", {"type": "message", "data": {"content": delta}})
+    buffer.add("chat", "msg", {"type": "status", "data": {"description": "done"}})
+    buffer.add("chat", "msg", {"type": "source", "data": {"id": "b"}})
+    await buffer.flush("chat", "msg")
+
+    assert chats.reads == 1
+    assert chats.writes == [
+        {
+            "content": "Hello world!",
+            "sources": [{"id": "a"}, {"id": "b"}],
+            "statusHistory": [{"description": "done"}],
+        }
+    ]
+    assert buffer.get_stats()["coalescing_ratio"] == 5
+
+
+@pytest.mark.asyncio
+async def test_replace_resets_pending_content(chats):
+    buffer = MessageEventBuffer(flush_interval=60)
+
+    buffer.add("chat", "msg", {"type": "message", "data": {"content": "lost"}})
+    buffer.add("chat", "msg", {"type": "replace", "data": {"content": "New"}})
+    buffer.add("chat", "msg", {"type": "message", "data": {"content": " text"}})
+    await buffer.flush("chat", "msg")
+
+    assert chats.writes == [{"content": "New text"}]
+
+
+@pytest.mark.asyncio
+async def test_flushes_after_interval_and_on_size(chats):
+    buffer = MessageEventBuffer(flush_interval=0.01, max_size=1024)
+
+    buffer.add("chat", "msg", {"type": "message", "data": {"content": "!"}})
+    await asyncio.sleep(0.1)
+    assert chats.writes == [{"content": "Hello!"}]
+
+    buffer.flush_interval = 60
+    buffer.add("chat", "msg", {"type": "message", "data": {"content": "x" * 2048}})
+    await asyncio.sleep(0.1)
+    assert len(chats.writes) == 2
+    assert buffer.get_stats()["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_flush_all_writes_pending_messages(chats):
+    buffer = MessageEventBuffer(flush_interval=60)
+
+    buffer.add("chat", "msg", {"type": "message", "data": {"content": "!"}})
+    await buffer.flush_all()
+
+    assert chats.writes == [{"content": "Hello!"}]
+    assert buffer.get_stats()["pending"] == 0
+    assert not buffer._timers
+
+
+@pytest.mark.asyncio
+async def test_statuses_are_written_at_once(chats):
+    chats.message["statusHistory"] = [{"description": "start"}]
+    buffer = MessageEventBuffer(flush_interval=60)
+
+    for description in ["searching", "done"]:
+        buffer.add(
+            "chat", "msg", {"type": "status", "data": {"description": description}}
+        )
+    await buffer.flush("chat", "msg")
+
+    assert chats.writes == [
+        {
+            "statusHistory": [
+                {"description": "start"},
+                {"description": "searching"},
+                {"description": "done"},
+            ]
+        }
+    ]
+
+
+@pytest.mark.asyncio
+async def test_direct_writes_follow_buffered_events(chats):
+    buffer = MessageEventBuffer(flush_interval=0.01)
+
+    buffer.add("chat", "msg", {"type": "message", "data": {"content": "!"}})
+    await buffer.upsert_message("chat", "msg", {"usage": {"total_tokens": 3}})
+    await asyncio.sleep(0.05)
+
+    # The buffered event is written before, and not alongside, the direct write
+    assert chats.writes == [{"content": "Hello!"}, {"usage": {"total_tokens": 3}}]
+    assert not buffer._timers
+    assert not buffer._locks
+
+
+def test_unknown_events_are_not_buffered(chats):
+    buffer = MessageEventBuffer()
+    assert buffer.add("chat", "msg", {"type": "chat:completion", "data": {}}) is False
@@ -0,0 +1,48 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from open_webui.utils.misc import get_message_list, get_message_path_ids
+
+
+def make_history(depth: int) -> dict:
+    messages = {}
+    parent_id = None
+    for i in range(depth):
+        messages[f"m{i}"] = {"id": f"m{i}", "parentId": parent_id}
+        # A regenerated sibling that is not on the branch
+        messages[f"b{i}"] = {"id": f"b{i}", "parentId": parent_id}
+        parent_id = f"m{i}"
+    return messages
+
+
+def test_get_message_list_follows_the_branch():
+    messages = make_history(2000)
+
+    message_list = get_message_list(messages, "m1999")
+    assert [message["id"] for message in message_list] == [f"m{i}" for i in range(2000)]
+    assert [message["id"] for message in get_message_list(messages, "b3")] == [
+        "m0",
+        "m1",
+        "m2",
+        "b3",
+    ]
+
+    assert get_message_list(messages, "missing") == []
+    assert get_message_list({}, "m0") == []
+
+
+def test_get_message_path_ids_limit():
+    messages = make_history(100)
+
+    assert get_message_path_ids(messages, "m99", limit=3) == ["m97", "m98", "m99"]
+    assert get_message_path_ids(messages, "m1", limit=3) == ["m0", "m1"]
+
+
+def test_get_message_list_stops_on_cycles():
+    messages = {
+        "a": {"id": "a", "parentId": "b"},
+        "b": {"id": "b", "parentId": "a"},
+    }
+    assert get_message_path_ids(messages, "a") == ["b", "a"]
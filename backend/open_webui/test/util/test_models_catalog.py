@@ -0,0 +1,105 @@
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+
+def _backend_dir() -> Path:
+    return Path(__file__).resolve().parents[3]
+
+
+def _catalog_script() -> str:
+    # Runs in a fresh process with its own DATA_DIR, as importing the app
+    # migrates and reads the database
+    return """
+import asyncio
+
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from open_webui.main import app
+from open_webui.models.auths import Auths
+from open_webui.models.models import ModelForm, Models
+from open_webui.utils import models as utils_models
+from open_webui.utils.auth import create_token
+
+base_fetches = []
+
+
+async def get_all_base_models(request, user=None):
+    base_fetches.append(1)
+    return [
+        {"id": "base", "name": "Base", "object": "model", "created": 0, "owned_by": "openai"}
+    ]
+
+
+# The connections are not what is tested here
+utils_models.get_all_base_models = get_all_base_models
+app.state.config.ENABLE_BASE_MODELS_CACHE = True
+app.state.config.ENABLE_EVALUATION_ARENA_MODELS = False
+
+request = Request({"type": "http", "app": app, "headers": []})
+
+
+def get_names():
+    models = asyncio.run(utils_models.get_all_models(request))
+    return {model["id"]: model["name"] for model in models}
+
+
+assert get_names() == {"base": "Base"}
+assert get_names() == {"base": "Base"}
+assert len(base_fetches) == 1
+
+admin = Auths.insert_new_auth("admin@example.com", "password", "Admin", role="admin")
+client = TestClient(app)
+headers = {"Authorization": f"Bearer {create_token({'id': admin.id})}"}
+form = {"id": "custom", "base_model_id": "base", "name": "Custom", "meta": {}, "params": {}}
+
+# Creating and editing a model bump the catalog version
+version = utils_models.get_models_version(app)
+response = client.post("/api/v1/models/create", json=form, headers=headers)
+assert response.status_code == 200, response.text
+assert utils_models.get_models_version(app) == version + 1
+assert get_names() == {"base": "Base", "custom": "Custom"}
+
+response = client.post(
+    "/api/v1/models/model/update", json={**form, "name": "Renamed"}, headers=headers
+)
+assert response.status_code == 200, response.text
+assert get_names() == {"base": "Base", "custom": "Renamed"}
+
+# A write that does not bump this process's version (another worker without
+# Redis) is picked up once MODELS_CATALOG_CACHE_TTL has passed
+Models.update_model_by_id("custom", ModelForm(**{**form, "name": "Elsewhere"}))
+assert get_names()["custom"] == "Renamed"
+utils_models.MODELS_CATALOG_CACHE_TTL = 0
+assert get_names()["custom"] == "Elsewhere"
+print("ok")
+"""
+
+
+def test_model_edits_reach_the_cached_catalog():
+    with tempfile.TemporaryDirectory() as data_dir:
+        env = os.environ.copy()
+        env["PYTHONPATH"] = str(_backend_dir())
+        env["DATA_DIR"] = data_dir
+        # Loading the app rewrites the static directory
+        env["STATIC_DIR"] = os.path.join(data_dir, "static")
+        os.makedirs(env["STATIC_DIR"])
+        env["WEBUI_SECRET_KEY"] = "test"
+        env["ENABLE_OPENAI_API"] = "False"
+        env["ENABLE_OLLAMA_API"] = "False"
+        env.pop("REDIS_URL", None)
+
+        result = subprocess.run(
+            [sys.executable, "-c", _catalog_script()],
+            env=env,
+            cwd=data_dir,
+            capture_output=True,
+            text=True,
+            timeout=300,
+        )
+
+    assert result.returncode == 0, result.stderr[-4000:]
+    assert result.stdout.strip().endswith("ok")
@@ -0,0 +1,67 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from open_webui.utils.plugin_cache import SENDER_ID, PluginVersions
+
+
+class FakePubSub:
+    def __init__(self, messages):
+        self.messages = messages
+
+    async def subscribe(self, channel):
+        pass
+
+    async def listen(self):
+        for message in self.messages:
+            yield message
+
+
+class FakeRedis:
+    def __init__(self, messages=()):
+        self.published = []
+        self.messages = list(messages)
+
+    def publish(self, channel, data):
+        self.published.append(json.loads(data))
+
+    def pubsub(self):
+        return FakePubSub(self.messages)
+
+
+def test_bump_changes_only_the_named_versions():
+    versions = PluginVersions()
+    before = versions.get("functions", "function:a")
+
+    versions.bump("function:b")
+    assert versions.get("functions", "function:a") == before
+
+    versions.bump("function:a")
+    assert versions.get("functions", "function:a") != before
+
+
+def test_bumps_are_published_and_applied_from_other_workers():
+    redis = FakeRedis(
+        [
+            {"type": "subscribe", "data": 1},
+            {
+                "type": "message",
+                "data": json.dumps({"sender": "other", "names": ["tool:x"]}),
+            },
+            # Our own bumps were applied locally already
+            {
+                "type": "message",
+                "data": json.dumps({"sender": SENDER_ID, "names": ["tool:y"]}),
+            },
+        ]
+    )
+    versions = PluginVersions(redis=redis)
+
+    versions.bump("tools")
+    assert redis.published == [{"sender": SENDER_ID, "names": ["tools"]}]
+
+    asyncio.run(versions.listen(redis))
+    assert versions.get("tools", "tool:x", "tool:y") == (1, 1, 0)
@@ -0,0 +1,63 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from open_webui.utils import rate_limit
+from open_webui.utils.rate_limit import RateLimiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Aligned to the start of an hour
+    now = [3600.0 * 300]
+    monkeypatch.setattr(rate_limit.time, "time", lambda: now[0])
+    return now
+
+
+def test_sliding_window_across_limits(clock):
+    limiter = RateLimiter(None, limits=[(3, 60), (5, 3600)])
+
+    assert [limiter.is_limited("Key") for _ in range(4)] == [
+        False,
+        False,
+        False,
+        True,
+    ]
+    assert limiter.get_counts("key") == [4, 4]
+
+    # Half of the previous minute still counts
+    clock[0] += 90
+    assert limiter.get_counts("key") == [2, 4]
+    assert limiter.remaining("key") == 1
+
+    # The hourly limit holds after the minute has passed
+    clock[0] += 60
+    assert limiter.hit("key") == (False, [1, 5])
+    assert limiter.hit("key") == (True, [2, 6])
+
+
+def test_memory_store_is_bounded(clock):
+    limiter = RateLimiter(None, limit=1, window=60, max_memory_keys=2)
+    for key in ("a", "b", "c"):
+        limiter.is_limited(key)
+    assert list(limiter._memory_store) == ["b", "c"]
+
+    clock[0] += 121
+    limiter.is_limited("d")
+    assert list(limiter._memory_store) == ["d"]
+
+
+def test_redis_matches_memory(clock):
+    pytest.importorskip("lupa")
+    fakeredis = pytest.importorskip("fakeredis")
+
+    redis_limiter = RateLimiter(fakeredis.FakeRedis(), limits=[(3, 60), (5, 3600)])
+    memory_limiter = RateLimiter(None, limits=[(3, 60), (5, 3600)])
+
+    for step in (0, 10, 30, 45, 60, 75, 200):
+        clock[0] += step
+        assert redis_limiter.hit("key") == memory_limiter.hit("key")
+        assert redis_limiter.get_counts("key") == memory_limiter.get_counts("key")
@@ -0,0 +1,57 @@
+import sys
+from pathlib import Path
+
+import pytest
+from langchain_core.documents import Document
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from open_webui.retrieval import utils as retrieval_utils
+from open_webui.retrieval.utils import RerankCompressor
+
+
+class FakeVectorDB:
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    def get_vectors(self, collection_name, ids):
+        return {id: self.vectors[id] for id in ids if id in self.vectors}
+
+
+@pytest.mark.asyncio
+async def test_scores_candidates_with_stored_vectors(monkeypatch):
+    monkeypatch.setattr(
+        retrieval_utils,
+        "VECTOR_DB_CLIENT",
+        FakeVectorDB({"a": [1.0, 0.0], "b": [0.0, 2.0]}),
+    )
+    calls = []
+
+    async def embedding_function(query, prefix=None):
+        calls.append(query)
+        if isinstance(query, list):
+            return [[1.0, 1.0] for _ in query]
+        return [1.0, 0.0]
+
+    compressor = RerankCompressor(
+        embedding_function=embedding_function,
+        top_n=3,
+        reranking_function=None,
+        r_score=0.0,
+        collection_name="collection",
+        query_embeddings={"query": [1.0, 0.0]},
+    )
+    result = await compressor.acompress_documents(
+        [
+            Document(id="b", page_content="b", metadata={}),
+            Document(id="a", page_content="a", metadata={}),
+            Document(page_content="c", metadata={}),
+        ],
+        "query",
+    )
+
+    # Only the document without a stored vector is embedded
+    assert calls == [["c"]]
+    assert [doc.page_content for doc in result] == ["a", "c", "b"]
+    assert result[0].metadata["score"] == pytest.approx(1.0)
+    assert result[1].metadata["score"] == pytest.approx(2**-0.5)
@@ -0,0 +1,96 @@
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from open_webui.internal.db import AsyncTable, run_db
+
+
+class Table:
+    def get_thread_name(self, prefix: str, suffix: str = "") -> str:
+        return prefix + threading.current_thread().name + suffix
+
+
+def test_async_table_runs_on_the_db_threads():
+    table = AsyncTable(Table())
+
+    async def run():
+        return await asyncio.gather(
+            table.get_thread_name("thread ", suffix="!"),
+            run_db(Table().get_thread_name, ""),
+        )
+
+    [first, second] = asyncio.run(run())
+    assert first.startswith("thread db") and first.endswith("!")
+    assert second.startswith("db")
+    assert threading.current_thread().name == "MainThread"
+
+
+def _async_engine_script() -> str:
+    # The async engine is set up when open_webui.internal.db is imported, so
+    # this runs in a fresh process with DATABASE_ENABLE_ASYNC set
+    return """
+import asyncio
+import threading
+
+import open_webui.config  # runs the migrations
+from open_webui.internal import db as internal_db
+from open_webui.internal.db import AsyncTable, get_db_context
+from open_webui.models.users import AsyncUsers, User, Users
+
+assert internal_db.async_engine is not None
+assert internal_db.async_engine.url.drivername == "sqlite+aiosqlite"
+
+
+class Probe:
+    def get_session_info(self):
+        with get_db_context() as db:
+            db.execute(User.__table__.select().limit(1))
+            return threading.current_thread().name, str(db.bind.url.drivername)
+
+
+async def run():
+    await AsyncUsers.insert_new_user("u", "User", "u@example.com", role="user")
+    user, info = await asyncio.gather(
+        AsyncUsers.get_user_by_id("u"), AsyncTable(Probe()).get_session_info()
+    )
+    return user, info
+
+
+user, info = asyncio.run(run())
+assert user.email == "u@example.com"
+assert Users.get_user_by_id("u").role == "user"
+# Run on the event loop's thread, through the aiosqlite driver
+assert info == ("MainThread", "sqlite+aiosqlite"), info
+print("ok")
+"""
+
+
+def test_async_table_uses_the_async_engine():
+    with tempfile.TemporaryDirectory() as data_dir:
+        env = os.environ.copy()
+        env["PYTHONPATH"] = str(Path(__file__).resolve().parents[3])
+        env["DATA_DIR"] = data_dir
+        env["DATABASE_URL"] = f"sqlite:///{data_dir}/webui.db"
+        env["DATABASE_ENABLE_ASYNC"] = "true"
+        # Loading the config rewrites the static directory
+        env["STATIC_DIR"] = os.path.join(data_dir, "static")
+        os.makedirs(env["STATIC_DIR"])
+        env["WEBUI_SECRET_KEY"] = "test"
+
+        result = subprocess.run(
+            [sys.executable, "-c", _async_engine_script()],
+            env=env,
+            cwd=data_dir,
+            capture_output=True,
+            text=True,
+            timeout=300,
+        )
+
+    assert result.returncode == 0, result.stderr[-4000:]
+    assert result.stdout.strip().endswith("ok")
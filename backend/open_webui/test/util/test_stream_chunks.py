@@ -0,0 +1,66 @@
+import asyncio
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from open_webui.utils import misc
+from open_webui.utils.misc import LineFramer
+
+
+def split_randomly(data: bytes, rng: random.Random) -> list[bytes]:
+    chunks = []
+    start = 0
+    while start < len(data):
+        end = start + rng.randint(1, 40)
+        chunks.append(data[start:end])
+        start = end
+    return chunks
+
+
+def frame(chunks, max_line_size):
+    framer = LineFramer(max_line_size)
+    lines = [line for chunk in chunks for line in framer.feed(chunk)]
+    return lines, framer.flush()
+
+
+def test_lines_match_split_for_any_chunking():
+    rng = random.Random(0)
+    lines = [
+        b"data: " + bytes(rng.choice(b"abc{}") for _ in range(rng.randint(0, 60)))
+        for _ in range(200)
+    ]
+    data = b"\n".join(lines) + b"\n"
+
+    for _ in range(20):
+        framed, rest = frame(split_randomly(data, rng), max_line_size=1000)
+        assert framed == lines
+        assert rest is None
+
+
+def test_oversized_lines_are_dropped():
+    data = b"data: 1\n" + b"x" * 100 + b"\ndata: 2\n" + b"y" * 100
+    rng = random.Random(1)
+
+    for chunks in ([data], split_randomly(data, rng), split_randomly(data, rng)):
+        framed, rest = frame(chunks, max_line_size=50)
+        assert framed == [b"data: 1", None, b"data: 2"]
+        # The unterminated oversized tail is dropped as well
+        assert rest is None
+
+    assert frame([b"data: 1\ndata: 2"], max_line_size=50) == ([b"data: 1"], b"data: 2")
+
+
+def test_stream_chunks_handler(monkeypatch):
+    monkeypatch.setattr(misc, "CHAT_STREAM_RESPONSE_CHUNK_MAX_BUFFER_SIZE", 50)
+
+    class FakeStream:
+        async def iter_chunks(self):
+            for chunk in [b"data: a\n\nda", b"ta: " + b"x" * 100, b"\ndata: b"]:
+                yield chunk, False
+
+    async def run():
+        return [chunk async for chunk in misc.stream_chunks_handler(FakeStream())]
+
+    assert b"".join(asyncio.run(run())) == b"data: a\n\ndata: {}\ndata: b\n"
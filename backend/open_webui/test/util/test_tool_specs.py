@@ -0,0 +1,43 @@
+import sys
+import types
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from open_webui.utils.tools import compile_tool_specs
+
+
+def test_compile_tool_specs():
+    def search(query: str, __user__: dict = None):
+        """
+        Search the web.
+        :param query: What to search for
+        """
+
+    def nodoc(value: str):
+        pass
+
+    module = types.SimpleNamespace(search=search, nodoc=nodoc)
+    specs = [
+        {
+            "name": "search",
+            "parameters": {
+                "type": "object",
+                "properties": {"query": {"type": "str"}, "__user__": {}},
+            },
+        },
+        {
+            "name": "nodoc",
+            "parameters": {"type": "object", "properties": {"value": {}}},
+        },
+    ]
+
+    compiled = compile_tool_specs(module, specs)
+
+    assert compiled[0]["parameters"]["properties"] == {"query": {"type": "string"}}
+    assert compiled[0]["description"].strip() == "Search the web."
+    assert compiled[1]["description"] == "nodoc"
+
+    # The stored specs are left untouched
+    assert specs[0]["parameters"]["properties"]["query"] == {"type": "str"}
+    assert "description" not in specs[0]
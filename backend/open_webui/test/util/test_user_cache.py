@@ -0,0 +1,116 @@
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from open_webui.internal import db as internal_db
+from open_webui.internal.db import Base
+from open_webui.models import users as users_module
+from open_webui.models.chat_messages import (
+    ChatMessage,
+    ChatMessageRollup,
+    ChatMessageRollupState,
+)
+from open_webui.models.chat_search import ChatSearch
+from open_webui.models.chats import Chat
+from open_webui.models.groups import Group, GroupMember
+from open_webui.models.users import ApiKey, User, Users
+from open_webui.utils.access_cache import AccessCache
+
+
+@pytest.fixture
+def db(monkeypatch, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'webui.db'}")
+    # Deleting a user also deletes their chats and group memberships
+    Base.metadata.create_all(
+        engine,
+        tables=[
+            User.__table__,
+            ApiKey.__table__,
+            Group.__table__,
+            GroupMember.__table__,
+            Chat.__table__,
+            ChatMessage.__table__,
+            ChatMessageRollup.__table__,
+            ChatMessageRollupState.__table__,
+            ChatSearch.__table__,
+        ],
+    )
+
+    # The cached lookups open their own sessions, so route those to this
+    # database as well
+    @contextmanager
+    def get_db():
+        with Session(engine) as session:
+            yield session
+
+    monkeypatch.setattr(internal_db, "DATABASE_ENABLE_SESSION_SHARING", True)
+    monkeypatch.setattr(internal_db, "get_db", get_db)
+    monkeypatch.setattr(users_module, "USER_CACHE", AccessCache(ttl=60, size=100))
+
+    with Session(engine) as db:
+        yield db
+
+
+def set_role_behind_the_cache(db, id: str, role: str):
+    db.query(User).filter_by(id=id).update({"role": role})
+    db.commit()
+
+
+def test_writes_invalidate_the_cached_user(db):
+    Users.insert_new_user("u1", "User", "u1@example.com", role="user", db=db)
+    assert Users.get_cached_user_by_id("u1").role == "user"
+
+    # Served from the cache until a write through the table
+    set_role_behind_the_cache(db, "u1", "admin")
+    assert Users.get_cached_user_by_id("u1").role == "user"
+
+    Users.update_user_role_by_id("u1", "pending", db=db)
+    assert Users.get_cached_user_by_id("u1").role == "pending"
+
+    Users.update_user_by_id("u1", {"name": "Renamed"}, db=db)
+    assert Users.get_cached_user_by_id("u1").name == "Renamed"
+
+    Users.delete_user_by_id("u1", db=db)
+    assert Users.get_cached_user_by_id("u1") is None
+
+
+def test_api_key_changes_invalidate_the_cached_lookup(db):
+    Users.insert_new_user("u2", "User", "u2@example.com", role="user", db=db)
+    assert Users.get_cached_user_by_api_key("sk-old") is None
+
+    Users.update_user_api_key_by_id("u2", "sk-old", db=db)
+    assert Users.get_cached_user_by_api_key("sk-old").id == "u2"
+
+    Users.update_user_api_key_by_id("u2", "sk-new", db=db)
+    assert Users.get_cached_user_by_api_key("sk-old") is None
+    assert Users.get_cached_user_by_api_key("sk-new").id == "u2"
+
+    Users.delete_user_api_key_by_id("u2", db=db)
+    assert Users.get_cached_user_by_api_key("sk-new") is None
+
+
+def test_flush_last_active_persists_buffered_timestamps(db, monkeypatch):
+    monkeypatch.setattr(users_module, "DATABASE_USER_ACTIVE_STATUS_FLUSH_INTERVAL", 60)
+    for id in ("u3", "u4"):
+        Users.insert_new_user(id, "User", f"{id}@example.com", db=db)
+    db.query(User).update({"last_active_at": 0})
+    db.commit()
+
+    Users.update_last_active_by_id("u3")
+    Users.update_last_active_by_id("u4")
+
+    # Buffered until the flush
+    db.expire_all()
+    assert {user.last_active_at for user in db.query(User)} == {0}
+
+    assert Users.flush_last_active(db=db) == 2
+    db.expire_all()
+    assert all(user.last_active_at > 0 for user in db.query(User))
+
+    assert Users.flush_last_active(db=db) == 0
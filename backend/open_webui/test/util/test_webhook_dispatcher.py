@@ -0,0 +1,76 @@
+import asyncio
+import sys
+from pathlib import Path
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from open_webui.utils.http_client import HTTP_CLIENTS
+from open_webui.utils.webhook import WebhookDispatcher
+
+
+def test_posts_once_per_url_and_retries_server_errors():
+    calls = {}
+    in_flight = 0
+    max_in_flight = 0
+
+    async def handler(request):
+        nonlocal in_flight, max_in_flight
+        name = request.match_info["name"]
+        calls[name] = calls.get(name, 0) + 1
+
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+        if name == "flaky" and calls[name] < 3:
+            return web.Response(status=503)
+        if name == "missing":
+            return web.Response(status=404)
+        assert await request.json() == {"action": "channel"}
+        return web.Response()
+
+    async def run():
+        app = web.Application()
+        app.router.add_post("/{name}", handler)
+
+        dispatcher = WebhookDispatcher(
+            concurrency=2, max_retries=3, timeout=5, backoff=0
+        )
+        async with TestServer(app) as server:
+            urls = [str(server.make_url(f"/hook-{i}")) for i in range(5)]
+            urls += urls + [
+                str(server.make_url("/flaky")),
+                str(server.make_url("/missing")),
+                "",
+            ]
+
+            assert (
+                dispatcher.dispatch("Open WebUI", urls, "hi", {"action": "channel"})
+                == 7
+            )
+            await asyncio.gather(*dispatcher.tasks)
+
+            # Posted on the dispatcher's own session, not the upstream pools
+            origin = str(server.make_url("/")).rstrip("/")
+            assert origin not in [pool["origin"] for pool in HTTP_CLIENTS.get_stats()]
+            await dispatcher.close()
+            assert dispatcher.session is None
+
+        assert all(calls[f"hook-{i}"] == 1 for i in range(5))
+        assert calls["flaky"] == 3
+        assert calls["missing"] == 1
+        assert max_in_flight == 2
+        assert dispatcher.get_stats() == {
+            "dispatched": 7,
+            "sent": 6,
+            "failed": 1,
+            "retried": 2,
+            "pending": 0,
+            "concurrency": 2,
+        }
+
+    asyncio.run(run())
@@ -0,0 +1,127 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from open_webui.env import (
+    ACCESS_CACHE_SIZE,
+    ACCESS_CACHE_TTL,
+    REDIS_KEY_PREFIX,
+    USER_CACHE_TTL,
+)
+from open_webui.utils.redis import get_redis_client
+
+log = logging.getLogger(__name__)
+
+# Default TTL of the caches when their generation counters are not shared
+LOCAL_CACHE_TTL = 5
+
+
+class AccessCache:
+    """
+    Bounded cache of access decisions (a user's group ids, the resource ids a
+    user can access), tagged with the generation counters they depend on.
+
+    Writers bump a counter after committing, which makes every entry read
+    under an older generation a miss. With Redis the counters are shared, so
+    a change on one replica invalidates the entries of all of them; the TTL
+    only bounds the staleness of changes made outside the application.
+    """
+
+    def __init__(self, ttl: int, size: int, redis=None):
+        self.ttl = ttl
+        self.size = size
+        self.redis = redis
+
+        self.entries: OrderedDict[tuple, tuple] = OrderedDict()
+        self.generations: dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def _get_redis_key(self, name: str) -> str:
+        # The hash tag keeps all counters in one slot, so MGET works on a cluster
+        return f"{REDIS_KEY_PREFIX}:{{access}}:generation:{name}"
+
+    def get_generations(self, names: tuple[str, ...]) -> Optional[tuple]:
+        if self.redis is not None:
+            try:
+                values = self.redis.mget([self._get_redis_key(name) for name in names])
+                return tuple(int(value or 0) for value in values)
+            except Exception as e:
+                log.warning(f"Failed to read access cache generations: {e}")
+                return None
+
+        with self.lock:
+            return tuple(self.generations.get(name, 0) for name in names)
+
+    def bump(self, *names: str):
+        with self.lock:
+            for name in names:
+                self.generations[name] = self.generations.get(name, 0) + 1
+
+        if self.redis is not None:
+            try:
+                pipe = self.redis.pipeline()
+                for name in names:
+                    pipe.incr(self._get_redis_key(name))
+                pipe.execute()
+            except Exception as e:
+                log.warning(f"Failed to bump access cache generations: {e}")
+                self.clear()
+
+    def get_or_load(self, key: tuple, names: tuple[str, ...], load: Callable):
+        if not self.ttl:
+            return load()
+
+        # Read the generations before loading, so a concurrent bump is a miss next time
+        generations = self.get_generations(names)
+        if generations is None:
+            return load()
+
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] == generations and entry[1] > now:
+                self.entries.move_to_end(key)
+                return entry[2]
+
+        value = load()
+
+        with self.lock:
+            self.entries[key] = (generations, now + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+        return value
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+def get_cache_ttl(ttl: Optional[int], default: int, redis) -> int:
+    """
+    The TTL of a cache, defaulting to a few seconds without Redis: the
+    generation counters are then per process, so a write on one worker does
+    not invalidate the entries of the others.
+    """
+    if ttl is not None:
+        return ttl
+    return default if redis is not None else min(default, LOCAL_CACHE_TTL)
+
+
+REDIS_CLIENT = get_redis_client()
+
+ACCESS_CACHE = AccessCache(
+    ttl=get_cache_ttl(ACCESS_CACHE_TTL, 300, REDIS_CLIENT),
+    size=ACCESS_CACHE_SIZE,
+    redis=REDIS_CLIENT if ACCESS_CACHE_TTL != 0 else None,
+)
+
+# Authenticated users by id, and user ids by API key hash
+USER_CACHE = AccessCache(
+    ttl=get_cache_ttl(USER_CACHE_TTL, 10, REDIS_CLIENT),
+    size=ACCESS_CACHE_SIZE,
+    redis=REDIS_CLIENT if USER_CACHE_TTL != 0 else None,
+)
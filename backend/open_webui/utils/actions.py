@@ -10,7 +10,10 @@ from open_webui.models.users import UserModel
 from open_webui.models.functions import Functions
 
 from open_webui.socket.main import get_event_call, get_event_emitter
-from open_webui.utils.plugin import get_function_module_from_cache
+from open_webui.utils.plugin import (
+    get_function_module_from_cache,
+    get_function_valves_from_cache,
+)
 from open_webui.utils.models import get_all_models
 from open_webui.utils.middleware import process_tool_result
 
@@ -67,7 +70,7 @@ async def chat_action(request: Request, action_id: str, form_data: dict, user: A
     function_module, _, _ = get_function_module_from_cache(request, action_id)
 
     if hasattr(function_module, "valves") and hasattr(function_module, "Valves"):
-        valves = Functions.get_function_valves_by_id(action_id)
+        valves = get_function_valves_from_cache(request, action_id)
         function_module.valves = function_module.Valves(**(valves if valves else {}))
 
     if hasattr(function_module, "action"):
@@ -4,6 +4,7 @@ import logging
 from open_webui.utils.plugin import (
     load_function_module_by_id,
     get_function_module_from_cache,
+    get_function_valves_from_cache,
 )
 from open_webui.models.functions import Functions
 
@@ -22,11 +23,12 @@ def get_function_module(request, function_id, load_from_db=True):
 
 def get_sorted_filter_ids(request, model: dict, enabled_filter_ids: list = None):
     def get_priority(function_id):
-        function = Functions.get_function_by_id(function_id)
-        if function is not None:
-            valves = Functions.get_function_valves_by_id(function_id)
-            return valves.get("priority", 0) if valves else 0
-        return 0
+        try:
+            valves = get_function_valves_from_cache(request, function_id)
+        except Exception:
+            # The function no longer exists
+            return 0
+        return valves.get("priority", 0) if valves else 0
 
     filter_ids = [function.id for function in Functions.get_global_filter_functions()]
     if "info" in model and "meta" in model["info"]:
@@ -80,7 +82,7 @@ async def process_filter_functions(
 
         # Apply valves to the function
         if hasattr(function_module, "valves") and hasattr(function_module, "Valves"):
-            valves = Functions.get_function_valves_by_id(filter_id)
+            valves = get_function_valves_from_cache(request, filter_id)
             function_module.valves = function_module.Valves(
                 **(valves if valves else {})
             )
@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import time
+import urllib.request
+from dataclasses import dataclass, field
+from typing import Optional, Union
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from open_webui.env import (
+    AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT,
+    AIOHTTP_CLIENT_POOL_LIMIT,
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST,
+    AIOHTTP_CLIENT_SESSION_SSL,
+)
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class PoolStats:
+    created_at: float = field(default_factory=time.time)
+    requests: int = 0
+    handshakes: int = 0
+    reused: int = 0
+
+
+class HTTPClientRegistry:
+    """
+    App-lifetime aiohttp sessions for upstream model APIs, one per
+    (origin, SSL setting, proxy). Each session owns a keep-alive connection
+    pool, so requests to the same upstream skip the TCP and TLS handshakes.
+
+    Sessions are shared between users: they never store cookies, and callers
+    must not close them. Releasing or closing the response is enough.
+    """
+
+    def __init__(self, limit: int, limit_per_host: int, keepalive_timeout: float):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+
+        self.sessions: dict[tuple, aiohttp.ClientSession] = {}
+        self.stats: dict[tuple, PoolStats] = {}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @staticmethod
+    def get_key(url: str, ssl: Union[bool, object]) -> tuple:
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}".lower()
+
+        # Same proxy resolution as trust_env, so the key matches what aiohttp will use
+        proxy = None
+        if parts.hostname and not urllib.request.proxy_bypass(parts.hostname):
+            proxy = urllib.request.getproxies().get(parts.scheme)
+
+        return origin, ssl, proxy
+
+    def _create_session(self, key: tuple) -> aiohttp.ClientSession:
+        stats = PoolStats()
+        self.stats[key] = stats
+
+        async def on_request_start(session, context, params):
+            stats.requests += 1
+
+        async def on_connection_create_end(session, context, params):
+            stats.handshakes += 1
+
+        async def on_connection_reuseconn(session, context, params):
+            stats.reused += 1
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ssl=key[1],
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            cookie_jar=aiohttp.DummyCookieJar(),
+            trace_configs=[trace_config],
+            trust_env=True,
+        )
+
+    def get_session(
+        self, url: str, ssl: Union[bool, object] = AIOHTTP_CLIENT_SESSION_SSL
+    ) -> aiohttp.ClientSession:
+        """Return the shared session for the origin of url. Must be called from the event loop."""
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:
+            # Sessions are bound to the loop that created them (e.g. in tests)
+            self.sessions.clear()
+            self.stats.clear()
+            self.loop = loop
+
+        key = self.get_key(url, ssl)
+        session = self.sessions.get(key)
+        if session is None or session.closed:
+            session = self._create_session(key)
+            self.sessions[key] = session
+        return session
+
+    def get_stats(self) -> list[dict]:
+        pools = []
+        for key, session in self.sessions.items():
+            connector = session.connector
+            stats = self.stats[key]
+
+            in_use = len(getattr(connector, "_acquired", ()))
+            idle = sum(
+                len(conns) for conns in getattr(connector, "_conns", {}).values()
+            )
+
+            pools.append(
+                {
+                    "origin": key[0],
+                    "ssl": key[1] if isinstance(key[1], bool) else True,
+                    "proxy": bool(key[2]),
+                    "in_use": in_use,
+                    "idle": idle,
+                    "requests": stats.requests,
+                    "handshakes": stats.handshakes,
+                    "reused": stats.reused,
+                    "created_at": int(stats.created_at),
+                    "closed": session.closed,
+                }
+            )
+        return pools
+
+    async def close(self):
+        sessions = list(self.sessions.values())
+        self.sessions.clear()
+        self.stats.clear()
+
+        for session in sessions:
+            try:
+                await session.close()
+            except Exception as e:
+                log.debug(f"Failed to close HTTP client session: {e}")
+
+
+HTTP_CLIENTS = HTTPClientRegistry(
+    limit=AIOHTTP_CLIENT_POOL_LIMIT,
+    limit_per_host=AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST,
+    keepalive_timeout=AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT,
+)
+
+
+def get_http_session(
+    url: str, ssl: Union[bool, object] = AIOHTTP_CLIENT_SESSION_SSL
+) -> aiohttp.ClientSession:
+    return HTTP_CLIENTS.get_session(url, ssl=ssl)
@@ -1,16 +1,28 @@
 import asyncio
+import hashlib
+import json
+import logging
+import time
 from typing import Optional
 from contextlib import AsyncExitStack
 
 import anyio
 
-from mcp import ClientSession
+from mcp import ClientSession, types
+from mcp.shared.exceptions import McpError
 from mcp.client.auth import OAuthClientProvider, TokenStorage
 from mcp.client.streamable_http import streamablehttp_client
 from mcp.shared.auth import OAuthClientInformationFull, OAuthClientMetadata, OAuthToken
 import httpx
 from mcp.shared._httpx_utils import create_mcp_http_client
-from open_webui.env import AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL
+from open_webui.env import (
+    AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL,
+    MCP_SESSION_HEALTH_CHECK_INTERVAL,
+    MCP_SESSION_IDLE_TIMEOUT,
+    MCP_TOOL_SPECS_CACHE_TTL,
+)
+
+log = logging.getLogger(__name__)
 
 
 def create_insecure_httpx_client(headers=None, timeout=None, auth=None):
@@ -24,7 +36,9 @@ class MCPClient:
         self.session: Optional[ClientSession] = None
         self.exit_stack = None
 
-    async def connect(self, url: str, headers: Optional[dict] = None):
+    async def connect(
+        self, url: str, headers: Optional[dict] = None, message_handler=None
+    ):
         async with AsyncExitStack() as exit_stack:
             try:
                 if AIOHTTP_CLIENT_SESSION_TOOL_SERVER_SSL:
@@ -40,7 +54,7 @@ class MCPClient:
                 read_stream, write_stream, _ = transport
 
                 self._session_context = ClientSession(
-                    read_stream, write_stream
+                    read_stream, write_stream, message_handler=message_handler
                 )  # pylint: disable=W0201
 
                 self.session = await exit_stack.enter_async_context(
@@ -120,7 +134,8 @@ class MCPClient:
 
     async def disconnect(self):
         # Clean up and close the session
-        await self.exit_stack.aclose()
+        if self.exit_stack:
+            await self.exit_stack.aclose()
 
     async def __aenter__(self):
         await self.exit_stack.__aenter__()
@@ -129,3 +144,323 @@ class MCPClient:
     async def __aexit__(self, exc_type, exc_value, traceback):
         await self.exit_stack.__aexit__(exc_type, exc_value, traceback)
         await self.disconnect()
+
+
+def is_connection_error(e: BaseException) -> bool:
+    if isinstance(e, McpError):
+        # Raised for pending requests when the transport goes away, or when
+        # the server no longer knows the session (e.g. after a restart)
+        return e.error.code in (types.CONNECTION_CLOSED, 32600)
+    return isinstance(
+        e,
+        (
+            anyio.ClosedResourceError,
+            anyio.BrokenResourceError,
+            anyio.EndOfStream,
+            httpx.TransportError,
+            ConnectionError,
+        ),
+    )
+
+
+class PooledMCPSession:
+    """
+    An MCP session kept open between chat requests.
+
+    The transport enters anyio task groups that must be exited by the task
+    that entered them, so a background task owns the MCPClient from connect
+    to disconnect, and requests use the session from their own tasks.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        headers: Optional[dict],
+        health_check_interval: float,
+        tool_specs_ttl: float,
+    ):
+        self.url = url
+        self.headers = headers
+        self.health_check_interval = health_check_interval
+        self.tool_specs_ttl = tool_specs_ttl
+
+        self.client = MCPClient()
+        self.created_at = time.time()
+        self.last_used = time.monotonic()
+        self.last_checked = time.monotonic()
+        self.in_use = 0
+        self.closed = False
+
+        self.tool_specs: Optional[list] = None
+        self.tool_specs_at = 0.0
+        self.tool_specs_version = 0
+
+        self._closing = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        ready = asyncio.get_running_loop().create_future()
+        self._task = asyncio.create_task(self._run(ready))
+        try:
+            await ready
+        except BaseException:
+            self.close()
+            raise
+
+    async def _run(self, ready: asyncio.Future):
+        try:
+            await self.client.connect(
+                self.url, headers=self.headers, message_handler=self._handle_message
+            )
+        except BaseException as e:
+            self.closed = True
+            if not isinstance(e, Exception):
+                ready.cancel()
+                raise
+            if not ready.done():
+                ready.set_exception(e)
+            return
+
+        if ready.done():
+            # start() was cancelled while connecting
+            self.closed = True
+            await self.client.disconnect()
+            return
+        ready.set_result(None)
+        try:
+            await self._closing.wait()
+        finally:
+            # Also reached when the transport fails and cancels this task
+            self.closed = True
+            try:
+                await self.client.disconnect()
+            except Exception as e:
+                log.debug(f"Error closing MCP session for {self.url}: {e}")
+
+    async def _handle_message(self, message):
+        if isinstance(message, types.ServerNotification) and isinstance(
+            message.root, types.ToolListChangedNotification
+        ):
+            self.tool_specs = None
+            self.tool_specs_version += 1
+        elif isinstance(message, Exception):
+            log.debug(f"MCP session for {self.url} received an error: {message}")
+
+    def close(self):
+        """Stop the session, the owning task disconnects in the background."""
+        self.closed = True
+        self._closing.set()
+
+    async def wait_closed(self):
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def check(self) -> bool:
+        """Return whether the session can be reused, pinging it if it was idle."""
+        if self.closed:
+            return False
+        if time.monotonic() - self.last_checked < self.health_check_interval:
+            return True
+
+        try:
+            with anyio.fail_after(5):
+                await self.client.session.send_ping()
+        except Exception as e:
+            log.info(f"MCP session for {self.url} failed its health check: {e}")
+            return False
+
+        self.last_checked = time.monotonic()
+        return True
+
+    async def _request(self, method, *args, **kwargs):
+        if self.closed:
+            raise anyio.ClosedResourceError()
+
+        self.in_use += 1
+        try:
+            result = await method(*args, **kwargs)
+        except Exception as e:
+            if is_connection_error(e):
+                self.close()
+            raise
+        finally:
+            self.in_use -= 1
+            self.last_used = time.monotonic()
+
+        self.last_checked = self.last_used
+        return result
+
+    async def list_tool_specs(self) -> list:
+        if (
+            self.tool_specs is not None
+            and time.monotonic() - self.tool_specs_at < self.tool_specs_ttl
+        ):
+            return self.tool_specs
+
+        version = self.tool_specs_version
+        tool_specs = await self._request(self.client.list_tool_specs)
+
+        # Keep the list only if it did not change while it was being fetched
+        if version == self.tool_specs_version:
+            self.tool_specs = tool_specs
+            self.tool_specs_at = time.monotonic()
+        return tool_specs
+
+    async def call_tool(self, function_name: str, function_args: dict):
+        return await self._request(self.client.call_tool, function_name, function_args)
+
+
+class MCPSessionPool:
+    """
+    Open MCP sessions shared between chat requests, one per (server URL,
+    request headers). The headers carry the auth identity, so users never
+    share a session unless they connect with the same credentials.
+
+    Sessions idle for longer than idle_timeout are closed (by a background
+    task while the pool has sessions), and a session that was idle for longer
+    than health_check_interval is pinged before reuse.
+    """
+
+    def __init__(
+        self,
+        idle_timeout: float,
+        health_check_interval: float,
+        tool_specs_ttl: float,
+    ):
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.tool_specs_ttl = tool_specs_ttl
+
+        self.sessions: dict[tuple, PooledMCPSession] = {}
+        self.locks: dict[tuple, asyncio.Lock] = {}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.evict_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def get_key(url: str, headers: Optional[dict]) -> tuple:
+        digest = hashlib.sha256(
+            json.dumps(sorted((headers or {}).items())).encode()
+        ).hexdigest()
+        return url, digest
+
+    def evict_idle(self):
+        now = time.monotonic()
+        for key, session in list(self.sessions.items()):
+            if session.closed or (
+                not session.in_use and now - session.last_used > self.idle_timeout
+            ):
+                del self.sessions[key]
+                self.locks.pop(key, None)
+                session.close()
+
+    async def _evict_periodically(self):
+        # Until the last session is evicted; get_session starts it again
+        interval = min(max(self.idle_timeout / 2, 0.1), 60)
+        while self.sessions:
+            await asyncio.sleep(interval)
+            self.evict_idle()
+
+    async def get_session(
+        self, url: str, headers: Optional[dict] = None
+    ) -> PooledMCPSession:
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:
+            # Sessions are bound to the loop that created them (e.g. in tests)
+            self.sessions.clear()
+            self.locks.clear()
+            self.evict_task = None
+            self.loop = loop
+
+        self.evict_idle()
+
+        key = self.get_key(url, headers)
+        lock = self.locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            session = self.sessions.get(key)
+            if session is not None and not await session.check():
+                self.sessions.pop(key, None)
+                session.close()
+                session = None
+
+            if session is None:
+                session = PooledMCPSession(
+                    url,
+                    headers,
+                    health_check_interval=self.health_check_interval,
+                    tool_specs_ttl=self.tool_specs_ttl,
+                )
+                await session.start()
+                self.sessions[key] = session
+
+                if self.evict_task is None or self.evict_task.done():
+                    self.evict_task = asyncio.create_task(self._evict_periodically())
+
+            session.last_used = time.monotonic()
+            return session
+
+    def get_client(self, url: str, headers: Optional[dict] = None) -> "PooledMCPClient":
+        return PooledMCPClient(self, url, headers)
+
+    def get_stats(self) -> list[dict]:
+        now = time.monotonic()
+        return [
+            {
+                "url": session.url,
+                "in_use": session.in_use,
+                "idle_seconds": int(now - session.last_used),
+                "tool_specs_cached": session.tool_specs is not None,
+                "created_at": int(session.created_at),
+                "closed": session.closed,
+            }
+            for session in self.sessions.values()
+        ]
+
+    async def close(self):
+        if self.evict_task is not None:
+            self.evict_task.cancel()
+            self.evict_task = None
+
+        sessions = list(self.sessions.values())
+        self.sessions.clear()
+        self.locks.clear()
+
+        for session in sessions:
+            session.close()
+        for session in sessions:
+            await session.wait_closed()
+
+
+class PooledMCPClient:
+    """
+    MCPClient-like handle on a pooled session. The session is looked up on
+    every call, so a session closed in the meantime is reconnected.
+    """
+
+    def __init__(self, pool: MCPSessionPool, url: str, headers: Optional[dict]):
+        self.pool = pool
+        self.url = url
+        self.headers = headers
+
+    async def list_tool_specs(self) -> list:
+        session = await self.pool.get_session(self.url, self.headers)
+        try:
+            return await session.list_tool_specs()
+        except Exception as e:
+            if not is_connection_error(e):
+                raise
+
+        # Listing is safe to repeat, so retry once on a new session
+        session = await self.pool.get_session(self.url, self.headers)
+        return await session.list_tool_specs()
+
+    async def call_tool(self, function_name: str, function_args: dict):
+        # Not retried, the tool may have run before the connection failed
+        session = await self.pool.get_session(self.url, self.headers)
+        return await session.call_tool(function_name, function_args)
+
+
+MCP_SESSIONS = MCPSessionPool(
+    idle_timeout=MCP_SESSION_IDLE_TIMEOUT,
+    health_check_interval=MCP_SESSION_HEALTH_CHECK_INTERVAL,
+    tool_specs_ttl=MCP_TOOL_SPECS_CACHE_TTL,
+)
@@ -26,12 +26,14 @@ from starlette.responses import Response, StreamingResponse, JSONResponse
 
 from open_webui.utils.misc import is_string_allowed
 from open_webui.models.oauth_sessions import OAuthSessions
-from open_webui.models.chats import Chats
+from open_webui.models.chats import AsyncChats, Chats
 from open_webui.models.folders import Folders
-from open_webui.models.users import Users
+from open_webui.models.users import AsyncUsers
 from open_webui.socket.main import (
+    flush_message_events,
     get_event_call,
     get_event_emitter,
+    upsert_message,
 )
 from open_webui.routers.tasks import (
     generate_queries,
@@ -108,7 +110,7 @@ from open_webui.utils.filter import (
 from open_webui.utils.code_interpreter import execute_code_jupyter
 from open_webui.utils.payload import apply_system_prompt_to_body
 from open_webui.utils.response import normalize_usage
-from open_webui.utils.mcp.client import MCPClient
+from open_webui.utils.mcp.client import MCP_SESSIONS, MCPClient
 from open_webui.utils.function_calling_mode import (
     model_builtin_tools_enabled,
     model_supports_native_function_calling,
@@ -136,6 +138,7 @@ from open_webui.env import (
     ENABLE_FORWARD_USER_INFO_HEADERS,
     FORWARD_SESSION_INFO_HEADER_CHAT_ID,
     FORWARD_SESSION_INFO_HEADER_MESSAGE_ID,
+    MCP_SESSION_IDLE_TIMEOUT,
 )
 from open_webui.utils.headers import include_user_info_headers
 from open_webui.constants import TASKS
@@ -1478,15 +1481,10 @@ def add_file_context(messages: list, chat_id: str, user) -> list:
     if not chat_id or chat_id.startswith("local:"):
         return messages
 
-    chat = Chats.get_chat_by_id_and_user_id(chat_id, user.id)
-    if not chat:
+    stored_messages = Chats.get_message_list_by_chat_id(chat_id, user_id=user.id)
+    if not stored_messages:
         return messages
 
-    history = chat.chat.get("history", {})
-    stored_messages = get_message_list(
-        history.get("messages", {}), history.get("currentId")
-    )
-
     def format_file_tag(file):
         attrs = f'type="{file.get("type", "file")}" url="{file["url"]}"'
         if file.get("content_type"):
@@ -1531,7 +1529,7 @@ async def chat_image_generation_handler(
     if chat_id.startswith("local:"):
         message_list = form_data.get("messages", [])
     else:
-        chat = Chats.get_chat_by_id_and_user_id(chat_id, user.id)
+        chat = await AsyncChats.get_chat_by_id_and_user_id(chat_id, user.id)
         await __event_emitter__(
             {
                 "type": "status",
@@ -2019,7 +2017,7 @@ async def process_chat_payload(request, form_data, user, metadata, model):
     # Check if the request has chat_id and is inside of a folder
     chat_id = metadata.get("chat_id", None)
     if chat_id and user:
-        chat = Chats.get_chat_by_id_and_user_id(chat_id, user.id)
+        chat = await AsyncChats.get_chat_by_id_and_user_id(chat_id, user.id)
         if chat and chat.folder_id:
             folder = Folders.get_folder_by_id_and_user_id(chat.folder_id, user.id)
 
@@ -2308,11 +2306,19 @@ async def process_chat_payload(request, form_data, user, metadata, model):
                                 metadata.get("message_id")
                             )
 
-                    mcp_clients[server_id] = MCPClient()
-                    await mcp_clients[server_id].connect(
-                        url=mcp_server_connection.get("url", ""),
-                        headers=headers if headers else None,
-                    )
+                    url = mcp_server_connection.get("url", "")
+                    headers = headers if headers else None
+
+                    # Sessions are pooled per (url, headers), which never
+                    # matches when a per-message header is forwarded
+                    if MCP_SESSION_IDLE_TIMEOUT and not (
+                        headers and FORWARD_SESSION_INFO_HEADER_MESSAGE_ID in headers
+                    ):
+                        mcp_client = MCP_SESSIONS.get_client(url, headers)
+                    else:
+                        mcp_client = MCPClient()
+                        mcp_clients[server_id] = mcp_client
+                        await mcp_client.connect(url=url, headers=headers)
 
                     function_name_filter_list = mcp_server_connection.get(
                         "config", {}
@@ -2321,7 +2327,7 @@ async def process_chat_payload(request, form_data, user, metadata, model):
                     if isinstance(function_name_filter_list, str):
                         function_name_filter_list = function_name_filter_list.split(",")
 
-                    tool_specs = await mcp_clients[server_id].list_tool_specs()
+                    tool_specs = await mcp_client.list_tool_specs()
                     for tool_spec in tool_specs:
 
                         def make_tool_function(client, function_name):
@@ -2341,7 +2347,7 @@ async def process_chat_payload(request, form_data, user, metadata, model):
                                 continue
 
                         tool_function = make_tool_function(
-                            mcp_clients[server_id], tool_spec["name"]
+                            mcp_client, tool_spec["name"]
                         )
 
                         mcp_tools_dict[f"{server_id}_{tool_spec['name']}"] = {
@@ -2351,7 +2357,7 @@ async def process_chat_payload(request, form_data, user, metadata, model):
                             },
                             "callable": tool_function,
                             "type": "mcp",
-                            "client": mcp_clients[server_id],
+                            "client": mcp_client,
                             "direct": False,
                         }
                 except Exception as e:
@@ -2594,10 +2600,10 @@ async def background_tasks_handler(ctx):
     messages = []
 
     if "chat_id" in metadata and not metadata["chat_id"].startswith("local:"):
-        messages_map = Chats.get_messages_map_by_chat_id(metadata["chat_id"])
-        message = messages_map.get(metadata["message_id"]) if messages_map else None
-
-        message_list = get_message_list(messages_map, metadata["message_id"])
+        message_list = await AsyncChats.get_message_list_by_chat_id(
+            metadata["chat_id"], metadata["message_id"]
+        )
+        message = message_list[-1] if message_list else None
 
         # Remove details tags and files from the messages.
         # as get_message_list creates a new list, it does not affect
@@ -2679,7 +2685,7 @@ async def background_tasks_handler(ctx):
                         )
 
                         if not metadata.get("chat_id", "").startswith("local:"):
-                            Chats.upsert_message_to_chat_by_id_and_message_id(
+                            await upsert_message(
                                 metadata["chat_id"],
                                 metadata["message_id"],
                                 {
@@ -2740,7 +2746,9 @@ async def background_tasks_handler(ctx):
                             if not title:
                                 title = messages[0].get("content", user_message)
 
-                            Chats.update_chat_title_by_id(metadata["chat_id"], title)
+                            await AsyncChats.update_chat_title_by_id(
+                                metadata["chat_id"], title
+                            )
 
                             await event_emitter(
                                 {
@@ -2752,7 +2760,9 @@ async def background_tasks_handler(ctx):
                     if title == None and len(messages) == 2:
                         title = messages[0].get("content", user_message)
 
-                        Chats.update_chat_title_by_id(metadata["chat_id"], title)
+                        await AsyncChats.update_chat_title_by_id(
+                            metadata["chat_id"], title
+                        )
 
                         await event_emitter(
                             {
@@ -2790,7 +2800,7 @@ async def background_tasks_handler(ctx):
 
                         try:
                             tags = json.loads(tags_string).get("tags", [])
-                            Chats.update_chat_tags_by_id(
+                            await AsyncChats.update_chat_tags_by_id(
                                 metadata["chat_id"], tags, user
                             )
 
@@ -2827,7 +2837,7 @@ async def non_streaming_chat_response_handler(response, ctx):
                 else:
                     error = str(error)
 
-                Chats.upsert_message_to_chat_by_id_and_message_id(
+                await upsert_message(
                     metadata["chat_id"],
                     metadata["message_id"],
                     {
@@ -2843,7 +2853,7 @@ async def non_streaming_chat_response_handler(response, ctx):
                     )
 
             if "selected_model_id" in response_data:
-                Chats.upsert_message_to_chat_by_id_and_message_id(
+                await upsert_message(
                     metadata["chat_id"],
                     metadata["message_id"],
                     {
@@ -2863,7 +2873,7 @@ async def non_streaming_chat_response_handler(response, ctx):
                         }
                     )
 
-                    title = Chats.get_chat_title_by_id(metadata["chat_id"])
+                    title = await AsyncChats.get_chat_title_by_id(metadata["chat_id"])
 
                     # Use output from backend if provided (OR-compliant backends),
                     # otherwise generate from response content
@@ -2892,7 +2902,7 @@ async def non_streaming_chat_response_handler(response, ctx):
                     )
 
                     # Save message in the database
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
+                    await upsert_message(
                         metadata["chat_id"],
                         metadata["message_id"],
                         {
@@ -2903,8 +2913,10 @@ async def non_streaming_chat_response_handler(response, ctx):
                     )
 
                     # Send a webhook notification if the user is not active
-                    if not Users.is_user_active(user.id):
-                        webhook_url = Users.get_user_webhook_url_by_id(user.id)
+                    if not await AsyncUsers.is_user_active(user.id):
+                        webhook_url = await AsyncUsers.get_user_webhook_url_by_id(
+                            user.id
+                        )
                         if webhook_url:
                             await post_webhook(
                                 request.app.state.WEBUI_NAME,
@@ -3225,7 +3237,7 @@ async def streaming_chat_response_handler(response, ctx):
 
                 return output, end_flag
 
-            message = Chats.get_message_by_id_and_message_id(
+            message = await AsyncChats.get_message_by_id_and_message_id(
                 metadata["chat_id"], metadata["message_id"]
             )
 
@@ -3295,7 +3307,7 @@ async def streaming_chat_response_handler(response, ctx):
                     )
 
                     # Save message in the database
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
+                    await upsert_message(
                         metadata["chat_id"],
                         metadata["message_id"],
                         {
@@ -3372,7 +3384,7 @@ async def streaming_chat_response_handler(response, ctx):
 
                                 if "selected_model_id" in data:
                                     model_id = data["selected_model_id"]
-                                    Chats.upsert_message_to_chat_by_id_and_message_id(
+                                    await upsert_message(
                                         metadata["chat_id"],
                                         metadata["message_id"],
                                         {
@@ -3576,7 +3588,7 @@ async def streaming_chat_response_handler(response, ctx):
                                         delta.get("images", []), request, metadata, user
                                     )
                                     if image_urls:
-                                        message_files = Chats.add_message_files_by_id_and_message_id(
+                                        message_files = await AsyncChats.add_message_files_by_id_and_message_id(
                                             metadata["chat_id"],
                                             metadata["message_id"],
                                             [
@@ -3820,7 +3832,7 @@ async def streaming_chat_response_handler(response, ctx):
 
                                         if ENABLE_REALTIME_CHAT_SAVE:
                                             # Save message in the database
-                                            Chats.upsert_message_to_chat_by_id_and_message_id(
+                                            await upsert_message(
                                                 metadata["chat_id"],
                                                 metadata["message_id"],
                                                 {
@@ -4368,7 +4380,9 @@ async def streaming_chat_response_handler(response, ctx):
                     if item.get("status") == "in_progress":
                         item["status"] = "completed"
 
-                title = Chats.get_chat_title_by_id(metadata["chat_id"])
+                await flush_message_events(metadata["chat_id"], metadata["message_id"])
+
+                title = await AsyncChats.get_chat_title_by_id(metadata["chat_id"])
                 data = {
                     "done": True,
                     "content": serialize_output(output),
@@ -4378,7 +4392,7 @@ async def streaming_chat_response_handler(response, ctx):
 
                 if not ENABLE_REALTIME_CHAT_SAVE:
                     # Save message in the database
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
+                    await upsert_message(
                         metadata["chat_id"],
                         metadata["message_id"],
                         {
@@ -4388,15 +4402,15 @@ async def streaming_chat_response_handler(response, ctx):
                         },
                     )
                 elif usage:
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
+                    await upsert_message(
                         metadata["chat_id"],
                         metadata["message_id"],
                         {"usage": usage},
                     )
 
                 # Send a webhook notification if the user is not active
-                if not Users.is_user_active(user.id):
-                    webhook_url = Users.get_user_webhook_url_by_id(user.id)
+                if not await AsyncUsers.is_user_active(user.id):
+                    webhook_url = await AsyncUsers.get_user_webhook_url_by_id(user.id)
                     if webhook_url:
                         await post_webhook(
                             request.app.state.WEBUI_NAME,
@@ -4424,7 +4438,7 @@ async def streaming_chat_response_handler(response, ctx):
 
                 if not ENABLE_REALTIME_CHAT_SAVE:
                     # Save message in the database
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
+                    await upsert_message(
                         metadata["chat_id"],
                         metadata["message_id"],
                         {
@@ -70,36 +70,45 @@ def is_string_allowed(
     return True
 
 
-def get_message_list(messages_map, message_id):
+def get_message_path_ids(
+    messages_map, message_id, limit: Optional[int] = None
+) -> list[str]:
     """
-    Reconstructs a list of messages in order up to the specified message_id.
-
-    :param message_id: ID of the message to reconstruct the chain
-    :param messages: Message history dict containing all messages
-    :return: List of ordered messages starting from the root to the given message
+    Ids of the branch ending at message_id, root first, following the parentId
+    links. With limit, only the last limit ids are walked and returned.
     """
-
-    # Handle case where messages is None
     if not messages_map:
-        return []  # Return empty list instead of None to prevent iteration errors
+        return []
 
-    # Find the message by its id
-    current_message = messages_map.get(message_id)
+    path_ids = []
+    seen = set()
+    # seen guards against parentId cycles in corrupted histories
+    while message_id not in seen:
+        message = messages_map.get(message_id)
+        if not message or (limit is not None and len(path_ids) >= limit):
+            break
 
-    if not current_message:
-        return []  # Return empty list instead of None to prevent iteration errors
+        path_ids.append(message_id)
+        seen.add(message_id)
+        message_id = message.get("parentId")
 
-    # Reconstruct the chain by following the parentId links
-    message_list = []
+    path_ids.reverse()
+    return path_ids
 
-    while current_message:
-        message_list.insert(
-            0, current_message
-        )  # Insert the message at the beginning of the list
-        parent_id = current_message.get("parentId")  # Use .get() for safety
-        current_message = messages_map.get(parent_id) if parent_id else None
 
-    return message_list
+def get_message_list(messages_map, message_id, limit: Optional[int] = None):
+    """
+    Reconstructs a list of messages in order up to the specified message_id.
+
+    :param message_id: ID of the message to reconstruct the chain
+    :param messages: Message history dict containing all messages
+    :param limit: Only return the last limit messages of the chain
+    :return: List of ordered messages starting from the root to the given message
+    """
+    return [
+        messages_map[id]
+        for id in get_message_path_ids(messages_map, message_id, limit=limit)
+    ]
 
 
 def get_messages_content(messages: list[dict]) -> str:
@@ -809,11 +818,90 @@ async def stream_wrapper(response, session, content_handler=None):
         await cleanup_response(response, session)
 
 
+class LineFramer:
+    """
+    Split a byte stream into lines as chunks arrive.
+
+    Only the new bytes of each chunk are scanned for newlines. Lines that lie
+    within one chunk are sliced out of it directly, and only the trailing
+    partial line is kept, in a growable bytearray, so every byte is copied at
+    most twice however the lines are split across chunks.
+
+    Lines longer than max_line_size are dropped while they stream in, without
+    buffering them, and reported as None.
+    """
+
+    def __init__(self, max_line_size: int):
+        self.max_line_size = max_line_size
+        self.pending = bytearray()
+        self.skipping = False
+
+    def feed(self, data: bytes) -> list[Optional[bytes]]:
+        """Return the lines (without the newline) completed by data."""
+        lines = []
+        start = 0
+
+        if self.pending or self.skipping:
+            end = data.find(b"\n")
+            if end == -1:
+                self._keep(data, 0)
+                return lines
+
+            # The first newline completes the pending line
+            if self.skipping or len(self.pending) + end > self.max_line_size:
+                lines.append(None)
+            else:
+                self.pending += memoryview(data)[:end]
+                lines.append(bytes(self.pending))
+
+            self.pending.clear()
+            self.skipping = False
+            start = end + 1
+
+        if len(data) - start <= self.max_line_size:
+            # No line in the rest can be too long, split it in one pass
+            complete = (data[start:] if start else data).split(b"\n")
+            tail = complete.pop()
+            if lines:
+                lines += complete
+            else:
+                lines = complete
+            start = len(data) - len(tail)
+        else:
+            end = data.find(b"\n", start)
+            while end != -1:
+                lines.append(
+                    data[start:end] if end - start <= self.max_line_size else None
+                )
+                start = end + 1
+                end = data.find(b"\n", start)
+
+        self._keep(data, start)
+        return lines
+
+    def _keep(self, data: bytes, start: int):
+        if self.skipping or start == len(data):
+            return
+
+        if len(self.pending) + len(data) - start > self.max_line_size:
+            self.pending.clear()
+            self.skipping = True
+        else:
+            self.pending += memoryview(data)[start:]
+
+    def flush(self) -> Optional[bytes]:
+        """Return the unterminated last line, if any."""
+        line = bytes(self.pending) if self.pending and not self.skipping else None
+        self.pending.clear()
+        self.skipping = False
+        return line
+
+
 def stream_chunks_handler(stream: aiohttp.StreamReader):
     """
     Handle stream response chunks, supporting large data chunks that exceed the original 16kb limit.
-    When a single line exceeds max_buffer_size, returns an empty JSON string {} and skips subsequent data
-    until encountering normally sized data.
+    A line longer than max_buffer_size is replaced with an empty JSON string {},
+    and the lines after it are passed through unchanged.
 
     :param stream: The stream reader to handle.
     :return: An async generator that yields the stream data.
@@ -824,55 +912,24 @@ def stream_chunks_handler(stream: aiohttp.StreamReader):
         return stream
 
     async def yield_safe_stream_chunks():
-        buffer = b""
-        skip_mode = False
+        framer = LineFramer(max_buffer_size)
 
         async for data, _ in stream.iter_chunks():
             if not data:
                 continue
 
-            # In skip_mode, if buffer already exceeds the limit, clear it (it's part of an oversized line)
-            if skip_mode and len(buffer) > max_buffer_size:
-                buffer = b""
-
-            lines = (buffer + data).split(b"\n")
-
-            # Process complete lines (except the last possibly incomplete fragment)
-            for i in range(len(lines) - 1):
-                line = lines[i]
-
-                if skip_mode:
-                    # Skip mode: check if current line is small enough to exit skip mode
-                    if len(line) <= max_buffer_size:
-                        skip_mode = False
-                        yield line
-                    else:
-                        yield b"data: {}"
-                        yield b"\n"
+            for line in framer.feed(data):
+                if line is None:
+                    log.info("Skipped a stream line larger than the buffer size")
+                    yield b"data: {}"
                 else:
-                    # Normal mode: check if line exceeds limit
-                    if len(line) > max_buffer_size:
-                        skip_mode = True
-                        yield b"data: {}"
-                        yield b"\n"
-                        log.info(f"Skip mode triggered, line size: {len(line)}")
-                    else:
-                        yield line
-                        yield b"\n"
-
-            # Save the last incomplete fragment
-            buffer = lines[-1]
-
-            # Check if buffer exceeds limit
-            if not skip_mode and len(buffer) > max_buffer_size:
-                skip_mode = True
-                log.info(f"Skip mode triggered, buffer size: {len(buffer)}")
-                # Clear oversized buffer to prevent unlimited growth
-                buffer = b""
+                    yield line
+                yield b"\n"
 
         # Process remaining buffer data
-        if buffer and not skip_mode:
-            yield buffer
+        line = framer.flush()
+        if line:
+            yield line
             yield b"\n"
 
     return yield_safe_stream_chunks()
@@ -1,7 +1,9 @@
 import time
+import json
 import logging
 import asyncio
 import sys
+from typing import Optional
 
 from aiocache import cached
 from fastapi import Request
@@ -29,7 +31,11 @@ from open_webui.config import (
     DEFAULT_ARENA_MODEL,
 )
 
-from open_webui.env import BYPASS_MODEL_ACCESS_CONTROL, GLOBAL_LOG_LEVEL
+from open_webui.env import (
+    BYPASS_MODEL_ACCESS_CONTROL,
+    GLOBAL_LOG_LEVEL,
+    MODELS_CATALOG_CACHE_TTL,
+)
 from open_webui.models.users import UserModel
 
 logging.basicConfig(stream=sys.stdout, level=GLOBAL_LOG_LEVEL)
@@ -78,115 +84,208 @@ async def get_all_base_models(request: Request, user: UserModel = None):
     return function_models + openai_models + ollama_models
 
 
-async def get_all_models(request, refresh: bool = False, user: UserModel = None):
-    if (
-        request.app.state.MODELS
-        and request.app.state.BASE_MODELS
-        and (request.app.state.config.ENABLE_BASE_MODELS_CACHE and not refresh)
-    ):
-        base_models = request.app.state.BASE_MODELS
-    else:
-        base_models = await get_all_base_models(request, user=user)
-        request.app.state.BASE_MODELS = base_models
+def get_models_version(app) -> int:
+    """
+    Version of the model catalog. Shared through Redis alongside
+    app.state.MODELS when that is a RedisDict, process-local otherwise.
+    """
+    models = app.state.MODELS
+    if isinstance(models, RedisDict):
+        return int(models.redis.get(f"{models.name}:version") or 0)
+    return getattr(app.state, "MODELS_VERSION", 0)
+
+
+def is_models_cache_fresh(entry: Optional[dict], version: int) -> bool:
+    """
+    Whether a cached overlay or catalog can be reused: built for this version,
+    and recently enough to pick up the changes of workers whose version bumps
+    are not shared (no Redis).
+    """
+    return (
+        entry is not None
+        and entry["version"] == version
+        and time.time() - entry.get("loaded_at", 0) < MODELS_CATALOG_CACHE_TTL
+    )
 
-    # deep copy the base models to avoid modifying the original list
-    models = [model.copy() for model in base_models]
 
-    # If there are no models, return an empty list
-    if len(models) == 0:
-        return []
+def invalidate_models(app):
+    """Mark the model catalog stale after a model, function or connection change."""
+    models = app.state.MODELS
+    if isinstance(models, RedisDict):
+        models.redis.incr(f"{models.name}:version")
+    else:
+        app.state.MODELS_VERSION = getattr(app.state, "MODELS_VERSION", 0) + 1
 
-    # Add arena models
-    if request.app.state.config.ENABLE_EVALUATION_ARENA_MODELS:
-        arena_models = []
-        if len(request.app.state.config.EVALUATION_ARENA_MODELS) > 0:
-            arena_models = [
-                {
-                    "id": model["id"],
-                    "name": model["name"],
-                    "info": {
-                        "meta": model["meta"],
-                    },
-                    "object": "model",
-                    "created": int(time.time()),
-                    "owned_by": "arena",
-                    "arena": True,
-                }
-                for model in request.app.state.config.EVALUATION_ARENA_MODELS
-            ]
-        else:
-            # Add default arena model
-            arena_models = [
-                {
-                    "id": DEFAULT_ARENA_MODEL["id"],
-                    "name": DEFAULT_ARENA_MODEL["name"],
-                    "info": {
-                        "meta": DEFAULT_ARENA_MODEL["meta"],
-                    },
-                    "object": "model",
-                    "created": int(time.time()),
-                    "owned_by": "arena",
-                    "arena": True,
-                }
-            ]
-        models = models + arena_models
-
-    global_action_ids = [
-        function.id for function in Functions.get_global_action_functions()
+
+def get_arena_models(request) -> list[dict]:
+    arena_models = request.app.state.config.EVALUATION_ARENA_MODELS or [
+        DEFAULT_ARENA_MODEL
     ]
-    enabled_action_ids = [
-        function.id
-        for function in Functions.get_functions_by_type("action", active_only=True)
+    return [
+        {
+            "id": model["id"],
+            "name": model["name"],
+            "info": {
+                "meta": model["meta"],
+            },
+            "object": "model",
+            "created": int(time.time()),
+            "owned_by": "arena",
+            "arena": True,
+        }
+        for model in arena_models
     ]
 
-    global_filter_ids = [
-        function.id for function in Functions.get_global_filter_functions()
-    ]
-    enabled_filter_ids = [
-        function.id
-        for function in Functions.get_functions_by_type("filter", active_only=True)
+
+# Process action_ids to get the actions
+def get_action_items_from_module(function, module):
+    actions = []
+    if hasattr(module, "actions"):
+        actions = module.actions
+        return [
+            {
+                "id": f"{function.id}.{action['id']}",
+                "name": action.get("name", f"{function.name} ({action['id']})"),
+                "description": function.meta.description,
+                "icon": action.get(
+                    "icon_url",
+                    function.meta.manifest.get("icon_url", None)
+                    or getattr(module, "icon_url", None)
+                    or getattr(module, "icon", None),
+                ),
+            }
+            for action in actions
+        ]
+    else:
+        return [
+            {
+                "id": function.id,
+                "name": function.name,
+                "description": function.meta.description,
+                "icon": function.meta.manifest.get("icon_url", None)
+                or getattr(module, "icon_url", None)
+                or getattr(module, "icon", None),
+            }
+        ]
+
+
+# Process filter_ids to get the filters
+def get_filter_items_from_module(function, module):
+    return [
+        {
+            "id": function.id,
+            "name": function.name,
+            "description": function.meta.description,
+            "icon": function.meta.manifest.get("icon_url", None)
+            or getattr(module, "icon_url", None)
+            or getattr(module, "icon", None),
+            "has_user_valves": hasattr(module, "UserValves"),
+        }
     ]
 
-    custom_models = Models.get_all_models()
+
+def get_models_overlay(request, version: int) -> dict:
+    """
+    Custom models and action/filter items applied on top of the base models,
+    loaded once per catalog version (and MODELS_CATALOG_CACHE_TTL).
+    """
+    overlay = getattr(request.app.state, "MODELS_OVERLAY", None)
+    if is_models_cache_fresh(overlay, version):
+        return overlay
+
+    functions = {
+        function.id: function
+        for function in Functions.get_functions(active_only=True)
+        if function.type in ("action", "filter")
+    }
+
+    actions = {}
+    filters = {}
+    for function in functions.values():
+        function_module, _, _ = get_function_module_from_cache(request, function.id)
+        if function.type == "action":
+            actions[function.id] = get_action_items_from_module(
+                function, function_module
+            )
+        elif getattr(function_module, "toggle", None):
+            filters[function.id] = get_filter_items_from_module(
+                function, function_module
+            )
+
+    overlay = {
+        "version": version,
+        "loaded_at": time.time(),
+        "custom_models": Models.get_all_models(),
+        "actions": actions,
+        "filters": filters,
+        "global_action_ids": [
+            function.id
+            for function in functions.values()
+            if function.type == "action" and function.is_global
+        ],
+        "global_filter_ids": [
+            function.id
+            for function in functions.values()
+            if function.type == "filter" and function.is_global
+        ],
+    }
+    request.app.state.MODELS_OVERLAY = overlay
+    return overlay
+
+
+def apply_models_overlay(models: list[dict], overlay: dict) -> list[dict]:
+    custom_models = overlay["custom_models"]
+
+    models_by_id = {}
+    # Ollama may return model ids in different formats (e.g., 'llama3' vs. 'llama3:7b')
+    models_by_ollama_name = {}
+    for model in models:
+        models_by_id.setdefault(model["id"], []).append(model)
+        if model.get("owned_by") == "ollama":
+            models_by_ollama_name.setdefault(model["id"].split(":")[0], []).append(
+                model
+            )
+
+    removed_ids = set()
     for custom_model in custom_models:
         if custom_model.base_model_id is None:
             # Applied directly to a base model
-            for model in models:
-                if custom_model.id == model["id"] or (
-                    model.get("owned_by") == "ollama"
-                    and custom_model.id
-                    == model["id"].split(":")[
-                        0
-                    ]  # Ollama may return model ids in different formats (e.g., 'llama3' vs. 'llama3:7b')
-                ):
-                    if custom_model.is_active:
-                        model["name"] = custom_model.name
-                        model["info"] = custom_model.model_dump()
-
-                        # Set action_ids and filter_ids
-                        action_ids = []
-                        filter_ids = []
-
-                        if "info" in model:
-                            if "meta" in model["info"]:
-                                action_ids.extend(
-                                    model["info"]["meta"].get("actionIds", [])
-                                )
-                                filter_ids.extend(
-                                    model["info"]["meta"].get("filterIds", [])
-                                )
-
-                            if "params" in model["info"]:
-                                # Remove params to avoid exposing sensitive info
-                                del model["info"]["params"]
-
-                        model["action_ids"] = action_ids
-                        model["filter_ids"] = filter_ids
-                    else:
-                        models.remove(model)
-
-        elif custom_model.is_active and (
-            custom_model.id not in [model["id"] for model in models]
+            matches = {
+                id(model): model
+                for model in models_by_id.get(custom_model.id, [])
+                + models_by_ollama_name.get(custom_model.id, [])
+            }
+
+            for model in matches.values():
+                if custom_model.is_active:
+                    model["name"] = custom_model.name
+                    info = custom_model.model_dump()
+                    if "params" in info:
+                        # Remove params to avoid exposing sensitive info
+                        del info["params"]
+                    model["info"] = info
+
+                    # Set action_ids and filter_ids
+                    meta = info.get("meta") or {}
+                    model["action_ids"] = list(meta.get("actionIds") or [])
+                    model["filter_ids"] = list(meta.get("filterIds") or [])
+                else:
+                    removed_ids.add(id(model))
+
+    models = [model for model in models if id(model) not in removed_ids]
+
+    # The first model whose id, or id without the tag, is a preset's base model
+    base_models = {}
+    for model in models:
+        base_models.setdefault(model["id"], model)
+        base_models.setdefault(model["id"].split(":")[0], model)
+    model_ids = {model["id"] for model in models}
+
+    for custom_model in custom_models:
+        if (
+            custom_model.base_model_id is not None
+            and custom_model.is_active
+            and custom_model.id not in model_ids
         ):
             # Custom model based on a base model
             owned_by = "openai"
@@ -194,17 +293,13 @@ async def get_all_models(request, refresh: bool = False, user: UserModel = None)
 
             pipe = None
 
-            for m in models:
-                if (
-                    custom_model.base_model_id == m["id"]
-                    or custom_model.base_model_id == m["id"].split(":")[0]
-                ):
-                    owned_by = m.get("owned_by", "unknown")
-                    if "pipe" in m:
-                        pipe = m["pipe"]
+            m = base_models.get(custom_model.base_model_id)
+            if m is not None:
+                owned_by = m.get("owned_by", "unknown")
+                if "pipe" in m:
+                    pipe = m["pipe"]
 
-                    connection_type = m.get("connection_type", None)
-                    break
+                connection_type = m.get("connection_type", None)
 
             model = {
                 "id": f"{custom_model.id}",
@@ -239,102 +334,140 @@ async def get_all_models(request, refresh: bool = False, user: UserModel = None)
             model["action_ids"] = action_ids
             model["filter_ids"] = filter_ids
 
+            base_models.setdefault(model["id"], model)
+            base_models.setdefault(model["id"].split(":")[0], model)
+            model_ids.add(model["id"])
             models.append(model)
 
-    # Process action_ids to get the actions
-    def get_action_items_from_module(function, module):
-        actions = []
-        if hasattr(module, "actions"):
-            actions = module.actions
-            return [
-                {
-                    "id": f"{function.id}.{action['id']}",
-                    "name": action.get("name", f"{function.name} ({action['id']})"),
-                    "description": function.meta.description,
-                    "icon": action.get(
-                        "icon_url",
-                        function.meta.manifest.get("icon_url", None)
-                        or getattr(module, "icon_url", None)
-                        or getattr(module, "icon", None),
-                    ),
-                }
-                for action in actions
-            ]
-        else:
-            return [
-                {
-                    "id": function.id,
-                    "name": function.name,
-                    "description": function.meta.description,
-                    "icon": function.meta.manifest.get("icon_url", None)
-                    or getattr(module, "icon_url", None)
-                    or getattr(module, "icon", None),
-                }
-            ]
-
-    # Process filter_ids to get the filters
-    def get_filter_items_from_module(function, module):
-        return [
-            {
-                "id": function.id,
-                "name": function.name,
-                "description": function.meta.description,
-                "icon": function.meta.manifest.get("icon_url", None)
-                or getattr(module, "icon_url", None)
-                or getattr(module, "icon", None),
-                "has_user_valves": hasattr(module, "UserValves"),
-            }
-        ]
-
-    def get_function_module_by_id(function_id):
-        function_module, _, _ = get_function_module_from_cache(request, function_id)
-        return function_module
-
     for model in models:
-        action_ids = [
-            action_id
-            for action_id in list(set(model.pop("action_ids", []) + global_action_ids))
-            if action_id in enabled_action_ids
-        ]
-        filter_ids = [
-            filter_id
-            for filter_id in list(set(model.pop("filter_ids", []) + global_filter_ids))
-            if filter_id in enabled_filter_ids
-        ]
+        action_ids = set(model.pop("action_ids", []) + overlay["global_action_ids"])
+        filter_ids = set(model.pop("filter_ids", []) + overlay["global_filter_ids"])
 
         model["actions"] = []
         for action_id in action_ids:
-            action_function = Functions.get_function_by_id(action_id)
-            if action_function is None:
-                raise Exception(f"Action not found: {action_id}")
-
-            function_module = get_function_module_by_id(action_id)
-            model["actions"].extend(
-                get_action_items_from_module(action_function, function_module)
-            )
+            model["actions"].extend(overlay["actions"].get(action_id, []))
 
         model["filters"] = []
         for filter_id in filter_ids:
-            filter_function = Functions.get_function_by_id(filter_id)
-            if filter_function is None:
-                raise Exception(f"Filter not found: {filter_id}")
+            model["filters"].extend(overlay["filters"].get(filter_id, []))
 
-            function_module = get_function_module_by_id(filter_id)
+    return models
 
-            if getattr(function_module, "toggle", None):
-                model["filters"].extend(
-                    get_filter_items_from_module(filter_function, function_module)
-                )
 
-    log.debug(f"get_all_models() returned {len(models)} models")
+def get_cached_models_catalog(app, version: int) -> Optional[dict]:
+    catalog = getattr(app.state, "MODELS_CATALOG", None)
+    if is_models_cache_fresh(catalog, version):
+        return catalog
+
+    models = app.state.MODELS
+    if isinstance(models, RedisDict):
+        # Another worker may already have assembled this version
+        value = models.redis.get(f"{models.name}:catalog")
+        if value:
+            catalog = json.loads(value)
+            if is_models_cache_fresh(catalog, version):
+                app.state.MODELS_CATALOG = catalog
+                return catalog
 
-    models_dict = {model["id"]: model for model in models}
-    if isinstance(request.app.state.MODELS, RedisDict):
-        request.app.state.MODELS.set(models_dict)
+    return None
+
+
+def set_models_catalog(app, catalog: dict):
+    app.state.MODELS_CATALOG = catalog
+
+    models_dict = {model["id"]: model for model in catalog["models"]}
+    if isinstance(app.state.MODELS, RedisDict):
+        app.state.MODELS.set(models_dict)
+        app.state.MODELS.redis.set(
+            f"{app.state.MODELS.name}:catalog", json.dumps(catalog)
+        )
     else:
-        request.app.state.MODELS = models_dict
+        app.state.MODELS = models_dict
+
+
+async def get_models_catalog(
+    request, refresh: bool = False, user: UserModel = None
+) -> dict:
+    """
+    The assembled model catalog: {"version", "models", "owners"}, where owners
+    maps the ids of models stored in the database to their user_id.
+
+    With ENABLE_BASE_MODELS_CACHE the catalog is reused until the version is
+    bumped by invalidate_models() or a refresh, otherwise the base models are
+    fetched on every call and only the database overlay is reused. Either way
+    the overlay is reloaded after MODELS_CATALOG_CACHE_TTL.
+    """
+    app = request.app
+    if refresh:
+        invalidate_models(app)
+    version = get_models_version(app)
+
+    use_cache = app.state.config.ENABLE_BASE_MODELS_CACHE and not refresh
+    if use_cache:
+        catalog = get_cached_models_catalog(app, version)
+        if catalog is not None:
+            return catalog
 
-    return models
+    if (
+        use_cache
+        and app.state.BASE_MODELS
+        and getattr(app.state, "BASE_MODELS_VERSION", None) == version
+    ):
+        base_models = app.state.BASE_MODELS
+        overlay = await asyncio.to_thread(get_models_overlay, request, version)
+    else:
+        # Fetch the base models and load the overlay concurrently
+        base_models, overlay = await asyncio.gather(
+            get_all_base_models(request, user=user),
+            asyncio.to_thread(get_models_overlay, request, version),
+        )
+        app.state.BASE_MODELS = base_models
+        app.state.BASE_MODELS_VERSION = version
+
+    # If there are no models, return an empty catalog
+    if len(base_models) == 0:
+        return {"version": version, "models": [], "owners": {}}
+
+    # copy the base models to avoid modifying the original list
+    models = [model.copy() for model in base_models]
+
+    # Add arena models
+    if app.state.config.ENABLE_EVALUATION_ARENA_MODELS:
+        models = models + get_arena_models(request)
+
+    models = apply_models_overlay(models, overlay)
+
+    model_ids = {model["id"] for model in models}
+    catalog = {
+        "version": version,
+        "loaded_at": overlay["loaded_at"],
+        "models": models,
+        "owners": {
+            custom_model.id: custom_model.user_id
+            for custom_model in overlay["custom_models"]
+            if custom_model.id in model_ids
+        },
+    }
+
+    log.debug(f"get_all_models() returned {len(models)} models")
+
+    set_models_catalog(app, catalog)
+    return catalog
+
+
+async def get_all_models(request, refresh: bool = False, user: UserModel = None):
+    catalog = await get_models_catalog(request, refresh=refresh, user=user)
+    return catalog["models"]
+
+
+async def get_user_models(
+    request, user: UserModel, refresh: bool = False, db=None
+) -> list[dict]:
+    """The cached model catalog filtered down to the models the user can read."""
+    catalog = await get_models_catalog(request, refresh=refresh, user=user)
+    return get_filtered_models(
+        catalog["models"], user, db=db, model_owners=catalog["owners"]
+    )
 
 
 def check_model_access(user, model, db=None):
@@ -365,27 +498,26 @@ def check_model_access(user, model, db=None):
             raise Exception("Model not found")
 
 
-def get_filtered_models(models, user, db=None):
+def get_filtered_models(models, user, db=None, model_owners: Optional[dict] = None):
     # Filter out models that the user does not have access to
     if (
         user.role == "user"
         or (user.role == "admin" and not BYPASS_ADMIN_ACCESS_CONTROL)
     ) and not BYPASS_MODEL_ACCESS_CONTROL:
-        model_ids = [model["id"] for model in models if not model.get("arena")]
-        model_infos = {
-            model_info.id: model_info
-            for model_info in Models.get_models_by_ids(model_ids)
-        }
+        if model_owners is None:
+            model_ids = [model["id"] for model in models if not model.get("arena")]
+            model_owners = {
+                model_info.id: model_info.user_id
+                for model_info in Models.get_models_by_ids(model_ids)
+            }
 
-        user_group_ids = {
-            group.id for group in Groups.get_groups_by_member_id(user.id, db=db)
-        }
+        user_group_ids = Groups.get_group_ids_by_member_id(user.id, db=db)
 
         # Batch-fetch accessible resource IDs in a single query instead of N has_access calls
         accessible_model_ids = AccessGrants.get_accessible_resource_ids(
             user_id=user.id,
             resource_type="model",
-            resource_ids=list(model_infos.keys()),
+            resource_ids=list(model_owners.keys()),
             permission="read",
             user_group_ids=user_group_ids,
             db=db,
@@ -405,12 +537,11 @@ def get_filtered_models(models, user, db=None):
                     filtered_models.append(model)
                 continue
 
-            model_info = model_infos.get(model["id"], None)
-            if model_info:
+            if model["id"] in model_owners:
                 if (
                     (user.role == "admin" and BYPASS_ADMIN_ACCESS_CONTROL)
-                    or user.id == model_info.user_id
-                    or model_info.id in accessible_model_ids
+                    or user.id == model_owners[model["id"]]
+                    or model["id"] in accessible_model_ids
                 ):
                     filtered_models.append(model)
 
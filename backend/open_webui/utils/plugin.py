@@ -1,16 +1,25 @@
+import hashlib
 import os
 import re
 import subprocess
 import sys
+import time
+from dataclasses import dataclass, field
 from importlib import util
 import types
 import tempfile
 import logging
-from typing import Any
-
-from open_webui.env import PIP_OPTIONS, PIP_PACKAGE_INDEX_OPTIONS, OFFLINE_MODE
+from typing import Any, Optional
+
+from open_webui.env import (
+    PIP_OPTIONS,
+    PIP_PACKAGE_INDEX_OPTIONS,
+    OFFLINE_MODE,
+    PLUGIN_CACHE_TTL,
+)
 from open_webui.models.functions import Functions
 from open_webui.models.tools import Tools
+from open_webui.utils.plugin_cache import PLUGIN_VERSIONS
 
 log = logging.getLogger(__name__)
 
@@ -251,7 +260,7 @@ def load_tool_module_by_id(tool_id, content=None):
         os.unlink(temp_file.name)
 
 
-def load_function_module_by_id(function_id: str, content: str | None = None):
+def load_function_module_by_id(function_id: str, content: str | None = None, app=None):
     if content is None:
         function = Functions.get_function_by_id(function_id)
         if not function:
@@ -297,14 +306,63 @@ def load_function_module_by_id(function_id: str, content: str | None = None):
         del sys.modules[module_name]
 
         Functions.update_function_by_id(function_id, {"is_active": False})
+        if app is not None:
+            from open_webui.utils.models import invalidate_models
+
+            # Drop its actions and filters from the model catalog
+            invalidate_models(app)
         raise e
     finally:
         os.unlink(temp_file.name)
 
 
+@dataclass
+class PluginCacheEntry:
+    content_hash: str
+    versions: tuple[int, ...]
+    checked_at: float
+    valves: Optional[dict] = None
+    user_id: Optional[str] = None
+    specs: Optional[list] = None
+    # Data derived from the module and the fields above (e.g. compiled tool
+    # specs), dropped with the entry
+    compiled: dict = field(default_factory=dict)
+
+
+def get_content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def get_app_state_dict(request, name: str) -> dict:
+    if not hasattr(request.app.state, name):
+        setattr(request.app.state, name, {})
+    return getattr(request.app.state, name)
+
+
+def get_valid_cache_entry(
+    modules: dict, cache: dict, id: str, versions: tuple
+) -> Optional[PluginCacheEntry]:
+    entry = cache.get(id)
+    if (
+        id in modules
+        and entry is not None
+        and entry.versions == versions
+        and time.monotonic() - entry.checked_at < PLUGIN_CACHE_TTL
+    ):
+        return entry
+    return None
+
+
 def get_tool_module_from_cache(request, tool_id, load_from_db=True):
+    modules = get_app_state_dict(request, "TOOLS")
+    cache = get_app_state_dict(request, "TOOL_CACHE")
+
     if load_from_db:
-        # Always load from the database by default
+        # Read before loading, so a concurrent update is picked up on the next call
+        versions = PLUGIN_VERSIONS.get("tools", f"tool:{tool_id}")
+        if get_valid_cache_entry(modules, cache, tool_id, versions):
+            return modules[tool_id], None
+
         tool = Tools.get_tool_by_id(tool_id)
         if not tool:
             raise Exception(f"Tool not found: {tool_id}")
@@ -315,40 +373,53 @@ def get_tool_module_from_cache(request, tool_id, load_from_db=True):
             content = new_content
             # Update the tool content in the database
             Tools.update_tool_by_id(tool_id, {"content": content})
+            versions = PLUGIN_VERSIONS.get("tools", f"tool:{tool_id}")
+
+        entry = PluginCacheEntry(
+            content_hash=get_content_hash(content),
+            versions=versions,
+            checked_at=time.monotonic(),
+            valves=Tools.get_tool_valves_by_id(tool_id),
+            user_id=tool.user_id,
+            specs=tool.specs,
+        )
 
+        # Only the valves or metadata changed, keep the loaded module
+        previous_entry = cache.get(tool_id)
         if (
-            hasattr(request.app.state, "TOOL_CONTENTS")
-            and tool_id in request.app.state.TOOL_CONTENTS
-        ) and (
-            hasattr(request.app.state, "TOOLS") and tool_id in request.app.state.TOOLS
+            tool_id in modules
+            and previous_entry is not None
+            and previous_entry.content_hash == entry.content_hash
         ):
-            if request.app.state.TOOL_CONTENTS[tool_id] == content:
-                return request.app.state.TOOLS[tool_id], None
+            cache[tool_id] = entry
+            return modules[tool_id], None
 
         tool_module, frontmatter = load_tool_module_by_id(tool_id, content)
+        modules[tool_id] = tool_module
+        cache[tool_id] = entry
     else:
-        if hasattr(request.app.state, "TOOLS") and tool_id in request.app.state.TOOLS:
-            return request.app.state.TOOLS[tool_id], None
+        if tool_id in modules:
+            return modules[tool_id], None
 
         tool_module, frontmatter = load_tool_module_by_id(tool_id)
-
-    if not hasattr(request.app.state, "TOOLS"):
-        request.app.state.TOOLS = {}
-
-    if not hasattr(request.app.state, "TOOL_CONTENTS"):
-        request.app.state.TOOL_CONTENTS = {}
-
-    request.app.state.TOOLS[tool_id] = tool_module
-    request.app.state.TOOL_CONTENTS[tool_id] = content
+        modules[tool_id] = tool_module
+        # Content unknown here, the next call with load_from_db validates it
+        cache.pop(tool_id, None)
 
     return tool_module, frontmatter
 
 
 def get_function_module_from_cache(request, function_id, load_from_db=True):
+    modules = get_app_state_dict(request, "FUNCTIONS")
+    cache = get_app_state_dict(request, "FUNCTION_CACHE")
+
     if load_from_db:
-        # Always load from the database by default
-        # This is useful for hooks like "inlet" or "outlet" where the content might change
-        # and we want to ensure the latest content is used.
+        # Hooks like "inlet" or "outlet" must use the latest content. The cached
+        # module is used as long as the function's version counter is unchanged,
+        # which every write to the function bumps (on all workers, with Redis).
+        versions = PLUGIN_VERSIONS.get("functions", f"function:{function_id}")
+        if get_valid_cache_entry(modules, cache, function_id, versions):
+            return modules[function_id], None, None
 
         function = Functions.get_function_by_id(function_id)
         if not function:
@@ -360,44 +431,63 @@ def get_function_module_from_cache(request, function_id, load_from_db=True):
             content = new_content
             # Update the function content in the database
             Functions.update_function_by_id(function_id, {"content": content})
+            versions = PLUGIN_VERSIONS.get("functions", f"function:{function_id}")
 
+        entry = PluginCacheEntry(
+            content_hash=get_content_hash(content),
+            versions=versions,
+            checked_at=time.monotonic(),
+            valves=Functions.get_function_valves_by_id(function_id),
+        )
+
+        # Only the valves or metadata changed, keep the loaded module
+        previous_entry = cache.get(function_id)
         if (
-            hasattr(request.app.state, "FUNCTION_CONTENTS")
-            and function_id in request.app.state.FUNCTION_CONTENTS
-        ) and (
-            hasattr(request.app.state, "FUNCTIONS")
-            and function_id in request.app.state.FUNCTIONS
+            function_id in modules
+            and previous_entry is not None
+            and previous_entry.content_hash == entry.content_hash
         ):
-            if request.app.state.FUNCTION_CONTENTS[function_id] == content:
-                return request.app.state.FUNCTIONS[function_id], None, None
+            cache[function_id] = entry
+            return modules[function_id], None, None
 
         function_module, function_type, frontmatter = load_function_module_by_id(
-            function_id, content
+            function_id, content, app=request.app
         )
+        modules[function_id] = function_module
+        cache[function_id] = entry
     else:
         # Load from cache (e.g. "stream" hook)
         # This is useful for performance reasons
 
-        if (
-            hasattr(request.app.state, "FUNCTIONS")
-            and function_id in request.app.state.FUNCTIONS
-        ):
-            return request.app.state.FUNCTIONS[function_id], None, None
+        if function_id in modules:
+            return modules[function_id], None, None
 
         function_module, function_type, frontmatter = load_function_module_by_id(
-            function_id
+            function_id, app=request.app
         )
+        modules[function_id] = function_module
+        # Content unknown here, the next call with load_from_db validates it
+        cache.pop(function_id, None)
 
-    if not hasattr(request.app.state, "FUNCTIONS"):
-        request.app.state.FUNCTIONS = {}
+    return function_module, function_type, frontmatter
 
-    if not hasattr(request.app.state, "FUNCTION_CONTENTS"):
-        request.app.state.FUNCTION_CONTENTS = {}
 
-    request.app.state.FUNCTIONS[function_id] = function_module
-    request.app.state.FUNCTION_CONTENTS[function_id] = content
+def get_tool_cache_entry(request, tool_id) -> PluginCacheEntry:
+    """Load or validate the module of a tool and return its cache entry."""
+    get_tool_module_from_cache(request, tool_id)
+    return get_app_state_dict(request, "TOOL_CACHE")[tool_id]
 
-    return function_module, function_type, frontmatter
+
+def get_tool_valves_from_cache(request, tool_id) -> Optional[dict]:
+    """Get the valves of a tool, cached alongside its module."""
+    return get_tool_cache_entry(request, tool_id).valves
+
+
+def get_function_valves_from_cache(request, function_id) -> Optional[dict]:
+    """Get the valves of a function, cached alongside its module."""
+    get_function_module_from_cache(request, function_id)
+    entry = get_app_state_dict(request, "FUNCTION_CACHE").get(function_id)
+    return entry.valves if entry else Functions.get_function_valves_by_id(function_id)
 
 
 def install_frontmatter_requirements(requirements: str):
@@ -0,0 +1,69 @@
+import json
+import logging
+import threading
+import uuid
+
+from open_webui.env import PLUGIN_CACHE_TTL, REDIS_KEY_PREFIX
+from open_webui.utils.redis import get_redis_client
+
+log = logging.getLogger(__name__)
+
+REDIS_PLUGIN_CHANNEL = f"{REDIS_KEY_PREFIX}:plugins:versions"
+
+# Identifies this process, workers of one instance share INSTANCE_ID
+SENDER_ID = str(uuid.uuid4())
+
+
+class PluginVersions:
+    """
+    Version counters of functions and tools ("function:<id>", "tool:<id>",
+    and "functions"/"tools" for bulk changes), used to validate the cached
+    plugin modules without reading the database.
+
+    Writers bump a counter after committing. With Redis the bump is
+    published, and every worker bumps its own counters when it receives it.
+    """
+
+    def __init__(self, redis=None):
+        self.redis = redis
+        self.versions: dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def get(self, *names: str) -> tuple[int, ...]:
+        with self.lock:
+            return tuple(self.versions.get(name, 0) for name in names)
+
+    def _bump_local(self, names):
+        with self.lock:
+            for name in names:
+                self.versions[name] = self.versions.get(name, 0) + 1
+
+    def bump(self, *names: str):
+        self._bump_local(names)
+
+        if self.redis is not None:
+            try:
+                self.redis.publish(
+                    REDIS_PLUGIN_CHANNEL,
+                    json.dumps({"sender": SENDER_ID, "names": list(names)}),
+                )
+            except Exception as e:
+                log.warning(f"Failed to publish plugin versions: {e}")
+
+    async def listen(self, redis):
+        """Apply the bumps published by other workers. Runs for the app lifetime."""
+        pubsub = redis.pubsub()
+        await pubsub.subscribe(REDIS_PLUGIN_CHANNEL)
+
+        async for message in pubsub.listen():
+            if message["type"] != "message":
+                continue
+            try:
+                data = json.loads(message["data"])
+                if data.get("sender") != SENDER_ID:
+                    self._bump_local(data.get("names", []))
+            except Exception as e:
+                log.exception(f"Error handling plugin versions message: {e}")
+
+
+PLUGIN_VERSIONS = PluginVersions(redis=get_redis_client() if PLUGIN_CACHE_TTL else None)
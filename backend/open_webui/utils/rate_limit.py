@@ -1,139 +1,243 @@
+import logging
+import threading
 import time
-from typing import Optional, Dict
+from collections import OrderedDict
+from typing import Optional
+
 from open_webui.env import REDIS_KEY_PREFIX
 
+log = logging.getLogger(__name__)
+
+# Increments the counter of the current window of every limit and estimates the
+# sliding count from it and the previous window, weighted by how much of the
+# previous window still overlaps. One round trip, atomic for all limits.
+#
+# KEYS: current and previous window counters, two per limit
+# ARGV: now, then limit and window for each limit
+SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local limited = 0
+local result = {0}
+
+for i = 1, #KEYS / 2 do
+    local limit = tonumber(ARGV[i * 2])
+    local window = tonumber(ARGV[i * 2 + 1])
+
+    local current = redis.call('INCR', KEYS[i * 2 - 1])
+    if current == 1 then
+        redis.call('EXPIRE', KEYS[i * 2 - 1], window * 2)
+    end
+    local previous = tonumber(redis.call('GET', KEYS[i * 2]) or '0')
+
+    local count = math.floor(previous * (1 - (now % window) / window) + current)
+    if count > limit then
+        limited = 1
+    end
+    result[i + 1] = count
+end
+
+result[1] = limited
+return result
+"""
+
 
 class RateLimiter:
     """
-    General-purpose rate limiter using Redis with a rolling window strategy.
-    Falls back to in-memory storage if Redis is not available.
+    General-purpose sliding window rate limiter. Every limit keeps a counter
+    for the current and the previous fixed window in Redis, checked and
+    incremented by a single Lua script. Falls back to a bounded in-memory
+    store if Redis is not available.
     """
 
-    # In-memory fallback storage
-    _memory_store: Dict[str, Dict[int, int]] = {}
-
     def __init__(
         self,
         redis_client,
-        limit: int,
-        window: int,
-        bucket_size: int = 60,
+        limit: Optional[int] = None,
+        window: Optional[int] = None,
         enabled: bool = True,
+        limits: Optional[list[tuple[int, int]]] = None,
+        max_memory_keys: int = 10000,
     ):
         """
         :param redis_client: Redis client instance or None
         :param limit: Max allowed events in the window
         :param window: Time window in seconds
-        :param bucket_size: Bucket resolution
         :param enabled: Turn on/off rate limiting globally
+        :param limits: (limit, window) pairs applied together, e.g. per minute and per day
+        :param max_memory_keys: Max keys kept by the in-memory fallback
         """
         self.r = redis_client
-        self.limit = limit
-        self.window = window
-        self.bucket_size = bucket_size
-        self.num_buckets = window // bucket_size
-        self.enabled = enabled
+        self.limits = list(limits or [])
+        if limit is not None and window is not None:
+            self.limits.insert(0, (limit, window))
+        if not self.limits:
+            raise ValueError("RateLimiter needs at least one (limit, window)")
 
-    def _bucket_key(self, key: str, bucket_index: int) -> str:
-        return f"{REDIS_KEY_PREFIX}:ratelimit:{key.lower()}:{bucket_index}"
-
-    def _current_bucket(self) -> int:
-        return int(time.time()) // self.bucket_size
+        self.enabled = enabled
+        self.max_memory_keys = max_memory_keys
+        self.max_window = max(window for _, window in self.limits)
+
+        self._script = None
+        # key -> (expires_at, {window: [window_index, current, previous]})
+        self._memory_store: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        return self.limits[0][0]
+
+    @property
+    def window(self) -> int:
+        return self.limits[0][1]
+
+    def _window_key(self, key: str, window: int, window_index: int) -> str:
+        # The hash tag keeps every counter of a key in one cluster slot
+        return f"{REDIS_KEY_PREFIX}:ratelimit:{{{key}}}:{window}:{window_index}"
+
+    def _get_window_keys(self, key: str, now: float) -> list[str]:
+        keys = []
+        for _, window in self.limits:
+            window_index = int(now // window)
+            keys.append(self._window_key(key, window, window_index))
+            keys.append(self._window_key(key, window, window_index - 1))
+        return keys
+
+    def _get_sliding_count(
+        self, current: int, previous: int, window: int, now: float
+    ) -> int:
+        return int(previous * (1 - (now % window) / window) + current)
 
     def _redis_available(self) -> bool:
         return self.r is not None
 
     def is_limited(self, key: str) -> bool:
         """
-        Main rate-limit check.
+        Main rate-limit check. Counts the attempt against every limit and
+        reports whether any of them is exceeded.
         Gracefully handles missing or failing Redis.
         """
         if not self.enabled:
             return False
 
-        if self._redis_available():
-            try:
-                return self._is_limited_redis(key)
-            except Exception:
-                return self._is_limited_memory(key)
-        else:
-            return self._is_limited_memory(key)
+        limited, _ = self.hit(key)
+        return limited
 
-    def get_count(self, key: str) -> int:
+    def hit(self, key: str) -> tuple[bool, list[int]]:
+        """Count an attempt, returning whether it is limited and the count per limit."""
         if not self.enabled:
-            return 0
+            return False, [0] * len(self.limits)
 
+        key = key.lower()
+        now = time.time()
         if self._redis_available():
             try:
-                return self._get_count_redis(key)
-            except Exception:
-                return self._get_count_memory(key)
-        else:
-            return self._get_count_memory(key)
-
-    def remaining(self, key: str) -> int:
-        used = self.get_count(key)
-        return max(0, self.limit - used)
+                return self._hit_redis(key, now)
+            except Exception as e:
+                log.debug(f"Rate limit check failed, using memory: {e}")
+        return self._hit_memory(key, now)
 
-    def _is_limited_redis(self, key: str) -> bool:
-        now_bucket = self._current_bucket()
-        bucket_key = self._bucket_key(key, now_bucket)
-
-        attempts = self.r.incr(bucket_key)
-        if attempts == 1:
-            self.r.expire(bucket_key, self.window + self.bucket_size)
-
-        # Collect buckets
-        buckets = [
-            self._bucket_key(key, now_bucket - i) for i in range(self.num_buckets + 1)
-        ]
+    def get_counts(self, key: str) -> list[int]:
+        if not self.enabled:
+            return [0] * len(self.limits)
 
-        counts = self.r.mget(buckets)
-        total = sum(int(c) for c in counts if c)
+        key = key.lower()
+        now = time.time()
+        if self._redis_available():
+            try:
+                return self._get_counts_redis(key, now)
+            except Exception as e:
+                log.debug(f"Rate limit count failed, using memory: {e}")
+        return self._get_counts_memory(key, now)
 
-        return total > self.limit
+    def get_count(self, key: str) -> int:
+        return self.get_counts(key)[0]
 
-    def _get_count_redis(self, key: str) -> int:
-        now_bucket = self._current_bucket()
-        buckets = [
-            self._bucket_key(key, now_bucket - i) for i in range(self.num_buckets + 1)
+    def remaining(self, key: str) -> int:
+        counts = self.get_counts(key)
+        return max(
+            0, min(limit - count for (limit, _), count in zip(self.limits, counts))
+        )
+
+    def _hit_redis(self, key: str, now: float) -> tuple[bool, list[int]]:
+        if self._script is None:
+            self._script = self.r.register_script(SLIDING_WINDOW_SCRIPT)
+
+        args = [now]
+        for limit, window in self.limits:
+            args.extend([limit, window])
+
+        result = self._script(
+            keys=self._get_window_keys(key, now), args=args, client=self.r
+        )
+        return bool(result[0]), [int(count) for count in result[1:]]
+
+    def _get_counts_redis(self, key: str, now: float) -> list[int]:
+        values = self.r.mget(self._get_window_keys(key, now))
+        return [
+            self._get_sliding_count(
+                int(values[i * 2] or 0), int(values[i * 2 + 1] or 0), window, now
+            )
+            for i, (_, window) in enumerate(self.limits)
         ]
-        counts = self.r.mget(buckets)
-        return sum(int(c) for c in counts if c)
-
-    def _is_limited_memory(self, key: str) -> bool:
-        now_bucket = self._current_bucket()
-
-        # Init storage
-        if key not in self._memory_store:
-            self._memory_store[key] = {}
-
-        store = self._memory_store[key]
-
-        # Increment bucket
-        store[now_bucket] = store.get(now_bucket, 0) + 1
-
-        # Drop expired buckets
-        min_bucket = now_bucket - self.num_buckets
-        expired = [b for b in store if b < min_bucket]
-        for b in expired:
-            del store[b]
-
-        # Count totals
-        total = sum(store.values())
-        return total > self.limit
-
-    def _get_count_memory(self, key: str) -> int:
-        now_bucket = self._current_bucket()
-        if key not in self._memory_store:
-            return 0
-
-        store = self._memory_store[key]
-        min_bucket = now_bucket - self.num_buckets
-
-        # Remove expired
-        expired = [b for b in store if b < min_bucket]
-        for b in expired:
-            del store[b]
 
-        return sum(store.values())
+    def _get_windows_memory(self, key: str, now: float) -> Optional[dict]:
+        entry = self._memory_store.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= now:
+            del self._memory_store[key]
+            return None
+
+        windows = entry[1]
+        for window, counters in windows.items():
+            window_index = int(now // window)
+            if counters[0] == window_index - 1:
+                counters[:] = [window_index, 0, counters[1]]
+            elif counters[0] != window_index:
+                counters[:] = [window_index, 0, 0]
+        return windows
+
+    def _hit_memory(self, key: str, now: float) -> tuple[bool, list[int]]:
+        with self._lock:
+            windows = self._get_windows_memory(key, now)
+            if windows is None:
+                windows = {
+                    window: [int(now // window), 0, 0] for _, window in self.limits
+                }
+
+            limited = False
+            counts = []
+            for limit, window in self.limits:
+                counters = windows[window]
+                counters[1] += 1
+                count = self._get_sliding_count(counters[1], counters[2], window, now)
+                limited = limited or count > limit
+                counts.append(count)
+
+            # Entries expire once their longest window can no longer count
+            self._memory_store[key] = (now + self.max_window * 2, windows)
+            self._memory_store.move_to_end(key)
+            self._evict_memory(now)
+
+            return limited, counts
+
+    def _get_counts_memory(self, key: str, now: float) -> list[int]:
+        with self._lock:
+            windows = self._get_windows_memory(key, now)
+            if windows is None:
+                return [0] * len(self.limits)
+
+            return [
+                self._get_sliding_count(
+                    windows[window][1], windows[window][2], window, now
+                )
+                for _, window in self.limits
+            ]
+
+    def _evict_memory(self, now: float):
+        # Entries are kept in last-hit order, so the expired ones come first
+        while self._memory_store:
+            key, (expires_at, _) = next(iter(self._memory_store.items()))
+            if expires_at > now and len(self._memory_store) <= self.max_memory_keys:
+                break
+            del self._memory_store[key]
@@ -11,14 +11,26 @@ Metrics collected:
 
 Attributes used: http.method, http.route, http.status_code
 
+The EventLoopMonitor additionally records:
+
+* webui.event_loop.lag (histogram, milliseconds)
+* webui.event_loop.block.duration (histogram, milliseconds; http.route)
+
 If you wish to add more attributes (e.g. user-agent) you can, but beware of
 high-cardinality label sets.
 """
 
 from __future__ import annotations
 
+import asyncio
+import inspect
+import linecache
+import sys
+import threading
 import time
-from typing import Dict, List, Sequence, Any
+from collections import Counter, deque
+from types import CodeType
+from typing import Callable, Dict, List, Optional, Sequence, Any
 from base64 import b64encode
 
 from fastapi import FastAPI, Request
@@ -31,7 +43,7 @@ from opentelemetry.exporter.otlp.proto.http.metric_exporter import (
     OTLPMetricExporter as OTLPHttpMetricExporter,
 )
 from opentelemetry.sdk.metrics import MeterProvider
-from opentelemetry.sdk.metrics.view import View
+from opentelemetry.sdk.metrics.view import ExplicitBucketHistogramAggregation, View
 from opentelemetry.sdk.metrics.export import (
     PeriodicExportingMetricReader,
 )
@@ -44,11 +56,17 @@ from open_webui.env import (
     OTEL_METRICS_BASIC_AUTH_PASSWORD,
     OTEL_METRICS_OTLP_SPAN_EXPORTER,
     OTEL_METRICS_EXPORTER_OTLP_INSECURE,
+    OPEN_WEBUI_DIR,
+    EVENT_LOOP_MONITOR_INTERVAL,
+    EVENT_LOOP_MONITOR_SLOW_THRESHOLD,
 )
 from open_webui.models.users import Users
 
 _EXPORT_INTERVAL_MILLIS = 10_000  # 10 seconds
 
+# Event loop lag is mostly sub-millisecond, blocks range up to seconds
+_EVENT_LOOP_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
 
 def _build_meter_provider(resource: Resource) -> MeterProvider:
     """Return a configured MeterProvider."""
@@ -101,6 +119,15 @@ def _build_meter_provider(resource: Resource) -> MeterProvider:
         View(
             instrument_name="webui.users.active.today",
         ),
+        View(
+            instrument_name="webui.event_loop.lag",
+            aggregation=ExplicitBucketHistogramAggregation(_EVENT_LOOP_BUCKETS_MS),
+        ),
+        View(
+            instrument_name="webui.event_loop.block.duration",
+            attribute_keys=["http.route"],
+            aggregation=ExplicitBucketHistogramAggregation(_EVENT_LOOP_BUCKETS_MS),
+        ),
     ]
 
     provider = MeterProvider(
@@ -204,3 +231,222 @@ def setup_metrics(app: FastAPI, resource: Resource) -> None:
 
             request_counter.add(1, attrs)
             duration_histogram.record(elapsed_ms, attrs)
+
+
+class EventLoopMonitor:
+    """
+    Samples event loop lag and records the call sites that block the loop.
+
+    A task on the loop sleeps for `interval` seconds and records how late it
+    wakes up. A watchdog thread checks that the task keeps waking up: once the
+    loop has been stuck for `slow_threshold` seconds, it captures the stack of
+    the loop thread, so the blocking call is caught while it is still running.
+    The block is recorded when the loop wakes up again, aggregated per call
+    site (the innermost Open WebUI frame) with the routes it was reached from.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.1,
+        slow_threshold: float = 0.1,
+        max_sites: int = 200,
+        max_samples: int = 1000,
+    ):
+        self.interval = interval
+        self.slow_threshold = slow_threshold
+        self.max_sites = max_sites
+
+        # Code objects of route and socket handlers, to name the route of a block
+        self._entrypoints: Dict[CodeType, str] = {}
+
+        self._lock = threading.Lock()
+        self._lags: deque = deque(maxlen=max_samples)
+        self._sites: Dict[str, dict] = {}
+        self._stats = {"samples": 0, "blocks": 0, "blocked_seconds_total": 0.0}
+
+        # perf_counter() at which the sampling task went to sleep
+        self._heartbeat: Optional[float] = None
+        # (heartbeat, site, route, stack) captured by the watchdog
+        self._block: Optional[tuple] = None
+
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+
+        meter = metrics.get_meter(__name__)
+        self._lag_histogram = meter.create_histogram(
+            name="webui.event_loop.lag",
+            description="Delay of the event loop in running a scheduled callback",
+            unit="ms",
+        )
+        self._block_histogram = meter.create_histogram(
+            name="webui.event_loop.block.duration",
+            description="Duration of calls blocking the event loop",
+            unit="ms",
+        )
+
+    def add_entrypoint(self, fn: Callable, name: str):
+        code = getattr(inspect.unwrap(fn), "__code__", None)
+        if code is not None:
+            self._entrypoints[code] = name
+
+    def start(self):
+        """Start monitoring the running event loop."""
+        if self._task is not None and not self._task.done():
+            return
+
+        self._loop_thread_id = threading.get_ident()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._sample())
+        self._thread = threading.Thread(
+            target=self._watch, name="event-loop-monitor", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _sample(self):
+        while True:
+            heartbeat = time.perf_counter()
+            self._heartbeat = heartbeat
+            await asyncio.sleep(self.interval)
+            lag = max(time.perf_counter() - heartbeat - self.interval, 0.0)
+
+            with self._lock:
+                block, self._block = self._block, None
+            if block is not None and block[0] != heartbeat:
+                block = None
+
+            self._record(lag, block)
+
+    def _watch(self):
+        poll = min(self.interval, self.slow_threshold) / 2
+        while not self._stopped.wait(poll):
+            heartbeat = self._heartbeat
+            if (
+                heartbeat is None
+                or time.perf_counter() - heartbeat < self.interval + self.slow_threshold
+            ):
+                continue
+
+            with self._lock:
+                if self._block is not None and self._block[0] == heartbeat:
+                    continue
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            block = (heartbeat, *self._capture(frame))
+            del frame
+
+            with self._lock:
+                self._block = block
+
+    def _capture(self, frame) -> tuple[str, Optional[str], list]:
+        """The call site, route and stack (innermost first) of a frame."""
+        stack = []
+        route = None
+        while frame is not None:
+            code = frame.f_code
+            stack.append((code.co_filename, frame.f_lineno, code.co_name))
+            if route is None:
+                route = self._entrypoints.get(code)
+            frame = frame.f_back
+
+        site = stack[0] if stack else ("<unknown>", 0, "<unknown>")
+        for filename, lineno, name in stack:
+            if filename.startswith(str(OPEN_WEBUI_DIR)) and filename != __file__:
+                site = (filename, lineno, name)
+                break
+
+        filename, lineno, name = site
+        if filename.startswith(str(OPEN_WEBUI_DIR)):
+            filename = filename[len(str(OPEN_WEBUI_DIR.parent)) + 1 :]
+        return f"{filename}:{lineno} in {name}", route, stack
+
+    def _record(self, lag: float, block: Optional[tuple]):
+        self._lag_histogram.record(lag * 1000)
+
+        with self._lock:
+            self._lags.append(lag)
+            self._stats["samples"] += 1
+            if block is None:
+                return
+
+            _, site, route, stack = block
+            route = route or "background"
+            self._stats["blocks"] += 1
+            self._stats["blocked_seconds_total"] += lag
+
+            entry = self._sites.get(site)
+            if entry is None:
+                if len(self._sites) >= self.max_sites:
+                    del self._sites[
+                        min(self._sites, key=lambda key: self._sites[key]["total"])
+                    ]
+                entry = self._sites[site] = {
+                    "count": 0,
+                    "total": 0.0,
+                    "max": 0.0,
+                    "routes": Counter(),
+                    "stack": stack,
+                }
+
+            entry["count"] += 1
+            entry["total"] += lag
+            entry["routes"][route] += 1
+            if lag >= entry["max"]:
+                entry["max"] = lag
+                entry["stack"] = stack
+
+        self._block_histogram.record(lag * 1000, {"http.route": route})
+
+    def get_stats(self, limit: int = 20) -> dict:
+        with self._lock:
+            lags = sorted(self._lags)
+            sites = sorted(
+                self._sites.items(), key=lambda item: item[1]["total"], reverse=True
+            )[:limit]
+            stats = dict(self._stats)
+
+        def percentile(p: float) -> float:
+            return lags[min(int(len(lags) * p), len(lags) - 1)] * 1000 if lags else 0.0
+
+        return {
+            **stats,
+            "running": self._task is not None and not self._task.done(),
+            "interval": self.interval,
+            "slow_threshold": self.slow_threshold,
+            "lag_ms": {
+                "p50": percentile(0.5),
+                "p99": percentile(0.99),
+                "max": lags[-1] * 1000 if lags else 0.0,
+            },
+            "sites": [
+                {
+                    "site": site,
+                    "count": entry["count"],
+                    "total_ms": entry["total"] * 1000,
+                    "max_ms": entry["max"] * 1000,
+                    "routes": dict(entry["routes"].most_common(5)),
+                    # Stack of the longest block, outermost frame first
+                    "stack": [
+                        f"{filename}:{lineno} in {name}: "
+                        f"{linecache.getline(filename, lineno).strip()}"
+                        for filename, lineno, name in reversed(entry["stack"][:30])
+                    ],
+                }
+                for site, entry in sites
+            ],
+        }
+
+
+EVENT_LOOP_MONITOR = EventLoopMonitor(
+    interval=EVENT_LOOP_MONITOR_INTERVAL,
+    slow_threshold=EVENT_LOOP_MONITOR_SLOW_THRESHOLD,
+)
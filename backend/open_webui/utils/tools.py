@@ -39,7 +39,7 @@ from open_webui.models.tools import Tools
 from open_webui.models.users import UserModel
 from open_webui.models.groups import Groups
 from open_webui.models.access_grants import AccessGrants
-from open_webui.utils.plugin import load_tool_module_by_id
+from open_webui.utils.plugin import get_tool_cache_entry
 from open_webui.utils.access_control import has_access
 from open_webui.config import BYPASS_ADMIN_ACCESS_CONTROL
 from open_webui.env import (
@@ -151,13 +151,45 @@ def has_tool_server_access(
         return True
 
     if user_group_ids is None:
-        user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user.id)}
+        user_group_ids = Groups.get_group_ids_by_member_id(user.id)
 
     server_config = server_connection.get("config", {})
     access_grants = server_config.get("access_grants", [])
     return has_access(user.id, "read", access_grants, user_group_ids)
 
 
+def compile_tool_specs(module, specs: list[dict]) -> list[dict]:
+    """
+    Turn the stored specs of a tool into the specs sent to the model. Depends
+    only on the tool, so the result is cached with the tool module.
+    """
+    compiled = []
+    for spec in copy.deepcopy(specs):
+        # TODO: Fix hack for OpenAI API
+        # Some times breaks OpenAI but others don't. Leaving the comment
+        for val in spec.get("parameters", {}).get("properties", {}).values():
+            if val.get("type") == "str":
+                val["type"] = "string"
+
+        # Remove internal reserved parameters (e.g. __id__, __user__)
+        spec["parameters"]["properties"] = {
+            key: val
+            for key, val in spec["parameters"]["properties"].items()
+            if not key.startswith("__")
+        }
+
+        # TODO: Support Pydantic models as parameters
+        function_name = spec["name"]
+        doc = getattr(module, function_name).__doc__
+        if doc and doc.strip() != "":
+            spec["description"] = re.split(":(param|return)", doc, 1)[0]
+        else:
+            spec["description"] = function_name
+
+        compiled.append(spec)
+    return compiled
+
+
 async def get_tools(
     request: Request, tool_ids: list[str], user: UserModel, extra_params: dict
 ) -> dict[str, dict]:
@@ -165,30 +197,47 @@ async def get_tools(
     tools_dict = {}
 
     # Get user's group memberships for access control checks
-    user_group_ids = {group.id for group in Groups.get_groups_by_member_id(user.id)}
+    user_group_ids = Groups.get_group_ids_by_member_id(user.id)
 
+    # Modules, valves and specs of local tools, cached until the tool changes
+    tool_entries = {}
     for tool_id in tool_ids:
-        tool = Tools.get_tool_by_id(tool_id)
-        if tool:
-            # Check access control for local tools
-            if (
-                not (user.role == "admin" and BYPASS_ADMIN_ACCESS_CONTROL)
-                and tool.user_id != user.id
-                and not AccessGrants.has_access(
-                    user_id=user.id,
-                    resource_type="tool",
-                    resource_id=tool.id,
-                    permission="read",
-                    user_group_ids=user_group_ids,
-                )
-            ):
+        if tool_id.startswith("server:"):
+            continue
+        try:
+            tool_entries[tool_id] = get_tool_cache_entry(request, tool_id)
+        except Exception as e:
+            log.warning(f"Failed to load tool {tool_id}: {e}")
+
+    # Check access control for local tools, in one query
+    if user.role == "admin" and BYPASS_ADMIN_ACCESS_CONTROL:
+        accessible_tool_ids = set(tool_entries)
+    else:
+        accessible_tool_ids = {
+            tool_id
+            for tool_id, entry in tool_entries.items()
+            if entry.user_id == user.id
+        }
+        accessible_tool_ids |= AccessGrants.get_accessible_resource_ids(
+            user_id=user.id,
+            resource_type="tool",
+            resource_ids=[
+                tool_id
+                for tool_id in tool_entries
+                if tool_id not in accessible_tool_ids
+            ],
+            permission="read",
+            user_group_ids=user_group_ids,
+        )
+
+    for tool_id in tool_ids:
+        entry = tool_entries.get(tool_id)
+        if entry:
+            if tool_id not in accessible_tool_ids:
                 log.warning(f"Access denied to tool {tool_id} for user {user.id}")
                 continue
 
-            module = request.app.state.TOOLS.get(tool_id, None)
-            if module is None:
-                module, _ = load_tool_module_by_id(tool_id)
-                request.app.state.TOOLS[tool_id] = module
+            module = request.app.state.TOOLS[tool_id]
 
             __user__ = {
                 **extra_params["__user__"],
@@ -196,27 +245,16 @@ async def get_tools(
 
             # Set valves for the tool
             if hasattr(module, "valves") and hasattr(module, "Valves"):
-                valves = Tools.get_tool_valves_by_id(tool_id) or {}
-                module.valves = module.Valves(**valves)
+                module.valves = module.Valves(**(entry.valves or {}))
             if hasattr(module, "UserValves"):
                 __user__["valves"] = module.UserValves(  # type: ignore
-                    **Tools.get_user_valves_by_id_and_user_id(tool_id, user.id)
+                    **(Tools.get_user_valves_by_id_and_user_id(tool_id, user.id) or {})
                 )
 
-            for spec in tool.specs:
-                # TODO: Fix hack for OpenAI API
-                # Some times breaks OpenAI but others don't. Leaving the comment
-                for val in spec.get("parameters", {}).get("properties", {}).values():
-                    if val.get("type") == "str":
-                        val["type"] = "string"
-
-                # Remove internal reserved parameters (e.g. __id__, __user__)
-                spec["parameters"]["properties"] = {
-                    key: val
-                    for key, val in spec["parameters"]["properties"].items()
-                    if not key.startswith("__")
-                }
+            if "specs" not in entry.compiled:
+                entry.compiled["specs"] = compile_tool_specs(module, entry.specs)
 
+            for spec in entry.compiled["specs"]:
                 # convert to function that takes only model params and inserts custom params
                 function_name = spec["name"]
                 tool_function = getattr(module, function_name)
@@ -229,17 +267,10 @@ async def get_tools(
                     },
                 )
 
-                # TODO: Support Pydantic models as parameters
-                if callable.__doc__ and callable.__doc__.strip() != "":
-                    s = re.split(":(param|return)", callable.__doc__, 1)
-                    spec["description"] = s[0]
-                else:
-                    spec["description"] = function_name
-
                 tool_dict = {
                     "tool_id": tool_id,
                     "callable": callable,
-                    "spec": spec,
+                    "spec": {**spec},
                     # Misc info
                     "metadata": {
                         "file_handler": hasattr(module, "file_handler")
@@ -448,6 +479,7 @@ def get_builtin_tools(
                 get_story_spec_template,
                 generate_presentation,
             )
+
             builtin_functions.extend(
                 [
                     get_available_templates,
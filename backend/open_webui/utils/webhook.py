@@ -1,53 +1,71 @@
+import asyncio
 import json
 import logging
+import random
+import time
+from typing import Iterable, Optional
+
 import aiohttp
+from opentelemetry import metrics
 
 from open_webui.config import WEBUI_FAVICON_URL
-from open_webui.env import AIOHTTP_CLIENT_TIMEOUT, VERSION
+from open_webui.env import (
+    AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT,
+    AIOHTTP_CLIENT_SESSION_SSL,
+    AIOHTTP_CLIENT_TIMEOUT,
+    NOTIFICATION_WEBHOOK_CONCURRENCY,
+    NOTIFICATION_WEBHOOK_MAX_RETRIES,
+    NOTIFICATION_WEBHOOK_TIMEOUT,
+    VERSION,
+)
 
 log = logging.getLogger(__name__)
 
 
+def get_webhook_payload(name: str, url: str, message: str, event_data: dict) -> dict:
+    payload = {}
+
+    # Slack and Google Chat Webhooks
+    if "https://hooks.slack.com" in url or "https://chat.googleapis.com" in url:
+        payload["text"] = message
+    # Discord Webhooks
+    elif "https://discord.com/api/webhooks" in url:
+        payload["content"] = (
+            message if len(message) < 2000 else f"{message[: 2000 - 20]}... (truncated)"
+        )
+    # Microsoft Teams Webhooks
+    elif "webhook.office.com" in url:
+        action = event_data.get("action", "undefined")
+        facts = [
+            {"name": name, "value": value}
+            for name, value in json.loads(event_data.get("user", {})).items()
+        ]
+        payload = {
+            "@type": "MessageCard",
+            "@context": "http://schema.org/extensions",
+            "themeColor": "0076D7",
+            "summary": message,
+            "sections": [
+                {
+                    "activityTitle": message,
+                    "activitySubtitle": f"{name} ({VERSION}) - {action}",
+                    "activityImage": WEBUI_FAVICON_URL,
+                    "facts": facts,
+                    "markdown": True,
+                }
+            ],
+        }
+    # Default Payload
+    else:
+        payload = {**event_data}
+
+    return payload
+
+
 async def post_webhook(name: str, url: str, message: str, event_data: dict) -> bool:
     try:
         log.debug(f"post_webhook: {url}, {message}, {event_data}")
-        payload = {}
-
-        # Slack and Google Chat Webhooks
-        if "https://hooks.slack.com" in url or "https://chat.googleapis.com" in url:
-            payload["text"] = message
-        # Discord Webhooks
-        elif "https://discord.com/api/webhooks" in url:
-            payload["content"] = (
-                message
-                if len(message) < 2000
-                else f"{message[: 2000 - 20]}... (truncated)"
-            )
-        # Microsoft Teams Webhooks
-        elif "webhook.office.com" in url:
-            action = event_data.get("action", "undefined")
-            facts = [
-                {"name": name, "value": value}
-                for name, value in json.loads(event_data.get("user", {})).items()
-            ]
-            payload = {
-                "@type": "MessageCard",
-                "@context": "http://schema.org/extensions",
-                "themeColor": "0076D7",
-                "summary": message,
-                "sections": [
-                    {
-                        "activityTitle": message,
-                        "activitySubtitle": f"{name} ({VERSION}) - {action}",
-                        "activityImage": WEBUI_FAVICON_URL,
-                        "facts": facts,
-                        "markdown": True,
-                    }
-                ],
-            }
-        # Default Payload
-        else:
-            payload = {**event_data}
+        payload = get_webhook_payload(name, url, message, event_data)
 
         log.debug(f"payload: {payload}")
         async with aiohttp.ClientSession(
@@ -62,3 +80,156 @@ async def post_webhook(name: str, url: str, message: str, event_data: dict) -> b
     except Exception as e:
         log.exception(e)
         return False
+
+
+class WebhookDispatcher:
+    """
+    Posts notification webhooks in the background, so a message sent to a
+    large channel does not wait on its members' webhooks one after the other.
+
+    Each dispatch posts once per distinct URL, at most `concurrency` posts run
+    at a time on a keep-alive session of the dispatcher's own (kept apart from
+    the upstream model API pools), and posts failing with a connection error,
+    a timeout, 429 or 5xx are retried with exponential backoff and jitter.
+    """
+
+    def __init__(
+        self,
+        concurrency: int,
+        max_retries: int,
+        timeout: float,
+        backoff: float = 1.0,
+    ):
+        self.concurrency = max(concurrency, 1)
+        self.max_retries = max(max_retries, 0)
+        self.timeout = timeout
+        self.backoff = backoff
+
+        self.tasks: set[asyncio.Task] = set()
+        self.stats = {"dispatched": 0, "sent": 0, "failed": 0, "retried": 0}
+        self.semaphore: Optional[asyncio.Semaphore] = None
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+        meter = metrics.get_meter(__name__)
+        self._delivery_counter = meter.create_counter(
+            name="webui.notifications.webhook.deliveries",
+            description="Notification webhook deliveries by outcome",
+            unit="{delivery}",
+        )
+        self._delivery_histogram = meter.create_histogram(
+            name="webui.notifications.webhook.duration",
+            description="Time from dispatch to the outcome of a notification webhook, retries included",
+            unit="ms",
+        )
+
+    def dispatch(
+        self, name: str, urls: Iterable[str], message: str, event_data: dict
+    ) -> int:
+        """
+        Schedule a post of the message to each distinct URL and return the
+        number of posts scheduled. Must be called from the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:
+            # Semaphores and sessions are bound to the loop that uses them
+            # (e.g. in tests)
+            self.semaphore = asyncio.Semaphore(self.concurrency)
+            self.session = None
+            self.loop = loop
+
+        urls = list(dict.fromkeys(url for url in urls if url))
+        for url in urls:
+            task = asyncio.create_task(self._deliver(name, url, message, event_data))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+        self.stats["dispatched"] += len(urls)
+        return len(urls)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.concurrency,
+                    keepalive_timeout=AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT,
+                    ssl=AIOHTTP_CLIENT_SESSION_SSL,
+                ),
+                cookie_jar=aiohttp.DummyCookieJar(),
+                trust_env=True,
+            )
+        return self.session
+
+    async def _post(self, url: str, payload: dict) -> int:
+        async with self._get_session().post(
+            url, json=payload, timeout=aiohttp.ClientTimeout(total=self.timeout)
+        ) as r:
+            await r.read()
+            return r.status
+
+    async def _deliver(self, name: str, url: str, message: str, event_data: dict):
+        start = time.perf_counter()
+        outcome = "failed"
+
+        try:
+            payload = get_webhook_payload(name, url, message, event_data)
+
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    self.stats["retried"] += 1
+                    delay = self.backoff * 2 ** (attempt - 1)
+                    await asyncio.sleep(delay * (0.5 + random.random()))
+
+                async with self.semaphore:
+                    try:
+                        status = await self._post(url, payload)
+                    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                        log.debug(f"Webhook post to {url} failed: {e!r}")
+                        continue
+
+                if status < 400:
+                    outcome = "sent"
+                    break
+                log.debug(f"Webhook post to {url} returned {status}")
+                if status != 429 and status < 500:
+                    break
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        except Exception as e:
+            log.warning(f"Webhook post to {url} failed: {e!r}")
+        finally:
+            if outcome != "cancelled":
+                self.stats[outcome] += 1
+            self._delivery_counter.add(1, {"outcome": outcome})
+            self._delivery_histogram.record(
+                (time.perf_counter() - start) * 1000, {"outcome": outcome}
+            )
+
+    def get_stats(self) -> dict:
+        return {
+            **self.stats,
+            "pending": len(self.tasks),
+            "concurrency": self.concurrency,
+        }
+
+    async def close(self):
+        """Cancel the posts still pending and close the session, e.g. at shutdown."""
+        tasks = list(self.tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        if self.session is not None:
+            try:
+                await self.session.close()
+            except Exception as e:
+                log.debug(f"Failed to close the webhook session: {e}")
+            self.session = None
+
+
+WEBHOOK_DISPATCHER = WebhookDispatcher(
+    concurrency=NOTIFICATION_WEBHOOK_CONCURRENCY,
+    max_retries=NOTIFICATION_WEBHOOK_MAX_RETRIES,
+    timeout=NOTIFICATION_WEBHOOK_TIMEOUT,
+)
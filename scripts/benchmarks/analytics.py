@@ -0,0 +1,128 @@
+"""
+Benchmark of the analytics dashboard queries on a large message history.
+
+    python scripts/benchmarks/analytics.py [--messages N] [--days N] [--repeat N]
+
+Creates a throwaway SQLite database (DATA_DIR is set to a temporary directory)
+holding N chat messages spread over the last days, then times each dashboard
+query for the whole range reading chat_message only, and again once the
+messages were compacted into the hourly rollups.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ["DATA_DIR"] = tempfile.mkdtemp()
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend"))
+
+import open_webui.config  # noqa: F401 (runs the migrations)
+from open_webui.internal.db import get_db
+from open_webui.models.chat_messages import ChatMessage, ChatMessages
+
+USERS = [f"user-{i}" for i in range(50)]
+MODELS = [f"model-{i}" for i in range(10)]
+
+
+def populate(count: int, days: int):
+    now = int(time.time())
+    rows = []
+    for i in range(count):
+        created_at = now - random.randint(0, days * 86400)
+        assistant = i % 2 == 1
+        rows.append(
+            {
+                "id": f"chat-{i // 20}-{i}",
+                "chat_id": f"chat-{i // 20}",
+                "user_id": random.choice(USERS),
+                "role": "assistant" if assistant else "user",
+                "model_id": random.choice(MODELS) if assistant else None,
+                "content": "lorem ipsum",
+                "usage": (
+                    {
+                        "input_tokens": random.randint(10, 2000),
+                        "output_tokens": random.randint(10, 2000),
+                    }
+                    if assistant
+                    else None
+                ),
+                "done": True,
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+        )
+
+    with get_db() as db:
+        for i in range(0, len(rows), 10000):
+            db.execute(ChatMessage.__table__.insert(), rows[i : i + 10000])
+        db.commit()
+
+
+def run_all(start_date: int, end_date: int, repeat: int) -> dict:
+    queries = {
+        "messages by model": lambda: ChatMessages.get_message_count_by_model(
+            start_date, end_date
+        ),
+        "messages by user": lambda: ChatMessages.get_message_count_by_user(
+            start_date, end_date
+        ),
+        "tokens by model": lambda: ChatMessages.get_token_usage_by_model(
+            start_date, end_date
+        ),
+        "tokens by user": lambda: ChatMessages.get_token_usage_by_user(
+            start_date, end_date
+        ),
+        "daily by model": lambda: ChatMessages.get_daily_message_counts_by_model(
+            start_date, end_date
+        ),
+        "hourly by model": lambda: ChatMessages.get_hourly_message_counts_by_model(
+            start_date, end_date
+        ),
+    }
+
+    results = {}
+    timings = {}
+    for name, fn in queries.items():
+        results[name] = fn()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        timings[name] = (time.perf_counter() - start) / repeat
+    return results, timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=500000)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    random.seed(0)
+    populate(args.messages, args.days)
+    end_date = int(time.time())
+    start_date = end_date - args.days * 86400
+
+    raw, raw_timings = run_all(start_date, end_date, args.repeat)
+
+    start = time.perf_counter()
+    rows = ChatMessages.compact_rollups()
+    print(f"compaction: {rows} rollup rows in {time.perf_counter() - start:.2f} s")
+
+    rollup, rollup_timings = run_all(start_date, end_date, args.repeat)
+    assert rollup == raw
+
+    print(f"{'query':<24} {'chat_message':>14} {'rollups':>14}")
+    for name in raw_timings:
+        print(
+            f"{name:<24} {raw_timings[name] * 1e3:>11.2f} ms"
+            f" {rollup_timings[name] * 1e3:>11.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""
+Benchmark of the channel sidebar and message list queries.
+
+    python scripts/benchmarks/channels.py [--channels N] [--messages N] [--repeat N]
+
+Creates a throwaway SQLite database (DATA_DIR is set to a temporary directory)
+with a user in N group channels and DMs, each holding messages with thread
+replies and reactions, then counts the queries and times:
+
+- the last message, unread count and DM members looked up per channel (the
+  previous sidebar) against the batched lookups
+- the reply counts and reactions of a message page looked up per message
+  against the batched lookups
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+os.environ["DATA_DIR"] = tempfile.mkdtemp()
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend"))
+
+import open_webui.config  # noqa: F401 (runs the migrations)
+from sqlalchemy import event
+from open_webui.internal.db import engine, get_db
+from open_webui.models.channels import Channel, ChannelMember, Channels
+from open_webui.models.messages import Message, MessageReaction, Messages
+from open_webui.models.users import User, Users
+
+USER_ID = "benchmark-user"
+
+query_count = 0
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def count_query(*args):
+    global query_count
+    query_count += 1
+
+
+def populate(channel_count: int, message_count: int):
+    now = time.time_ns()
+    users = [USER_ID] + [f"user-{i}" for i in range(20)]
+    channels, members, messages, reactions = [], [], [], []
+
+    for i in range(channel_count):
+        channel_id = str(uuid.uuid4())
+        dm = i % 3 == 0
+        channels.append(
+            {
+                "id": channel_id,
+                "user_id": USER_ID,
+                "type": "dm" if dm else "group",
+                "name": f"channel-{i}",
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+        for user_id in [USER_ID, random.choice(users[1:])]:
+            members.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "channel_id": channel_id,
+                    "user_id": user_id,
+                    "is_active": True,
+                    "is_channel_muted": False,
+                    "is_channel_pinned": False,
+                    "last_read_at": now - random.randint(0, message_count) * 10**9,
+                    "joined_at": now,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+
+        for j in range(message_count):
+            message_id = str(uuid.uuid4())
+            created_at = now - j * 10**9
+            messages.append(
+                {
+                    "id": message_id,
+                    "user_id": random.choice(users),
+                    "channel_id": channel_id,
+                    "parent_id": None,
+                    "is_pinned": False,
+                    "content": "hello",
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                }
+            )
+            for k in range(random.randint(0, 3)):
+                messages.append(
+                    {
+                        "id": str(uuid.uuid4()),
+                        "user_id": random.choice(users),
+                        "channel_id": channel_id,
+                        "parent_id": message_id,
+                        "is_pinned": False,
+                        "content": "reply",
+                        "created_at": created_at + k + 1,
+                        "updated_at": created_at + k + 1,
+                    }
+                )
+            for user_id in random.sample(users, random.randint(0, 3)):
+                reactions.append(
+                    {
+                        "id": str(uuid.uuid4()),
+                        "user_id": user_id,
+                        "message_id": message_id,
+                        "name": random.choice(["+1", "heart"]),
+                        "created_at": created_at,
+                    }
+                )
+
+    with get_db() as db:
+        db.execute(
+            User.__table__.insert(),
+            [
+                {
+                    "id": user_id,
+                    "name": user_id,
+                    "email": f"{user_id}@example.com",
+                    "role": "user",
+                    "profile_image_url": "",
+                    "last_active_at": 0,
+                    "created_at": 0,
+                    "updated_at": 0,
+                }
+                for user_id in users
+            ],
+        )
+        db.execute(Channel.__table__.insert(), channels)
+        db.execute(ChannelMember.__table__.insert(), members)
+        db.execute(Message.__table__.insert(), messages)
+        db.execute(MessageReaction.__table__.insert(), reactions)
+        db.commit()
+
+
+def sidebar_per_channel(channels):
+    result = {}
+    for channel in channels:
+        last_message = Messages.get_last_message_by_channel_id(channel.id)
+        member = Channels.get_member_by_channel_and_user_id(channel.id, USER_ID)
+        unread_count = (
+            Messages.get_unread_message_count(channel.id, USER_ID, member.last_read_at)
+            if member
+            else 0
+        )
+        user_ids = None
+        if channel.type == "dm":
+            user_ids = sorted(
+                m.user_id for m in Channels.get_members_by_channel_id(channel.id)
+            )
+            Users.get_users_by_user_ids(user_ids)
+        result[channel.id] = (
+            last_message.created_at if last_message else None,
+            unread_count,
+            user_ids,
+        )
+    return result
+
+
+def sidebar_batched(channels):
+    channel_ids = [channel.id for channel in channels]
+    last_message_at = Messages.get_last_message_at_by_channel_ids(channel_ids)
+    unread_counts = Messages.get_unread_message_counts_by_channel_ids(
+        channel_ids, USER_ID
+    )
+    dm_members = Channels.get_members_by_channel_ids(
+        [channel.id for channel in channels if channel.type == "dm"]
+    )
+    Users.get_users_by_user_ids(
+        list({m.user_id for members in dm_members.values() for m in members})
+    )
+    return {
+        channel.id: (
+            last_message_at.get(channel.id),
+            unread_counts.get(channel.id, 0),
+            (
+                sorted(m.user_id for m in dm_members[channel.id])
+                if channel.type == "dm"
+                else None
+            ),
+        )
+        for channel in channels
+    }
+
+
+def page_per_message(message_ids):
+    result = {}
+    for message_id in message_ids:
+        replies = Messages.get_thread_replies_by_message_id(message_id)
+        result[message_id] = (
+            len(replies),
+            replies[0].created_at if replies else None,
+            Messages.get_reactions_by_message_id(message_id),
+        )
+    return result
+
+
+def page_batched(message_ids):
+    stats = Messages.get_thread_reply_stats_by_message_ids(message_ids)
+    reactions = Messages.get_reactions_by_message_ids(message_ids)
+    return {
+        message_id: (*stats.get(message_id, (0, None)), reactions[message_id])
+        for message_id in message_ids
+    }
+
+
+def run(name: str, fn, repeat: int):
+    global query_count
+    fn()
+    query_count = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{name:<32} {elapsed * 1e3:>10.2f} ms {query_count // repeat:>6} queries")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--channels", type=int, default=150)
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    random.seed(0)
+    populate(args.channels, args.messages)
+
+    channels = run(
+        "channel list",
+        lambda: Channels.get_channels_by_user_id(USER_ID),
+        args.repeat,
+    )
+    previous = run(
+        "sidebar, per channel", lambda: sidebar_per_channel(channels), args.repeat
+    )
+    batched = run("sidebar, batched", lambda: sidebar_batched(channels), args.repeat)
+    assert batched == previous
+
+    channel_id = channels[0].id
+    page = run(
+        "message page",
+        lambda: Messages.get_messages_by_channel_id(channel_id, 0, 50),
+        args.repeat,
+    )
+    message_ids = [message.id for message in page]
+    previous = run(
+        "page details, per message",
+        lambda: page_per_message(message_ids),
+        args.repeat,
+    )
+    batched = run(
+        "page details, batched", lambda: page_batched(message_ids), args.repeat
+    )
+    assert batched == previous
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Benchmark of the sidebar chat list queries on a large account.
+
+    python scripts/benchmarks/chat_list.py [--chats N] [--repeat N]
+
+Creates a throwaway SQLite database (DATA_DIR is set to a temporary directory)
+holding N chats for one user, then times:
+
+- loading a page as full rows validated into ChatModel (the previous pinned,
+  archived and search lists) against the projected title list
+- a deep page selected with OFFSET against the same page selected with the
+  (updated_at, id) cursor
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+os.environ["DATA_DIR"] = tempfile.mkdtemp()
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend"))
+
+import open_webui.config  # noqa: F401 (runs the migrations)
+from open_webui.internal.db import get_db
+from open_webui.models.chats import Chat, ChatModel, Chats
+
+USER_ID = "benchmark-user"
+
+
+def populate(count: int):
+    now = int(time.time())
+    history = {
+        "messages": {
+            f"m{i}": {
+                "id": f"m{i}",
+                "parentId": f"m{i - 1}" if i else None,
+                "role": "user" if i % 2 == 0 else "assistant",
+                "content": "lorem ipsum dolor sit amet " * 40,
+            }
+            for i in range(20)
+        },
+        "currentId": "m19",
+    }
+    chat = json.dumps({"title": "Chat", "history": history})
+
+    with get_db() as db:
+        db.execute(
+            Chat.__table__.insert(),
+            [
+                {
+                    "id": str(uuid.uuid4()),
+                    "user_id": USER_ID,
+                    "title": f"Chat {i}",
+                    "chat": json.loads(chat),
+                    "meta": {},
+                    # Some chats share a timestamp, as after an import
+                    "created_at": now - i // 3,
+                    "updated_at": now - i // 3,
+                    "archived": False,
+                    "pinned": False,
+                }
+                for i in range(count)
+            ],
+        )
+        db.commit()
+
+
+def full_rows_page(skip: int, limit: int):
+    with get_db() as db:
+        rows = (
+            db.query(Chat)
+            .filter_by(user_id=USER_ID, archived=False)
+            .order_by(Chat.updated_at.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+        return [ChatModel.model_validate(row) for row in rows]
+
+
+def run(name: str, fn, repeat: int):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{name:<40} {elapsed * 1e3:>10.2f} ms/page")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chats", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    populate(args.chats)
+    limit = 60
+    skip = (args.chats // limit - 1) * limit
+
+    run("first page, full rows", lambda: full_rows_page(0, limit), args.repeat)
+    run(
+        "first page, projected",
+        lambda: Chats.get_chat_title_id_list_by_user_id(USER_ID, limit=limit),
+        args.repeat,
+    )
+
+    offset_page = run(
+        f"page at offset {skip}, OFFSET",
+        lambda: Chats.get_chat_title_id_list_by_user_id(
+            USER_ID, skip=skip, limit=limit
+        ),
+        args.repeat,
+    )
+    previous = Chats.get_chat_title_id_list_by_user_id(USER_ID, skip=skip - 1, limit=1)[
+        0
+    ]
+    cursor_page = run(
+        f"page at offset {skip}, cursor",
+        lambda: Chats.get_chat_title_id_list_by_user_id(
+            USER_ID, cursor=(previous.updated_at, previous.id), limit=limit
+        ),
+        args.repeat,
+    )
+    assert [chat.id for chat in cursor_page] == [chat.id for chat in offset_page]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Event loop lag caused by database calls made from async code.
+
+    python scripts/benchmarks/db_event_loop.py [--async] [--requests N] [--concurrency N]
+
+Creates a throwaway SQLite database (DATA_DIR is set to a temporary directory)
+with chats of a few hundred messages, then loads and saves them from concurrent
+coroutines, as chat completions do, while a ticker measures how late the event
+loop wakes it up:
+
+- calling the table methods directly on the event loop
+- through run_db (the DB_EXECUTOR thread pool, or with --async the aiosqlite
+  engine, which needs the aiosqlite package)
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ["DATA_DIR"] = tempfile.mkdtemp()
+if "--async" in sys.argv:
+    os.environ["DATABASE_ENABLE_ASYNC"] = "true"
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend"))
+
+import open_webui.config  # noqa: F401 (runs the migrations)
+from open_webui.internal.db import async_engine
+from open_webui.models.chats import AsyncChats, ChatForm, Chats
+
+USER_ID = "benchmark-user"
+TICK = 0.001
+
+
+def populate(count: int, messages: int = 300) -> list[str]:
+    history = {
+        "messages": {
+            f"m{i}": {
+                "id": f"m{i}",
+                "parentId": f"m{i - 1}" if i else None,
+                "childrenIds": [f"m{i + 1}"] if i < messages - 1 else [],
+                "role": "user" if i % 2 == 0 else "assistant",
+                "content": "lorem ipsum dolor sit amet " * 40,
+            }
+            for i in range(messages)
+        },
+        "currentId": f"m{messages - 1}",
+    }
+    return [
+        Chats.insert_new_chat(
+            USER_ID, ChatForm(chat={"title": f"Chat {i}", "history": history})
+        ).id
+        for i in range(count)
+    ]
+
+
+async def measure_lag(stop: asyncio.Event) -> list[float]:
+    lags = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - start - TICK)
+    return lags
+
+
+async def direct(chat_id: str):
+    chat = Chats.get_chat_by_id_and_user_id(chat_id, USER_ID)
+    Chats.upsert_message_to_chat_by_id_and_message_id(
+        chat_id, "m0", {"content": chat.title}
+    )
+
+
+async def bridged(chat_id: str):
+    chat = await AsyncChats.get_chat_by_id_and_user_id(chat_id, USER_ID)
+    await AsyncChats.upsert_message_to_chat_by_id_and_message_id(
+        chat_id, "m0", {"content": chat.title}
+    )
+
+
+async def run(name: str, fn, chat_ids: list[str], requests: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def request(i: int):
+        async with semaphore:
+            await fn(chat_ids[i % len(chat_ids)])
+
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(measure_lag(stop))
+    start = time.perf_counter()
+    await asyncio.gather(*[request(i) for i in range(requests)])
+    elapsed = time.perf_counter() - start
+    stop.set()
+    lags = sorted(await ticker)
+
+    print(
+        f"{name:<24} {elapsed * 1e3:>8.0f} ms total "
+        f"lag p50 {statistics.median(lags) * 1e3:>7.2f} ms "
+        f"p99 {lags[int(len(lags) * 0.99)] * 1e3:>7.2f} ms "
+        f"max {lags[-1] * 1e3:>7.2f} ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--async", dest="use_async", action="store_true")
+    parser.add_argument("--chats", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.use_async and async_engine is None:
+        sys.exit("The async engine is unavailable, is aiosqlite installed?")
+
+    chat_ids = populate(args.chats)
+    bridge = "run_db, async engine" if async_engine else "run_db, thread pool"
+    for name, fn in [("direct", direct), (bridge, bridged)]:
+        await run(name, fn, chat_ids, args.requests, args.concurrency)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
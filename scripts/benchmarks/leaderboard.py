@@ -0,0 +1,133 @@
+"""
+Benchmark of the evaluation leaderboard on a large feedback history.
+
+    python scripts/benchmarks/leaderboard.py [--feedbacks N] [--repeat N]
+
+Creates a throwaway SQLite database (DATA_DIR is set to a temporary directory)
+holding N rated feedbacks, then times:
+
+- the previous leaderboard, loading every feedback and replaying the Elo
+  ratings on each request, against reading the stored ratings
+- building the match arrays for a search query, cold and cached
+- replaying the ratings with per feedback weights, as for a search query
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+os.environ["DATA_DIR"] = tempfile.mkdtemp()
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend"))
+
+import open_webui.config  # noqa: F401 (runs the migrations)
+from open_webui.internal.db import get_db
+from open_webui.models.feedbacks import Feedback, Feedbacks
+from open_webui.models.leaderboard import Leaderboard
+
+MODELS = [f"model-{i}" for i in range(20)]
+TAGS = [f"tag-{i}" for i in range(200)]
+
+
+def populate(count: int):
+    now = int(time.time())
+    rows = []
+    for i in range(count):
+        model_id, opponent_id = random.sample(MODELS, 2)
+        rows.append(
+            {
+                "id": str(uuid.uuid4()),
+                "user_id": "benchmark-user",
+                "version": 0,
+                "type": "rating",
+                "data": {
+                    "model_id": model_id,
+                    "sibling_model_ids": [opponent_id],
+                    "rating": random.choice([1, -1]),
+                    "tags": random.sample(TAGS, 3),
+                },
+                "meta": {},
+                "snapshot": None,
+                "created_at": now - count + i,
+                "updated_at": now - count + i,
+            }
+        )
+
+    with get_db() as db:
+        db.execute(Feedback.__table__.insert(), rows)
+        db.commit()
+
+    Feedbacks.recompute_leaderboard()
+
+
+def legacy_leaderboard():
+    feedbacks = Feedbacks.get_feedbacks_for_leaderboard()
+
+    stats = {}
+    tags = {}
+    for feedback in feedbacks:
+        data = feedback.data or {}
+        model_id = data.get("model_id")
+        if model_id:
+            model_tags = tags.setdefault(model_id, {})
+            for tag in data.get("tags", []):
+                model_tags[tag] = model_tags.get(tag, 0) + 1
+
+        rating = str(data.get("rating", ""))
+        if not model_id or rating not in ("1", "-1"):
+            continue
+        for opponent_id in data.get("sibling_model_ids") or []:
+            model = stats.setdefault(model_id, {"rating": 1000.0, "won": 0, "lost": 0})
+            opponent = stats.setdefault(
+                opponent_id, {"rating": 1000.0, "won": 0, "lost": 0}
+            )
+            expected = 1 / (1 + 10 ** ((opponent["rating"] - model["rating"]) / 400))
+            delta = 32 * ((1 if rating == "1" else 0) - expected)
+            model["rating"] += delta
+            opponent["rating"] -= delta
+            model["won" if rating == "1" else "lost"] += 1
+            opponent["lost" if rating == "1" else "won"] += 1
+
+    return stats, tags
+
+
+def run(name: str, fn, repeat: int, warm: bool = True):
+    if warm:
+        fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{name:<40} {elapsed * 1e3:>10.2f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--feedbacks", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    import numpy as np
+
+    random.seed(0)
+    populate(args.feedbacks)
+
+    legacy, _ = run("full replay (previous)", legacy_leaderboard, args.repeat)
+    ratings = run("stored ratings", Leaderboard.get_ratings, args.repeat)
+    for rating in ratings:
+        assert abs(rating.rating - legacy[rating.model_id]["rating"]) < 1e-6
+
+    run("match arrays, cold", Feedbacks.get_leaderboard_matches, 1, warm=False)
+    matches = run("match arrays, cached", Feedbacks.get_leaderboard_matches, 10)
+
+    weights = np.random.default_rng(0).random(matches.feedback_count)
+    run("weighted replay", lambda: matches.replay(weights), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Microbenchmark of RateLimiter checks.
+
+    python scripts/benchmarks/rate_limit.py [--iterations N]
+
+Times is_limited() with the in-memory fallback and, when REDIS_URL is set,
+against Redis, next to the previous bucketed implementation (INCR, EXPIRE and
+MGET as separate round trips) for comparison.
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend"))
+
+from open_webui.utils.rate_limit import RateLimiter
+
+LIMITS = [(15, 180), (100, 3600), (1000, 86400)]
+
+
+def legacy_is_limited(r, key: str, limit=15, window=180, bucket_size=60) -> bool:
+    now_bucket = int(time.time()) // bucket_size
+    bucket_key = f"benchmark:legacy:{key}:{now_bucket}"
+
+    attempts = r.incr(bucket_key)
+    if attempts == 1:
+        r.expire(bucket_key, window + bucket_size)
+
+    buckets = [
+        f"benchmark:legacy:{key}:{now_bucket - i}"
+        for i in range(window // bucket_size + 1)
+    ]
+    return sum(int(c) for c in r.mget(buckets) if c) > limit
+
+
+def run(name: str, check, iterations: int, keys: int = 1000):
+    # Warm up, then spread the checks over many keys like distinct sign-in emails
+    for i in range(min(iterations, 100)):
+        check(f"user{i % keys}@example.com")
+
+    start = time.perf_counter()
+    for i in range(iterations):
+        check(f"user{i % keys}@example.com")
+    elapsed = time.perf_counter() - start
+
+    print(f"{name:<40} {elapsed / iterations * 1e6:>10.1f} us/check")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    run(
+        "memory, 1 limit",
+        RateLimiter(None, limit=15, window=180).is_limited,
+        args.iterations,
+    )
+    run(
+        "memory, 3 limits",
+        RateLimiter(None, limits=LIMITS).is_limited,
+        args.iterations,
+    )
+
+    redis_url = os.environ.get("REDIS_URL")
+    if not redis_url:
+        print("Set REDIS_URL to include Redis round trips")
+        return
+
+    import redis
+
+    r = redis.Redis.from_url(redis_url, decode_responses=True)
+    iterations = max(1, args.iterations // 10)
+
+    run(
+        "redis, legacy buckets (3 round trips)",
+        lambda key: legacy_is_limited(r, key),
+        iterations,
+    )
+    run(
+        "redis, lua, 1 limit",
+        RateLimiter(r, limit=15, window=180).is_limited,
+        iterations,
+    )
+    run(
+        "redis, lua, 3 limits",
+        RateLimiter(r, limits=LIMITS).is_limited,
+        iterations,
+    )
+
+
+if __name__ == "__main__":
+    main()
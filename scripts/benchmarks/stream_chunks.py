@@ -0,0 +1,99 @@
+"""
+Microbenchmark of the SSE line framing in stream_chunks_handler.
+
+    python scripts/benchmarks/stream_chunks.py [--repeat N]
+
+Replays provider-shaped streams through the LineFramer and through the
+previous implementation (buffer + data, then split on every chunk):
+
+- small token deltas, as sent for plain text completions
+- 1MB base64 lines (images, large tool call arguments) arriving in 16KB reads
+"""
+
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend"))
+
+from open_webui.utils.misc import LineFramer
+
+MAX_BUFFER_SIZE = 16 * 1024 * 1024
+
+
+def legacy_frame(chunks, max_buffer_size=MAX_BUFFER_SIZE):
+    buffer = b""
+    lines = 0
+    for data in chunks:
+        parts = (buffer + data).split(b"\n")
+        for line in parts[:-1]:
+            if len(line) <= max_buffer_size:
+                lines += 1
+        buffer = parts[-1]
+    return lines
+
+
+def framer_frame(chunks, max_buffer_size=MAX_BUFFER_SIZE):
+    framer = LineFramer(max_buffer_size)
+    lines = 0
+    for data in chunks:
+        for line in framer.feed(data):
+            lines += 1
+    return lines
+
+
+def event(delta: dict) -> bytes:
+    return b"data: " + json.dumps({"choices": [{"delta": delta}]}).encode() + b"\n\n"
+
+
+def split(data: bytes, size: int) -> list[bytes]:
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+def token_stream() -> list[bytes]:
+    # A few tokens per network read, as providers flush after every delta
+    events = [event({"content": f" token{i}"}) for i in range(5000)]
+    return [b"".join(events[i : i + 3]) for i in range(0, len(events), 3)]
+
+
+def base64_stream(size=1024 * 1024, read_size=16 * 1024) -> list[bytes]:
+    payload = base64.b64encode(os.urandom(size * 3 // 4)).decode()
+    data = event({"content": "Here is the image"}) + event(
+        {"images": [{"image_url": {"url": f"data:image/png;base64,{payload}"}}]}
+    )
+    return split(data * 4, read_size)
+
+
+def run(name: str, frame, chunks, repeat: int):
+    frame(chunks)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        frame(chunks)
+    elapsed = (time.perf_counter() - start) / repeat
+
+    size = sum(len(chunk) for chunk in chunks)
+    print(
+        f"{name:<32} {elapsed * 1e3:>10.2f} ms/stream {size / elapsed / 1e6:>10.1f} MB/s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    for stream_name, chunks in [
+        ("tokens", token_stream()),
+        ("1MB base64 lines", base64_stream()),
+    ]:
+        assert legacy_frame(chunks) == framer_frame(chunks)
+        run(f"{stream_name}, legacy split", legacy_frame, chunks, args.repeat)
+        run(f"{stream_name}, LineFramer", framer_frame, chunks, args.repeat)
+
+
+if __name__ == "__main__":
+    main()